@@ -10,6 +10,28 @@ Usage examples:
     python3 build_all_orchestrator.py
     python3 build_all_orchestrator.py --include-site --zip
     python3 build_all_orchestrator.py --skip-presentations
+    python3 build_all_orchestrator.py --jobs 4
+    python3 build_all_orchestrator.py --explain
+    python3 build_all_orchestrator.py --force
+    python3 build_all_orchestrator.py --artifact-cache /mnt/aac-cache --artifact-cache-size 4096
+
+Stages are modelled as a dependency graph and independent stages run
+concurrently (bounded by ``--jobs``). Each stage streams its output with a
+``[stage]`` prefix and also writes it to ``releases/logs/<stage>.log``. The
+first failing stage cancels the stages still running and skips the rest.
+
+Each stage declares the files it reads as glob patterns. A fingerprint of
+those inputs is stored under ``releases/.fingerprints/`` after a successful
+run, and the stage is skipped while the fingerprint is unchanged and its
+outputs are present. ``--force`` rebuilds everything and ``--explain``
+reports why each stage ran or was skipped.
+
+With ``--artifact-cache DIR`` (or ``AAC_ARTIFACT_CACHE``), finished stage
+outputs are also published to a shared content-addressed cache and restored
+on a fingerprint hit, so fresh checkouts reuse artifacts built elsewhere.
+
+The ``--zip`` archive deflates entries on its own thread pool, sized by
+``--archive-jobs`` (default: one thread per CPU) rather than ``--jobs``.
 
 The script is intentionally thin; the heavy lifting remains in:
     - generate_book.py
@@ -21,13 +43,28 @@ The script is intentionally thin; the heavy lifting remains in:
 from __future__ import annotations
 
 import argparse
+import fnmatch
+import hashlib
+import json
+import os
 import shutil
+import signal
+import struct
 import subprocess
 import sys
+import threading
+import tempfile
+import time
 import zipfile
+import zlib
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Iterable
+from typing import Callable, Iterable, TextIO
+
+from scripts.artifact_cache import DEFAULT_MAX_BYTES, ArtifactCache
 
 ROOT = Path(__file__).resolve().parent
 RELEASE_ROOT = ROOT / "releases"
@@ -35,6 +72,176 @@ BOOK_RELEASE = RELEASE_ROOT / "book"
 WHITEPAPER_RELEASE = RELEASE_ROOT / "whitepapers"
 PRESENTATION_RELEASE = RELEASE_ROOT / "presentation"
 WEBSITE_RELEASE = RELEASE_ROOT / "website"
+LOG_ROOT = RELEASE_ROOT / "logs"
+FINGERPRINT_ROOT = RELEASE_ROOT / ".fingerprints"
+FINGERPRINT_VERSION = 1
+
+# Inputs shared by every manuscript-driven stage. The generators import
+# helpers from scripts/ (navigation, manuscript, book_requirements, the pandoc
+# modules, ...), so all of them are fingerprinted rather than a list that has
+# to track every new import.
+_MANUSCRIPT_INPUTS = (
+    "docs/*.md",
+    "BOOK_REQUIREMENTS.md",
+    "mkdocs.yml",
+    "scripts/*.py",
+)
+_DIAGRAM_INPUTS = ("docs/images/*.mmd", "docs/images/*.png")
+# Files the book build writes back into docs/.
+_BOOK_BUILD_BYPRODUCTS = ("docs/architecture_as_code.*", "docs/images/book-cover.png")
+
+_output_lock = threading.Lock()
+_stage_local = threading.local()
+
+
+class StageCancelled(RuntimeError):
+    """Raised inside a stage that was stopped because a sibling stage failed."""
+
+
+@dataclass(frozen=True)
+class Stage:
+    """A named build step and the stages whose outputs it needs."""
+
+    name: str
+    run: Callable[[], None]
+    depends_on: tuple[str, ...] = ()
+    inputs: tuple[str, ...] = ()
+    excludes: tuple[str, ...] = ()
+    outputs: tuple[Path, ...] = ()
+    # Files or directories published to the artifact cache (defaults to outputs).
+    artifacts: tuple[Path, ...] = ()
+
+    @property
+    def cached_paths(self) -> tuple[Path, ...]:
+        return self.artifacts or self.outputs
+
+
+class FingerprintStore:
+    """Record the input fingerprint of each successfully built stage.
+
+    Stages without declared inputs are never considered up to date.
+    """
+
+    def __init__(self, directory: Path = FINGERPRINT_ROOT, root: Path = ROOT) -> None:
+        self.directory = directory
+        self.root = root
+
+    def collect(self, stage: Stage) -> dict[str, str]:
+        """Return the SHA-256 of every input file, keyed by repository path."""
+        files: dict[str, str] = {}
+        for pattern in stage.inputs:
+            for path in self.root.glob(pattern):
+                relative = path.relative_to(self.root).as_posix()
+                if not path.is_file() or relative in files:
+                    continue
+                if any(fnmatch.fnmatch(relative, exclude) for exclude in stage.excludes):
+                    continue
+                files[relative] = hashlib.sha256(path.read_bytes()).hexdigest()
+        return dict(sorted(files.items()))
+
+    @staticmethod
+    def digest(stage: Stage, files: dict[str, str]) -> str:
+        payload = json.dumps(
+            {"version": FINGERPRINT_VERSION, "stage": stage.name, "files": files},
+            sort_keys=True,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, name: str) -> Path:
+        return self.directory / f"{name}.json"
+
+    def load(self, name: str) -> dict | None:
+        try:
+            return json.loads(self._path(name).read_text(encoding="utf-8"))
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def save(self, stage: Stage, files: dict[str, str]) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        record = {"fingerprint": self.digest(stage, files), "files": files}
+        self._path(stage.name).write_text(json.dumps(record, indent=2) + "\n", encoding="utf-8")
+
+    def discard(self, name: str) -> None:
+        self._path(name).unlink(missing_ok=True)
+
+    def stale_reason(self, stage: Stage, files: dict[str, str]) -> str | None:
+        """Explain why ``stage`` must run, or return ``None`` when it is up to date."""
+        if not stage.inputs:
+            return "no inputs declared"
+
+        missing = [str(path.relative_to(self.root)) for path in stage.outputs if not _has_content(path)]
+        if missing:
+            return f"outputs missing: {', '.join(missing)}"
+
+        previous = self.load(stage.name)
+        if previous is None:
+            return "no previous fingerprint"
+        if previous.get("fingerprint") == self.digest(stage, files):
+            return None
+
+        before = previous.get("files", {})
+        changed = sorted(path for path in files.keys() & before.keys() if files[path] != before[path])
+        added = sorted(files.keys() - before.keys())
+        removed = sorted(before.keys() - files.keys())
+        parts = [
+            f"{label}: {', '.join(paths[:5])}{' …' if len(paths) > 5 else ''}"
+            for label, paths in (("changed", changed), ("added", added), ("removed", removed))
+            if paths
+        ]
+        return "inputs " + "; ".join(parts) if parts else "fingerprint format changed"
+
+
+def _has_content(path: Path) -> bool:
+    if path.is_dir():
+        return any(child.is_file() for child in path.rglob("*"))
+    return path.is_file() and path.stat().st_size > 0
+
+
+class StageContext:
+    """Per-stage output sink and subprocess tracker used while a stage runs."""
+
+    def __init__(self, name: str, log_file: TextIO, scheduler: "StageScheduler") -> None:
+        self.name = name
+        self.log_file = log_file
+        self.scheduler = scheduler
+
+    def emit(self, line: str) -> None:
+        with _output_lock:
+            print(f"[{self.name}] {line}", flush=True)
+            self.log_file.write(f"{line}\n")
+            self.log_file.flush()
+
+    def run(self, command: list[str], cwd: Path) -> None:
+        """Run ``command``, streaming merged stdout/stderr through :meth:`emit`."""
+        if self.scheduler.cancelled:
+            raise StageCancelled(self.name)
+
+        process = subprocess.Popen(
+            command,
+            cwd=cwd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            errors="replace",
+            start_new_session=os.name == "posix",
+        )
+        self.scheduler.track(process)
+        try:
+            assert process.stdout is not None
+            for line in process.stdout:
+                self.emit(line.rstrip("\n"))
+            returncode = process.wait()
+        finally:
+            self.scheduler.untrack(process)
+
+        if returncode != 0:
+            if self.scheduler.cancelled:
+                raise StageCancelled(self.name)
+            raise subprocess.CalledProcessError(returncode, command, None, None)
+
+
+def _current_stage() -> StageContext | None:
+    return getattr(_stage_local, "context", None)
 
 
 def _timestamp() -> str:
@@ -42,7 +249,12 @@ def _timestamp() -> str:
 
 
 def log(message: str) -> None:
-    print(f"[{_timestamp()}] {message}")
+    context = _current_stage()
+    if context is not None:
+        context.emit(f"[{_timestamp()}] {message}")
+        return
+    with _output_lock:
+        print(f"[{_timestamp()}] {message}", flush=True)
 
 
 def log_success(message: str) -> None:
@@ -63,6 +275,11 @@ def run_command(command: Iterable[str | Path], *, cwd: Path | None = None) -> No
     working_dir = cwd or ROOT
     log(f"→ Running: {' '.join(command_as_str)} (cwd: {working_dir})")
 
+    context = _current_stage()
+    if context is not None:
+        context.run(command_as_str, working_dir)
+        return
+
     result = subprocess.run(command_as_str, cwd=working_dir, check=False)
     if result.returncode != 0:
         raise subprocess.CalledProcessError(result.returncode, command_as_str, None, None)
@@ -108,6 +325,210 @@ def ensure_release_structure(include_site: bool) -> None:
         WEBSITE_RELEASE.mkdir(parents=True, exist_ok=True)
 
 
+_DONE_STATUSES = frozenset({"succeeded", "up to date", "restored"})
+
+
+class StageScheduler:
+    """Run a dependency graph of stages with at most ``jobs`` in parallel."""
+
+    def __init__(
+        self,
+        stages: Iterable[Stage],
+        *,
+        jobs: int = 1,
+        log_dir: Path = LOG_ROOT,
+        fingerprints: FingerprintStore | None = None,
+        artifact_cache: ArtifactCache | None = None,
+        force: bool = False,
+        explain: bool = False,
+    ) -> None:
+        self.stages = {stage.name: stage for stage in stages}
+        self.jobs = max(1, jobs)
+        self.log_dir = log_dir
+        self.fingerprints = fingerprints
+        self.artifact_cache = artifact_cache
+        self.force = force
+        self.explain = explain
+        self.statuses: dict[str, str] = {}
+        self.durations: dict[str, float] = {}
+        self._cancel = threading.Event()
+        self._lock = threading.Lock()
+        self._processes: set[subprocess.Popen] = set()
+        self._validate()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def _validate(self) -> None:
+        for stage in self.stages.values():
+            unknown = [name for name in stage.depends_on if name not in self.stages]
+            if unknown:
+                raise ValueError(f"Stage '{stage.name}' depends on unknown stage(s): {', '.join(unknown)}")
+
+        visiting: set[str] = set()
+        visited: set[str] = set()
+
+        def visit(name: str, path: tuple[str, ...]) -> None:
+            if name in visited:
+                return
+            if name in visiting:
+                raise ValueError(f"Stage dependency cycle: {' → '.join(path + (name,))}")
+            visiting.add(name)
+            for dependency in self.stages[name].depends_on:
+                visit(dependency, path + (name,))
+            visiting.discard(name)
+            visited.add(name)
+
+        for name in self.stages:
+            visit(name, ())
+
+    def track(self, process: subprocess.Popen) -> None:
+        with self._lock:
+            self._processes.add(process)
+        if self.cancelled:
+            self._terminate(process)
+
+    def untrack(self, process: subprocess.Popen) -> None:
+        with self._lock:
+            self._processes.discard(process)
+
+    def cancel(self) -> None:
+        """Stop running stages and prevent new ones from starting."""
+        self._cancel.set()
+        with self._lock:
+            processes = list(self._processes)
+        for process in processes:
+            self._terminate(process)
+
+    @staticmethod
+    def _terminate(process: subprocess.Popen) -> None:
+        if process.poll() is not None:
+            return
+        try:
+            if os.name == "posix":
+                os.killpg(process.pid, signal.SIGTERM)
+            else:
+                process.terminate()
+        except (ProcessLookupError, PermissionError):
+            pass
+
+    def _run_stage(self, stage: Stage) -> str:
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+        started = time.monotonic()
+        with (self.log_dir / f"{stage.name}.log").open("w", encoding="utf-8") as log_file:
+            _stage_local.context = StageContext(stage.name, log_file, self)
+            try:
+                return self._build_stage(stage)
+            finally:
+                _stage_local.context = None
+                self.durations[stage.name] = time.monotonic() - started
+
+    def _build_stage(self, stage: Stage) -> str:
+        files = None
+        if self.fingerprints is not None and stage.inputs:
+            files = self.fingerprints.collect(stage)
+            reason = "forced with --force" if self.force else self.fingerprints.stale_reason(stage, files)
+            if reason is None:
+                log(f"⏭️  Inputs unchanged ({len(files)} files) – skipping.")
+                return "up to date"
+            if self.explain:
+                log(f"🔎 Out of date: {reason}")
+            self.fingerprints.discard(stage.name)
+            if self._restore_artifacts(stage, files):
+                return "restored"
+        elif self.explain:
+            log("🔎 Out of date: no inputs declared")
+
+        stage.run()
+
+        if files is not None:
+            self.fingerprints.save(stage, files)
+            self._publish_artifacts(stage, files)
+        return "succeeded"
+
+    def _restore_artifacts(self, stage: Stage, files: dict[str, str]) -> bool:
+        if self.artifact_cache is None or self.force or not stage.cached_paths:
+            return False
+        fingerprint = FingerprintStore.digest(stage, files)
+        if not self.artifact_cache.restore(stage.name, fingerprint, self.fingerprints.root, stage.cached_paths):
+            return False
+        self.fingerprints.save(stage, files)
+        log(f"♻️  Restored outputs from artifact cache ({fingerprint[:12]}).")
+        return True
+
+    def _publish_artifacts(self, stage: Stage, files: dict[str, str]) -> None:
+        if self.artifact_cache is None or not stage.cached_paths:
+            return
+        fingerprint = FingerprintStore.digest(stage, files)
+        try:
+            stored = self.artifact_cache.store(stage.name, fingerprint, self.fingerprints.root, stage.cached_paths)
+        except OSError as exc:
+            log_warning(f"Could not publish artifacts to cache: {exc}")
+            return
+        log(f"📦 Published {stored} file(s) to artifact cache ({fingerprint[:12]}).")
+
+    def run(self) -> None:
+        """Run every stage, raising the first stage failure after cleanup."""
+        pending = dict(self.stages)
+        running: dict[Future, str] = {}
+        first_error: BaseException | None = None
+
+        with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+            try:
+                while pending or running:
+                    if self.cancelled:
+                        for name in pending:
+                            self.statuses[name] = "skipped"
+                        pending.clear()
+
+                    for name, stage in list(pending.items()):
+                        if len(running) >= self.jobs:
+                            break
+                        if all(self.statuses.get(dep) in _DONE_STATUSES for dep in stage.depends_on):
+                            del pending[name]
+                            self.statuses[name] = "running"
+                            running[executor.submit(self._run_stage, stage)] = name
+
+                    if not running:
+                        break
+
+                    finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        name = running.pop(future)
+                        error = future.exception()
+                        if error is None:
+                            self.statuses[name] = future.result()
+                        elif isinstance(error, StageCancelled):
+                            self.statuses[name] = "cancelled"
+                        else:
+                            self.statuses[name] = "failed"
+                            if first_error is None:
+                                first_error = error
+                                log_error(f"Stage '{name}' failed – cancelling remaining stages.")
+                                self.cancel()
+            except KeyboardInterrupt:
+                self.cancel()
+                raise
+
+        self._log_summary()
+        if first_error is not None:
+            raise first_error
+
+    def _log_summary(self) -> None:
+        for name in self.stages:
+            status = self.statuses.get(name, "skipped")
+            duration = self.durations.get(name)
+            timing = f" in {duration:.1f}s" if duration is not None else ""
+            message = f"Stage {name}: {status}{timing} (log: {self.log_dir / f'{name}.log'})"
+            if status in _DONE_STATUSES:
+                log_success(message)
+            elif status == "failed":
+                log_error(message)
+            else:
+                log_warning(message)
+
+
 def orchestrate_book() -> None:
     log("📚 Generating book content…")
     run_command([sys.executable, "generate_book.py"])
@@ -163,32 +584,229 @@ def orchestrate_site() -> None:
     verify_directory(WEBSITE_RELEASE, "Website")
 
 
-def create_archive(output_path: Path) -> None:
-    """Create a zip archive containing the entire releases/ directory."""
+# Formats that are already compressed gain nothing from deflate; store them as-is.
+STORED_SUFFIXES = frozenset(
+    {".pdf", ".epub", ".pptx", ".docx", ".png", ".jpg", ".jpeg", ".gif", ".webp",
+     ".zip", ".gz", ".bz2", ".xz", ".woff", ".woff2", ".mp4"}
+)
+_ARCHIVE_CHUNK_SIZE = 1024 * 1024
+# Compressed entries larger than this spill from memory to a temporary file.
+_ARCHIVE_SPOOL_SIZE = 8 * 1024 * 1024
+
+
+@dataclass
+class _ArchiveEntry:
+    info: zipfile.ZipInfo
+    sha256: str
+    data: tempfile.SpooledTemporaryFile | None = None
+
+
+def _deflate_file(path: Path, arcname: str) -> _ArchiveEntry:
+    """Compress ``path`` to a raw deflate stream (runs in a worker thread)."""
+    info = zipfile.ZipInfo.from_file(path, arcname)
+    info.compress_type = zipfile.ZIP_DEFLATED
+    compressor = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -15)
+    digest = hashlib.sha256()
+    crc = 0
+    spool = tempfile.SpooledTemporaryFile(max_size=_ARCHIVE_SPOOL_SIZE)
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(_ARCHIVE_CHUNK_SIZE), b""):
+            digest.update(chunk)
+            crc = zlib.crc32(chunk, crc)
+            spool.write(compressor.compress(chunk))
+    spool.write(compressor.flush())
+    info.CRC = crc
+    info.file_size = path.stat().st_size
+    info.compress_size = spool.tell()
+    spool.seek(0)
+    return _ArchiveEntry(info, digest.hexdigest(), spool)
+
+
+class _ZipWriter:
+    """Write a zip archive from entries whose bytes may already be deflated.
+
+    ``zipfile`` has no public API for adding pre-compressed data, so this
+    writes the local headers, the central directory and, past the classic
+    limits, the zip64 records itself. ``zipfile`` reads the result.
+    """
+
+    def __init__(self, handle) -> None:
+        self.handle = handle
+        self.infos: list[zipfile.ZipInfo] = []
+
+    @staticmethod
+    def _dos_time(info: zipfile.ZipInfo) -> tuple[int, int]:
+        year, month, day, hour, minute, second = info.date_time
+        return hour << 11 | minute << 5 | second // 2, (year - 1980) << 9 | month << 5 | day
+
+    @staticmethod
+    def _flags(info: zipfile.ZipInfo) -> int:
+        return 0 if info.filename.isascii() else 0x800
+
+    def _write_header(self, info: zipfile.ZipInfo) -> None:
+        info.header_offset = self.handle.tell()
+        zip64 = max(info.file_size, info.compress_size) > zipfile.ZIP64_LIMIT
+        name = info.filename.encode("utf-8")
+        extra = struct.pack("<HHQQ", 1, 16, info.file_size, info.compress_size) if zip64 else b""
+        sizes = (0xFFFFFFFF, 0xFFFFFFFF) if zip64 else (info.compress_size, info.file_size)
+        dos_time, dos_date = self._dos_time(info)
+        self.handle.write(struct.pack(
+            "<IHHHHHIIIHH", 0x04034B50, 45 if zip64 else 20, self._flags(info), info.compress_type,
+            dos_time, dos_date, info.CRC, *sizes, len(name), len(extra),
+        ))
+        self.handle.write(name + extra)
+
+    def write_deflated(self, entry: _ArchiveEntry) -> None:
+        """Append an entry compressed by :func:`_deflate_file`."""
+        self._write_header(entry.info)
+        shutil.copyfileobj(entry.data, self.handle, _ARCHIVE_CHUNK_SIZE)
+        entry.data.close()
+        self.infos.append(entry.info)
+
+    def write_stored(self, path: Path, arcname: str) -> str:
+        """Stream ``path`` into the archive uncompressed and return its SHA-256."""
+        info = zipfile.ZipInfo.from_file(path, arcname)
+        info.compress_type = zipfile.ZIP_STORED
+        info.file_size = info.compress_size = path.stat().st_size
+        info.CRC = 0
+        self._write_header(info)
+        digest = hashlib.sha256()
+        crc = 0
+        size = 0
+        with path.open("rb") as source:
+            for chunk in iter(lambda: source.read(_ARCHIVE_CHUNK_SIZE), b""):
+                digest.update(chunk)
+                crc = zlib.crc32(chunk, crc)
+                size += len(chunk)
+                self.handle.write(chunk)
+        if size != info.file_size:
+            raise OSError(f"{path} changed size while it was archived")
+        # The CRC is only known now; patch it into the local header.
+        end = self.handle.tell()
+        self.handle.seek(info.header_offset + 14)
+        self.handle.write(struct.pack("<I", crc))
+        self.handle.seek(end)
+        info.CRC = crc
+        self.infos.append(info)
+        return digest.hexdigest()
+
+    def close(self) -> None:
+        """Write the central directory.
+
+        Sizes and offsets past ``ZIP64_LIMIT`` move into a zip64 extra field
+        and their 32-bit fields hold 0xFFFFFFFF, matching the local headers.
+        """
+        directory_offset = self.handle.tell()
+        for info in self.infos:
+            compress_size, file_size, header_offset = info.compress_size, info.file_size, info.header_offset
+            moved: list[int] = []
+            if max(file_size, compress_size) > zipfile.ZIP64_LIMIT:
+                moved += [file_size, compress_size]
+                compress_size = file_size = 0xFFFFFFFF
+            if header_offset > zipfile.ZIP64_LIMIT:
+                moved.append(header_offset)
+                header_offset = 0xFFFFFFFF
+            extra = struct.pack(f"<HH{len(moved)}Q", 1, 8 * len(moved), *moved) if moved else b""
+            name = info.filename.encode("utf-8")
+            dos_time, dos_date = self._dos_time(info)
+            self.handle.write(struct.pack(
+                "<IHHHHHHIIIHHHHHII", 0x02014B50, 3 << 8 | 45, 45 if moved else 20, self._flags(info),
+                info.compress_type, dos_time, dos_date, info.CRC, compress_size, file_size,
+                len(name), len(extra), 0, 0, 0, info.external_attr, header_offset,
+            ))
+            self.handle.write(name + extra)
+        directory_size = self.handle.tell() - directory_offset
+
+        count = len(self.infos)
+        if count > 0xFFFF or max(directory_offset, directory_size) > zipfile.ZIP64_LIMIT:
+            zip64_offset = self.handle.tell()
+            self.handle.write(struct.pack(
+                "<IQHHIIQQQQ", 0x06064B50, 44, 45, 45, 0, 0, count, count, directory_size, directory_offset,
+            ))
+            self.handle.write(struct.pack("<IIQI", 0x07064B50, 0, zip64_offset, 1))
+            # The zip64 record holds the real values.
+            count, directory_size, directory_offset = 0xFFFF, 0xFFFFFFFF, 0xFFFFFFFF
+        self.handle.write(struct.pack(
+            "<IHHHHIIH", 0x06054B50, 0, 0, count, count, directory_size, directory_offset, 0,
+        ))
+
+
+def create_archive(output_path: Path, *, workers: int | None = None, manifest: bool = False) -> None:
+    """Create a zip archive containing the entire releases/ directory.
+
+    Already-compressed formats (see ``STORED_SUFFIXES``) are stored; every
+    other file is deflated by a pool of worker threads while entries are
+    written in a stable order. With ``manifest`` a ``sha256sum``-compatible
+    ``<archive>.sha256`` sidecar lists every entry.
+    """
     if not RELEASE_ROOT.exists():
         raise FileNotFoundError("Releases directory not found; nothing to archive.")
 
+    manifest_path = output_path.with_name(f"{output_path.name}.sha256")
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    if output_path.exists():
-        output_path.unlink()
+    for stale in (output_path, manifest_path):
+        if stale.exists():
+            stale.unlink()
 
-    files = [path for path in RELEASE_ROOT.rglob("*") if path.is_file()]
+    files = sorted(path for path in RELEASE_ROOT.rglob("*") if path.is_file())
     if not files:
         raise FileNotFoundError("No release files found to archive.")
 
-    # Ensure we never include the archive itself in the payload
-    files = [path for path in files if path != output_path]
+    # Ensure we never include the archive itself or build bookkeeping in the payload
+    files = [
+        path
+        for path in files
+        if path not in (output_path, manifest_path)
+        and LOG_ROOT not in path.parents
+        and FINGERPRINT_ROOT not in path.parents
+    ]
     if not files:
         raise FileNotFoundError("No release files found to archive.")
 
-    log(f"📦 Creating archive at {output_path} …")
-    with zipfile.ZipFile(output_path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+    workers = max(1, workers or os.cpu_count() or 1)
+    stored = sum(1 for path in files if path.suffix.lower() in STORED_SUFFIXES)
+    log(
+        f"📦 Creating archive at {output_path} … "
+        f"({stored} stored, {len(files) - stored} deflated with {workers} worker(s))"
+    )
+
+    checksums: list[tuple[str, str]] = []
+    with ThreadPoolExecutor(max_workers=workers) as executor, output_path.open("wb") as handle:
+        archive = _ZipWriter(handle)
+        # Keep a bounded window of compressions in flight so spooled results
+        # are written (and released) in order without piling up.
+        window: deque[tuple[Path, str, Future | None]] = deque()
         for file_path in files:
-            archive.write(file_path, file_path.relative_to(RELEASE_ROOT))
+            arcname = file_path.relative_to(RELEASE_ROOT).as_posix()
+            if file_path.suffix.lower() in STORED_SUFFIXES:
+                window.append((file_path, arcname, None))
+            else:
+                window.append((file_path, arcname, executor.submit(_deflate_file, file_path, arcname)))
+            while len(window) > workers * 2 or (window and window[0][2] is None):
+                checksums.append(_flush_archive_entry(archive, *window.popleft()))
+        while window:
+            checksums.append(_flush_archive_entry(archive, *window.popleft()))
+        archive.close()
+
+    if manifest:
+        manifest_path.write_text(
+            "".join(f"{sha256}  {arcname}\n" for arcname, sha256 in checksums), encoding="utf-8"
+        )
+        log_success(f"Checksum manifest written: {manifest_path}")
 
     log_success(f"Archive created: {output_path} ({human_readable_size(output_path)})")
 
 
+def _flush_archive_entry(
+    archive: _ZipWriter, path: Path, arcname: str, future: Future | None
+) -> tuple[str, str]:
+    if future is None:
+        return arcname, archive.write_stored(path, arcname)
+    entry = future.result()
+    archive.write_deflated(entry)
+    return arcname, entry.sha256
+
+
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(
         description="Build all Architecture as Code deliverables in one command."
@@ -216,37 +834,161 @@ def parse_args() -> argparse.Namespace:
         default="architecture_as_code_release.zip",
         help="Filename for the consolidated archive (default: architecture_as_code_release.zip).",
     )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Maximum number of stages to run concurrently (default: 1).",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Rebuild every stage even when its input fingerprint is unchanged.",
+    )
+    parser.add_argument(
+        "--explain",
+        action="store_true",
+        help="Report which inputs changed for every stage that reruns.",
+    )
+    parser.add_argument(
+        "--artifact-cache",
+        type=Path,
+        default=os.environ.get("AAC_ARTIFACT_CACHE") or None,
+        help="Shared artifact cache directory (default: $AAC_ARTIFACT_CACHE; disabled when unset).",
+    )
+    parser.add_argument(
+        "--artifact-cache-size",
+        type=int,
+        default=DEFAULT_MAX_BYTES // 1024**2,
+        help=f"Artifact cache size cap in MiB (default: {DEFAULT_MAX_BYTES // 1024**2}).",
+    )
+    parser.add_argument(
+        "--archive-jobs",
+        type=int,
+        default=None,
+        help="Threads that compress archive entries, independent of --jobs (default: CPU count).",
+    )
+    parser.add_argument(
+        "--archive-manifest",
+        action="store_true",
+        help="Write a SHA-256 checksum manifest next to the archive (requires --zip).",
+    )
     return parser.parse_args()
 
 
-def main() -> int:
-    args = parse_args()
-    ensure_release_structure(include_site=args.include_site)
+def _after_book(stages: list[Stage]) -> tuple[str, ...]:
+    return ("book",) if any(stage.name == "book" for stage in stages) else ()
 
-    try:
-        if args.skip_book:
-            log_warning("Skipping book generation as requested.")
-        else:
-            orchestrate_book()
 
-        if args.skip_whitepapers:
-            log_warning("Skipping whitepaper generation as requested.")
-        else:
-            orchestrate_whitepapers()
+def build_stages(args: argparse.Namespace) -> list[Stage]:
+    """Return the stage graph selected by the command-line options.
 
-        if args.skip_presentations:
-            log_warning("Skipping presentation generation as requested.")
-        else:
-            orchestrate_presentations()
+    The book stage rewrites docs/images/*.png and the book outputs under
+    docs/ in place, so presentations (which embed those PNGs) and the site
+    (which copies all of docs/) wait for it. Whitepapers only read the
+    markdown and run alongside the book; the archive waits for every other
+    selected stage.
+    """
+    stages: list[Stage] = []
 
-        if args.include_site:
-            orchestrate_site()
-        else:
-            log("🌐 Site build skipped (enable with --include-site).")
+    if args.skip_book:
+        log_warning("Skipping book generation as requested.")
+    else:
+        stages.append(
+            Stage(
+                "book",
+                orchestrate_book,
+                inputs=_MANUSCRIPT_INPUTS
+                + _DIAGRAM_INPUTS
+                + (
+                    "docs/*.yaml",
+                    "docs/*.json",
+                    "docs/*.css",
+                    "docs/build_book.sh",
+                    "templates/*.latex",
+                    "templates/book-cover.svg",
+                    "generate_book.py",
+                    "scripts/mermaid_*",
+                    "package-lock.json",
+                ),
+                excludes=_BOOK_BUILD_BYPRODUCTS,
+                outputs=(BOOK_RELEASE / "architecture_as_code.pdf",),
+                artifacts=(BOOK_RELEASE,),
+            )
+        )
 
-        if args.create_zip:
-            archive_path = RELEASE_ROOT / args.archive_name
-            create_archive(archive_path)
+    if args.skip_whitepapers:
+        log_warning("Skipping whitepaper generation as requested.")
+    else:
+        stages.append(
+            Stage(
+                "whitepapers",
+                orchestrate_whitepapers,
+                inputs=_MANUSCRIPT_INPUTS + ("templates/whitepaper-template.html", "generate_whitepapers.py"),
+                outputs=(WHITEPAPER_RELEASE,),
+            )
+        )
+
+    if args.skip_presentations:
+        log_warning("Skipping presentation generation as requested.")
+    else:
+        stages.append(
+            Stage(
+                "presentations",
+                orchestrate_presentations,
+                inputs=_MANUSCRIPT_INPUTS
+                + _DIAGRAM_INPUTS
+                + ("templates/presentation-template.html", "generate_presentation.py"),
+                excludes=_BOOK_BUILD_BYPRODUCTS,
+                outputs=(PRESENTATION_RELEASE,),
+                depends_on=_after_book(stages),
+            )
+        )
+
+    if args.include_site:
+        stages.append(
+            Stage(
+                "site",
+                orchestrate_site,
+                inputs=("docs/**/*", "mkdocs.yml"),
+                excludes=_BOOK_BUILD_BYPRODUCTS,
+                outputs=(WEBSITE_RELEASE,),
+                depends_on=_after_book(stages),
+            )
+        )
+    else:
+        log("🌐 Site build skipped (enable with --include-site).")
+
+    if args.create_zip:
+        archive_path = RELEASE_ROOT / args.archive_name
+        stages.append(
+            Stage(
+                "archive",
+                lambda: create_archive(archive_path, workers=args.archive_jobs, manifest=args.archive_manifest),
+                depends_on=tuple(stage.name for stage in stages),
+            )
+        )
+
+    return stages
+
+
+def main() -> int:
+    args = parse_args()
+    ensure_release_structure(include_site=args.include_site)
+
+    try:
+        StageScheduler(
+            build_stages(args),
+            jobs=args.jobs,
+            fingerprints=FingerprintStore(),
+            artifact_cache=(
+                ArtifactCache(Path(args.artifact_cache), max_bytes=args.artifact_cache_size * 1024**2)
+                if args.artifact_cache
+                else None
+            ),
+            force=args.force,
+            explain=args.explain,
+        ).run()
 
         log_success("Build orchestrator completed successfully.")
         return 0
@@ -117,10 +117,6 @@ cleanup_temp_artifacts() {
     if [ -n "$PUPPETEER_CONFIG_FILE" ] && [ -f "$PUPPETEER_CONFIG_FILE" ]; then
         rm -f "$PUPPETEER_CONFIG_FILE"
     fi
-
-    if [ -n "$SANITIZED_PART_DIR" ] && [ -d "$SANITIZED_PART_DIR" ]; then
-        rm -rf "$SANITIZED_PART_DIR"
-    fi
 }
 
 # Ensure Pandoc is available before continuing
@@ -320,7 +316,6 @@ fi
 CHROME_FLAGS="${CHROME_FLAGS:-}"
 CHROME_EXECUTABLE=""
 PUPPETEER_CONFIG_FILE=""
-SANITIZED_PART_DIR=""
 trap cleanup_temp_artifacts EXIT
 
 if CHROME_EXECUTABLE=$(find_chrome_executable); then
@@ -358,48 +353,59 @@ if [ ! -f "$MERMAID_THEME_FILE" ]; then
     echo "⚠️  Warning: Mermaid theme file '$MERMAID_THEME_FILE' not found. Falling back to default styling."
 fi
 
+MERMAID_CLI_VERSION=$(mmdc -V 2>/dev/null | head -n 1)
+MERMAID_CLI_VERSION="${MERMAID_CLI_VERSION:-unknown}"
+MERMAID_MANIFEST="images/mermaid-render-manifest.json"
+MERMAID_CACHE_ARGS=(
+    --manifest "$MERMAID_MANIFEST"
+    --cli-version "$MERMAID_CLI_VERSION"
+    --theme default
+    --background transparent
+    --width 1400
+    --height 900
+)
+if [ -f "$MERMAID_THEME_FILE" ]; then
+    MERMAID_CACHE_ARGS+=(--config-file "$MERMAID_THEME_FILE")
+fi
+
+# Only render diagrams whose source, theme, flags or CLI version changed
+MMD_SOURCES=()
 for mmd_file in images/*.mmd; do
     if [ -f "$mmd_file" ]; then
-        png_file="${mmd_file%.mmd}.png"
-        conversion_success=false
-
-        if [ -n "$PUPPETEER_CONFIG_FILE" ]; then
-            echo "Converting $mmd_file (Docker/CI mode)..."
-            if mmdc -i "$mmd_file" -o "$png_file" \
-                -t default \
-                ${MERMAID_THEME_FILE:+-c "$MERMAID_THEME_FILE"} \
-                -b transparent \
-                --width 1400 \
-                --height 900 \
-                --puppeteerConfigFile "$PUPPETEER_CONFIG_FILE" \
-                2>/dev/null; then
-                conversion_success=true
-            fi
-        else
-            echo "Converting $mmd_file (local mode)..."
-            if mmdc -i "$mmd_file" -o "$png_file" \
-                -t default \
-                ${MERMAID_THEME_FILE:+-c "$MERMAID_THEME_FILE"} \
-                -b transparent \
-                --width 1400 \
-                --height 900 \
-                2>/dev/null; then
-                conversion_success=true
-            fi
-        fi
+        MMD_SOURCES+=("$mmd_file")
+    fi
+done
 
-        if [ "$conversion_success" = true ] && [ -f "$png_file" ] && [ -s "$png_file" ]; then
-            echo "✅ Converted $mmd_file to $png_file with enhanced styling"
-        else
-            echo "⚠️  Warning: Failed to convert $mmd_file, skipping (PDF generation will continue)"
+STALE_MMD_FILES=()
+if [ ${#MMD_SOURCES[@]} -gt 0 ]; then
+    if STALE_OUTPUT=$(python3 ../scripts/mermaid_render_cache.py stale "${MERMAID_CACHE_ARGS[@]}" "${MMD_SOURCES[@]}"); then
+        if [ -n "$STALE_OUTPUT" ]; then
+            readarray -t STALE_MMD_FILES <<< "$STALE_OUTPUT"
         fi
+    else
+        echo "⚠️  Warning: Mermaid render cache unavailable, rendering every diagram"
+        STALE_MMD_FILES=("${MMD_SOURCES[@]}")
     fi
-done
+fi
+
+echo "Mermaid render cache: $(( ${#MMD_SOURCES[@]} - ${#STALE_MMD_FILES[@]} )) up to date, ${#STALE_MMD_FILES[@]} to render"
+
+# Render every stale diagram through one shared headless browser
+if [ ${#STALE_MMD_FILES[@]} -gt 0 ]; then
+    echo "Converting ${#STALE_MMD_FILES[@]} Mermaid diagrams with the batch renderer..."
+    if ! PUPPETEER_CONFIG_FILE="$PUPPETEER_CONFIG_FILE" python3 ../scripts/mermaid_batch_render.py \
+        "${MERMAID_CACHE_ARGS[@]}" \
+        --pages "${MERMAID_RENDER_PAGES:-4}" \
+        "${STALE_MMD_FILES[@]}"; then
+        echo "⚠️  Warning: Mermaid rendering unavailable, skipping diagram conversion (PDF generation will continue)"
+    fi
+fi
 
-# Generate PDF using the Pandoc configuration file
-echo "Generating PDF with Pandoc defaults..."
+# Generate the PDF (and EPUB/DOCX when requested) using the Pandoc configuration files
+echo "Generating book formats with Pandoc defaults..."
 
-# Build chapter list using the canonical navigation configuration
+# Build chapter list using the canonical navigation configuration (served from
+# the .cache/navigation.json index while mkdocs.yml is unchanged)
 if ! readarray -t CHAPTER_FILES < <(python3 ../scripts/navigation.py --book-build); then
     echo "❌ Error: Unable to resolve chapter ordering from mkdocs.yml"
     exit 1
@@ -410,57 +416,38 @@ if [ ${#CHAPTER_FILES[@]} -eq 0 ]; then
     exit 1
 fi
 
-# Build a sanitized list that excludes LaTeX-only part markers for non-LaTeX formats
 COVER_PAGE_MARKDOWN="00_front_cover.md"
-NON_LATEX_CHAPTER_FILES=()
-
-SANITIZED_PART_DIR=$(mktemp -d 2>/dev/null)
-if [ ! -d "$SANITIZED_PART_DIR" ]; then
-    echo "❌ Error: Failed to create temporary directory for part introductions"
-    exit 1
-fi
-
-for chapter_file in "${CHAPTER_FILES[@]}"; do
-    if [[ $chapter_file == part_*.md ]]; then
-        source_file="$chapter_file"
-        sanitized_file="$SANITIZED_PART_DIR/$chapter_file"
-        awk '
-            BEGIN { printed = 0 }
-            /^\\cleardoublepage/ { next }
-            /^\\part\{/ { next }
-            /^\\setbookpart/ { next }
-            {
-                if (!printed) {
-                    if ($0 ~ /^[[:space:]]*$/) next
-                    printed = 1
-                }
-                print
-            }
-        ' "$source_file" > "$sanitized_file"
-
-        if [ -s "$sanitized_file" ]; then
-            NON_LATEX_CHAPTER_FILES+=("$sanitized_file")
-        else
-            echo "⚠️  Warning: Skipping empty part introduction for non-LaTeX output ($chapter_file)"
-        fi
-        continue
-    fi
-
-    NON_LATEX_CHAPTER_FILES+=("$chapter_file")
-done
-
-if [ -f "$COVER_PAGE_MARKDOWN" ]; then
-    NON_LATEX_CHAPTER_FILES=("$COVER_PAGE_MARKDOWN" "${NON_LATEX_CHAPTER_FILES[@]}")
-else
+if [ ! -f "$COVER_PAGE_MARKDOWN" ]; then
     echo "⚠️  Warning: Non-LaTeX formats missing cover page markdown ($COVER_PAGE_MARKDOWN not found)"
 fi
 
-if [ ${#PANDOC_PRINT_CSS_ARGS[@]} -gt 0 ]; then
-    pandoc --defaults=pandoc.yaml "${PANDOC_PRINT_CSS_ARGS[@]}" "${CHAPTER_FILES[@]}" -o "$OUTPUT_PDF" 2>&1
-else
-    pandoc --defaults=pandoc.yaml "${CHAPTER_FILES[@]}" -o "$OUTPUT_PDF" 2>&1
+BUILD_OUTPUTS=(--output "pdf=$OUTPUT_PDF")
+if [ "$1" = "--all-formats" ] || [ "$1" = "--release" ]; then
+    BUILD_OUTPUTS+=(--output "epub=$OUTPUT_EPUB" --output "docx=$OUTPUT_DOCX")
 fi
 
+# Parse every chapter once into pandoc's JSON AST (cached per chapter under
+# .cache/pandoc-ast) and run the PDF, EPUB and DOCX writers concurrently from
+# it. For EPUB and DOCX the part introductions pass through the same
+# sanitise_part_markdown as generate_book.py, in memory. The PDF is compiled
+# from per-chapter LaTeX fragments in .cache/latex-build, whose aux and toc
+# files persist between builds, and falls back to the default template when
+# the Eisvogel run fails.
+rm -f "$OUTPUT_PDF" "$OUTPUT_EPUB" "$OUTPUT_DOCX"
+python3 ../scripts/pandoc_ast.py "${CHAPTER_FILES[@]}" \
+    --pdf-defaults=pandoc.yaml \
+    "${PANDOC_PRINT_CSS_ARGS[@]}" \
+    --pdf-fallback-template=default \
+    --pdf-build-dir=../.cache/latex-build \
+    "${NON_LATEX_DEFAULTS_ARGS[@]}" \
+    --cover-page "$COVER_PAGE_MARKDOWN" \
+    --metadata date="$(date +'%Y-%m-%d')" \
+    --metadata language=en \
+    --metadata lang=en-GB \
+    --epub-cover-image="images/book-cover.png" \
+    "${BUILD_OUTPUTS[@]}" \
+    2>&1
+
 # Check if PDF was actually generated
 if [ -f "$OUTPUT_PDF" ] && [ -s "$OUTPUT_PDF" ]; then
     echo "✅ Book generated: $OUTPUT_PDF ($(ls -lh "$OUTPUT_PDF" | awk '{print $5}'))"
@@ -473,36 +460,8 @@ if [ -f "$OUTPUT_PDF" ] && [ -s "$OUTPUT_PDF" ]; then
         exit 1
     fi
 else
-    echo "❌ Error: PDF generation failed with the Eisvogel template"
-    echo "Attempting fallback with the default template..."
-
-    # Try with default LaTeX template
-    # Reuse the shared pandoc defaults so LaTeX helpers like \setbookpart stay defined
-    if pandoc --defaults=pandoc.yaml \
-        "${PANDOC_PRINT_CSS_ARGS[@]}" \
-        --template=default \
-        "${CHAPTER_FILES[@]}" \
-        -o "$OUTPUT_PDF" \
-        2>&1; then
-
-        if [ -f "$OUTPUT_PDF" ] && [ -s "$OUTPUT_PDF" ]; then
-            echo "✅ Fallback PDF generation succeeded: $OUTPUT_PDF ($(ls -lh "$OUTPUT_PDF" | awk '{print $5}'))"
-
-            # Copy to release directory
-            if cp "$OUTPUT_PDF" "$RELEASE_PDF"; then
-                echo "✅ Fallback PDF copied to release directory: $RELEASE_PDF"
-            else
-                echo "❌ Error: Failed to copy fallback PDF to release directory: $RELEASE_PDF"
-                exit 1
-            fi
-        else
-            echo "❌ Error: Even fallback PDF generation failed"
-            exit 1
-        fi
-    else
-        echo "❌ Error: All PDF generation attempts failed"
-        exit 1
-    fi
+    echo "❌ Error: All PDF generation attempts failed"
+    exit 1
 fi
 
 # Function to validate EPUB files
@@ -547,18 +506,8 @@ validate_epub() {
 
 # Function to generate other formats
 generate_other_formats() {
-    echo "Generating EPUB format..."
-
-    # Generate EPUB with improved metadata
-    if pandoc "${NON_LATEX_CHAPTER_FILES[@]}" "${NON_LATEX_DEFAULTS_ARGS[@]}" \
-        -t epub \
-        -o "$OUTPUT_EPUB" \
-        --metadata date="$(date +'%Y-%m-%d')" \
-        --metadata language=en \
-        --metadata lang=en-GB \
-        --epub-cover-image="images/book-cover.png" \
-        2>&1; then
-
+    # EPUB and DOCX were written alongside the PDF from the shared AST.
+    if [ -s "$OUTPUT_EPUB" ]; then
         echo "EPUB generated: $OUTPUT_EPUB"
 
         # Validate the generated EPUB
@@ -586,10 +535,10 @@ generate_other_formats() {
         return 1
     fi
 
-    echo "Generating DOCX format..."
-    pandoc "${NON_LATEX_CHAPTER_FILES[@]}" "${NON_LATEX_DEFAULTS_ARGS[@]}" \
-        -t docx \
-        -o "$OUTPUT_DOCX"
+    if [ ! -s "$OUTPUT_DOCX" ]; then
+        echo "❌ DOCX generation failed"
+        return 1
+    fi
     echo "DOCX generated: $OUTPUT_DOCX"
     cp "$OUTPUT_DOCX" "$RELEASE_DOCX"
     echo "DOCX copied to release directory: $RELEASE_DOCX"
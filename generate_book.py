@@ -5,11 +5,20 @@ import datetime
 import os
 import subprocess
 import sys
-import tempfile
 from pathlib import Path
 from typing import Sequence
 
+from scripts.epub_assembler import assemble_epub
 from scripts.navigation import get_book_build_files
+from scripts.pandoc_ast import non_latex_source
+from scripts.pandoc_ast import sanitise_part_markdown  # noqa: F401 - re-exported for existing callers
+from scripts.pandoc_server import (
+    ConversionRequest,
+    PandocUnavailable,
+    create_converter,
+    load_defaults,
+    with_metadata,
+)
 
 REPO_ROOT = Path(__file__).resolve().parent
 DOCS_DIR = REPO_ROOT / "docs"
@@ -22,7 +31,6 @@ DEFAULT_SAMPLE_CHAPTERS: Sequence[str] = (
     "02_fundamental_principles.md",
     "03_version_control.md",
 )
-PART_FILE_PREFIX = "part_"
 NON_LATEX_COVER_PAGE = "00_front_cover.md"
 BOOK_COVER_IMAGE = DOCS_DIR / "images" / "book-cover.png"
 
@@ -76,90 +84,85 @@ def resolve_chapter_paths(chapter_names: Sequence[str]) -> list[Path]:
     return paths
 
 
-def sanitise_part_markdown(content: str) -> str:
-    """Remove LaTeX-only helpers from part introduction files."""
-
-    skip_prefixes = ("\\cleardoublepage", "\\part{", "\\setbookpart")
-    cleaned_lines: list[str] = []
-
-    for line in content.splitlines():
-        if any(line.startswith(prefix) for prefix in skip_prefixes):
-            continue
-        cleaned_lines.append(line)
+def prepare_non_latex_sources(chapter_paths: Sequence[Path]) -> list[str]:
+    """Return the chapter sources for non-LaTeX formats, read into memory."""
 
-    while cleaned_lines and not cleaned_lines[0].strip():
-        cleaned_lines.pop(0)
-
-    while cleaned_lines and not cleaned_lines[-1].strip():
-        cleaned_lines.pop()
+    sources: list[str] = []
+    cover_path = DOCS_DIR / NON_LATEX_COVER_PAGE
+    if cover_path.exists() and cover_path not in chapter_paths:
+        sources.append(cover_path.read_text(encoding="utf-8"))
 
-    return "\n".join(cleaned_lines)
+    for chapter_path in chapter_paths:
+        content = non_latex_source(chapter_path)
+        if content.strip():
+            sources.append(content)
 
+    return sources
 
-def prepare_non_latex_chapter_paths(
-    chapter_paths: Sequence[Path],
-) -> tuple[list[Path], tempfile.TemporaryDirectory[str]]:
-    """Prepare chapter paths for non-LaTeX formats such as EPUB."""
 
-    temp_dir = tempfile.TemporaryDirectory()
-    prepared: list[Path] = []
+def non_latex_options() -> dict[str, object]:
+    """Return the pandoc options for EPUB output, with today's metadata."""
 
-    for chapter_path in chapter_paths:
-        if chapter_path.name.startswith(PART_FILE_PREFIX):
-            sanitised = sanitise_part_markdown(
-                chapter_path.read_text(encoding="utf-8")
-            )
-            if sanitised.strip():
-                destination = Path(temp_dir.name) / chapter_path.name
-                destination.write_text(sanitised + "\n", encoding="utf-8")
-                prepared.append(destination)
-        else:
-            prepared.append(chapter_path)
-
-    cover_path = DOCS_DIR / NON_LATEX_COVER_PAGE
-    if cover_path.exists() and cover_path not in prepared:
-        prepared.insert(0, cover_path)
+    options: dict[str, object] = {}
+    if PANDOC_NON_LATEX_DEFAULTS.exists():
+        options = load_defaults(PANDOC_NON_LATEX_DEFAULTS)
+    return with_metadata(
+        options,
+        {
+            "date": f"{datetime.date.today():%Y-%m-%d}",
+            "language": "en-GB",
+            "lang": "en-GB",
+        },
+    )
 
-    return prepared, temp_dir
 
+def build_epub_from_chapters(
+    chapter_paths: Sequence[Path],
+    output_path: Path,
+    *,
+    incremental: bool = True,
+) -> None:
+    """Combine the provided chapters into an EPUB using Pandoc.
 
-def build_epub_from_chapters(chapter_paths: Sequence[Path], output_path: Path) -> None:
-    """Combine the provided chapters into an EPUB using Pandoc."""
+    By default each chapter is converted on its own and cached, and the EPUB
+    package is assembled in Python; ``incremental=False`` converts the whole
+    manuscript in a single pandoc run instead.
+    """
 
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    prepared_paths, temp_dir = prepare_non_latex_chapter_paths(chapter_paths)
+    options = non_latex_options()
 
     try:
-        command: list[str] = ["pandoc"]
-        if PANDOC_NON_LATEX_DEFAULTS.exists():
-            command.extend(["--defaults", str(PANDOC_NON_LATEX_DEFAULTS)])
-
-        command.extend(str(path) for path in prepared_paths)
-        command.extend(
-            [
-                "-t",
-                "epub",
-                "-o",
-                str(output_path),
-                "--metadata",
-                f"date={datetime.date.today():%Y-%m-%d}",
-                "--metadata",
-                "language=en-GB",
-                "--metadata",
-                "lang=en-GB",
-            ]
-        )
-
-        if BOOK_COVER_IMAGE.exists():
-            command.extend(["--epub-cover-image", str(BOOK_COVER_IMAGE)])
-
-        subprocess.run(command, check=True)
-    except FileNotFoundError as exc:
+        converter = create_converter()
+    except PandocUnavailable as exc:
         raise FileNotFoundError(
             "Pandoc is required to build EPUB output but was not found in PATH."
         ) from exc
-    finally:
-        temp_dir.cleanup()
+
+    with converter:
+        if incremental:
+            cover_path = DOCS_DIR / NON_LATEX_COVER_PAGE
+            chapters = list(chapter_paths)
+            if cover_path.exists() and cover_path not in chapters:
+                chapters.insert(0, cover_path)
+            assemble_epub(
+                chapters,
+                output_path,
+                converter,
+                options=options,
+                resource_root=DOCS_DIR,
+                cover_image=BOOK_COVER_IMAGE if BOOK_COVER_IMAGE.exists() else None,
+            )
+        else:
+            if BOOK_COVER_IMAGE.exists():
+                options["epub-cover-image"] = BOOK_COVER_IMAGE.relative_to(DOCS_DIR).as_posix()
+            request = ConversionRequest(
+                "\n\n".join(prepare_non_latex_sources(chapter_paths)),
+                "epub",
+                options,
+                resource_root=DOCS_DIR,
+            )
+            output_path.write_bytes(converter.convert(request).output)
 
     if not output_path.exists() or output_path.stat().st_size == 0:
         raise RuntimeError(
@@ -212,6 +215,14 @@ def create_argument_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Run EPUBCheck after building the EPUB output.",
     )
+    parser.add_argument(
+        "--whole-book",
+        action="store_true",
+        help=(
+            "Convert the manuscript in one pandoc run instead of assembling "
+            "the EPUB from cached per-chapter conversions."
+        ),
+    )
 
     return parser
 
@@ -243,7 +254,9 @@ def run_cli(arguments: Sequence[str]) -> int:
         print(
             f"📚 Building EPUB with {len(chapter_paths)} chapters → {display_path}"
         )
-        build_epub_from_chapters(chapter_paths, output_path)
+        build_epub_from_chapters(
+            chapter_paths, output_path, incremental=not args.whole_book
+        )
 
         if args.validate:
             success, log_output = validate_epub_file(str(output_path))
@@ -45,12 +45,19 @@ import importlib.util
 from types import SimpleNamespace
 
 try:
-    import yaml
+    import yaml  # noqa: F401 - required by scripts.book_requirements
 except ImportError as exc:  # pragma: no cover - dependency check
     print("❌ Error: PyYAML library not installed")
     print("   Install with: pip install PyYAML>=6.0")
     sys.exit(1)
 
+from scripts.book_requirements import (
+    BookRequirementsError,
+    load_book_requirements as _shared_book_requirements,
+    load_book_requirements_or_empty,
+)
+from scripts.manuscript import load_document
+
 _PPTX_SPEC = importlib.util.find_spec("pptx")
 PPTX_AVAILABLE = _PPTX_SPEC is not None
 
@@ -524,54 +531,15 @@ def build_presentation_document(prs, presentation_data):
 
 def _load_canonical_chapter_filenames(requirements_path=Path("BOOK_REQUIREMENTS.md")):
     """Load canonical chapter filenames from the requirements specification."""
-    if not requirements_path.exists():
-        return set()
-
-    content = requirements_path.read_text(encoding="utf-8").splitlines()
-    if not content or content[0].strip() != "---":
-        return set()
-
-    front_matter_lines = []
-    for line in content[1:]:
-        if line.strip() == "---":
-            break
-        front_matter_lines.append(line)
-
-    if not front_matter_lines:
+    try:
+        return set(_shared_book_requirements(requirements_path).chapter_filenames)
+    except BookRequirementsError:
         return set()
 
-    data = yaml.safe_load("\n".join(front_matter_lines)) or {}
-    book_config = data.get("book", {})
-
-    canonical = {
-        chapter.get("filename")
-        for chapter in book_config.get("chapters", [])
-        if chapter.get("filename")
-    }
-
-    return canonical
-
 
 def load_book_requirements(requirements_path=Path("BOOK_REQUIREMENTS.md")):
     """Load the structured book requirements from the specification front matter."""
-    if not requirements_path.exists():
-        return {}
-
-    content = requirements_path.read_text(encoding="utf-8").splitlines()
-    if not content or content[0].strip() != "---":
-        return {}
-
-    front_matter_lines = []
-    for line in content[1:]:
-        if line.strip() == "---":
-            break
-        front_matter_lines.append(line)
-
-    if not front_matter_lines:
-        return {}
-
-    data = yaml.safe_load("\n".join(front_matter_lines)) or {}
-    return data
+    return load_book_requirements_or_empty(requirements_path)
 
 
 PART_AREA_MAP = {
@@ -1232,31 +1200,23 @@ def read_front_matter_content(front_file, metadata=None):
 def read_chapter_content(chapter_file):
     """Read and parse a chapter markdown file."""
     try:
-        with open(chapter_file, 'r', encoding='utf-8') as f:
-            content = f.read()
+        document = load_document(Path(chapter_file))
+        content = document.text
 
         # Extract chapter title (first h1)
-        lines = content.split('\n')
-        title = "Untitled Chapter"
-        for line in lines:
-            if line.startswith('# '):
-                title = line[2:].strip()
-                break
+        lines = document.lines
+        title = document.title or "Untitled Chapter"
         
         # Extract diagram paths - prefer flowchart representations
         diagram_path = None
         diagram_metadata = None
         selected_reference = None
         diagram_candidates = []
-        for line in lines:
-            if line.startswith('![') and 'images/' in line:
-                match = re.search(r'!\[.*?\]\((.*?)\)', line)
-                if match:
-                    relative_path = match.group(1)
-                    if relative_path.endswith('.png'):
-                        full_path = os.path.join("docs", relative_path)
-                        metadata = extract_diagram_metadata(full_path, content)
-                        diagram_candidates.append((full_path, metadata, relative_path))
+        for image in document.images:
+            if image.standalone and 'images/' in image.target and image.target.endswith('.png'):
+                full_path = os.path.join("docs", image.target)
+                metadata = extract_diagram_metadata(full_path, content)
+                diagram_candidates.append((full_path, metadata, image.target))
 
         for candidate in diagram_candidates:
             candidate_metadata = candidate[1] or {}
@@ -1460,6 +1420,103 @@ def generate_presentation_outline():
 
     return presentation_data
 
+def render_presentation_outline(presentation_data):
+    """Return the markdown outline for ``presentation_data``."""
+    outline_content = "# Presentation Outline\n\n"
+    outline_content += "This presentation is generated from the book chapters in docs/\n\n"
+    
+    for item in presentation_data:
+        item_type = item.get('type')
+
+        if item_type == 'chapter':
+            chapter = item.get('chapter') or {}
+            title = chapter.get('title') or item.get('file', 'Chapter')
+            outline_content += f"## {title}\n\n"
+            for point in chapter.get('key_points') or []:
+                outline_content += f"- {point}\n"
+            outline_content += "\n"
+            continue
+
+        if item_type == 'part':
+            part = item.get('part') or {}
+            title = part.get('title') or item.get('file', 'Part Introduction')
+            outline_content += f"## {title} (Part Introduction)\n\n"
+            for point in part.get('key_points') or []:
+                outline_content += f"- {point}\n"
+            outline_content += "\n"
+            continue
+
+        if item_type == 'front_matter':
+            front = item.get('front_matter') or {}
+            title = front.get('title') or item.get('file', 'Front Matter')
+            outline_content += f"## {title}\n\n"
+            for point in front.get('key_points') or []:
+                outline_content += f"- {point}\n"
+            outline_content += "\n"
+    
+    return outline_content
+
+
+def write_presentation_outline(presentation_data, presentations_dir):
+    """Write the outline and the presentation data (outside docs directory)."""
+    presentations_dir = Path(presentations_dir)
+    presentations_dir.mkdir(exist_ok=True, parents=True)
+    with open(presentations_dir / "presentation_outline.md", 'w', encoding='utf-8') as f:
+        f.write(render_presentation_outline(presentation_data))
+
+    data_file = presentations_dir / "presentation_data.json"
+    data_file.write_text(json.dumps(presentation_data, ensure_ascii=False, indent=2), encoding='utf-8')
+
+
+def refresh_presentation_outline(presentation_data, changed_filenames):
+    """Re-read only the outline entries whose source file changed.
+
+    Entries keep their position and the requirements metadata recorded when
+    the outline was generated; entries whose file was deleted are dropped.
+    Callers regenerate the full outline when the requirements themselves or
+    the set of chapters change.
+    """
+    changed = set(changed_filenames)
+    if not changed:
+        return presentation_data
+
+    book_config = load_book_requirements().get('book', {})
+    metadata = {
+        entry['filename']: entry
+        for key in ('front_matter', 'part_introductions', 'chapters')
+        for entry in book_config.get(key, [])
+        if entry.get('filename')
+    }
+    docs_dir = Path("docs")
+    refreshed = []
+    for item in presentation_data:
+        filename = item.get('file')
+        if filename not in changed:
+            refreshed.append(item)
+            continue
+
+        path = docs_dir / filename
+        if not path.exists():
+            continue
+
+        item_type = item.get('type')
+        if item_type == 'chapter':
+            content = read_chapter_content(path)
+            if content:
+                previous = item.get('chapter') or {}
+                for key in ('label', 'area', 'focus_keyword', 'identifier'):
+                    if key in previous:
+                        content[key] = previous[key]
+        elif item_type == 'part':
+            content = read_part_content(path, metadata.get(filename))
+        else:
+            content = read_front_matter_content(path, metadata.get(filename))
+
+        if content:
+            refreshed.append({**item, item_type: content})
+    return refreshed
+
+
 def create_presentation_script(presentation_data):
     """Create a standalone script that renders the presentation using shared helpers."""
     script_content = '''#!/usr/bin/env python3
@@ -1622,45 +1679,7 @@ def main():
             "⚠️ Prezi slides were not generated because the maturity radar configuration was unavailable"
         )
     
-    # Create presentation outline
-    outline_content = "# Presentation Outline\n\n"
-    outline_content += "This presentation is generated from the book chapters in docs/\n\n"
-    
-    for item in presentation_data:
-        item_type = item.get('type')
-
-        if item_type == 'chapter':
-            chapter = item.get('chapter') or {}
-            title = chapter.get('title') or item.get('file', 'Chapter')
-            outline_content += f"## {title}\n\n"
-            for point in chapter.get('key_points') or []:
-                outline_content += f"- {point}\n"
-            outline_content += "\n"
-            continue
-
-        if item_type == 'part':
-            part = item.get('part') or {}
-            title = part.get('title') or item.get('file', 'Part Introduction')
-            outline_content += f"## {title} (Part Introduction)\n\n"
-            for point in part.get('key_points') or []:
-                outline_content += f"- {point}\n"
-            outline_content += "\n"
-            continue
-
-        if item_type == 'front_matter':
-            front = item.get('front_matter') or {}
-            title = front.get('title') or item.get('file', 'Front Matter')
-            outline_content += f"## {title}\n\n"
-            for point in front.get('key_points') or []:
-                outline_content += f"- {point}\n"
-            outline_content += "\n"
-    
-    # Write outline (outside docs directory)
-    with open(presentations_dir / "presentation_outline.md", 'w', encoding='utf-8') as f:
-        f.write(outline_content)
-
-    data_file = presentations_dir / "presentation_data.json"
-    data_file.write_text(json.dumps(presentation_data, ensure_ascii=False, indent=2), encoding='utf-8')
+    write_presentation_outline(presentation_data, presentations_dir)
 
     # Create PowerPoint generator script
     pptx_script = create_presentation_script(presentation_data)
@@ -20,49 +20,56 @@ Design Compliance:
 Usage:
     python generate_whitepapers.py              # Generate to whitepapers/
     python generate_whitepapers.py --release    # Generate to releases/whitepapers/
+    python generate_whitepapers.py --jobs 8     # Render chapters on 8 processes
+    python generate_whitepapers.py --full       # Re-render chapters whose digest is unchanged
 
 Note: This script ONLY reads from docs/ and creates files in the whitepapers/ directory.
 It should never modify any files in the docs/ directory.
 """
 
+import argparse
+import hashlib
+import io
+import json
 import os
 import sys
-import re
 import shutil
+import threading
 from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager, redirect_stdout
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from html import escape
 from pathlib import Path
-
-import yaml
-
+from typing import Callable, Iterator
+
+from scripts import html_template, manuscript
+from scripts.book_requirements import (
+    BookRequirementsError,
+    load_book_requirements,
+    load_book_requirements_or_empty,
+)
+from scripts.html_template import compile_template
+from scripts.manuscript import load_document
 from scripts.navigation import get_whitepaper_chapter_files
 
 def read_chapter_content(chapter_file):
     """Read and parse a chapter markdown file."""
     try:
-        with open(chapter_file, 'r', encoding='utf-8') as f:
-            content = f.read()
+        document = load_document(Path(chapter_file))
+        content = document.text
         
         # Check if file is empty or too short
         if len(content.strip()) < 10:
             print(f"Warning: {chapter_file} appears to be empty or too short")
             return None
         
-        word_count = len(re.findall(r'\w+', content))
-        
         # Extract chapter title (first h1)
-        lines = content.split('\n')
-        title = "Untitled Chapter"
-        title_found = False
-        for line in lines:
-            if line.startswith('# '):
-                title = line[2:].strip()
-                title_found = True
-                break
+        title = document.title or "Untitled Chapter"
         
         # If no H1 title found, try to extract from filename
-        if not title_found:
+        if document.title is None:
             filename = os.path.basename(chapter_file)
             # Convert filename to readable title
             title_base = filename.replace('.md', '').replace('_', ' ')
@@ -71,55 +78,25 @@ def read_chapter_content(chapter_file):
             print(f"Warning: No H1 title found in {chapter_file}, using filename-based title: {title}")
         
         # Extract diagram reference
-        diagram_path = None
-        for line in lines:
-            if line.startswith('![') and 'images/' in line:
-                # Extract diagram path from markdown image syntax
-                match = re.search(r'!\[.*?\]\((.*?)\)', line)
-                if match:
-                    diagram_path = match.group(1)
-                    break
+        diagram_path = next(
+            (image.target for image in document.images if image.standalone and 'images/' in image.target),
+            None,
+        )
         
         # Extract condensed content (first 2-3 paragraphs + key section headers)
-        condensed_content = []
-        section_headers = []
-        paragraph_count = 0
-        
-        for line in lines:
-            line = line.strip()
-            
-            # Skip title, empty lines, and image lines
-            if (line.startswith('# ') or not line or 
-                line.startswith('![') or line.startswith('##')):
-                
-                # Collect section headers for summary
-                if line.startswith('## '):
-                    section_headers.append(line[3:].strip())
-                continue
-            
-            # Skip markdown code blocks, bullet points, and other formatting
-            if (line.startswith('```') or line.startswith('*') or 
-                line.startswith('-') or line.startswith('>')):
-                continue
-            
-            # Collect first few substantial paragraphs
-            if paragraph_count < 3 and len(line) > 30:  # Lowered from 50 to 30 for edge cases
-                condensed_content.append(line)
-                paragraph_count += 1
+        section_headers = document.section_headings(2)
+        condensed_content = [
+            paragraph.text
+            for paragraph in document.paragraphs
+            if not paragraph.text.startswith('*') and len(paragraph.text) > 30
+        ][:3]
         
         # If we don't have enough content, try to extract from any substantial text
-        if paragraph_count == 0:
+        if not condensed_content:
             print(f"Warning: No substantial paragraphs found in {chapter_file}, extracting any available text")
-            for line in lines:
-                line = line.strip()
-                # Skip headers, empty lines, images, and short lines
-                if (not line or line.startswith('#') or line.startswith('![') or 
-                    line.startswith('```') or len(line) < 20):
-                    continue
-                if len(condensed_content) < 2:  # Get at least something
-                    condensed_content.append(line)
-                else:
-                    break
+            condensed_content = [
+                paragraph.text for paragraph in document.paragraphs if len(paragraph.text) >= 20
+            ][:2]
         
         # Provide fallback content if still empty
         if not condensed_content:
@@ -136,7 +113,7 @@ def read_chapter_content(chapter_file):
             'diagram_path': diagram_path,
             'condensed_content': condensed_content,
             'section_headers': section_headers[:6],  # Limit to 6 main sections
-            'word_count': word_count
+            'word_count': document.word_count
         }
     
     except Exception as e:
@@ -164,20 +141,7 @@ security aspects, and organisational changes required for successful IaC adoptio
 
 def _load_requirements_metadata(requirements_path: Path = Path("BOOK_REQUIREMENTS.md")) -> dict:
     """Load requirements front matter from the markdown specification."""
-    if not requirements_path.exists():
-        return {}
-
-    lines = requirements_path.read_text(encoding="utf-8").splitlines()
-    if not lines or lines[0].strip() != "---":
-        return {}
-
-    front_matter = []
-    for line in lines[1:]:
-        if line.strip() == "---":
-            break
-        front_matter.append(line)
-
-    return yaml.safe_load("\n".join(front_matter)) or {}
+    return load_book_requirements_or_empty(requirements_path)
 
 
 def get_release_metadata(requirements_path: Path = Path("BOOK_REQUIREMENTS.md")) -> dict:
@@ -268,17 +232,80 @@ def get_chapter_mapping():
 
     return mapping
 
-def create_whitepaper_html(chapter_data, chapter_meta, book_overview, release_info, output_directory):
-    """Create HTML content for a whitepaper."""
-    
-    # Read the template
-    template_path = Path(__file__).parent / "templates" / "whitepaper-template.html"
-    
+WHITEPAPER_TEMPLATE_PATH = Path(__file__).parent / "templates" / "whitepaper-template.html"
+# Stand-in for the diagram src, the only value that differs between output
+# directories; it is swapped for the relative path when a render is written.
+_DIAGRAM_SRC_SLOT = "\x00DIAGRAM_SRC\x00"
+# Placeholders the whitepaper template must provide; see scripts/html_template.py.
+WHITEPAPER_SLOTS = frozenset({
+    "PAGE_TITLE", "PAGE_ATTRIBUTES", "CATEGORY", "TITLE", "SUBTITLE",
+    "AUTHOR", "DATE", "VERSION", "FEATURE_TAGS", "WHITEPAPER_CONTENT",
+})
+
+
+_template_lock = threading.Lock()
+_template_cache: dict[Path, tuple[tuple[int, int], str]] = {}
+
+
+def load_whitepaper_template(template_path: Path | None = None) -> str | None:
+    """Return the whitepaper template, re-reading it only when the file changed."""
+    resolved = Path(template_path or WHITEPAPER_TEMPLATE_PATH).resolve()
+    try:
+        stat = resolved.stat()
+    except FileNotFoundError:
+        print(f"Template not found at {resolved}")
+        return None
+    signature = (stat.st_mtime_ns, stat.st_size)
+
+    with _template_lock:
+        cached = _template_cache.get(resolved)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        template = resolved.read_text(encoding="utf-8")
+        _template_cache[resolved] = (signature, template)
+        return template
+
+
+@dataclass(frozen=True)
+class RenderedWhitepaper:
+    """A chapter rendered once, ready to be written to any output directory."""
+
+    parts: tuple[str, ...]
+    diagram_path: str | None = None
+
+    def for_directory(self, output_directory: Path) -> str:
+        """Return the HTML with the diagram path made relative to ``output_directory``."""
+        if len(self.parts) == 1:
+            return self.parts[0]
+        diagram_src = escape(resolve_diagram_src(self.diagram_path, output_directory) or "")
+        return diagram_src.join(self.parts)
+
+
+def write_if_changed(path: Path, content: str) -> bool:
+    """Write ``content`` to ``path`` unless the file already holds the same bytes."""
+    data = content.encode("utf-8")
     try:
-        with open(template_path, 'r', encoding='utf-8') as f:
-            template = f.read()
+        if path.stat().st_size == len(data) and path.read_bytes() == data:
+            return False
     except FileNotFoundError:
-        print(f"Template not found at {template_path}")
+        pass
+    path.write_bytes(data)
+    return True
+
+
+def create_whitepaper_html(chapter_data, chapter_meta, book_overview, release_info, output_directory):
+    """Create HTML content for a whitepaper."""
+    rendered = render_whitepaper(chapter_data, chapter_meta, book_overview, release_info)
+    if rendered is None:
+        return None
+    return rendered.for_directory(output_directory)
+
+
+def render_whitepaper(chapter_data, chapter_meta, book_overview, release_info):
+    """Render a whitepaper independently of the directory it will be written to."""
+    template = load_whitepaper_template()
+    if template is None:
         return None
 
     if isinstance(chapter_meta, dict):
@@ -336,12 +363,12 @@ def create_whitepaper_html(chapter_data, chapter_meta, book_overview, release_in
 
     # Prepare content sections
     diagram_html = ""
-    diagram_src = resolve_diagram_src(chapter_data.get('diagram_path'), output_directory)
+    diagram_path = chapter_data.get('diagram_path')
 
-    if diagram_src:
+    if diagram_path:
         diagram_html = (
             "            <figure class=\"chapter-figure\">\n"
-            f"                <img src=\"{escape(diagram_src)}\" alt=\"Chapter diagram for {escaped_chapter_title}\">\n"
+            f"                <img src=\"{_DIAGRAM_SRC_SLOT}\" alt=\"Chapter diagram for {escaped_chapter_title}\">\n"
             "            </figure>"
         )
     
@@ -365,22 +392,6 @@ def create_whitepaper_html(chapter_data, chapter_meta, book_overview, release_in
             "            </ul>"
         )
     
-    # Replace the title and content in template
-    html_output = template
-
-    replacements = {
-        "[[PAGE_TITLE]]": escaped_page_title,
-        "[[CATEGORY]]": escaped_chapter_area,
-        "[[TITLE]]": escaped_mapped_title,
-        "[[SUBTITLE]]": escaped_subtitle_text,
-        "[[AUTHOR]]": escaped_author_text,
-        "[[DATE]]": escaped_published_date,
-        "[[VERSION]]": escaped_version_text,
-    }
-
-    for placeholder, value in replacements.items():
-        html_output = html_output.replace(placeholder, value)
-
     escaped_book_title = escape(book_overview['title'])
     escaped_book_description = escape(book_overview['description']).replace('\n', '<br>')
     escaped_target_audience = escape(book_overview['target_audience'])
@@ -397,7 +408,6 @@ def create_whitepaper_html(chapter_data, chapter_meta, book_overview, release_in
             f'{tag_markup}\n'
             '            </div>'
         )
-    html_output = html_output.replace("            <!-- FEATURE_TAGS -->", feature_tags_html, 1)
 
     data_attributes = [f'data-release-version="{escaped_version_text}"']
     if feature_tags:
@@ -408,7 +418,6 @@ def create_whitepaper_html(chapter_data, chapter_meta, book_overview, release_in
         data_attributes.append(f'data-release-codename="{escaped_codename}"')
 
     attribute_string = " ".join(data_attributes)
-    html_output = html_output.replace('<div class="page">', f'<div class="page" {attribute_string}>', 1)
     
     # Create the new content sections
     new_content = f'''        <!-- Book Overview -->
@@ -445,14 +454,145 @@ def create_whitepaper_html(chapter_data, chapter_meta, book_overview, release_in
             <p><strong>Explore adjacent chapters:</strong> The surrounding sections expand upon the themes introduced here and provide complementary techniques.</p>
         </section>'''
 
-    content_placeholder = "        <!-- WHITEPAPER_CONTENT -->"
-    if content_placeholder in html_output:
-        html_output = html_output.replace(content_placeholder, new_content)
+    html_output = compile_template(template, WHITEPAPER_SLOTS).render({
+        "PAGE_TITLE": escaped_page_title,
+        "PAGE_ATTRIBUTES": attribute_string,
+        "CATEGORY": escaped_chapter_area,
+        "TITLE": escaped_mapped_title,
+        "SUBTITLE": escaped_subtitle_text,
+        "AUTHOR": escaped_author_text,
+        "DATE": escaped_published_date,
+        "VERSION": escaped_version_text,
+        "FEATURE_TAGS": feature_tags_html,
+        "WHITEPAPER_CONTENT": new_content,
+    })
+
+    return RenderedWhitepaper(tuple(html_output.split(_DIAGRAM_SRC_SLOT)), diagram_path)
+
+WHITEPAPER_STATE_FILENAME = ".whitepaper-state.json"
+WHITEPAPER_STATE_VERSION = 1
+
+
+def _shared_render_digest(template: str, release_metadata: dict, book_overview: dict) -> str:
+    """Digest of every input shared by all chapters, including this generator."""
+    digest = hashlib.sha256()
+    digest.update(f"v{WHITEPAPER_STATE_VERSION}".encode("utf-8"))
+    digest.update(Path(__file__).read_bytes())
+    for module in (html_template, manuscript):
+        digest.update(Path(module.__file__).read_bytes())
+    digest.update(template.encode("utf-8"))
+    digest.update(json.dumps([release_metadata, book_overview], sort_keys=True, default=str).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def chapter_digest(chapter_path: Path, chapter_entry: dict, shared_digest: str) -> str:
+    """Digest of the inputs that determine a chapter's whitepaper."""
+    digest = hashlib.sha256(shared_digest.encode("utf-8"))
+    digest.update(json.dumps(chapter_entry, sort_keys=True, default=str).encode("utf-8"))
+    digest.update(chapter_path.read_bytes())
+    return digest.hexdigest()
+
+
+def load_whitepaper_state(output_dir: Path) -> dict[str, str]:
+    """Return the chapter digests recorded by the previous run in ``output_dir``."""
+    try:
+        state = json.loads((output_dir / WHITEPAPER_STATE_FILENAME).read_text(encoding="utf-8"))
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+    if state.get("version") != WHITEPAPER_STATE_VERSION:
+        return {}
+    return dict(state.get("chapters", {}))
+
+
+def save_whitepaper_state(output_dir: Path, chapters: dict[str, str]) -> None:
+    state = {"version": WHITEPAPER_STATE_VERSION, "chapters": dict(sorted(chapters.items()))}
+    write_if_changed(output_dir / WHITEPAPER_STATE_FILENAME, json.dumps(state, indent=2) + "\n")
+
+
+def remove_orphaned_whitepapers(output_dirs, expected_filenames) -> list[Path]:
+    """Delete whitepapers for chapters that are no longer in the navigation."""
+    removed = []
+    for output_dir in output_dirs:
+        for path in sorted(output_dir.glob("*_whitepaper.html")):
+            if path.name not in expected_filenames:
+                path.unlink()
+                removed.append(path)
+    return removed
+
+
+@dataclass(frozen=True)
+class ChapterRender:
+    """Result of rendering one chapter, including the log lines it produced."""
+
+    filename: str
+    rendered: RenderedWhitepaper | None
+    error: str | None
+    output: str
+
 
-    return html_output
+# Read-only inputs shared by every chapter render, set once per worker process.
+_RENDER_INPUTS: dict = {}
 
-def generate_whitepapers(release_mode=False):
-    """Main function to generate whitepapers."""
+
+def _init_render_worker(chapter_mapping, book_overview, release_metadata):
+    _RENDER_INPUTS.update(
+        chapter_mapping=chapter_mapping,
+        book_overview=book_overview,
+        release_metadata=release_metadata,
+    )
+    load_whitepaper_template()
+
+
+def _render_chapter(chapter_path: Path) -> ChapterRender:
+    """Read and render one chapter, capturing its log output for ordered printing."""
+    filename = chapter_path.name
+    buffer = io.StringIO()
+    with redirect_stdout(buffer):
+        print(f"Processing {filename}...")
+        chapter_data = read_chapter_content(chapter_path)
+        if not chapter_data:
+            print(f"Failed to read {filename}, skipping...")
+            error = "Failed to read chapter content"
+            rendered = None
+        else:
+            rendered = render_whitepaper(
+                chapter_data,
+                _RENDER_INPUTS["chapter_mapping"][filename],
+                _RENDER_INPUTS["book_overview"],
+                _RENDER_INPUTS["release_metadata"],
+            )
+            error = None
+            if rendered is None:
+                print(f"Failed to generate HTML for {filename}, skipping...")
+                error = "Failed to generate HTML"
+    return ChapterRender(filename, rendered, error, buffer.getvalue())
+
+
+@contextmanager
+def _chapter_renderer(jobs: int, shared_inputs: tuple) -> Iterator[Callable]:
+    """Yield an order-preserving ``map`` that renders chapters on ``jobs`` processes."""
+    if jobs <= 1:
+        _init_render_worker(*shared_inputs)
+        yield map
+        return
+
+    with ProcessPoolExecutor(
+        max_workers=jobs, initializer=_init_render_worker, initargs=shared_inputs
+    ) as executor:
+        yield executor.map
+
+
+def generate_whitepapers(release_mode=False, jobs=1, full=False):
+    """Main function to generate whitepapers.
+
+    With ``jobs`` > 1 chapters are read and rendered on a process pool; writes,
+    log output and the summary still follow the canonical chapter order.
+
+    Only chapters whose digest (markdown, template, BOOK_REQUIREMENTS.md entry
+    and release metadata) changed since the last run are rendered, unless
+    ``full`` is set. Whitepapers of chapters that left the navigation are
+    deleted.
+    """
     print("Generating whitepapers from book chapters...")
     
     # Set up output directories
@@ -464,10 +604,10 @@ def generate_whitepapers(release_mode=False):
         whitepapers_dir = Path("whitepapers")
         secondary_dir = None
     
-    # Ensure whitepapers directory exists
-    whitepapers_dir.mkdir(exist_ok=True, parents=True)
-    if secondary_dir:
-        secondary_dir.mkdir(exist_ok=True, parents=True)
+    # Ensure whitepapers directories exist
+    output_dirs = [whitepapers_dir] + ([secondary_dir] if secondary_dir else [])
+    for output_dir in output_dirs:
+        output_dir.mkdir(exist_ok=True, parents=True)
     
     # Get chapter mapping and book overview
     chapter_mapping = get_chapter_mapping()
@@ -499,88 +639,110 @@ def generate_whitepapers(release_mode=False):
     print(f"Chapter mapping contains {len(chapter_mapping)} entries")
     
     generated_count = 0
+    unchanged_count = 0
     skipped_files = []
     error_files = []
     
-    for chapter_path in chapter_files:
-        filename = chapter_path.name
-
-        # Skip files that aren't in our mapping (like build artifacts)
-        if filename not in chapter_mapping:
-            # Log the reason for skipping
-            if filename.startswith('README') or filename.isupper() or filename.startswith('BOOK_') or filename.startswith('EPUB_') or filename.startswith('TERMINOLOGI_'):
-                print(f"Skipping non-chapter file: {filename}")
-                skipped_files.append((filename, "Non-chapter file (README, metadata, etc.)"))
-            else:
-                print(f"WARNING: Chapter file {filename} not found in mapping - this chapter will not have a whitepaper!")
-                skipped_files.append((filename, "Missing from chapter mapping"))
-            continue
-            
-        print(f"Processing {filename}...")
-        
-        # Read chapter content
-        chapter_data = read_chapter_content(chapter_path)
-        if not chapter_data:
-            print(f"Failed to read {filename}, skipping...")
-            error_files.append((filename, "Failed to read chapter content"))
-            continue
-        
-        # Get chapter metadata
-        chapter_meta = chapter_mapping[filename]
-        
-        # Write whitepaper file
-        output_filename = filename.replace('.md', '_whitepaper.html')
-        output_path = whitepapers_dir / output_filename
-        
-        # Generate whitepaper HTML
-        html_content = create_whitepaper_html(
-            chapter_data,
-            chapter_meta,
-            book_overview,
-            release_metadata,
-            whitepapers_dir
+    renderable = [path for path in chapter_files if path.name in chapter_mapping]
+    shared_inputs = (chapter_mapping, book_overview, release_metadata)
+
+    # Work out which chapters changed since the previous run
+    template = load_whitepaper_template() or ""
+    shared_digest = _shared_render_digest(template, release_metadata, book_overview)
+    try:
+        requirements = load_book_requirements(Path("BOOK_REQUIREMENTS.md"))
+    except BookRequirementsError:
+        requirements = None
+    previous_state = {} if full else load_whitepaper_state(whitepapers_dir)
+    digests = {
+        path.name: chapter_digest(path, (requirements and requirements.chapter(path.name)) or {}, shared_digest)
+        for path in renderable
+    }
+    stale = [
+        path
+        for path in renderable
+        if previous_state.get(path.name) != digests[path.name]
+        or not all(
+            (output_dir / path.name.replace('.md', '_whitepaper.html')).exists()
+            for output_dir in output_dirs
         )
-        if not html_content:
-            print(f"Failed to generate HTML for {filename}, skipping...")
-            error_files.append((filename, "Failed to generate HTML"))
-            continue
-        
-        try:
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(html_content)
-            print(f"Generated: {output_path}")
-            generated_count += 1
-        except Exception as e:
-            print(f"Error writing {output_path}: {e}")
-            error_files.append((filename, f"Write error: {e}"))
-
-        if secondary_dir:
-            secondary_output_path = secondary_dir / output_filename
-            secondary_html = create_whitepaper_html(
-                chapter_data,
-                chapter_meta,
-                book_overview,
-                release_metadata,
-                secondary_dir
-            )
-            if not secondary_html:
-                print(f"Warning: Failed to generate HTML for standard location: {filename}")
-                error_files.append((filename, "Failed to generate HTML for standard location"))
-            else:
+    ]
+    stale_names = {path.name for path in stale}
+    up_to_date_count = 0
+    new_state: dict[str, str] = {}
+    print(f"Chapters to render: {len(stale)} of {len(renderable)}{' (full rebuild)' if full else ''}")
+    if jobs > 1 and stale:
+        print(f"Rendering {len(stale)} chapters with {jobs} worker processes")
+
+    with _chapter_renderer(jobs if stale else 1, shared_inputs) as render_map:
+        results = render_map(_render_chapter, stale)
+
+        for chapter_path in chapter_files:
+            filename = chapter_path.name
+
+            # Skip files that aren't in our mapping (like build artifacts)
+            if filename not in chapter_mapping:
+                # Log the reason for skipping
+                if filename.startswith('README') or filename.isupper() or filename.startswith('BOOK_') or filename.startswith('EPUB_') or filename.startswith('TERMINOLOGI_'):
+                    print(f"Skipping non-chapter file: {filename}")
+                    skipped_files.append((filename, "Non-chapter file (README, metadata, etc.)"))
+                else:
+                    print(f"WARNING: Chapter file {filename} not found in mapping - this chapter will not have a whitepaper!")
+                    skipped_files.append((filename, "Missing from chapter mapping"))
+                continue
+
+            if filename not in stale_names:
+                print(f"Up to date: {filename}")
+                generated_count += 1
+                up_to_date_count += 1
+                new_state[filename] = digests[filename]
+                continue
+
+            # Rendering happened in order on the pool; collect this chapter's result
+            result = next(results)
+            print(result.output, end="")
+            if result.rendered is None:
+                error_files.append((filename, result.error))
+                continue
+
+            rendered = result.rendered
+            output_filename = filename.replace('.md', '_whitepaper.html')
+
+            written_everywhere = True
+            for output_dir in output_dirs:
+                output_path = output_dir / output_filename
+                is_primary = output_dir == whitepapers_dir
+                label = "" if is_primary else " (standard location)"
                 try:
-                    with open(secondary_output_path, 'w', encoding='utf-8') as f:
-                        f.write(secondary_html)
-                    print(f"Generated: {secondary_output_path} (standard location)")
+                    if write_if_changed(output_path, rendered.for_directory(output_dir)):
+                        print(f"Generated: {output_path}{label}")
+                    else:
+                        print(f"Unchanged: {output_path}{label}")
+                        if is_primary:
+                            unchanged_count += 1
+                    if is_primary:
+                        generated_count += 1
                 except Exception as e:
-                    print(f"Error writing {secondary_output_path}: {e}")
-                    error_files.append((filename, f"Standard write error: {e}"))
+                    print(f"Error writing {output_path}: {e}")
+                    error_files.append((filename, f"{'Write' if is_primary else 'Standard write'} error: {e}"))
+                    written_everywhere = False
+            if written_everywhere:
+                new_state[filename] = digests[filename]
+
+    expected_outputs = {path.name.replace('.md', '_whitepaper.html') for path in renderable}
+    for orphan in remove_orphaned_whitepapers(output_dirs, expected_outputs):
+        print(f"Removed orphaned whitepaper: {orphan}")
+    save_whitepaper_state(whitepapers_dir, new_state)
     
     if release_mode:
         print("Standard whitepapers also generated in whitepapers/")
 
     # Print summary
     print(f"\n=== WHITEPAPER GENERATION SUMMARY ===")
-    print(f"Generated {generated_count} whitepapers in {whitepapers_dir}/")
+    print(
+        f"Generated {generated_count} whitepapers in {whitepapers_dir}/ "
+        f"({up_to_date_count} up to date, {unchanged_count} unchanged on disk)"
+    )
     print(f"Total files processed: {len(chapter_files)}")
     print(f"Files skipped: {len(skipped_files)}")
     print(f"Files with errors: {len(error_files)}")
@@ -604,12 +766,32 @@ def generate_whitepapers(release_mode=False):
     
     return generated_count > 0
 
-def main():
+def _parse_arguments(argv=None):
+    parser = argparse.ArgumentParser(description="Generate whitepapers from book chapters.")
+    parser.add_argument(
+        "--release",
+        action="store_true",
+        help="Write to releases/whitepapers/ and mirror into whitepapers/.",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Render chapters on N worker processes (default: 1).",
+    )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Re-render every chapter, ignoring the recorded chapter digests.",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
     """Main function."""
     try:
-        # Check for --release flag
-        release_mode = "--release" in sys.argv
-        success = generate_whitepapers(release_mode)
+        args = _parse_arguments(argv)
+        success = generate_whitepapers(args.release, jobs=args.jobs, full=args.full)
         return 0 if success else 1
     except Exception as e:
         print(f"Error: {e}")
@@ -12,46 +12,12 @@ Tasks:
 - Provide recommended edits or splits for any chapters breaching the threshold
 """
 
-import re
 import sys
 from pathlib import Path
 from typing import List, Dict, Tuple
 
-
-def count_content_words(content: str) -> int:
-    """Count actual content words, excluding markdown formatting and code blocks."""
-    # Remove code blocks (both fenced and indented)
-    content_no_code = re.sub(r'```.*?```', '', content, flags=re.DOTALL)
-    content_no_code = re.sub(r'^ {4,}.*$', '', content_no_code, flags=re.MULTILINE)
-    
-    # Remove inline code
-    content_no_code = re.sub(r'`[^`]*`', '', content_no_code)
-    
-    # Remove headers (they are structural, not content)
-    content_no_code = re.sub(r'^#{1,6}\s+.*$', '', content_no_code, flags=re.MULTILINE)
-    
-    # Remove image references
-    content_no_code = re.sub(r'!\[.*?\]\([^)]*\)', '', content_no_code)
-    
-    # Remove links but keep link text
-    content_no_code = re.sub(r'\[([^\]]*)\]\([^)]*\)', r'\1', content_no_code)
-    
-    # Remove markdown formatting characters
-    content_no_code = re.sub(r'[*_~`#\[\]()!-]', ' ', content_no_code)
-    
-    # Split into words and count non-empty words
-    words = content_no_code.split()
-    return len([word for word in words if word.strip()])
-
-
-def extract_chapter_title(content: str) -> str:
-    """Extract the chapter title from markdown content."""
-    lines = content.split('\n')
-    for line in lines:
-        line = line.strip()
-        if line.startswith('# '):
-            return line[2:].strip()
-    return "Untitled"
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from manuscript import load_document  # noqa: E402
 
 
 def analyze_chapters(docs_dir: Path) -> Tuple[List[Dict], Dict]:
@@ -73,9 +39,9 @@ def analyze_chapters(docs_dir: Path) -> Tuple[List[Dict], Dict]:
     
     # Collect word counts for all chapters
     for chapter_file in chapter_files:
-        content = chapter_file.read_text(encoding='utf-8')
-        word_count = count_content_words(content)
-        title = extract_chapter_title(content)
+        document = load_document(chapter_file)
+        word_count = document.content_word_count
+        title = document.title or "Untitled"
         
         chapter_stats.append({
             'filename': chapter_file.name,
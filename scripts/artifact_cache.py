@@ -0,0 +1,222 @@
+"""Content-addressed cache of finished build-stage artifacts.
+
+``build_all_orchestrator.py`` publishes the outputs of each stage (book
+formats, whitepapers, presentation, site) under the stage's input
+fingerprint and restores them on a later fingerprint hit, even in a fresh
+checkout. The cache is a plain directory, so it can live on a mounted volume
+shared between CI runners or worktrees::
+
+    <cache>/objects/ab/abcdef…   file contents, named by SHA-256
+    <cache>/entries/<stage>-<fingerprint>.json
+
+Entries are evicted least-recently-used first once the stored objects exceed
+the size cap. Objects no entry references are only removed once they are
+older than :data:`ORPHAN_GRACE_SECONDS`: a store publishes its objects before
+its entry, and another process sharing the cache may be mid-store. Every restored object is re-hashed; a corrupt object discards
+the entry and reports a miss so the stage is rebuilt.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+DEFAULT_MAX_BYTES = 2 * 1024**3
+ORPHAN_GRACE_SECONDS = 60 * 60
+_CHUNK_SIZE = 1024 * 1024
+
+
+class ArtifactCacheError(RuntimeError):
+    """Raised when a cached artifact fails integrity verification."""
+
+
+@dataclass(frozen=True)
+class CachedFile:
+    path: str
+    sha256: str
+    size: int
+
+
+def _hash_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _artifact_files(artifacts: tuple[Path, ...]) -> list[Path]:
+    files: list[Path] = []
+    for artifact in artifacts:
+        if artifact.is_dir():
+            files.extend(sorted(path for path in artifact.rglob("*") if path.is_file()))
+        elif artifact.is_file():
+            files.append(artifact)
+    return files
+
+
+class ArtifactCache:
+    """Directory-backed store of stage outputs keyed by input fingerprint."""
+
+    def __init__(self, directory: Path, *, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.objects = directory / "objects"
+        self.entries = directory / "entries"
+
+    def _entry_path(self, stage: str, fingerprint: str) -> Path:
+        return self.entries / f"{stage}-{fingerprint}.json"
+
+    def _object_path(self, sha256: str) -> Path:
+        return self.objects / sha256[:2] / sha256
+
+    def _load_entry(self, path: Path) -> list[CachedFile] | None:
+        try:
+            record = json.loads(path.read_text(encoding="utf-8"))
+            return [CachedFile(**item) for item in record["files"]]
+        except (FileNotFoundError, json.JSONDecodeError, KeyError, TypeError):
+            return None
+
+    def store(self, stage: str, fingerprint: str, root: Path, artifacts: tuple[Path, ...]) -> int:
+        """Publish the files under ``artifacts`` and return how many were stored."""
+        files: list[CachedFile] = []
+        for path in _artifact_files(artifacts):
+            sha256 = _hash_file(path)
+            target = self._object_path(sha256)
+            try:
+                # Refresh reused objects so a concurrent evict treats them as in flight.
+                os.utime(target)
+            except FileNotFoundError:
+                target.parent.mkdir(parents=True, exist_ok=True)
+                with tempfile.NamedTemporaryFile(dir=target.parent, delete=False) as handle:
+                    temporary = Path(handle.name)
+                shutil.copyfile(path, temporary)
+                os.replace(temporary, target)
+            files.append(CachedFile(path.relative_to(root).as_posix(), sha256, path.stat().st_size))
+
+        if not files:
+            return 0
+
+        self.entries.mkdir(parents=True, exist_ok=True)
+        entry = self._entry_path(stage, fingerprint)
+        payload = {
+            "stage": stage,
+            "fingerprint": fingerprint,
+            "created": time.time(),
+            "artifacts": [artifact.relative_to(root).as_posix() for artifact in artifacts],
+            "files": [asdict(file) for file in files],
+        }
+        with tempfile.NamedTemporaryFile("w", dir=self.entries, delete=False, encoding="utf-8") as handle:
+            json.dump(payload, handle, indent=2)
+            temporary = Path(handle.name)
+        os.replace(temporary, entry)
+
+        self.evict()
+        return len(files)
+
+    def restore(self, stage: str, fingerprint: str, root: Path, artifacts: tuple[Path, ...]) -> bool:
+        """Restore a cached entry into ``root``; return ``False`` on a miss.
+
+        Artifact directories are mirrored exactly, so files left over from
+        other builds are removed.
+        """
+        entry = self._entry_path(stage, fingerprint)
+        files = self._load_entry(entry)
+        if files is None:
+            return False
+
+        try:
+            staged = self._stage_files(files)
+        except ArtifactCacheError:
+            entry.unlink(missing_ok=True)
+            return False
+
+        try:
+            expected = {root / file.path for file in files}
+            for path in _artifact_files(artifacts):
+                if path not in expected:
+                    path.unlink()
+            for file, temporary in zip(files, staged):
+                destination = root / file.path
+                destination.parent.mkdir(parents=True, exist_ok=True)
+                shutil.move(str(temporary), destination)
+        finally:
+            for temporary in staged:
+                Path(temporary).unlink(missing_ok=True)
+
+        os.utime(entry)  # Mark as recently used for LRU eviction.
+        return True
+
+    def _stage_files(self, files: list[CachedFile]) -> list[Path]:
+        """Copy and verify every object before touching the workspace."""
+        staged: list[Path] = []
+        try:
+            for file in files:
+                source = self._object_path(file.sha256)
+                if not source.is_file():
+                    raise ArtifactCacheError(f"Missing cached object for {file.path}")
+                with tempfile.NamedTemporaryFile(delete=False) as handle:
+                    staged.append(Path(handle.name))
+                shutil.copyfile(source, staged[-1])
+                if _hash_file(staged[-1]) != file.sha256:
+                    source.unlink(missing_ok=True)
+                    raise ArtifactCacheError(f"Cached object for {file.path} is corrupt")
+        except BaseException:
+            for temporary in staged:
+                temporary.unlink(missing_ok=True)
+            raise
+        return staged
+
+    def evict(self, now: float | None = None) -> None:
+        """Drop least-recently-used entries until objects fit the size cap.
+
+        Unreferenced objects modified within :data:`ORPHAN_GRACE_SECONDS`
+        of ``now`` are kept, as they may belong to a store in progress.
+        """
+        if not self.entries.is_dir():
+            return
+        cutoff = (time.time() if now is None else now) - ORPHAN_GRACE_SECONDS
+
+        entries: list[tuple[float, Path]] = []
+        for entry in self.entries.glob("*.json"):
+            try:
+                entries.append((entry.stat().st_mtime, entry))
+            except FileNotFoundError:
+                # Another process sharing the cache evicted or replaced it.
+                continue
+        referenced: dict[Path, dict[str, int]] = {}
+        for _, entry in sorted(entries):
+            files = self._load_entry(entry)
+            if files is None:
+                entry.unlink(missing_ok=True)
+                continue
+            referenced[entry] = {file.sha256: file.size for file in files}
+
+        def total() -> int:
+            sizes: dict[str, int] = {}
+            for objects in referenced.values():
+                sizes.update(objects)
+            return sum(sizes.values())
+
+        while referenced and total() > self.max_bytes:
+            oldest = next(iter(referenced))
+            del referenced[oldest]
+            oldest.unlink(missing_ok=True)
+
+        live = {sha256 for objects in referenced.values() for sha256 in objects}
+        if self.objects.is_dir():
+            for path in self.objects.glob("*/*"):
+                # Skip temporary files of stores still in progress.
+                if len(path.name) != 64 or path.name in live:
+                    continue
+                try:
+                    if path.stat().st_mtime < cutoff:
+                        path.unlink()
+                except FileNotFoundError:
+                    pass
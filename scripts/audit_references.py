@@ -23,9 +23,7 @@ Usage:
 
 from __future__ import annotations
 
-import re
 import sys
-from collections import defaultdict
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Set, Tuple
@@ -37,6 +35,8 @@ from typing import Dict, List, Set, Tuple
 _SCRIPTS_DIR = Path(__file__).resolve().parent
 sys.path.insert(0, str(_SCRIPTS_DIR))
 
+from manuscript import load_document  # noqa: E402
+from manuscript_lint import ReferenceAuditRule, audit_document, load_reference_anchors  # noqa: E402
 from navigation import REPO_ROOT, get_book_build_files  # noqa: E402
 
 DOCS_DIR = REPO_ROOT / "docs"
@@ -44,53 +44,11 @@ REFERENCES_FILE = DOCS_DIR / "33_references.md"
 REPORTS_DIR = REPO_ROOT / "reports"
 REPORT_FILE = REPORTS_DIR / "reference_audit.md"
 
-# ---------------------------------------------------------------------------
-# Compiled regular expressions
-# ---------------------------------------------------------------------------
-
-# The canonical sources header is exactly ``## Sources`` (nothing after it).
-_STANDARD_SOURCES_RE = re.compile(r"^## Sources\s*$", re.MULTILINE)
-
-# Non-standard variants that look like a references section but are wrong.
-_NON_STANDARD_HEADER_RE = re.compile(
-    r"^(#{1,3})\s+"
-    r"(References?|Sources?\s+and\s+[Rr]eferences?|Sources?\s+and\s+[Ss]ources?)"
-    r"\s*$",
-    re.MULTILINE | re.IGNORECASE,
-)
-
-# A well-formed inline citation: [Source [N]](33_references.md#source-N)
-# Captures the cited number from the link text and the anchor number.
-_STANDARD_INLINE_RE = re.compile(
-    r"\[Source \[(\d+)\]\]\(33_references\.md#source-(\d+)\)"
-)
-
-# Any ``[Source [`` token — used to find *all* citation-like patterns so we
-# can flag those that do not satisfy the standard form above.
-_ANY_SOURCE_BRACKET_RE = re.compile(r"\[Source \[")
-
-# Anchors in 33_references.md — both HTML and Pandoc/Commonmark formats.
-# HTML:   <a id="source-N">
-# Pandoc span: [anything]{#source-N} — matched by looking for ]{#source-N}
-#   because the span text may contain nested brackets (e.g. [**Source [1]:**])
-_ANCHOR_HTML_RE = re.compile(r'<a\s+id="source-(\d+)"')
-_ANCHOR_PANDOC_RE = re.compile(r"\]\{#source-(\d+)\}")
-
 # ---------------------------------------------------------------------------
 # Data collection helpers
 # ---------------------------------------------------------------------------
 
 
-def load_reference_anchors(references_path: Path) -> Set[int]:
-    """Return the set of source numbers declared as anchors in references.md."""
-    if not references_path.exists():
-        return set()
-    text = references_path.read_text(encoding="utf-8")
-    html_ids = {int(m) for m in _ANCHOR_HTML_RE.findall(text)}
-    pandoc_ids = {int(m) for m in _ANCHOR_PANDOC_RE.findall(text)}
-    return html_ids | pandoc_ids
-
-
 def audit_chapter(
     chapter_path: Path,
 ) -> Dict:
@@ -99,65 +57,20 @@ def audit_chapter(
 
     ``missing_sources_section`` : bool
     ``non_standard_headers``    : list of (line_number, header_text) tuples
-    ``malformed_citations``     : list of (line_number, raw_text) tuples
+    ``malformed_citations``     : list of (line_number, raw_text, reason) tuples
     ``cited_source_numbers``    : set of ints (numbers from standard citations)
-    """
-    findings: Dict = {
-        "missing_sources_section": False,
-        "non_standard_headers": [],
-        "malformed_citations": [],
-        "cited_source_numbers": set(),
-    }
 
+    The checks are the ``reference-audit`` rule of ``manuscript_lint.py``.
+    """
     if not chapter_path.exists():
-        findings["missing_sources_section"] = True
-        return findings
-
-    text = chapter_path.read_text(encoding="utf-8")
-    lines = text.splitlines()
-
-    # 1. Check for standard ## Sources section.
-    if not _STANDARD_SOURCES_RE.search(text):
-        findings["missing_sources_section"] = True
-
-    # 2. Detect non-standard reference headers.
-    for match in _NON_STANDARD_HEADER_RE.finditer(text):
-        line_no = text[: match.start()].count("\n") + 1
-        findings["non_standard_headers"].append((line_no, match.group(0).strip()))
-
-    # 3. Collect standard citations and detect malformed ones.
-    for line_no, line in enumerate(lines, start=1):
-        # Collect all well-formed citations on this line first.
-        for std_match in _STANDARD_INLINE_RE.finditer(line):
-            text_num = int(std_match.group(1))
-            anchor_num = int(std_match.group(2))
-            # Both numbers should match; if they differ, flag as malformed.
-            if text_num == anchor_num:
-                findings["cited_source_numbers"].add(text_num)
-            else:
-                findings["malformed_citations"].append(
-                    (
-                        line_no,
-                        std_match.group(0),
-                        "Citation text number and anchor number do not match",
-                    )
-                )
-
-        # Find any ``[Source [`` tokens not covered by the standard pattern.
-        # We do this by removing all standard hits from the line and checking
-        # whether any ``[Source [`` tokens remain.
-        stripped = _STANDARD_INLINE_RE.sub("", line)
-        for _ in _ANY_SOURCE_BRACKET_RE.finditer(stripped):
-            findings["malformed_citations"].append(
-                (
-                    line_no,
-                    line.strip(),
-                    "Citation does not match [Source [N]](33_references.md#source-N)",
-                )
-            )
-            break  # one report per line is enough to keep the report readable
-
-    return findings
+        return {
+            "missing_sources_section": True,
+            "non_standard_headers": [],
+            "malformed_citations": [],
+            "cited_source_numbers": set(),
+        }
+
+    return audit_document(load_document(chapter_path))
 
 
 # ---------------------------------------------------------------------------
@@ -336,18 +249,11 @@ def main() -> int:
     chapter_findings: List[Tuple[str, Dict]] = []
     all_cited: Set[int] = set()
 
-    skip_stems = {"33_references"}  # the references file is not a chapter
+    # Part introductions and the references file itself are not audited.
+    rule = ReferenceAuditRule()
 
     for rel_path in book_files:
-        path_obj = Path(rel_path)
-        stem = path_obj.stem
-
-        # Skip part introduction pages — they don't carry citations.
-        if stem.startswith("part_"):
-            continue
-
-        # Skip the references file itself.
-        if stem in skip_stems:
+        if not rule.applies_to(f"docs/{rel_path}"):
             continue
 
         chapter_path = DOCS_DIR / rel_path
@@ -0,0 +1,136 @@
+"""Shared, memoized view of the ``BOOK_REQUIREMENTS.md`` front matter.
+
+The YAML front matter of ``BOOK_REQUIREMENTS.md`` drives the whitepaper and
+presentation generators, the environment check and the test suite. This
+module parses it once per process and hands every caller the same
+:class:`BookRequirements` object. The cache is validated against the file's
+modification time and size, so edits are picked up without restarting a
+long-running process. The libyaml ``CSafeLoader`` is used when PyYAML was
+built with it.
+
+The parsed data is shared between callers and must be treated as read-only.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+BOOK_REQUIREMENTS_PATH = REPO_ROOT / "BOOK_REQUIREMENTS.md"
+
+_Loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+class BookRequirementsError(RuntimeError):
+    """Raised when ``BOOK_REQUIREMENTS.md`` is missing or has no front matter."""
+
+
+@dataclass(frozen=True)
+class BookRequirements:
+    """Typed accessors over the parsed front matter."""
+
+    path: Path
+    data: Mapping[str, Any]
+    _chapters_by_filename: dict[str, Mapping[str, Any]] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        lookup = {
+            str(chapter["filename"]): chapter
+            for chapter in self.chapters
+            if chapter.get("filename")
+        }
+        object.__setattr__(self, "_chapters_by_filename", lookup)
+
+    @property
+    def book(self) -> Mapping[str, Any]:
+        return self.data.get("book") or {}
+
+    @property
+    def release(self) -> Mapping[str, Any]:
+        return self.data.get("release") or {}
+
+    @property
+    def chapters(self) -> list[Mapping[str, Any]]:
+        return self.book.get("chapters") or []
+
+    @property
+    def parts(self) -> list[Mapping[str, Any]]:
+        return self.book.get("part_introductions") or []
+
+    @property
+    def quality(self) -> Mapping[str, Any]:
+        return self.data.get("quality") or {}
+
+    @property
+    def chapter_filenames(self) -> list[str]:
+        """Canonical chapter filenames in manuscript order."""
+        return list(self._chapters_by_filename)
+
+    def chapter(self, filename: str) -> Mapping[str, Any] | None:
+        """Return the chapter entry for ``filename`` without scanning the list."""
+        return self._chapters_by_filename.get(filename)
+
+
+def parse_front_matter(text: str, source: Path | str = "BOOK_REQUIREMENTS.md") -> dict:
+    """Parse the YAML block between the leading ``---`` delimiters of ``text``."""
+    lines = text.splitlines()
+    if not lines or lines[0].strip() != "---":
+        raise BookRequirementsError(f"{source} does not contain YAML front matter.")
+
+    front_matter_lines = []
+    for line in lines[1:]:
+        if line.strip() == "---":
+            break
+        front_matter_lines.append(line)
+
+    if not front_matter_lines:
+        raise BookRequirementsError(f"{source} front matter is empty.")
+
+    data = yaml.load("\n".join(front_matter_lines), Loader=_Loader) or {}
+    if not isinstance(data, dict):
+        raise BookRequirementsError(f"Front matter in {source} did not produce a dictionary.")
+    return data
+
+
+_cache_lock = threading.Lock()
+_cache: dict[Path, tuple[tuple[int, int], BookRequirements]] = {}
+
+
+def load_book_requirements(path: Path = BOOK_REQUIREMENTS_PATH) -> BookRequirements:
+    """Return the parsed requirements, re-reading the file only when it changed."""
+    resolved = Path(path).resolve()
+    try:
+        stat = os.stat(resolved)
+    except FileNotFoundError:
+        raise BookRequirementsError(f"{path} is missing.") from None
+    signature = (stat.st_mtime_ns, stat.st_size)
+
+    with _cache_lock:
+        cached = _cache.get(resolved)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        data = parse_front_matter(resolved.read_text(encoding="utf-8"), path)
+        requirements = BookRequirements(resolved, data)
+        _cache[resolved] = (signature, requirements)
+        return requirements
+
+
+def load_book_requirements_or_empty(path: Path = BOOK_REQUIREMENTS_PATH) -> Mapping[str, Any]:
+    """Return the raw front matter, or an empty mapping when it is unavailable."""
+    try:
+        return load_book_requirements(path).data
+    except BookRequirementsError:
+        return {}
+
+
+def clear_cache() -> None:
+    with _cache_lock:
+        _cache.clear()
@@ -0,0 +1,199 @@
+"""Resolve which manuscript files a change touches, for incremental validation.
+
+:func:`resolve_change_scope` asks git which files changed since a reference
+(committed, staged, unstaged and untracked) and adds the files whose
+validation depends on them:
+
+* a chapter that embeds a diagram whose ``.mmd`` source or rendered image
+  changed;
+* a chapter that cites a source whose entry in ``33_references.md`` changed;
+* ``33_references.md`` itself when a chapter's set of citations changed.
+
+A :class:`ChangeScope` with ``files=None`` means "validate everything". That
+is the result on the main branch, when the reference cannot be resolved and
+when a file that shapes every check (navigation, book requirements, the
+validators and the tests themselves) changed, so incremental runs never skip
+work they cannot reason about.
+"""
+
+from __future__ import annotations
+
+import fnmatch
+import os
+import re
+import subprocess
+import sys
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from manuscript import load_document, parse_document  # noqa: E402
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+REFERENCES_PATH = "docs/33_references.md"
+FULL_RUN_BRANCHES = frozenset({"main", "master"})
+
+# Files that every validator depends on; changing one forces a full run.
+GLOBAL_INPUTS = frozenset({
+    "BOOK_REQUIREMENTS.md",
+    "mkdocs.yml",
+    "pytest.ini",
+    "requirements.txt",
+    "scripts/change_scope.py",
+    "scripts/manuscript.py",
+    "scripts/manuscript_lint.py",
+    "scripts/navigation.py",
+})
+# Validators and tests check the whole corpus; a change to one must too.
+GLOBAL_INPUT_PATTERNS = ("tests/*", "scripts/validate_*.py", "scripts/check_*.py")
+
+_REFERENCE_ANCHOR_RE = re.compile(r'(?:\{#|<a\s+id=")source-(\d+)')
+_IMAGE_SUFFIXES = (".mmd", ".png", ".svg")
+
+
+class ChangeScopeError(RuntimeError):
+    """Raised when git cannot report the changed files."""
+
+
+@dataclass(frozen=True)
+class ChangeScope:
+    """Repository-relative files to validate; ``None`` selects everything."""
+
+    ref: str
+    files: frozenset[str] | None
+    reason: str = ""
+
+    @property
+    def full(self) -> bool:
+        return self.files is None
+
+    def includes(self, rel_path: str) -> bool:
+        return self.files is None or rel_path in self.files
+
+    def filter(self, paths: Iterable[Path], root: Path = REPO_ROOT) -> list[Path]:
+        """Return the ``paths`` inside the scope, preserving their order."""
+        paths = list(paths)
+        if self.files is None:
+            return paths
+        return [path for path in paths if _relative(path, root) in self.files]
+
+
+def _relative(path: Path, root: Path) -> str:
+    try:
+        return Path(path).resolve().relative_to(root.resolve()).as_posix()
+    except ValueError:
+        return Path(path).as_posix()
+
+
+def _git(args: Sequence[str], root: Path) -> str:
+    try:
+        result = subprocess.run(
+            ["git", *args], cwd=root, capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError) as exc:
+        stderr = getattr(exc, "stderr", "") or str(exc)
+        raise ChangeScopeError(f"git {' '.join(args)} failed: {stderr.strip()}") from None
+    return result.stdout
+
+
+def _show(ref: str, rel_path: str, root: Path) -> str | None:
+    """Return the contents of ``rel_path`` at ``ref``, or None if it did not exist."""
+    try:
+        return _git(["show", f"{ref}:{rel_path}"], root)
+    except ChangeScopeError:
+        return None
+
+
+def current_branch(root: Path = REPO_ROOT) -> str:
+    """Return the checked-out branch, or the pushed branch on GitHub Actions."""
+    if os.environ.get("GITHUB_EVENT_NAME") == "push" and os.environ.get("GITHUB_REF_NAME"):
+        return os.environ["GITHUB_REF_NAME"]
+    try:
+        return _git(["rev-parse", "--abbrev-ref", "HEAD"], root).strip()
+    except ChangeScopeError:
+        return ""
+
+
+def changed_files(ref: str, root: Path = REPO_ROOT) -> set[str]:
+    """Files changed since the merge base with ``ref``, including the work tree."""
+    base = _git(["merge-base", ref, "HEAD"], root).strip()
+    outputs = [
+        _git(["diff", "--name-only", base], root),
+        _git(["ls-files", "--others", "--exclude-standard"], root),
+    ]
+    return {line.strip() for output in outputs for line in output.splitlines() if line.strip()}
+
+
+def reference_entries(text: str) -> dict[int, str]:
+    """Map each source number in ``33_references.md`` to its entry line."""
+    entries: dict[int, str] = {}
+    for line in text.splitlines():
+        match = _REFERENCE_ANCHOR_RE.search(line)
+        if match:
+            entries[int(match.group(1))] = line.strip()
+    return entries
+
+
+def _cited_numbers(text: str) -> set[int]:
+    return {citation.number for citation in parse_document(text).citations if citation.well_formed}
+
+
+def dependents(changed: Iterable[str], ref: str, root: Path = REPO_ROOT) -> set[str]:
+    """Return the files whose validation depends on ``changed``."""
+    changed = set(changed)
+    chapters = sorted((root / "docs").glob("*.md"))
+    result: set[str] = set()
+
+    changed_images = {
+        Path(path).stem for path in changed
+        if path.startswith("docs/images/") and path.endswith(_IMAGE_SUFFIXES)
+    }
+    changed_sources: set[int] = set()
+    if REFERENCES_PATH in changed and (root / REFERENCES_PATH).exists():
+        old = reference_entries(_show(ref, REFERENCES_PATH, root) or "")
+        new = reference_entries((root / REFERENCES_PATH).read_text(encoding="utf-8"))
+        changed_sources = {number for number in old.keys() | new.keys() if old.get(number) != new.get(number)}
+
+    for chapter in chapters:
+        rel_path = _relative(chapter, root)
+        if rel_path == REFERENCES_PATH:
+            continue
+        document = load_document(chapter)
+        if changed_images and any(Path(image.target).stem in changed_images for image in document.images):
+            result.add(rel_path)
+        cited = {citation.number for citation in document.citations if citation.well_formed}
+        if cited & changed_sources:
+            result.add(rel_path)
+        if rel_path in changed and cited != _cited_numbers(_show(ref, rel_path, root) or ""):
+            result.add(REFERENCES_PATH)
+
+    # A deleted chapter takes its citations with it.
+    for rel_path in changed:
+        if rel_path.startswith("docs/") and rel_path.endswith(".md") and not (root / rel_path).exists():
+            if _cited_numbers(_show(ref, rel_path, root) or ""):
+                result.add(REFERENCES_PATH)
+
+    return result - changed
+
+
+def resolve_change_scope(ref: str, root: Path = REPO_ROOT, *, branch: str | None = None) -> ChangeScope:
+    """Return the files to validate for a change against ``ref``."""
+    branch = current_branch(root) if branch is None else branch
+    if branch in FULL_RUN_BRANCHES:
+        return ChangeScope(ref, None, f"on {branch}")
+
+    try:
+        changed = changed_files(ref, root)
+    except ChangeScopeError as exc:
+        return ChangeScope(ref, None, str(exc))
+
+    global_inputs = sorted(
+        path for path in changed
+        if path in GLOBAL_INPUTS or any(fnmatch.fnmatch(path, pattern) for pattern in GLOBAL_INPUT_PATTERNS)
+    )
+    if global_inputs:
+        return ChangeScope(ref, None, f"{', '.join(global_inputs)} changed")
+
+    files = changed | dependents(changed, ref, root)
+    return ChangeScope(ref, frozenset(files), f"{len(changed)} changed, {len(files) - len(changed)} dependent")
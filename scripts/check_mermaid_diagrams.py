@@ -1,90 +1,54 @@
 #!/usr/bin/env python3
-"""Validate that committed Mermaid diagrams reflect their sources."""
+"""Validate that committed Mermaid diagrams reflect their sources.
+
+Diagrams listed in ``docs/images/mermaid-render-manifest.json`` whose source,
+theme, render flags and Mermaid CLI version still hash to the recorded cache
+key, and whose committed PNG still has the recorded SHA-256, are trusted
+without rendering. Only the remaining diagrams are rendered and compared; use
+``--full`` to re-render and compare every diagram.
+
+Entries are only recorded after a render has been compared against the
+committed PNG. The *Verify Mermaid diagrams* workflow seeds the manifest with
+its first ``--write-missing`` run, which renders every diagram, and commits it
+together with any re-rendered PNGs.
+"""
 
 from __future__ import annotations
 
 import argparse
 import filecmp
-import os
 import shutil
-import subprocess
 import sys
 import tempfile
 from pathlib import Path
-from typing import List, Tuple
-
-
-def _resolve_mmdc(root: Path) -> Path:
-    """Locate the Mermaid CLI executable."""
-
-    local_mmdc = root / "node_modules" / ".bin" / "mmdc"
-    if local_mmdc.is_file():
-        return local_mmdc
-
-    fallback = shutil.which("mmdc")
-    if fallback:
-        return Path(fallback)
-
-    raise FileNotFoundError(
-        "Mermaid CLI (mmdc) is unavailable. Run 'npm ci' before executing this check."
-    )
-
-
-def _build_command(
-    mmdc_path: Path, source: Path, target: Path, theme: Path | None
-) -> List[str]:
-    command = [
-        str(mmdc_path),
-        "-i",
-        str(source),
-        "-o",
-        str(target),
-        "-t",
-        "default",
-        "-b",
-        "transparent",
-        "--width",
-        "1400",
-        "--height",
-        "900",
-    ]
-
-    if theme and theme.is_file():
-        command.extend(["-c", str(theme)])
-
-    puppeteer_config = os.environ.get("PUPPETEER_CONFIG_FILE")
-    if puppeteer_config and Path(puppeteer_config).is_file():
-        command.extend(["--puppeteerConfigFile", puppeteer_config])
-
-    return command
-
-
-def _render_diagram(
-    mmdc_path: Path, source: Path, target: Path, theme: Path | None
-) -> Tuple[bool, str]:
-    """Render a Mermaid source file to ``target`` using the configured CLI."""
-
-    command = _build_command(mmdc_path, source, target, theme)
-
-    result = subprocess.run(
-        command,
-        check=False,
-        env=os.environ,
-        capture_output=True,
-        text=True,
-    )
-
-    if result.returncode != 0:
-        detail = (result.stderr or result.stdout or "").strip()
-        return False, detail
-
-    if not target.is_file() or target.stat().st_size == 0:
-        return False, "Mermaid CLI did not produce output"
-
-    return True, ""
-
-
-def _prepare_arguments() -> argparse.Namespace:
+from typing import Dict, List, Sequence
+
+# Allow importing sibling modules when executed as a script.
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from mermaid_batch_render import (  # noqa: E402
+    DEFAULT_PAGES,
+    RenderJob,
+    RenderResult,
+    RendererUnavailable,
+    create_renderer,
+    mermaid_cli_version,
+)
+from mermaid_render_cache import (  # noqa: E402
+    MANIFEST_FILENAME,
+    RenderCache,
+    RenderManifest,
+    build_render_options,
+)
+
+_BROWSER_LAUNCH_FAILURE = (
+    "❌ Mermaid CLI could not launch a headless browser. Install the "
+    "GTK/ATK runtime (e.g. libatk-1.0-0, libgtk-3-0, libnss3, libxss1) "
+    "or point PUPPETEER_EXECUTABLE_PATH to an existing Chrome binary "
+    "before running the check."
+)
+
+
+def _prepare_arguments(argv: Sequence[str] | None = None) -> argparse.Namespace:
     parser = argparse.ArgumentParser(
         description=(
             "Validate committed Mermaid diagrams and optionally refresh missing "
@@ -99,12 +63,43 @@ def _prepare_arguments() -> argparse.Namespace:
             "current Mermaid source definitions."
         ),
     )
-    return parser.parse_args()
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help=(
+            "Ignore the render manifest and re-render every diagram for comparison "
+            "against its committed PNG."
+        ),
+    )
+    parser.add_argument(
+        "--pages",
+        type=int,
+        default=DEFAULT_PAGES,
+        help=(
+            "Number of concurrent browser pages used by the batch renderer "
+            f"(default: {DEFAULT_PAGES})."
+        ),
+    )
+    parser.add_argument(
+        "--no-batch",
+        action="store_true",
+        help="Launch a separate mmdc process per diagram instead of one shared browser.",
+    )
+    return parser.parse_args(argv)
+
 
+def _render_all(renderer, jobs: List[RenderJob]) -> Dict[RenderJob, RenderResult]:
+    """Render ``jobs`` and index the results by job for ordered reporting."""
+
+    try:
+        return {result.job: result for result in renderer.render(jobs)}
+    finally:
+        renderer.close()
 
-def main() -> int:
-    args = _prepare_arguments()
-    repo_root = Path(__file__).resolve().parents[1]
+
+def main(argv: Sequence[str] | None = None, *, repo_root: Path | None = None) -> int:
+    args = _prepare_arguments(argv)
+    repo_root = repo_root or Path(__file__).resolve().parents[1]
     images_dir = repo_root / "docs" / "images"
     theme_file = repo_root / "docs" / "mermaid-kvadrat-theme.json"
 
@@ -112,68 +107,102 @@ def main() -> int:
         print("No diagram directory found; nothing to validate.")
         return 0
 
-    try:
-        mmdc_path = _resolve_mmdc(repo_root)
-    except FileNotFoundError as exc:  # pragma: no cover - direct exit path
-        print(str(exc), file=sys.stderr)
-        return 2
-
     sources = sorted(images_dir.glob("*.mmd"))
     if not sources:
         print("No Mermaid sources discovered; nothing to validate.")
         return 0
 
+    cache = RenderCache(
+        RenderManifest.load(images_dir / MANIFEST_FILENAME),
+        config_file=theme_file,
+        options=build_render_options(),
+        cli_version=mermaid_cli_version(repo_root),
+    )
+    pending = list(sources) if args.full else cache.stale_sources(sources)
+    trusted = len(sources) - len(pending)
+    if not args.full:
+        print(
+            f"Render manifest: {trusted} diagrams unchanged, "
+            f"{len(pending)} require rendering."
+        )
+
     failures: List[str] = []
     generated: List[Path] = []
     refreshed: List[Path] = []
 
-    with tempfile.TemporaryDirectory() as tmp_dir:
-        tmp_path = Path(tmp_dir)
+    for source in pending:
+        if not source.with_suffix(".png").is_file() and not args.write_missing:
+            failures.append(
+                "❌ Missing rendered diagram for "
+                f"{source.relative_to(repo_root)}"
+            )
+    pending = [
+        source
+        for source in pending
+        if source.with_suffix(".png").is_file() or args.write_missing
+    ]
 
-        for source in sources:
-            target = source.with_suffix(".png")
+    if pending:
+        try:
+            renderer = create_renderer(
+                batch=not args.no_batch, pages=args.pages, root=repo_root
+            )
+        except RendererUnavailable as exc:  # pragma: no cover - direct exit path
+            print(str(exc), file=sys.stderr)
+            return 2
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tmp_path = Path(tmp_dir)
+
+            # Missing PNGs are rendered straight into place; existing ones are
+            # rendered to a scratch copy for comparison. Every job shares one
+            # browser session.
+            jobs: Dict[Path, RenderJob] = {}
+            for source in pending:
+                target = source.with_suffix(".png")
+                destination = target if not target.is_file() else tmp_path / target.name
+                jobs[source] = RenderJob(source, destination, config_file=theme_file)
+
+            results = _render_all(renderer, list(jobs.values()))
+
+            if any("libatk-1.0.so.0" in result.detail for result in results.values()):
+                failures.append(_BROWSER_LAUNCH_FAILURE)
+                pending = []
+
+            for source in pending:
+                target = source.with_suffix(".png")
+                job = jobs[source]
+                result = results[job]
+
+                if job.target == target:
+                    if not result.success:
+                        failures.append(
+                            "❌ Failed to render missing diagram "
+                            f"{source.relative_to(repo_root)} via Mermaid CLI: {result.detail}"
+                        )
+                        continue
 
-            if not target.is_file():
-                if not args.write_missing:
-                    failures.append(
-                        "❌ Missing rendered diagram for "
-                        f"{source.relative_to(repo_root)}"
-                    )
+                    generated.append(target)
+                    cache.record(source)
                     continue
 
-                success, detail = _render_diagram(mmdc_path, source, target, theme_file)
-                if not success:
+                if not result.success:
                     failures.append(
-                        "❌ Failed to render missing diagram "
-                        f"{source.relative_to(repo_root)} via Mermaid CLI: {detail}"
+                        "❌ Failed to render "
+                        f"{source.relative_to(repo_root)} via Mermaid CLI: {result.detail}"
                     )
                     continue
 
-                generated.append(target)
-
-            candidate = tmp_path / target.name
-            success, detail = _render_diagram(mmdc_path, source, candidate, theme_file)
-
-            if not success:
-                if "libatk-1.0.so.0" in detail:
-                    failures.append(
-                        "❌ Mermaid CLI could not launch a headless browser. Install the "
-                        "GTK/ATK runtime (e.g. libatk-1.0-0, libgtk-3-0, libnss3, libxss1) "
-                        "or point PUPPETEER_EXECUTABLE_PATH to an existing Chrome binary "
-                        "before running the check."
-                    )
-                    break
-
-                failures.append(
-                    "❌ Failed to render "
-                    f"{source.relative_to(repo_root)} via Mermaid CLI: {detail}"
-                )
-                continue
+                if not filecmp.cmp(job.target, target, shallow=False):
+                    if not args.write_missing:
+                        failures.append(
+                            "❌ Rendered output diverges from committed PNG: "
+                            f"{target.relative_to(repo_root)}"
+                        )
+                        continue
 
-            if not filecmp.cmp(candidate, target, shallow=False):
-                if args.write_missing:
                     try:
-                        shutil.copy2(candidate, target)
+                        shutil.copy2(job.target, target)
                     except OSError as err:
                         failures.append(
                             "❌ Unable to refresh diagram "
@@ -182,11 +211,16 @@ def main() -> int:
                         continue
 
                     refreshed.append(target)
-                else:
-                    failures.append(
-                        "❌ Rendered output diverges from committed PNG: "
-                        f"{target.relative_to(repo_root)}"
-                    )
+
+                cache.record(source)
+
+    if args.write_missing:
+        cache.manifest.prune(sources)
+        if cache.manifest.save():
+            print(
+                "🧾 Updated render manifest "
+                f"{cache.manifest.path.relative_to(repo_root)}"
+            )
 
     if failures:
         print("Mermaid diagram validation failed:")
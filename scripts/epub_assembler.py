@@ -0,0 +1,448 @@
+"""Assemble the EPUB from per-chapter cached XHTML instead of one pandoc run.
+
+A whole-book ``pandoc -t epub`` re-converts every chapter even when only one
+paragraph changed. :func:`assemble_epub` converts each chapter on its own and
+caches the XHTML body under ``.cache/epub-chapters``:
+
+1. part introductions lose their LaTeX-only commands, and every chapter is
+   parsed into pandoc's JSON AST through the cache in :mod:`pandoc_ast`;
+2. each AST is written as an HTML fragment. The cache key covers the AST, the
+   writer options and the pandoc version. The options include the section
+   number offset, so section numbers still run across chapters;
+3. the package (OPF manifest and spine, ``nav.xhtml``, stylesheet, cover page
+   and images) is written directly as a zip.
+
+After a single-chapter edit a rebuild therefore costs one parse, one HTML
+conversion and the zip write. Links to other chapters (``02_x.md#id`` or a
+bare ``#id`` defined elsewhere) are rewritten to the chapter documents.
+Raw HTML in chapters must be well-formed XHTML, as it is copied verbatim.
+"""
+
+from __future__ import annotations
+
+import datetime
+import html
+import json
+import os
+import re
+import sys
+import tempfile
+import uuid
+import zipfile
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:  # pragma: no cover - defensive guard for CLI execution
+    sys.path.insert(0, str(REPO_ROOT))
+
+from scripts.pandoc_ast import (  # noqa: E402
+    AstCache,
+    Converter,
+    non_latex_source,
+    parse_sources,
+    reader_options,
+)
+from scripts.pandoc_server import ConversionRequest, PandocError  # noqa: E402
+
+DEFAULT_CACHE_DIR = REPO_ROOT / ".cache" / "epub-chapters"
+MEDIA_TYPES = {
+    ".gif": "image/gif",
+    ".jpeg": "image/jpeg",
+    ".jpg": "image/jpeg",
+    ".png": "image/png",
+    ".svg": "image/svg+xml",
+    ".webp": "image/webp",
+}
+# Keys of the defaults file that shape a chapter's HTML fragment.
+_FRAGMENT_KEYS = ("number-sections", "highlight-style", "html-q-tags", "email-obfuscation")
+_HEADING_RE = re.compile(r"<h([1-6])\b([^>]*)>(.*?)</h\1>", re.DOTALL)
+_ID_RE = re.compile(r'\bid="([^"]+)"')
+_HREF_RE = re.compile(r'\bhref="([^"#:]*\.md)?(#[^"]*)?"')
+_SRC_RE = re.compile(r'\bsrc="(?![a-z]+:)([^"]+)"')
+_TAG_RE = re.compile(r"<[^>]+>")
+_STYLE_RE = re.compile(r"<style[^>]*>(.*?)</style>", re.DOTALL)
+_HIGHLIGHT_SAMPLE = "```python\nprint('highlight')\n```\n"
+_BASE_STYLESHEET = """body { margin: 5%; text-align: justify; font-size: medium; }
+code { font-family: monospace; }
+h1, h2, h3, h4, h5, h6 { text-align: left; }
+img { max-width: 100%; }
+figure { margin: 1em 0; text-align: center; }
+nav#toc ol, nav#landmarks ol { padding: 0; margin-left: 1em; }
+nav#toc ol li, nav#landmarks ol li { list-style-type: none; margin: 0; padding: 0; }
+"""
+
+
+@dataclass(frozen=True)
+class ChapterDocument:
+    """One chapter's XHTML body and the headings that feed the navigation."""
+
+    name: str
+    body: str
+    headings: tuple[tuple[int, str, str], ...]
+
+    @property
+    def href(self) -> str:
+        return f"text/{self.name}.xhtml"
+
+    @property
+    def title(self) -> str:
+        return self.headings[0][2] if self.headings else self.name
+
+
+def _text(fragment: str) -> str:
+    return " ".join(html.unescape(_TAG_RE.sub("", fragment)).split())
+
+
+def _headings(body: str) -> tuple[tuple[int, str, str], ...]:
+    found = []
+    for match in _HEADING_RE.finditer(body):
+        identifier = _ID_RE.search(match.group(2))
+        if identifier:
+            found.append((int(match.group(1)), identifier.group(1), _text(match.group(3))))
+    return tuple(found)
+
+
+def _numbered_top_level_headings(ast: dict) -> int:
+    return sum(
+        1 for block in ast["blocks"]
+        if block.get("t") == "Header" and block["c"][0] == 1 and "unnumbered" not in block["c"][1][1]
+    )
+
+
+def render_chapters(
+    chapters: Sequence[Path],
+    converter: Converter,
+    *,
+    options: Mapping[str, object] | None = None,
+    ast_cache: AstCache | None = None,
+    cache: AstCache | None = None,
+) -> list[ChapterDocument]:
+    """Return each chapter's XHTML body, converting only cache misses."""
+
+    options = dict(options or {})
+    ast_cache = ast_cache or AstCache()
+    cache = cache or AstCache(DEFAULT_CACHE_DIR, version=ast_cache.version)
+    sources = [(Path(path).stem, non_latex_source(path)) for path in chapters]
+    sources = [(name, text) for name, text in sources if text.strip()]
+    asts = parse_sources(
+        [text for _, text in sources],
+        converter,
+        names=[name for name, _ in sources],
+        reader=reader_options(options),
+        cache=ast_cache,
+    )
+
+    numbered = bool(options.get("number-sections"))
+    writer = {key: options[key] for key in _FRAGMENT_KEYS if key in options}
+    writer.update({"from": "json", "standalone": False, "section-divs": False})
+
+    pending: list[tuple[str, str, dict]] = []
+    offset = 0
+    for (name, _), ast in zip(sources, asts):
+        if not ast["blocks"]:
+            continue
+        chapter_options = dict(writer)
+        if numbered:
+            chapter_options["number-offset"] = [offset]
+            offset += _numbered_top_level_headings(ast)
+        pending.append((name, json.dumps(ast), chapter_options))
+
+    keys = [cache.key(text, chapter_options) for _, text, chapter_options in pending]
+    bodies: list[str | None] = []
+    for key in keys:
+        entry = cache.get(key)
+        bodies.append(entry.get("body") if entry else None)
+
+    missing = [index for index, body in enumerate(bodies) if body is None]
+    cache.hits += len(pending) - len(missing)
+    cache.misses += len(missing)
+    requests = [ConversionRequest(pending[index][1], "html5", pending[index][2]) for index in missing]
+    for index, result in zip(missing, converter.convert_many(requests)):
+        if isinstance(result, PandocError):
+            raise PandocError(f"Could not convert {pending[index][0]}: {result}")
+        body = result.output.decode("utf-8")
+        cache.put(keys[index], {"body": body})
+        bodies[index] = body
+
+    return [
+        ChapterDocument(name, body, _headings(body))
+        for (name, _, _), body in zip(pending, bodies)
+        if body is not None
+    ]
+
+
+def _link_chapters(documents: Sequence[ChapterDocument]) -> list[ChapterDocument]:
+    """Point ``NN_name.md#id`` and cross-chapter ``#id`` links at chapter files."""
+
+    owners: dict[str, str] = {}
+    for document in documents:
+        for identifier in _ID_RE.findall(document.body):
+            owners.setdefault(identifier, f"{document.name}.xhtml")
+
+    linked = []
+    for document in documents:
+        local = set(_ID_RE.findall(document.body))
+
+        def rewrite(match: re.Match[str]) -> str:
+            target, fragment = match.group(1), match.group(2) or ""
+            if target:
+                return f'href="{Path(target).stem}.xhtml{fragment}"'
+            identifier = fragment[1:]
+            if identifier and identifier not in local and identifier in owners:
+                return f'href="{owners[identifier]}{fragment}"'
+            return match.group(0)
+
+        body = _HREF_RE.sub(rewrite, document.body)
+        body = _SRC_RE.sub(lambda match: f'src="../{match.group(1)}"', body)
+        linked.append(ChapterDocument(document.name, body, document.headings))
+    return linked
+
+
+def stylesheet(converter: Converter, options: Mapping[str, object], cache: AstCache) -> str:
+    """Return the EPUB stylesheet, including pandoc's syntax highlighting rules."""
+
+    style = options.get("highlight-style")
+    if not style:
+        return _BASE_STYLESHEET
+    request_options = {"highlight-style": style, "standalone": True, "metadata": {"title": "highlight"}}
+    key = cache.key(_HIGHLIGHT_SAMPLE, request_options)
+    entry = cache.get(key)
+    if entry is None:
+        result = converter.convert(ConversionRequest(_HIGHLIGHT_SAMPLE, "html5", request_options))
+        styles = "\n".join(_STYLE_RE.findall(result.output.decode("utf-8")))
+        # Keep only the highlighting rules pandoc appends to its HTML styles.
+        start = styles.find("code.sourceCode")
+        start = styles.rfind("\n", 0, start) + 1 if start >= 0 else len(styles)
+        entry = {"css": styles[start:].strip() + "\n"}
+        cache.put(key, entry)
+    return _BASE_STYLESHEET + entry["css"]
+
+
+def _xhtml(
+    title: str,
+    body: str,
+    *,
+    language: str,
+    body_type: str = "bodymatter",
+    stylesheet_href: str = "../styles/stylesheet.css",
+) -> str:
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        "<!DOCTYPE html>\n"
+        '<html xmlns="http://www.w3.org/1999/xhtml" xmlns:epub="http://www.idpf.org/2007/ops"'
+        f' xml:lang="{language}" lang="{language}">\n'
+        "<head>\n"
+        '<meta charset="utf-8" />\n'
+        f"<title>{html.escape(title)}</title>\n"
+        f'<link rel="stylesheet" type="text/css" href="{stylesheet_href}" />\n'
+        "</head>\n"
+        f'<body epub:type="{body_type}">\n{body}\n</body>\n'
+        "</html>\n"
+    )
+
+
+def _toc_list(nodes: list[tuple[str, str, list]]) -> str:
+    items = "".join(
+        f'<li><a href="{href}">{html.escape(text)}</a>{_toc_list(children) if children else ""}</li>\n'
+        for href, text, children in nodes
+    )
+    return f"<ol>\n{items}</ol>"
+
+
+def _nav(documents: Sequence[ChapterDocument], *, toc_depth: int, language: str, title: str) -> str:
+    root: list[tuple[str, str, list]] = []
+    stack: list[tuple[int, list]] = [(0, root)]
+    for document in documents:
+        for level, identifier, text in document.headings:
+            if level > toc_depth:
+                continue
+            while stack[-1][0] >= level:
+                stack.pop()
+            node = (f"{document.href}#{html.escape(identifier)}", text, [])
+            stack[-1][1].append(node)
+            stack.append((level, node[2]))
+
+    body = f'<nav epub:type="toc" id="toc">\n<h1>{html.escape(title)}</h1>\n{_toc_list(root)}\n</nav>'
+    return _xhtml(title, body, language=language, body_type="frontmatter", stylesheet_href="styles/stylesheet.css")
+
+
+def _media_paths(documents: Sequence[ChapterDocument]) -> list[str]:
+    paths: set[str] = set()
+    for document in documents:
+        for source in _SRC_RE.findall(document.body):
+            if source.startswith("../"):
+                paths.add(source[3:])
+    return sorted(paths)
+
+
+def _modified() -> str:
+    epoch = os.environ.get("SOURCE_DATE_EPOCH")
+    moment = (
+        datetime.datetime.fromtimestamp(int(epoch), datetime.timezone.utc)
+        if epoch
+        else datetime.datetime.now(datetime.timezone.utc)
+    )
+    return moment.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _opf(
+    metadata: Mapping[str, object],
+    documents: Sequence[ChapterDocument],
+    media: Sequence[str],
+    cover: str | None,
+    *,
+    language: str,
+) -> str:
+    title = str(metadata.get("title") or "Untitled")
+    identifier = uuid.uuid5(uuid.NAMESPACE_URL, f"urn:book:{title}")
+    meta = [
+        f'<dc:identifier id="book-id">urn:uuid:{identifier}</dc:identifier>',
+        f"<dc:title>{html.escape(title)}</dc:title>",
+        f"<dc:language>{html.escape(language)}</dc:language>",
+        f'<meta property="dcterms:modified">{_modified()}</meta>',
+    ]
+    if metadata.get("subtitle"):
+        meta.insert(2, f'<dc:title id="subtitle">{html.escape(str(metadata["subtitle"]))}</dc:title>')
+        meta.insert(3, '<meta refines="#subtitle" property="title-type">subtitle</meta>')
+    if metadata.get("author"):
+        meta.append(f"<dc:creator>{html.escape(str(metadata['author']))}</dc:creator>")
+    if metadata.get("date"):
+        meta.append(f"<dc:date>{html.escape(str(metadata['date']))}</dc:date>")
+
+    manifest = [
+        '<item id="nav" href="nav.xhtml" media-type="application/xhtml+xml" properties="nav" />',
+        '<item id="stylesheet" href="styles/stylesheet.css" media-type="text/css" />',
+    ]
+    spine = []
+    if cover:
+        meta.append('<meta name="cover" content="cover-image" />')
+        manifest.append('<item id="cover" href="text/cover.xhtml" media-type="application/xhtml+xml" />')
+        manifest.append(
+            f'<item id="cover-image" href="{html.escape(cover)}" media-type="{MEDIA_TYPES.get(Path(cover).suffix.lower(), "image/png")}" properties="cover-image" />'
+        )
+        spine.append('<itemref idref="cover" />')
+    spine.append('<itemref idref="nav" />')
+    for index, document in enumerate(documents, start=1):
+        manifest.append(f'<item id="ch{index:03d}" href="{document.href}" media-type="application/xhtml+xml" />')
+        spine.append(f'<itemref idref="ch{index:03d}" />')
+    for index, path in enumerate(media, start=1):
+        if path == cover:
+            continue
+        media_type = MEDIA_TYPES.get(Path(path).suffix.lower(), "application/octet-stream")
+        manifest.append(f'<item id="media{index:03d}" href="{html.escape(path)}" media-type="{media_type}" />')
+
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        f'<package xmlns="http://www.idpf.org/2007/opf" version="3.0" unique-identifier="book-id" xml:lang="{language}">\n'
+        '<metadata xmlns:dc="http://purl.org/dc/elements/1.1/">\n'
+        + "\n".join(meta)
+        + "\n</metadata>\n<manifest>\n"
+        + "\n".join(manifest)
+        + "\n</manifest>\n<spine>\n"
+        + "\n".join(spine)
+        + "\n</spine>\n</package>\n"
+    )
+
+
+CONTAINER_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<container version="1.0" xmlns="urn:oasis:names:tc:opendocument:xmlns:container">
+<rootfiles>
+<rootfile full-path="EPUB/content.opf" media-type="application/oebps-package+xml" />
+</rootfiles>
+</container>
+"""
+
+
+def write_epub(
+    output_path: Path,
+    documents: Sequence[ChapterDocument],
+    *,
+    metadata: Mapping[str, object],
+    resource_root: Path,
+    css: str = _BASE_STYLESHEET,
+    cover_image: Path | None = None,
+    toc_depth: int = 3,
+) -> None:
+    """Write the EPUB package for ``documents`` to ``output_path`` atomically."""
+
+    language = str(metadata.get("lang") or metadata.get("language") or "en-GB")
+    documents = _link_chapters(documents)
+    media = _media_paths(documents)
+    cover = None
+    if cover_image is not None and cover_image.is_file():
+        try:
+            cover = cover_image.resolve().relative_to(resource_root.resolve()).as_posix()
+        except ValueError:
+            cover = f"images/{cover_image.name}"
+        media = sorted({*media, cover})
+    media_sources = {path: resource_root / path for path in media}
+    if cover is not None:
+        media_sources[cover] = cover_image
+    missing = [path for path, source in media_sources.items() if not source.is_file()]
+    if missing:
+        raise FileNotFoundError(f"Images referenced by the manuscript are missing: {', '.join(missing)}")
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile(dir=output_path.parent, suffix=".epub", delete=False) as handle:
+        temporary = Path(handle.name)
+    try:
+        with zipfile.ZipFile(temporary, "w", zipfile.ZIP_DEFLATED) as archive:
+            # The mimetype entry must come first and stay uncompressed.
+            archive.writestr(zipfile.ZipInfo("mimetype"), "application/epub+zip", zipfile.ZIP_STORED)
+            archive.writestr("META-INF/container.xml", CONTAINER_XML)
+            archive.writestr("EPUB/content.opf", _opf(metadata, documents, media, cover, language=language))
+            archive.writestr(
+                "EPUB/nav.xhtml",
+                _nav(documents, toc_depth=toc_depth, language=language, title=str(metadata.get("title") or "Contents")),
+            )
+            archive.writestr("EPUB/styles/stylesheet.css", css)
+            if cover is not None:
+                cover_body = f'<section epub:type="cover"><img src="../{html.escape(cover)}" alt="Cover" /></section>'
+                archive.writestr(
+                    "EPUB/text/cover.xhtml",
+                    _xhtml("Cover", cover_body, language=language, body_type="cover"),
+                )
+            for document in documents:
+                archive.writestr(f"EPUB/{document.href}", _xhtml(document.title, document.body, language=language))
+            for path, source in media_sources.items():
+                # Images are already compressed.
+                archive.write(source, f"EPUB/{path}", zipfile.ZIP_STORED)
+        os.replace(temporary, output_path)
+    except BaseException:
+        temporary.unlink(missing_ok=True)
+        raise
+
+
+def assemble_epub(
+    chapters: Sequence[Path],
+    output_path: Path,
+    converter: Converter,
+    *,
+    options: Mapping[str, object] | None = None,
+    resource_root: Path,
+    cover_image: Path | None = None,
+    ast_cache: AstCache | None = None,
+    cache: AstCache | None = None,
+) -> list[ChapterDocument]:
+    """Build an EPUB from ``chapters`` with per-chapter caching.
+
+    ``options`` use pandoc defaults-file keys; ``metadata``, ``number-sections``,
+    ``highlight-style`` and ``toc-depth`` are honoured.
+    """
+
+    options = dict(options or {})
+    ast_cache = ast_cache or AstCache()
+    cache = cache or AstCache(DEFAULT_CACHE_DIR, version=ast_cache.version)
+    documents = render_chapters(chapters, converter, options=options, ast_cache=ast_cache, cache=cache)
+    write_epub(
+        output_path,
+        documents,
+        metadata=dict(options.get("metadata") or {}),
+        resource_root=resource_root,
+        css=stylesheet(converter, options, cache),
+        cover_image=cover_image,
+        toc_depth=int(options.get("toc-depth") or 3),
+    )
+    return documents
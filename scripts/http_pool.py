@@ -0,0 +1,260 @@
+"""Pooled keep-alive HTTP client used by the source verifier.
+
+``urllib.request`` opens a fresh TCP (and TLS) connection for every request,
+which dominates the cost of checking hundreds of citations that point at a
+handful of hosts. :class:`PooledHttpClient` keeps idle HTTP/1.1 connections
+per scheme, host and port, shares one TLS context and resolves each host name
+once, so consecutive probes of the same host reuse an established connection.
+
+Proxies come from ``urllib.request.getproxies()`` (``HTTP_PROXY``,
+``HTTPS_PROXY`` and ``NO_PROXY``), as they did for ``urllib``: plain HTTP
+requests go to the proxy in absolute form and HTTPS requests are tunnelled
+through it with ``CONNECT``.
+"""
+
+from __future__ import annotations
+
+import base64
+import http.client
+import socket
+import ssl
+import threading
+import urllib.request
+from collections.abc import Mapping
+from dataclasses import dataclass
+from urllib.parse import unquote, urljoin, urlsplit
+
+REDIRECT_STATUSES = frozenset({301, 302, 303, 307, 308})
+MAX_REDIRECTS = 10
+# Bodies up to this size are drained so the connection can be reused; larger
+# bodies (servers that ignore Range) are abandoned and the connection closed.
+MAX_DRAIN_BYTES = 64 * 1024
+
+# (scheme, host, port, proxy URL or "")
+_PoolKey = tuple[str, str, int, str]
+
+
+@dataclass(frozen=True)
+class HttpResponse:
+    """Status line and final location of a completed request."""
+
+    status: int
+    reason: str
+    url: str
+
+
+class DnsCache:
+    """Resolve each ``(host, port)`` pair once and share the addresses."""
+
+    def __init__(self) -> None:
+        self.lookups = 0
+        self._lock = threading.Lock()
+        self._host_locks: dict[tuple[str, int], threading.Lock] = {}
+        self._addresses: dict[tuple[str, int], list[tuple]] = {}
+
+    def resolve(self, host: str, port: int) -> list[tuple]:
+        key = (host, port)
+        with self._lock:
+            host_lock = self._host_locks.setdefault(key, threading.Lock())
+        with host_lock:
+            if key not in self._addresses:
+                self.lookups += 1
+                infos = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+                self._addresses[key] = [(info[0], info[4]) for info in infos]
+            return self._addresses[key]
+
+    def connect(self, host: str, port: int, timeout: float) -> socket.socket:
+        """Open a TCP connection to the first reachable resolved address."""
+
+        error: OSError | None = None
+        for family, address in self.resolve(host, port):
+            sock = socket.socket(family, socket.SOCK_STREAM)
+            try:
+                sock.settimeout(timeout)
+                sock.connect(address)
+                return sock
+            except OSError as exc:
+                sock.close()
+                error = exc
+        raise error or OSError(f"No addresses found for {host}")
+
+
+class _HTTPConnection(http.client.HTTPConnection):
+    def __init__(self, host: str, port: int, *, timeout: float, dns: DnsCache) -> None:
+        super().__init__(host, port, timeout=timeout)
+        self._dns = dns
+
+    def connect(self) -> None:
+        self.sock = self._dns.connect(self.host, self.port, self.timeout)
+
+
+class _HTTPSConnection(http.client.HTTPSConnection):
+    def __init__(
+        self, host: str, port: int, *, timeout: float, dns: DnsCache, context: ssl.SSLContext
+    ) -> None:
+        super().__init__(host, port, timeout=timeout, context=context)
+        self._dns = dns
+
+    def connect(self) -> None:
+        sock = self._dns.connect(self.host, self.port, self.timeout)
+        self.sock = self._context.wrap_socket(sock, server_hostname=self.host)
+
+
+def _proxy_authorization(proxy: str) -> dict[str, str]:
+    parts = urlsplit(proxy)
+    if parts.username is None:
+        return {}
+    credentials = f"{unquote(parts.username)}:{unquote(parts.password or '')}"
+    return {"Proxy-Authorization": "Basic " + base64.b64encode(credentials.encode()).decode("ascii")}
+
+
+class PooledHttpClient:
+    """Thread-safe HTTP client that reuses connections per host.
+
+    ``proxies`` maps schemes to proxy URLs, plus an optional ``"no"`` entry,
+    as returned by ``urllib.request.getproxies()``; it defaults to the
+    environment.
+    """
+
+    def __init__(
+        self,
+        timeout: float = 10,
+        user_agent: str | None = None,
+        max_idle_per_host: int = 2,
+        dns: DnsCache | None = None,
+        context: ssl.SSLContext | None = None,
+        proxies: Mapping[str, str] | None = None,
+    ) -> None:
+        self.timeout = timeout
+        self.user_agent = user_agent
+        self.max_idle_per_host = max(1, max_idle_per_host)
+        self.dns = dns or DnsCache()
+        self.context = context or ssl.create_default_context()
+        self._environment_proxies = proxies is None
+        self.proxies = dict(urllib.request.getproxies() if proxies is None else proxies)
+        self.connections_opened = 0
+        self._lock = threading.Lock()
+        self._idle: dict[_PoolKey, list[http.client.HTTPConnection]] = {}
+
+    def request(
+        self, method: str, url: str, headers: Mapping[str, str] | None = None
+    ) -> HttpResponse:
+        """Send ``method`` to ``url``, following redirects, and return the final status."""
+
+        for _ in range(MAX_REDIRECTS + 1):
+            status, reason, location = self._send(method, url, headers or {})
+            if status not in REDIRECT_STATUSES or not location:
+                return HttpResponse(status, reason, url)
+            url = urljoin(url, location)
+            if status == 303 and method != "HEAD":
+                method = "GET"
+        raise http.client.HTTPException(f"Too many redirects for {url}")
+
+    def close(self) -> None:
+        """Close every idle connection."""
+
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for connection in connections:
+                connection.close()
+
+    def __enter__(self) -> "PooledHttpClient":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _send(
+        self, method: str, url: str, headers: Mapping[str, str]
+    ) -> tuple[int, str, str | None]:
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise ValueError(f"Unsupported URL: {url}")
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+        proxy = self._proxy_for(parts.scheme, parts.hostname)
+        key = (parts.scheme, parts.hostname, port, proxy)
+        target = parts.path or "/"
+        if parts.query:
+            target = f"{target}?{parts.query}"
+
+        request_headers = dict(headers)
+        if self.user_agent:
+            request_headers.setdefault("User-Agent", self.user_agent)
+        if proxy and parts.scheme == "http":
+            # Plain HTTP goes to the proxy with the absolute URL as target.
+            target = f"http://{parts.netloc}{target}"
+            request_headers.update(_proxy_authorization(proxy))
+
+        connection, reused = self._acquire(key)
+        try:
+            try:
+                connection.request(method, target, headers=request_headers)
+                response = connection.getresponse()
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                # The server dropped an idle keep-alive connection; retry once
+                # on a new one.
+                connection.close()
+                if not reused:
+                    raise
+                connection, _ = self._acquire(key, fresh=True)
+                connection.request(method, target, headers=request_headers)
+                response = connection.getresponse()
+
+            result = (response.status, response.reason, response.getheader("Location"))
+            drained = response.read(MAX_DRAIN_BYTES + 1)
+            reusable = not response.will_close and len(drained) <= MAX_DRAIN_BYTES
+            response.close()
+        except BaseException:
+            connection.close()
+            raise
+
+        if reusable:
+            self._release(key, connection)
+        else:
+            connection.close()
+        return result
+
+    def _proxy_for(self, scheme: str, host: str) -> str:
+        proxy = self.proxies.get(scheme)
+        if not proxy:
+            return ""
+        if self._environment_proxies:
+            bypass = urllib.request.proxy_bypass(host)
+        else:
+            bypass = urllib.request.proxy_bypass_environment(host, self.proxies)
+        if bypass:
+            return ""
+        return proxy if "://" in proxy else f"http://{proxy}"
+
+    def _acquire(self, key: _PoolKey, fresh: bool = False) -> tuple[http.client.HTTPConnection, bool]:
+        if not fresh:
+            with self._lock:
+                idle = self._idle.get(key)
+                if idle:
+                    return idle.pop(), True
+
+        scheme, host, port, proxy = key
+        with self._lock:
+            self.connections_opened += 1
+        if proxy:
+            proxy_parts = urlsplit(proxy)
+            proxy_host, proxy_port = proxy_parts.hostname, proxy_parts.port or 80
+            if scheme == "https":
+                connection = http.client.HTTPSConnection(
+                    proxy_host, proxy_port, timeout=self.timeout, context=self.context
+                )
+                connection.set_tunnel(host, port, headers=_proxy_authorization(proxy))
+                return connection, False
+            return http.client.HTTPConnection(proxy_host, proxy_port, timeout=self.timeout), False
+        if scheme == "https":
+            return _HTTPSConnection(host, port, timeout=self.timeout, dns=self.dns, context=self.context), False
+        return _HTTPConnection(host, port, timeout=self.timeout, dns=self.dns), False
+
+    def _release(self, key: _PoolKey, connection: http.client.HTTPConnection) -> None:
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_idle_per_host:
+                idle.append(connection)
+                return
+        connection.close()
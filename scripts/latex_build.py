@@ -0,0 +1,441 @@
+"""Compile the PDF incrementally from per-chapter LaTeX fragments.
+
+A whole-book ``pandoc --pdf-engine=xelatex`` run writes the entire book as
+LaTeX into a fresh temporary directory. xelatex then starts from an empty
+``.aux`` and ``.toc`` and needs two or three passes every time. When the
+Eisvogel template fails, everything is repeated with the default template.
+:func:`build_pdf` keeps that work in a reused build directory
+(``.cache/latex-build`` from ``docs/build_book.sh``):
+
+1. each chapter's AST is written as a LaTeX fragment. Fragments are cached by
+   AST, writer options and pandoc version, and stored as
+   ``chapters/<name>.tex``;
+2. ``book.tex`` is the template's preamble with one ``\\input`` per chapter;
+3. :func:`compile_pdf` runs xelatex in the build directory, so the ``.aux``,
+   ``.toc`` and ``.out`` files survive between builds. Like latexmk, it
+   reruns only while a pass changes one of them and reports which file
+   triggered the rerun. It records the digest of every input listed in the
+   ``-recorder`` file list, so an unchanged book skips xelatex entirely.
+
+A template that failed is remembered with the master it failed on; the next
+build of the same master goes straight to the fallback template.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:  # pragma: no cover - defensive guard for CLI execution
+    sys.path.insert(0, str(REPO_ROOT))
+
+from scripts.pandoc_server import ConversionRequest, PandocCli, PandocError  # noqa: E402
+
+MASTER_NAME = "book"
+STAMP_NAME = f"{MASTER_NAME}.fdb.json"
+CHAPTER_DIR = "chapters"
+ENGINES = ("xelatex", "lualatex", "pdflatex")
+# Files a pass writes and the next pass reads; a change means another pass.
+AUXILIARY_SUFFIXES = (".aux", ".toc", ".lof", ".lot", ".out")
+MAX_PASSES = 5
+# Keys of the defaults file that shape a chapter's LaTeX fragment.
+_FRAGMENT_KEYS = (
+    "top-level-division",
+    "number-sections",
+    "highlight-style",
+    "syntax-highlighting",
+    "listings",
+    "reference-location",
+    "wrap",
+    "columns",
+    "ascii",
+)
+# Keys that only concern the PDF engine, not the LaTeX pandoc writes.
+_ENGINE_KEYS = ("pdf-engine", "pdf-engine-opt", "pdf-engine-opts", "css")
+_BLOCK_TYPES = frozenset({
+    "Plain", "Para", "LineBlock", "CodeBlock", "RawBlock", "BlockQuote", "OrderedList", "BulletList",
+    "DefinitionList", "Header", "HorizontalRule", "Table", "Figure", "Div",
+})
+_INLINE_TYPES = frozenset({
+    "Str", "Emph", "Underline", "Strong", "Strikeout", "Superscript", "Subscript", "SmallCaps", "Quoted",
+    "Cite", "Code", "Space", "SoftBreak", "LineBreak", "Math", "RawInline", "Link", "Image", "Note", "Span",
+})
+_ATTR_POSITION = {"CodeBlock": 0, "Header": 1, "Table": 0, "Figure": 0, "Div": 0, "Code": 0, "Link": 0, "Image": 0, "Span": 0}
+
+
+class LatexError(RuntimeError):
+    """Raised when the LaTeX engine is missing or fails."""
+
+
+@dataclass(frozen=True)
+class LatexPass:
+    """One engine run and the auxiliary files it changed."""
+
+    number: int
+    changed: tuple[str, ...]
+
+
+def _digest(path: Path) -> str | None:
+    try:
+        return hashlib.sha256(path.read_bytes()).hexdigest()
+    except OSError:
+        return None
+
+
+def _write_if_changed(path: Path, text: str) -> bool:
+    """Write ``text`` unless ``path`` already holds it; return whether it was written."""
+
+    try:
+        if path.read_text(encoding="utf-8") == text:
+            return False
+    except OSError:
+        pass
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+    return True
+
+
+def render_fragments(
+    names: Sequence[str],
+    asts: Sequence[dict],
+    converter,
+    *,
+    options: Mapping[str, object],
+    cache,
+) -> list[str]:
+    """Return each chapter's LaTeX body, converting only cache misses.
+
+    ``asts`` must already carry book-wide unique heading identifiers (see
+    :func:`pandoc_ast.unique_identifiers`).
+    """
+
+    writer = {key: options[key] for key in _FRAGMENT_KEYS if key in options}
+    writer.update({"from": "json", "standalone": False})
+    texts = [json.dumps(ast) for ast in asts]
+    keys = [cache.key(text, {**writer, "to": "latex"}) for text in texts]
+
+    fragments: list[str | None] = []
+    for key in keys:
+        entry = cache.get(key)
+        fragments.append(entry.get("latex") if entry else None)
+
+    missing = [index for index, fragment in enumerate(fragments) if fragment is None]
+    cache.hits += len(keys) - len(missing)
+    cache.misses += len(missing)
+    requests = [ConversionRequest(texts[index], "latex", writer) for index in missing]
+    for index, result in zip(missing, converter.convert_many(requests)):
+        if isinstance(result, PandocError):
+            raise PandocError(f"Could not convert {names[index]} to LaTeX: {result}")
+        fragment = result.output.decode("utf-8")
+        cache.put(keys[index], {"latex": fragment})
+        fragments[index] = fragment
+
+    return [fragment for fragment in fragments if fragment is not None]
+
+
+def _scrub(node: object) -> object:
+    """Copy ``node`` with code and raw content reduced to placeholders."""
+
+    if isinstance(node, list):
+        return [_scrub(item) for item in node]
+    if not isinstance(node, dict):
+        return node
+    kind = node.get("t")
+    if kind in ("CodeBlock", "Code"):
+        return {"t": kind, "c": [node["c"][0], "x"]}
+    if kind in ("RawBlock", "RawInline"):
+        return {"t": kind, "c": [node["c"][0], ""]}
+    return {key: _scrub(value) for key, value in node.items()}
+
+
+def _feature_sample(asts: Sequence[dict]) -> list[dict]:
+    """Return one block per kind of element the chapters use.
+
+    The LaTeX writer only emits the template's table, graphics, strikeout
+    and highlighting preambles when the document contains such elements,
+    so the master carries a sample of them inside ``\\iffalse``.
+    """
+
+    sample: dict[tuple, dict] = {}
+
+    def visit(node: object) -> None:
+        if isinstance(node, list):
+            for item in node:
+                visit(item)
+            return
+        if not isinstance(node, dict):
+            return
+        kind = node.get("t")
+        if kind in _BLOCK_TYPES or kind in _INLINE_TYPES:
+            feature: tuple = (kind,)
+            if kind in _ATTR_POSITION:
+                _, classes, attributes = node["c"][_ATTR_POSITION[kind]]
+                feature = (kind, tuple(classes), tuple(value for name, value in attributes if name == "lang"))
+            if feature not in sample and kind not in ("RawBlock", "RawInline"):
+                element = _scrub(node)
+                sample[feature] = element if kind in _BLOCK_TYPES else {"t": "Plain", "c": [element]}
+        for value in node.values():
+            visit(value)
+
+    visit([ast.get("blocks", []) for ast in asts])
+    return list(sample.values())
+
+
+def master_document(names: Sequence[str], asts: Sequence[dict]) -> dict:
+    """Return the AST of ``book.tex``: every chapter's metadata and one ``\\input`` each."""
+
+    meta: dict = {}
+    for ast in asts:
+        meta.update(ast.get("meta", {}))
+    blocks = [{"t": "RawBlock", "c": ["latex", "\\iffalse"]}, *_feature_sample(asts), {"t": "RawBlock", "c": ["latex", "\\fi"]}]
+    blocks.extend({"t": "RawBlock", "c": ["latex", f"\\input{{{CHAPTER_DIR}/{name}.tex}}"]} for name in names)
+    return {"pandoc-api-version": asts[0]["pandoc-api-version"], "meta": meta, "blocks": blocks}
+
+
+def _template_digest(options: Mapping[str, object], resource_root: Path | None) -> str | None:
+    """Digest of the template file pandoc will use, when it is a file on disk."""
+
+    template = options.get("template")
+    if not template:
+        return None
+    name = str(template) if Path(str(template)).suffix else f"{template}.latex"
+    data_dirs = [Path(str(options["data-dir"]))] if options.get("data-dir") else []
+    data_dirs += [Path.home() / ".local" / "share" / "pandoc", Path.home() / ".pandoc"]
+    candidates = [Path(name)] if resource_root is None else [resource_root / name]
+    candidates += [data_dir / "templates" / name for data_dir in data_dirs]
+    for candidate in candidates:
+        if candidate.is_file():
+            return _digest(candidate)
+    return None
+
+
+def _master_options(options: Mapping[str, object]) -> dict[str, object]:
+    master = {key: value for key, value in options.items() if key not in _ENGINE_KEYS}
+    master.update({"from": "json", "standalone": True})
+    return master
+
+
+def _engine_command(options: Mapping[str, object]) -> list[str]:
+    engine = str(options.get("pdf-engine") or "xelatex")
+    if Path(engine).name not in ENGINES:
+        raise LatexError(f"Incremental PDF builds support {', '.join(ENGINES)}, not {engine}.")
+    extra = options.get("pdf-engine-opts") or options.get("pdf-engine-opt") or []
+    if isinstance(extra, str):
+        extra = [extra]
+    return [engine, *map(str, extra)]
+
+
+def _read_stamp(build_dir: Path) -> dict:
+    try:
+        return json.loads((build_dir / STAMP_NAME).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_stamp(build_dir: Path, stamp: Mapping[str, object]) -> None:
+    (build_dir / STAMP_NAME).write_text(json.dumps(stamp, indent=2, sort_keys=True), encoding="utf-8")
+
+
+def _auxiliary_digests(build_dir: Path) -> dict[str, str | None]:
+    return {f"{MASTER_NAME}{suffix}": _digest(build_dir / f"{MASTER_NAME}{suffix}") for suffix in AUXILIARY_SUFFIXES}
+
+
+def _clean_auxiliary(build_dir: Path) -> None:
+    for suffix in (*AUXILIARY_SUFFIXES, ".fls"):
+        (build_dir / f"{MASTER_NAME}{suffix}").unlink(missing_ok=True)
+    (build_dir / STAMP_NAME).unlink(missing_ok=True)
+
+
+def recorded_inputs(build_dir: Path, roots: Sequence[Path]) -> list[Path]:
+    """Files under ``roots`` that the last run read, from the ``-recorder`` list.
+
+    Files the run also wrote (the auxiliary files) are left out; so are TeX
+    distribution files, which only change with the installation.
+    """
+
+    try:
+        lines = (build_dir / f"{MASTER_NAME}.fls").read_text(encoding="utf-8", errors="replace").splitlines()
+    except OSError:
+        return []
+
+    cwd = build_dir
+    inputs: set[Path] = set()
+    outputs: set[Path] = set()
+    for line in lines:
+        kind, _, value = line.partition(" ")
+        if kind == "PWD":
+            cwd = Path(value)
+        elif kind in ("INPUT", "OUTPUT"):
+            path = (cwd / value).resolve()
+            (inputs if kind == "INPUT" else outputs).add(path)
+
+    resolved_roots = [root.resolve() for root in roots]
+    return sorted(
+        path for path in inputs - outputs
+        if path.is_file() and any(path.is_relative_to(root) for root in resolved_roots)
+    )
+
+
+def _up_to_date(build_dir: Path, stamp: Mapping[str, object], command: Sequence[str]) -> bool:
+    pdf = build_dir / f"{MASTER_NAME}.pdf"
+    if not stamp.get("inputs") or stamp.get("command") != list(command) or _digest(pdf) != stamp.get("pdf"):
+        return False
+    return all(_digest(Path(path)) == digest for path, digest in stamp["inputs"].items())
+
+
+def _failure(build_dir: Path, output: str) -> str:
+    try:
+        log = (build_dir / f"{MASTER_NAME}.log").read_text(encoding="utf-8", errors="replace").splitlines()
+    except OSError:
+        log = output.splitlines()
+    errors = [line for line in log if line.startswith("!") or ".tex:" in line]
+    return "\n".join(errors[:5] or log[-10:])
+
+
+def compile_pdf(
+    build_dir: Path,
+    *,
+    command: Sequence[str] = ("xelatex",),
+    resource_root: Path | None = None,
+    max_passes: int = MAX_PASSES,
+) -> list[LatexPass]:
+    """Compile ``book.tex`` in ``build_dir``, rerunning until the auxiliary files settle.
+
+    Returns the passes that ran; none when every recorded input is unchanged
+    since the last successful build.
+    """
+
+    build_dir = build_dir.resolve()
+    stamp = _read_stamp(build_dir)
+    if _up_to_date(build_dir, stamp, command):
+        return []
+
+    engine = shutil.which(command[0])
+    if not engine:
+        raise LatexError(f"{command[0]} is required for PDF builds but was not found in PATH.")
+
+    env = dict(os.environ)
+    if resource_root is not None:
+        # Images and include-before graphics resolve against the manuscript;
+        # the trailing separator keeps the TeX distribution's own paths.
+        env["TEXINPUTS"] = f"{resource_root.resolve()}{os.pathsep}{env.get('TEXINPUTS', '')}"
+
+    passes: list[LatexPass] = []
+    while True:
+        before = _auxiliary_digests(build_dir)
+        result = subprocess.run(
+            [engine, *command[1:], "-interaction=nonstopmode", "-halt-on-error", "-file-line-error",
+             "-recorder", f"{MASTER_NAME}.tex"],
+            cwd=build_dir,
+            env=env,
+            capture_output=True,
+            text=True,
+            errors="replace",
+            check=False,
+        )
+        if result.returncode != 0:
+            message = _failure(build_dir, result.stdout)
+            # A failed pass can leave half-written auxiliary files behind.
+            _clean_auxiliary(build_dir)
+            raise LatexError(f"{Path(command[0]).name} failed on pass {len(passes) + 1}:\n{message}")
+
+        after = _auxiliary_digests(build_dir)
+        changed = tuple(name for name in after if after[name] != before[name])
+        passes.append(LatexPass(len(passes) + 1, changed))
+        if not changed:
+            break
+        if len(passes) >= max_passes:
+            print(f"⚠️  {', '.join(changed)} still changing after {max_passes} passes; stopping")
+            break
+        print(f"🔁 Pass {len(passes)} changed {', '.join(changed)}; rerunning {Path(command[0]).name}")
+
+    roots = [build_dir] + ([resource_root] if resource_root is not None else [])
+    inputs = {str(path): _digest(path) for path in recorded_inputs(build_dir, roots)}
+    _write_stamp(
+        build_dir,
+        {**stamp, "command": list(command), "inputs": inputs, "pdf": _digest(build_dir / f"{MASTER_NAME}.pdf")},
+    )
+    return passes
+
+
+def build_pdf(
+    names: Sequence[str],
+    asts: Sequence[dict],
+    converter,
+    *,
+    options: Mapping[str, object],
+    build_dir: Path,
+    cache,
+    cli: PandocCli | None = None,
+    resource_root: Path | None = None,
+    fallback_template: str | None = None,
+) -> bytes:
+    """Return the PDF of the chapter ``asts``, recompiling only what changed.
+
+    ``options`` are the PDF writer's defaults-file keys. Fragments go through
+    ``converter``; ``book.tex`` goes through the pandoc CLI so that templates
+    resolve from pandoc's data directory.
+    """
+
+    if not asts:
+        raise PandocError("No chapters to compile.")
+
+    build_dir.mkdir(parents=True, exist_ok=True)
+    chapter_dir = build_dir / CHAPTER_DIR
+    fragments = render_fragments(names, asts, converter, options=options, cache=cache)
+    for name, fragment in zip(names, fragments):
+        _write_if_changed(chapter_dir / f"{name}.tex", fragment)
+    for stale in set(chapter_dir.glob("*.tex")) - {chapter_dir / f"{name}.tex" for name in names}:
+        stale.unlink()
+
+    command = _engine_command(options)
+    master = json.dumps(master_document(names, asts))
+    attempts = [_master_options(options)]
+    if fallback_template and options.get("template") != fallback_template:
+        attempts.append({**attempts[0], "template": fallback_template})
+
+    for attempt, master_options in enumerate(attempts, start=1):
+        template = master_options.get("template", "the default template")
+        key = cache.key(master, {**master_options, "template-digest": _template_digest(master_options, resource_root)})
+        last = attempt == len(attempts)
+        if not last and _read_stamp(build_dir).get("failed-master") == key:
+            print(f"⏭️  {template} failed on this book before; using the {fallback_template} template")
+            continue
+        try:
+            entry = cache.get(key)
+            if entry is None:
+                request = ConversionRequest(master, "latex", master_options, resource_root=resource_root)
+                entry = {"latex": (cli or PandocCli(workers=1)).convert(request).output.decode("utf-8")}
+                cache.put(key, entry)
+            _write_if_changed(build_dir / f"{MASTER_NAME}.tex", entry["latex"])
+            stamp = _read_stamp(build_dir)
+            if stamp.get("template", template) != template:
+                # Another template leaves macros in the .aux that this one may not define.
+                _clean_auxiliary(build_dir)
+                stamp = {key: value for key, value in stamp.items() if key == "failed-master"}
+            _write_stamp(build_dir, {**stamp, "template": template})
+            passes = compile_pdf(build_dir, command=command, resource_root=resource_root)
+        except (PandocError, LatexError) as exc:
+            if last:
+                raise
+            print(f"⚠️  PDF generation failed with {template}; retrying with the {fallback_template} template")
+            print(f"   {str(exc).splitlines()[0]}")
+            _clean_auxiliary(build_dir)
+            _write_stamp(build_dir, {"failed-master": key})
+            continue
+
+        if passes:
+            print(f"📄 {Path(command[0]).name} finished after {len(passes)} pass(es)")
+        else:
+            print(f"📄 PDF inputs unchanged; skipped {Path(command[0]).name}")
+        return (build_dir / f"{MASTER_NAME}.pdf").read_bytes()
+
+    raise PandocError("No PDF template to try.")  # pragma: no cover - attempts is never empty
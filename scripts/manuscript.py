@@ -0,0 +1,327 @@
+"""Parsed document model of manuscript chapters with a persistent cache.
+
+Generators, validators, audits and tests all need the same structure from a
+chapter: its title, headings, prose paragraphs, fenced code blocks, image
+references, ``[Source [N]]`` citations and the entries of its sources
+section. :func:`load_document` parses a chapter once into a
+:class:`ChapterDocument` and stores the result under
+``.cache/manuscript/<sha256>.json``. The key is the SHA-256 of the chapter
+bytes combined with this parser's source, so unchanged chapters are never
+re-parsed across runs and edits to the parser invalidate every entry.
+Within a process, documents are also memoized by path, modification time and
+size.
+
+Fenced code blocks are opaque: headings, images, citations and paragraphs are
+only collected from the prose around them.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_CACHE_DIR = REPO_ROOT / ".cache" / "manuscript"
+
+_FENCE_RE = re.compile(r"^\s{0,3}(`{3,}|~{3,})\s*([^\s`]*)")
+_HEADING_RE = re.compile(r"^(#{1,6})\s+(.*?)\s*$")
+_IMAGE_RE = re.compile(r"!\[(.*?)\]\((.*?)\)")
+_STANDARD_CITATION_RE = re.compile(r"\[Source \[(\d+)\]\]\(33_references\.md#source-(\d+)\)")
+_ANY_CITATION_RE = re.compile(r"\[Source \[")
+_SOURCES_START_RE = re.compile(r"^(##\s+)?Sources?(\s+and\s+[Rr]eferences)?:?\s*$", re.IGNORECASE)
+_SOURCES_END_RE = re.compile(r"^##\s+(?!.*[Ss]ources)")
+_SOURCE_ITEM_RE = re.compile(r"^[-*]\s+(.+)$")
+_NON_PARAGRAPH_RE = re.compile(r"^(?:[-*+]\s|\d+[.)]\s|>|\||!\[|<)")
+
+
+@dataclass(frozen=True)
+class Heading:
+    level: int
+    text: str
+    line: int
+
+
+@dataclass(frozen=True)
+class Paragraph:
+    """Consecutive prose lines, joined with single spaces."""
+
+    text: str
+    line: int
+
+
+@dataclass(frozen=True)
+class CodeBlock:
+    language: str
+    content: str
+    line: int
+
+
+@dataclass(frozen=True)
+class ImageRef:
+    alt: str
+    target: str
+    line: int
+    # True when the image opens its line, as chapter diagrams do.
+    standalone: bool
+
+
+@dataclass(frozen=True)
+class Citation:
+    """An inline ``[Source [N]]`` citation.
+
+    ``number`` and ``anchor`` are ``None`` when the citation does not follow
+    the ``[Source [N]](33_references.md#source-N)`` form; ``raw`` then holds
+    the whole offending line.
+    """
+
+    raw: str
+    line: int
+    number: int | None = None
+    anchor: int | None = None
+
+    @property
+    def well_formed(self) -> bool:
+        return self.number is not None and self.number == self.anchor
+
+
+@dataclass(frozen=True)
+class SourceEntry:
+    """A list item inside a ``Sources`` section."""
+
+    text: str
+    line: int
+
+
+@dataclass(frozen=True)
+class ChapterDocument:
+    path: Path
+    sha256: str
+    title: str | None
+    headings: tuple[Heading, ...]
+    paragraphs: tuple[Paragraph, ...]
+    code_blocks: tuple[CodeBlock, ...]
+    images: tuple[ImageRef, ...]
+    citations: tuple[Citation, ...]
+    sources: tuple[SourceEntry, ...]
+    # Every ``\w+`` token in the file, code included.
+    word_count: int
+    # Prose words, excluding code, headings, images and markdown syntax.
+    content_word_count: int
+    text: str = field(default="", repr=False, compare=False)
+
+    @property
+    def lines(self) -> list[str]:
+        return self.text.split("\n")
+
+    @property
+    def has_sources_section(self) -> bool:
+        """True when the chapter has the canonical ``## Sources`` heading."""
+        return any(heading.level == 2 and heading.text == "Sources" for heading in self.headings)
+
+    def section_headings(self, level: int = 2) -> list[str]:
+        return [heading.text for heading in self.headings if heading.level == level]
+
+
+def count_content_words(content: str) -> int:
+    """Count actual content words, excluding markdown formatting and code blocks."""
+    # Remove code blocks (both fenced and indented)
+    content_no_code = re.sub(r'```.*?```', '', content, flags=re.DOTALL)
+    content_no_code = re.sub(r'^ {4,}.*$', '', content_no_code, flags=re.MULTILINE)
+
+    # Remove inline code
+    content_no_code = re.sub(r'`[^`]*`', '', content_no_code)
+
+    # Remove headers (they are structural, not content)
+    content_no_code = re.sub(r'^#{1,6}\s+.*$', '', content_no_code, flags=re.MULTILINE)
+
+    # Remove image references
+    content_no_code = re.sub(r'!\[.*?\]\([^)]*\)', '', content_no_code)
+
+    # Remove links but keep link text
+    content_no_code = re.sub(r'\[([^\]]*)\]\([^)]*\)', r'\1', content_no_code)
+
+    # Remove markdown formatting characters
+    content_no_code = re.sub(r'[*_~`#\[\]()!-]', ' ', content_no_code)
+
+    return len(content_no_code.split())
+
+
+def parse_document(text: str, path: Path = Path("<memory>"), sha256: str = "") -> ChapterDocument:
+    """Build a :class:`ChapterDocument` from markdown ``text``."""
+    headings: list[Heading] = []
+    paragraphs: list[Paragraph] = []
+    code_blocks: list[CodeBlock] = []
+    images: list[ImageRef] = []
+    citations: list[Citation] = []
+    sources: list[SourceEntry] = []
+
+    paragraph: list[str] = []
+    paragraph_start = 0
+    fence: str | None = None
+    fence_language = ""
+    fence_start = 0
+    fence_lines: list[str] = []
+    in_sources = False
+
+    def flush_paragraph() -> None:
+        if paragraph:
+            paragraphs.append(Paragraph(" ".join(paragraph), paragraph_start))
+            paragraph.clear()
+
+    for line_no, line in enumerate(text.split("\n"), start=1):
+        stripped = line.strip()
+
+        if fence is not None:
+            if stripped.startswith(fence) and not stripped[len(fence):].strip():
+                code_blocks.append(CodeBlock(fence_language, "\n".join(fence_lines), fence_start))
+                fence = None
+            else:
+                fence_lines.append(line)
+            continue
+
+        fence_match = _FENCE_RE.match(line)
+        if fence_match:
+            flush_paragraph()
+            fence, fence_language, fence_start, fence_lines = fence_match.group(1), fence_match.group(2), line_no, []
+            continue
+
+        if _SOURCES_START_RE.match(line):
+            in_sources = True
+        elif in_sources and _SOURCES_END_RE.match(line):
+            in_sources = False
+        elif in_sources:
+            item = _SOURCE_ITEM_RE.match(line)
+            if item:
+                sources.append(SourceEntry(item.group(1).strip(), line_no))
+
+        heading = _HEADING_RE.match(line)
+        if heading:
+            flush_paragraph()
+            headings.append(Heading(len(heading.group(1)), heading.group(2), line_no))
+            continue
+
+        for image in _IMAGE_RE.finditer(line):
+            images.append(ImageRef(image.group(1), image.group(2), line_no, line.startswith("![")))
+
+        for citation in _STANDARD_CITATION_RE.finditer(line):
+            citations.append(Citation(citation.group(0), line_no, int(citation.group(1)), int(citation.group(2))))
+        if _ANY_CITATION_RE.search(_STANDARD_CITATION_RE.sub("", line)):
+            citations.append(Citation(stripped, line_no))
+
+        if not stripped or _NON_PARAGRAPH_RE.match(stripped):
+            flush_paragraph()
+            continue
+        if not paragraph:
+            paragraph_start = line_no
+        paragraph.append(stripped)
+
+    flush_paragraph()
+    if fence is not None:
+        code_blocks.append(CodeBlock(fence_language, "\n".join(fence_lines), fence_start))
+
+    title = next((heading.text for heading in headings if heading.level == 1), None)
+    return ChapterDocument(
+        path=path,
+        sha256=sha256,
+        title=title,
+        headings=tuple(headings),
+        paragraphs=tuple(paragraphs),
+        code_blocks=tuple(code_blocks),
+        images=tuple(images),
+        citations=tuple(citations),
+        sources=tuple(sources),
+        word_count=len(re.findall(r"\w+", text)),
+        content_word_count=count_content_words(text),
+        text=text,
+    )
+
+
+_PARSER_DIGEST = hashlib.sha256(Path(__file__).read_bytes()).hexdigest()[:16]
+
+_FIELD_TYPES = {
+    "headings": Heading,
+    "paragraphs": Paragraph,
+    "code_blocks": CodeBlock,
+    "images": ImageRef,
+    "citations": Citation,
+    "sources": SourceEntry,
+}
+
+
+def _to_json(document: ChapterDocument) -> dict:
+    record = asdict(document)
+    record.pop("text")
+    record["path"] = str(document.path)
+    record["parser"] = _PARSER_DIGEST
+    return record
+
+
+def _from_json(record: dict, path: Path, text: str) -> ChapterDocument:
+    values = {name: record[name] for name in ("sha256", "title", "word_count", "content_word_count")}
+    for name, item_type in _FIELD_TYPES.items():
+        values[name] = tuple(item_type(**item) for item in record[name])
+    return ChapterDocument(path=path, text=text, **values)
+
+
+_memo_lock = threading.Lock()
+_memo: dict[Path, tuple[tuple[int, int], ChapterDocument]] = {}
+
+
+def load_document(path: Path, cache_dir: Path | None = DEFAULT_CACHE_DIR) -> ChapterDocument:
+    """Return the parsed document for ``path``, reusing cached parses.
+
+    Pass ``cache_dir=None`` to skip the on-disk cache.
+    """
+    path = Path(path)
+    stat = os.stat(path)
+    signature = (stat.st_mtime_ns, stat.st_size)
+    key = path.resolve()
+    with _memo_lock:
+        cached = _memo.get(key)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    data = path.read_bytes()
+    text = data.decode("utf-8")
+    sha256 = hashlib.sha256(data).hexdigest()
+    document = None
+    entry = cache_dir / f"{sha256}.json" if cache_dir is not None else None
+
+    if entry is not None:
+        try:
+            record = json.loads(entry.read_text(encoding="utf-8"))
+            if record.get("parser") == _PARSER_DIGEST:
+                document = _from_json(record, path, text)
+        except (OSError, ValueError, KeyError, TypeError):
+            document = None
+
+    if document is None:
+        document = parse_document(text, path, sha256)
+        if entry is not None:
+            _write_entry(entry, _to_json(document))
+
+    with _memo_lock:
+        _memo[key] = (signature, document)
+    return document
+
+
+def _write_entry(entry: Path, record: dict) -> None:
+    try:
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile("w", dir=entry.parent, delete=False, encoding="utf-8") as handle:
+            json.dump(record, handle)
+            temporary = Path(handle.name)
+        os.replace(temporary, entry)
+    except OSError:
+        # The cache only saves work; a read-only checkout still parses.
+        pass
+
+
+def load_documents(paths, cache_dir: Path | None = DEFAULT_CACHE_DIR) -> list[ChapterDocument]:
+    return [load_document(path, cache_dir) for path in paths]
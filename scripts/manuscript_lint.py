@@ -0,0 +1,704 @@
+#!/usr/bin/env python3
+"""Single-pass lint engine for the manuscript and its diagrams.
+
+Every file under ``docs/`` is read and tokenized once, and the resulting
+:class:`SourceFile` is handed to each registered :class:`Rule` that applies
+to it. Files are processed in parallel, and all findings share one report
+format that can be written as text, JSON or SARIF. The heading, figure
+caption, diagram branding, numbering and reference audit scripts are rules
+here; their original command lines remain as thin wrappers.
+
+Usage:
+    python3 scripts/manuscript_lint.py                         # All rules, text report
+    python3 scripts/manuscript_lint.py --rule heading-capitalization
+    python3 scripts/manuscript_lint.py --format sarif --output lint.sarif
+    python3 scripts/manuscript_lint.py docs/04_adr.md          # Selected files only
+    python3 scripts/manuscript_lint.py --changed-since origin/main
+
+Exit codes:
+  0 - No error-level findings
+  1 - One or more error-level findings
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import sys
+from collections import defaultdict
+from collections.abc import Iterable, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from functools import cached_property
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from change_scope import resolve_change_scope  # noqa: E402
+from manuscript import ChapterDocument, load_document  # noqa: E402
+from navigation import get_book_build_files  # noqa: E402
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+CORPUS_SUFFIXES = (".md", ".mmd")
+# Rule name of the findings reported for files that cannot be read.
+READ_ERROR = "read-error"
+
+
+@dataclass(frozen=True)
+class Finding:
+    rule: str
+    path: str
+    line: int | None
+    message: str
+    severity: str = "error"
+
+
+@dataclass(frozen=True)
+class Line:
+    number: int
+    text: str
+    # Inside a ``` or ~~~ fence; fence lines themselves are marked too.
+    in_code: bool
+
+
+class SourceFile:
+    """A corpus file read and tokenized once for every rule."""
+
+    def __init__(self, path: Path, root: Path = REPO_ROOT) -> None:
+        self.path = path
+        self.rel_path = _relative(path, root)
+        self.text = path.read_text(encoding="utf-8")
+
+    @cached_property
+    def lines(self) -> list[Line]:
+        tokens: list[Line] = []
+        in_code = False
+        for number, raw in enumerate(self.text.split("\n"), start=1):
+            text = raw.rstrip()
+            if text.startswith("```") or text.startswith("~~~"):
+                in_code = not in_code
+                tokens.append(Line(number, text, True))
+                continue
+            tokens.append(Line(number, text, in_code))
+        return tokens
+
+    @property
+    def prose_lines(self) -> Iterable[Line]:
+        return (line for line in self.lines if not line.in_code)
+
+    @cached_property
+    def document(self) -> ChapterDocument:
+        return load_document(self.path)
+
+
+def _relative(path: Path, root: Path) -> str:
+    try:
+        return path.resolve().relative_to(root.resolve()).as_posix()
+    except ValueError:
+        return path.as_posix()
+
+
+class Rule:
+    """Base class for lint rules.
+
+    ``check`` runs once per applicable file, possibly in a worker process;
+    ``finish`` runs once in the main process with every applicable path in
+    the corpus and reports findings that span files.
+    """
+
+    name = ""
+    description = ""
+    severity = "error"
+
+    def applies_to(self, rel_path: str) -> bool:
+        return False
+
+    def check(self, source: SourceFile) -> Iterable[Finding]:
+        return ()
+
+    def finish(self, rel_paths: Sequence[str], root: Path) -> Iterable[Finding]:
+        return ()
+
+    def finding(self, path: str, line: int | None, message: str, severity: str | None = None) -> Finding:
+        return Finding(self.name, path, line, message, severity or self.severity)
+
+
+# ---------------------------------------------------------------------------
+# Rules
+# ---------------------------------------------------------------------------
+
+
+def is_heading_properly_capitalized(line: str) -> bool:
+    """Return False for a markdown heading whose first letter is lowercase."""
+    match = re.match(r'^(#+)\s+(.+)$', line)
+    if not match:
+        return True  # Not a heading
+
+    heading_text = match.group(2)
+
+    # Skip if heading starts with a special character, number, or backtick (code)
+    if heading_text and heading_text[0] in '`0123456789#@$%^&*()[]{}|\\/<>=+-_~':
+        return True
+
+    if heading_text and heading_text[0].isalpha():
+        return heading_text[0].isupper()
+
+    return True  # Non-alphabetic first character is acceptable
+
+
+class HeadingCapitalizationRule(Rule):
+    name = "heading-capitalization"
+    description = "Headings must start with an uppercase letter."
+
+    def applies_to(self, rel_path: str) -> bool:
+        return rel_path.startswith("docs/") and rel_path.endswith(".md")
+
+    def check(self, source: SourceFile) -> Iterable[Finding]:
+        for line in source.prose_lines:
+            if line.text.startswith("#") and not is_heading_properly_capitalized(line.text):
+                yield self.finding(source.rel_path, line.number, line.text)
+
+
+def is_figure_caption_properly_capitalized(line: str) -> bool:
+    """Return False for an italic ``*figure X.Y`` caption with a lowercase F."""
+    match = re.match(r'^\*([Ff]igure)\s+\d+\.\d+', line)
+    if not match:
+        return True  # Not a figure caption
+    return match.group(1)[0].isupper()
+
+
+class FigureCaptionRule(Rule):
+    name = "figure-caption"
+    description = "Figure captions must start with an uppercase 'Figure'."
+
+    def applies_to(self, rel_path: str) -> bool:
+        return rel_path.startswith("docs/") and rel_path.endswith(".md") and "archive" not in rel_path
+
+    def check(self, source: SourceFile) -> Iterable[Finding]:
+        for line in source.prose_lines:
+            if line.text.startswith("*") and "igure" in line.text:
+                if not is_figure_caption_properly_capitalized(line.text):
+                    yield self.finding(source.rel_path, line.number, line.text)
+
+
+class DiagramBrandingRule(Rule):
+    name = "diagram-branding"
+    description = "Mermaid diagrams must follow the Kvadrat brand guidelines."
+
+    # American to British spelling mappings
+    AMERICAN_SPELLINGS = {
+        'organization': 'organisation',
+        'organizations': 'organisations',
+        'organizational': 'organisational',
+        'optimize': 'optimise',
+        'optimized': 'optimised',
+        'optimizing': 'optimising',
+        'optimization': 'optimisation',
+        'optimizations': 'optimisations',
+        'optimizer': 'optimiser',
+        'color': 'colour',
+        'colors': 'colours',
+        'colored': 'coloured',
+        'colorize': 'colourise',
+        'center': 'centre',
+        'centered': 'centred',
+        'centers': 'centres',
+        'behavior': 'behaviour',
+        'behavioral': 'behavioural',
+        'behaviors': 'behaviours',
+        'digitization': 'digitisation',
+        'digitalization': 'digitalisation',
+        'containerization': 'containerisation',
+        'modernization': 'modernisation',
+        'standardization': 'standardisation',
+    }
+    _SPELLING_PATTERNS = [
+        (re.compile(r'\b' + re.escape(american) + r'\b', re.IGNORECASE), british)
+        for american, british in AMERICAN_SPELLINGS.items()
+    ]
+
+    # Emoji Unicode ranges to detect
+    EMOJI_PATTERN = re.compile(
+        r'[\U0001F300-\U0001F9FF]|'  # Misc Symbols and Pictographs
+        r'[\U0001F600-\U0001F64F]|'  # Emoticons
+        r'[\U0001F680-\U0001F6FF]|'  # Transport and Map
+        r'[\U00002600-\U000027BF]|'  # Misc symbols
+        r'[\U0001F1E0-\U0001F1FF]|'  # Flags
+        r'[\U00002700-\U000027BF]|'  # Dingbats
+        r'[\U0001F900-\U0001F9FF]|'  # Supplemental Symbols and Pictographs
+        r'[\U00002B50]|'             # Star
+        r'[\U00002764]|'             # Heart
+        r'[\U0001F3FB-\U0001F3FF]'   # Skin tones
+    )
+
+    VALID_CLASSES = ('kv-primary', 'kv-accent', 'kv-highlight', 'kv-muted', 'kv-pattern', 'kv-outline')
+    _CLASS_PATTERN = re.compile(r':::([a-zA-Z0-9_-]+)')
+
+    def applies_to(self, rel_path: str) -> bool:
+        return rel_path.endswith(".mmd") and "archive" not in rel_path
+
+    def check(self, source: SourceFile) -> Iterable[Finding]:
+        content = source.text
+        for check in (self.inline_theme, self.american_spelling, self.emojis, self.css_classes):
+            for line, message in check(content):
+                yield self.finding(source.rel_path, line, message)
+
+    def inline_theme(self, content: str) -> list[tuple[int, str]]:
+        """Detect inline theme configuration blocks."""
+        return [
+            (
+                number,
+                "Inline theme configuration detected. "
+                "Use central theme file (docs/mermaid-kvadrat-theme.json) instead.",
+            )
+            for number, line in enumerate(content.split('\n'), 1)
+            if '%%{init:' in line
+        ]
+
+    def american_spelling(self, content: str) -> list[tuple[int, str]]:
+        """Detect American English spellings."""
+        issues = []
+        for pattern, british in self._SPELLING_PATTERNS:
+            for match in pattern.finditer(content):
+                issues.append((
+                    _line_at(content, match.start()),
+                    f"American spelling '{match.group()}' detected. Use British spelling '{british}' instead.",
+                ))
+        return issues
+
+    def emojis(self, content: str) -> list[tuple[int, str]]:
+        """Detect emojis in content."""
+        issues = []
+        for number, line in enumerate(content.split('\n'), 1):
+            emojis_found = self.EMOJI_PATTERN.findall(line)
+            if emojis_found:
+                issues.append((
+                    number,
+                    f"Emoji detected: {' '.join(emojis_found)}. Remove emojis for professional brand compliance.",
+                ))
+        return issues
+
+    def css_classes(self, content: str) -> list[tuple[int, str]]:
+        """Verify proper CSS class usage."""
+        issues = []
+        for match in self._CLASS_PATTERN.finditer(content):
+            class_name = match.group(1)
+            if class_name.startswith('kv-') and class_name not in self.VALID_CLASSES:
+                issues.append((
+                    _line_at(content, match.start()),
+                    f"Invalid CSS class ':::{class_name}'. Valid classes: {', '.join(self.VALID_CLASSES)}",
+                ))
+        return issues
+
+
+def _line_at(content: str, offset: int) -> int:
+    return content.count('\n', 0, offset) + 1
+
+
+class DocNumberingRule(Rule):
+    name = "doc-numbering"
+    description = "Numbered chapter files must not have gaps or duplicates."
+
+    PATTERN = re.compile(r"^(?P<number>\d+)(?P<suffix>[a-z]*)_.*\.md$", re.IGNORECASE)
+
+    def applies_to(self, rel_path: str) -> bool:
+        directory, _, name = rel_path.rpartition("/")
+        return directory == "docs" and bool(self.PATTERN.match(name))
+
+    def finish(self, rel_paths: Sequence[str], root: Path) -> Iterable[Finding]:
+        numbered: dict[int, list[tuple[str, Path]]] = defaultdict(list)
+        for rel_path in rel_paths:
+            path = root / rel_path
+            match = self.PATTERN.match(path.name)
+            numbered[int(match.group("number"))].append((match.group("suffix").lower(), path))
+
+        for message in numbering_errors(numbered):
+            yield self.finding("docs", None, message)
+
+
+def find_numeric_gaps(sorted_numbers: list[int]) -> list[tuple[int, int]]:
+    gaps: list[tuple[int, int]] = []
+    for current, nxt in zip(sorted_numbers, sorted_numbers[1:]):
+        if nxt - current > 1:
+            gaps.append((current, nxt))
+    return gaps
+
+
+def find_numeric_duplicates(entries: dict[int, list[tuple[str, Path]]]) -> list[str]:
+    duplicates: list[str] = []
+    for number, suffixes in entries.items():
+        seen: dict[str, Path] = {}
+        for suffix, path in suffixes:
+            key = f"{number}{suffix}"
+            if key in seen:
+                duplicates.append(
+                    "Duplicate entry for "
+                    f"{key}: {seen[key].name} and {path.name}"
+                )
+            else:
+                seen[key] = path
+    return duplicates
+
+
+def check_suffix_sequences(number: int, suffix_entries: list[tuple[str, Path]]) -> list[str]:
+    errors: list[str] = []
+
+    base_present = any(suffix == "" for suffix, _ in suffix_entries)
+    letters = sorted({suffix for suffix, _ in suffix_entries if suffix})
+
+    if len(letters) != len([suffix for suffix, _ in suffix_entries if suffix]):
+        errors.append(f"Duplicate appendix suffix detected for {number:02d}")
+
+    if not letters:
+        return errors
+
+    expected_start = "a" if not base_present else letters[0]
+    expected_ord = ord(expected_start)
+
+    for letter in letters:
+        if ord(letter) != expected_ord:
+            expected_label = chr(expected_ord).upper()
+            errors.append(
+                "Missing appendix label for "
+                f"{number:02d}: expected suffix '{expected_label}' before '{letter.upper()}'"
+            )
+            expected_ord = ord(letter)
+        expected_ord += 1
+
+    return errors
+
+
+def numbering_errors(numbered: dict[int, list[tuple[str, Path]]]) -> list[str]:
+    """Return gap, duplicate and appendix-suffix errors for numbered chapters."""
+    errors = [
+        "Gap detected between numbered chapters: "
+        f"{previous_number:02d} is followed by {next_number:02d}."
+        for previous_number, next_number in find_numeric_gaps(sorted(numbered))
+    ]
+    errors.extend(find_numeric_duplicates(numbered))
+    for number, suffix_entries in numbered.items():
+        errors.extend(check_suffix_sequences(number, suffix_entries))
+    return errors
+
+
+# Non-standard variants that look like a references section but are wrong.
+_NON_STANDARD_HEADER_RE = re.compile(
+    r"(References?|Sources?\s+and\s+[Rr]eferences?|Sources?\s+and\s+[Ss]ources?)",
+    re.IGNORECASE,
+)
+
+# Anchors in 33_references.md — both HTML and Pandoc/Commonmark formats.
+# HTML:   <a id="source-N">
+# Pandoc span: [anything]{#source-N} — matched by looking for ]{#source-N}
+#   because the span text may contain nested brackets (e.g. [**Source [1]:**])
+_ANCHOR_HTML_RE = re.compile(r'<a\s+id="source-(\d+)"')
+_ANCHOR_PANDOC_RE = re.compile(r"\]\{#source-(\d+)\}")
+
+
+def load_reference_anchors(references_path: Path) -> set[int]:
+    """Return the set of source numbers declared as anchors in references.md."""
+    if not references_path.exists():
+        return set()
+    text = references_path.read_text(encoding="utf-8")
+    html_ids = {int(m) for m in _ANCHOR_HTML_RE.findall(text)}
+    pandoc_ids = {int(m) for m in _ANCHOR_PANDOC_RE.findall(text)}
+    return html_ids | pandoc_ids
+
+
+def audit_document(document: ChapterDocument) -> dict:
+    """Return the reference-audit findings for one chapter.
+
+    ``missing_sources_section`` : bool
+    ``non_standard_headers``    : list of (line_number, header_text) tuples
+    ``malformed_citations``     : list of (line_number, raw_text, reason) tuples
+    ``cited_source_numbers``    : set of ints (numbers from standard citations)
+    """
+    findings: dict = {
+        "missing_sources_section": not document.has_sources_section,
+        "non_standard_headers": [],
+        "malformed_citations": [],
+        "cited_source_numbers": set(),
+    }
+
+    for heading in document.headings:
+        if heading.level <= 3 and _NON_STANDARD_HEADER_RE.fullmatch(heading.text):
+            findings["non_standard_headers"].append((heading.line, f"{'#' * heading.level} {heading.text}"))
+
+    for citation in document.citations:
+        if citation.well_formed:
+            findings["cited_source_numbers"].add(citation.number)
+        elif citation.number is not None:
+            # Both numbers should match; if they differ, flag as malformed.
+            findings["malformed_citations"].append(
+                (citation.line, citation.raw, "Citation text number and anchor number do not match")
+            )
+        else:
+            findings["malformed_citations"].append(
+                (citation.line, citation.raw, "Citation does not match [Source [N]](33_references.md#source-N)")
+            )
+
+    return findings
+
+
+class ReferenceAuditRule(Rule):
+    name = "reference-audit"
+    description = "Canonical chapters must cite sources as [Source [N]](33_references.md#source-N)."
+    severity = "warning"
+
+    REFERENCES_PATH = "docs/33_references.md"
+
+    @cached_property
+    def chapters(self) -> frozenset[str]:
+        """Canonical chapters, without part introductions and the references file."""
+        return frozenset(
+            f"docs/{name}"
+            for name in get_book_build_files()
+            if not Path(name).stem.startswith("part_") and Path(name).stem != "33_references"
+        )
+
+    def applies_to(self, rel_path: str) -> bool:
+        return rel_path in self.chapters
+
+    def check(self, source: SourceFile) -> Iterable[Finding]:
+        audit = audit_document(source.document)
+        if audit["missing_sources_section"]:
+            yield self.finding(source.rel_path, None, "Missing '## Sources' section")
+        for line, header in audit["non_standard_headers"]:
+            yield self.finding(source.rel_path, line, f"Non-standard references header: {header}")
+        for line, raw, reason in audit["malformed_citations"]:
+            yield self.finding(source.rel_path, line, f"{reason}: {raw}")
+
+    def finish(self, rel_paths: Sequence[str], root: Path) -> Iterable[Finding]:
+        # Documents come from the on-disk parse cache the workers just filled.
+        cited: dict[int, tuple[str, int]] = {}
+        for rel_path in rel_paths:
+            for citation in load_document(root / rel_path).citations:
+                if citation.well_formed:
+                    cited.setdefault(citation.number, (rel_path, citation.line))
+
+        defined = load_reference_anchors(root / self.REFERENCES_PATH)
+        for number in sorted(set(cited) - defined):
+            path, line = cited[number]
+            yield self.finding(path, line, f"Source {number} is cited but has no anchor in 33_references.md")
+        for number in sorted(defined - set(cited)):
+            yield self.finding(self.REFERENCES_PATH, None, f"Source {number} is never cited", "note")
+
+
+RULES: dict[str, type[Rule]] = {
+    rule.name: rule
+    for rule in (
+        HeadingCapitalizationRule,
+        FigureCaptionRule,
+        DiagramBrandingRule,
+        DocNumberingRule,
+        ReferenceAuditRule,
+    )
+}
+
+
+def register(rule: type[Rule]) -> type[Rule]:
+    """Add a rule class to the default rule set; usable as a decorator."""
+    RULES[rule.name] = rule
+    return rule
+
+
+# ---------------------------------------------------------------------------
+# Engine
+# ---------------------------------------------------------------------------
+
+
+def corpus_files(root: Path = REPO_ROOT) -> list[Path]:
+    """Return every lintable file under ``docs/`` in a stable order."""
+    docs = root / "docs"
+    return sorted(path for path in docs.rglob("*") if path.suffix in CORPUS_SUFFIXES and path.is_file())
+
+
+def select_files(rule_name: str, paths: Sequence[Path] | None = None, *, root: Path = REPO_ROOT) -> list[Path]:
+    """Return the files among ``paths`` (default: the corpus) that a rule checks."""
+    rule = RULES[rule_name]()
+    files = [Path(path) for path in paths] if paths is not None else corpus_files(root)
+    return [path for path in files if rule.applies_to(_relative(path, root))]
+
+
+_WORKER_RULES: dict[str, Rule] = {}
+
+
+def _init_worker(rule_names: Sequence[str]) -> None:
+    _WORKER_RULES.clear()
+    _WORKER_RULES.update((name, RULES[name]()) for name in rule_names)
+
+
+def _check_file(task: tuple[str, str, Sequence[str]]) -> list[Finding]:
+    path, root, rule_names = task
+    try:
+        source = SourceFile(Path(path), Path(root))
+    except (OSError, UnicodeDecodeError) as exc:
+        rel_path = _relative(Path(path), Path(root))
+        return [Finding(READ_ERROR, rel_path, None, f"Error reading {rel_path}: {exc}")]
+    findings: list[Finding] = []
+    for name in rule_names:
+        findings.extend(_WORKER_RULES[name].check(source))
+    return findings
+
+
+def run_rules(
+    rule_names: Sequence[str] | None = None,
+    paths: Sequence[Path] | None = None,
+    *,
+    root: Path = REPO_ROOT,
+    jobs: int | None = None,
+) -> list[Finding]:
+    """Lint ``paths`` (default: the whole corpus) with the named rules."""
+    rule_names = list(rule_names or RULES)
+    unknown = sorted(set(rule_names) - set(RULES))
+    if unknown:
+        raise ValueError(f"Unknown lint rules: {', '.join(unknown)}")
+
+    rules = {name: RULES[name]() for name in rule_names}
+    corpus = corpus_files(root)
+    files = [Path(path) for path in paths] if paths is not None else corpus
+
+    tasks: list[tuple[str, str, list[str]]] = []
+    for path in files:
+        names = [name for name, rule in rules.items() if rule.applies_to(_relative(path, root))]
+        if names:
+            tasks.append((str(path), str(root), names))
+
+    # Cross-file checks always see the whole corpus, even when only some
+    # files are linted.
+    applicable: dict[str, list[str]] = defaultdict(list)
+    for path in corpus:
+        rel_path = _relative(path, root)
+        for name, rule in rules.items():
+            if rule.applies_to(rel_path):
+                applicable[name].append(rel_path)
+
+    jobs = max(1, jobs or os.cpu_count() or 1)
+    findings: list[Finding] = []
+    if jobs == 1 or len(tasks) < 2:
+        _init_worker(rule_names)
+        for result in map(_check_file, tasks):
+            findings.extend(result)
+    else:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(rule_names,)) as pool:
+            for result in pool.map(_check_file, tasks, chunksize=8):
+                findings.extend(result)
+
+    for name, rule in rules.items():
+        findings.extend(rule.finish(applicable.get(name, []), root))
+
+    # Stable sort: within a file, findings stay in the order the rules emitted them.
+    return sorted(findings, key=lambda finding: finding.path)
+
+
+# ---------------------------------------------------------------------------
+# Reports
+# ---------------------------------------------------------------------------
+
+
+def format_text(findings: Sequence[Finding]) -> str:
+    lines = []
+    for finding in findings:
+        location = f"{finding.path}:{finding.line}" if finding.line else finding.path
+        lines.append(f"{location}: {finding.severity} [{finding.rule}] {finding.message}")
+
+    errors = sum(1 for finding in findings if finding.severity == "error")
+    files = len({finding.path for finding in findings})
+    if findings:
+        lines.append("")
+        lines.append(
+            f"{'❌' if errors else '⚠️'} {len(findings)} finding(s) in {files} file(s), {errors} error(s)"
+        )
+    else:
+        lines.append("✅ No lint findings.")
+    return "\n".join(lines) + "\n"
+
+
+def format_json(findings: Sequence[Finding]) -> str:
+    return json.dumps({"findings": [asdict(finding) for finding in findings]}, indent=2) + "\n"
+
+
+def format_sarif(findings: Sequence[Finding], rule_names: Sequence[str]) -> str:
+    levels = {"error": "error", "warning": "warning", "note": "note"}
+    results = []
+    for finding in findings:
+        location: dict = {"artifactLocation": {"uri": finding.path}}
+        if finding.line:
+            location["region"] = {"startLine": finding.line}
+        results.append({
+            "ruleId": finding.rule,
+            "level": levels.get(finding.severity, "warning"),
+            "message": {"text": finding.message},
+            "locations": [{"physicalLocation": location}],
+        })
+
+    rules = [
+        {"id": name, "shortDescription": {"text": RULES[name].description}}
+        for name in rule_names
+    ]
+    sarif = {
+        "$schema": "https://json.schemastore.org/sarif-2.1.0.json",
+        "version": "2.1.0",
+        "runs": [{
+            "tool": {"driver": {"name": "manuscript-lint", "rules": rules}},
+            "results": results,
+        }],
+    }
+    return json.dumps(sarif, indent=2) + "\n"
+
+
+def _parse_arguments(argv: Sequence[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Lint the manuscript and diagrams in a single pass.")
+    parser.add_argument("paths", nargs="*", type=Path, help="Files to lint (default: everything under docs/).")
+    parser.add_argument(
+        "--rule",
+        action="append",
+        choices=sorted(RULES),
+        help="Run only this rule; may be repeated (default: all rules).",
+    )
+    parser.add_argument("--format", choices=("text", "json", "sarif"), default="text", help="Report format.")
+    parser.add_argument("--output", type=Path, help="Write the report to this file instead of stdout.")
+    parser.add_argument("--jobs", type=int, default=None, help="Worker processes (default: CPU count).")
+    parser.add_argument(
+        "--changed-since",
+        metavar="REF",
+        help="Lint only files changed since REF and the files that depend on them "
+        "(always a full run on main).",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = _parse_arguments(argv)
+    rule_names = args.rule or list(RULES)
+    paths = args.paths or None
+    if args.changed_since:
+        scope = resolve_change_scope(args.changed_since)
+        print(
+            f"ℹ️  {'Full run' if scope.full else 'Incremental run'} "
+            f"(changed since {args.changed_since}: {scope.reason})",
+            file=sys.stderr,
+        )
+        paths = scope.filter(paths or corpus_files())
+    findings = run_rules(rule_names, paths, jobs=args.jobs)
+
+    if args.format == "json":
+        report = format_json(findings)
+    elif args.format == "sarif":
+        report = format_sarif(findings, rule_names)
+    else:
+        report = format_text(findings)
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(report, encoding="utf-8")
+        print(f"Report written to {args.output}")
+    else:
+        sys.stdout.write(report)
+
+    return 1 if any(finding.severity == "error" for finding in findings) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
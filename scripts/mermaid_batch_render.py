@@ -0,0 +1,500 @@
+#!/usr/bin/env python3
+"""Render many Mermaid diagrams through one long-lived headless browser.
+
+``mmdc`` launches a fresh Chromium for every diagram, which dominates the time
+spent validating or building ~100 diagrams. :class:`BatchRenderer` instead
+starts ``scripts/mermaid_batch_worker.mjs`` once, streams render jobs to it
+over stdin and yields per-job results as the worker reports them. When Node.js
+or the Mermaid CLI package cannot be located the renderer falls back to
+:class:`MmdcRenderer`, which keeps the historical one-process-per-diagram
+behaviour.
+
+Command line usage (as invoked by ``docs/build_book.sh``)::
+
+    python3 scripts/mermaid_batch_render.py --config-file docs/mermaid-kvadrat-theme.json \\
+        --pages 4 docs/images/*.mmd
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import queue
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, Sequence
+
+# Allow importing sibling modules when executed as a script.
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from mermaid_render_cache import (  # noqa: E402
+    DEFAULT_RENDER_OPTIONS,
+    RenderCache,
+    RenderManifest,
+    build_render_options,
+)
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+WORKER_SCRIPT = Path(__file__).resolve().parent / "mermaid_batch_worker.mjs"
+MERMAID_CLI_PACKAGE = Path("@mermaid-js") / "mermaid-cli"
+DEFAULT_PAGES = min(8, os.cpu_count() or 1)
+# Seconds the worker may go without reporting a result before it counts as hung.
+DEFAULT_JOB_TIMEOUT = 120.0
+
+
+class RendererUnavailable(RuntimeError):
+    """Raised when no Mermaid rendering backend can be started."""
+
+
+@dataclass(frozen=True)
+class RenderJob:
+    """A single Mermaid source to render into ``target``."""
+
+    source: Path
+    target: Path
+    theme: str = str(DEFAULT_RENDER_OPTIONS["theme"])
+    background: str = str(DEFAULT_RENDER_OPTIONS["background"])
+    width: int = int(DEFAULT_RENDER_OPTIONS["width"])
+    height: int = int(DEFAULT_RENDER_OPTIONS["height"])
+    config_file: Path | None = None
+
+    def to_payload(self, job_id: str) -> dict[str, object]:
+        config = self.config_file if self.config_file and self.config_file.is_file() else None
+        return {
+            "id": job_id,
+            "source": str(self.source.resolve()),
+            "target": str(self.target.resolve()),
+            "theme": self.theme,
+            "background": self.background,
+            "width": self.width,
+            "height": self.height,
+            "configFile": str(config.resolve()) if config else None,
+        }
+
+
+@dataclass(frozen=True)
+class RenderResult:
+    """Outcome of a :class:`RenderJob`."""
+
+    job: RenderJob
+    success: bool
+    detail: str = ""
+
+
+def _puppeteer_config_from_environment() -> Path | None:
+    configured = os.environ.get("PUPPETEER_CONFIG_FILE")
+    if configured and Path(configured).is_file():
+        return Path(configured)
+    return None
+
+
+def _validate_output(job: RenderJob) -> RenderResult:
+    if not job.target.is_file() or job.target.stat().st_size == 0:
+        return RenderResult(job, False, "Mermaid CLI did not produce output")
+    return RenderResult(job, True)
+
+
+def resolve_mmdc(root: Path = REPO_ROOT) -> Path:
+    """Locate the Mermaid CLI executable."""
+
+    local_mmdc = root / "node_modules" / ".bin" / "mmdc"
+    if local_mmdc.is_file():
+        return local_mmdc
+
+    fallback = shutil.which("mmdc")
+    if fallback:
+        return Path(fallback)
+
+    raise FileNotFoundError(
+        "Mermaid CLI (mmdc) is unavailable. Run 'npm ci' before executing this check."
+    )
+
+
+def resolve_module_root(root: Path = REPO_ROOT) -> Path:
+    """Return the ``node_modules`` directory that provides the Mermaid CLI package."""
+
+    local_modules = root / "node_modules"
+    if (local_modules / MERMAID_CLI_PACKAGE / "package.json").is_file():
+        return local_modules
+
+    npm = shutil.which("npm")
+    if npm:
+        result = subprocess.run(
+            [npm, "root", "-g"], check=False, capture_output=True, text=True
+        )
+        global_modules = Path(result.stdout.strip())
+        if result.returncode == 0 and (
+            global_modules / MERMAID_CLI_PACKAGE / "package.json"
+        ).is_file():
+            return global_modules
+
+    raise RendererUnavailable(
+        "The @mermaid-js/mermaid-cli package is not installed locally or globally."
+    )
+
+
+def mermaid_cli_version(root: Path = REPO_ROOT) -> str:
+    """Return the Mermaid CLI version used for render cache keys.
+
+    The installed package is preferred, then ``mmdc -V`` and finally the
+    version pinned in ``package.json`` so that cache lookups still work on
+    machines without Node.js.
+    """
+
+    try:
+        manifest = resolve_module_root(root) / MERMAID_CLI_PACKAGE / "package.json"
+        version = json.loads(manifest.read_text(encoding="utf-8")).get("version")
+        if version:
+            return str(version)
+    except (RendererUnavailable, OSError, json.JSONDecodeError):
+        pass
+
+    try:
+        result = subprocess.run(
+            [str(resolve_mmdc(root)), "-V"], check=False, capture_output=True, text=True
+        )
+        if result.returncode == 0 and result.stdout.strip():
+            return result.stdout.strip().splitlines()[0]
+    except (FileNotFoundError, OSError):
+        pass
+
+    try:
+        package = json.loads((root / "package.json").read_text(encoding="utf-8"))
+        pinned = package.get("devDependencies", {}).get("@mermaid-js/mermaid-cli")
+        if pinned:
+            return str(pinned).lstrip("^~=")
+    except (OSError, json.JSONDecodeError):
+        pass
+
+    return "unknown"
+
+
+class MmdcRenderer:
+    """Render each job with its own ``mmdc`` process."""
+
+    def __init__(self, mmdc_path: Path, *, puppeteer_config: Path | None = None) -> None:
+        self.mmdc_path = mmdc_path
+        self.puppeteer_config = puppeteer_config
+
+    def build_command(self, job: RenderJob) -> list[str]:
+        command = [
+            str(self.mmdc_path),
+            "-i",
+            str(job.source),
+            "-o",
+            str(job.target),
+            "-t",
+            job.theme,
+            "-b",
+            job.background,
+            "--width",
+            str(job.width),
+            "--height",
+            str(job.height),
+        ]
+
+        if job.config_file and job.config_file.is_file():
+            command.extend(["-c", str(job.config_file)])
+
+        if self.puppeteer_config:
+            command.extend(["--puppeteerConfigFile", str(self.puppeteer_config)])
+
+        return command
+
+    def render(self, jobs: Sequence[RenderJob]) -> Iterator[RenderResult]:
+        for job in jobs:
+            result = subprocess.run(
+                self.build_command(job),
+                check=False,
+                env=os.environ,
+                capture_output=True,
+                text=True,
+            )
+            if result.returncode != 0:
+                detail = (result.stderr or result.stdout or "").strip()
+                yield RenderResult(job, False, detail)
+                continue
+            yield _validate_output(job)
+
+    def close(self) -> None:
+        """Nothing to release; present for interface parity."""
+
+
+class BatchRenderer:
+    """Drive a persistent Node/Puppeteer worker that renders jobs concurrently."""
+
+    def __init__(
+        self,
+        *,
+        pages: int = DEFAULT_PAGES,
+        root: Path = REPO_ROOT,
+        node: str | None = None,
+        puppeteer_config: Path | None = None,
+        job_timeout: float = DEFAULT_JOB_TIMEOUT,
+    ) -> None:
+        node_path = node or shutil.which("node")
+        if not node_path:
+            raise RendererUnavailable("Node.js is required for batch Mermaid rendering.")
+
+        command = [
+            node_path,
+            str(WORKER_SCRIPT),
+            "--pages",
+            str(max(1, pages)),
+            "--module-root",
+            str(resolve_module_root(root)),
+        ]
+        if puppeteer_config:
+            command.extend(["--puppeteer-config", str(puppeteer_config)])
+
+        self.root = root
+        self.puppeteer_config = puppeteer_config
+        self.job_timeout = job_timeout
+        # Browser warnings go to a file: an undrained stderr pipe could fill up
+        # and block the worker.
+        self._stderr = tempfile.TemporaryFile("w+", encoding="utf-8")
+        self._process = subprocess.Popen(
+            command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=self._stderr,
+            text=True,
+            encoding="utf-8",
+            bufsize=1,
+        )
+        self._lines: queue.Queue[str | None] = queue.Queue()
+        self._reader = threading.Thread(target=self._read_stdout, daemon=True)
+        self._reader.start()
+        self._fallback: MmdcRenderer | None = None
+        self._next_id = 0
+
+    def _read_stdout(self) -> None:
+        assert self._process.stdout is not None
+        for line in self._process.stdout:
+            self._lines.put(line)
+        self._lines.put(None)
+
+    def _write_jobs(self, payloads: list[dict[str, object]]) -> None:
+        assert self._process.stdin is not None
+        try:
+            for payload in payloads:
+                self._process.stdin.write(json.dumps(payload) + "\n")
+            self._process.stdin.flush()
+        except BrokenPipeError:
+            pass
+
+    def render(self, jobs: Sequence[RenderJob]) -> Iterator[RenderResult]:
+        """Submit ``jobs`` and yield results in completion order.
+
+        When the worker reports nothing for ``job_timeout`` seconds it is
+        killed and the remaining jobs are rendered with :class:`MmdcRenderer`.
+        """
+
+        if self._fallback is not None:
+            yield from self._fallback.render(jobs)
+            return
+
+        pending: dict[str, RenderJob] = {}
+        payloads: list[dict[str, object]] = []
+        for job in jobs:
+            job_id = str(self._next_id)
+            self._next_id += 1
+            pending[job_id] = job
+            payloads.append(job.to_payload(job_id))
+
+        # Write from a helper thread so a full stdout pipe can never deadlock us.
+        writer = threading.Thread(target=self._write_jobs, args=(payloads,), daemon=True)
+        writer.start()
+
+        while pending:
+            try:
+                line = self._lines.get(timeout=self.job_timeout)
+            except queue.Empty:
+                yield from self._abandon_worker(list(pending.values()))
+                return
+            if line is None:
+                break
+            try:
+                message = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+
+            job = pending.pop(str(message.get("id")), None)
+            if job is None:
+                continue
+            if message.get("ok"):
+                yield _validate_output(job)
+            else:
+                yield RenderResult(job, False, str(message.get("error") or "").strip())
+
+        writer.join()
+        if pending:
+            detail = self._drain_stderr() or "Mermaid batch worker exited unexpectedly"
+            for job in pending.values():
+                yield RenderResult(job, False, detail)
+
+    def _abandon_worker(self, jobs: list[RenderJob]) -> Iterator[RenderResult]:
+        print(
+            f"⚠️  Mermaid batch worker reported nothing for {self.job_timeout:g}s; "
+            "stopping it and using mmdc per diagram."
+        )
+        self._process.kill()
+        self._process.wait()
+        try:
+            self._fallback = MmdcRenderer(resolve_mmdc(self.root), puppeteer_config=self.puppeteer_config)
+        except FileNotFoundError as exc:
+            for job in jobs:
+                yield RenderResult(job, False, f"Mermaid batch worker timed out; {exc}")
+            return
+        yield from self._fallback.render(jobs)
+
+    def _drain_stderr(self) -> str:
+        if self._process.poll() is None:
+            return ""
+        self._stderr.seek(0)
+        return self._stderr.read().strip()
+
+    def close(self) -> None:
+        """Close the job stream and wait for the browser to shut down."""
+
+        if self._process.stdin and not self._process.stdin.closed:
+            try:
+                self._process.stdin.close()
+            except BrokenPipeError:
+                pass
+        try:
+            self._process.wait(timeout=60)
+        except subprocess.TimeoutExpired:  # pragma: no cover - defensive cleanup
+            self._process.kill()
+            self._process.wait()
+        self._stderr.close()
+
+    def __enter__(self) -> "BatchRenderer":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+def create_renderer(
+    *,
+    batch: bool = True,
+    pages: int = DEFAULT_PAGES,
+    root: Path = REPO_ROOT,
+) -> BatchRenderer | MmdcRenderer:
+    """Return the fastest available renderer, falling back to per-file ``mmdc``."""
+
+    puppeteer_config = _puppeteer_config_from_environment()
+    if batch:
+        try:
+            return BatchRenderer(pages=pages, root=root, puppeteer_config=puppeteer_config)
+        except RendererUnavailable as exc:
+            print(f"⚠️  Batch Mermaid renderer unavailable ({exc}); using mmdc per diagram.")
+
+    try:
+        mmdc_path = resolve_mmdc(root)
+    except FileNotFoundError as exc:
+        raise RendererUnavailable(str(exc)) from exc
+    return MmdcRenderer(mmdc_path, puppeteer_config=puppeteer_config)
+
+
+def _parse_arguments(argv: Sequence[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Render Mermaid sources to PNG files next to each source."
+    )
+    parser.add_argument("sources", nargs="*", type=Path, help="Mermaid source files.")
+    parser.add_argument("--config-file", type=Path, help="Mermaid theme configuration.")
+    parser.add_argument("--theme", default=DEFAULT_RENDER_OPTIONS["theme"])
+    parser.add_argument("--background", default=DEFAULT_RENDER_OPTIONS["background"])
+    parser.add_argument("--width", type=int, default=DEFAULT_RENDER_OPTIONS["width"])
+    parser.add_argument("--height", type=int, default=DEFAULT_RENDER_OPTIONS["height"])
+    parser.add_argument(
+        "--pages",
+        type=int,
+        default=DEFAULT_PAGES,
+        help=f"Concurrent browser pages for batch rendering (default: {DEFAULT_PAGES}).",
+    )
+    parser.add_argument(
+        "--no-batch",
+        action="store_true",
+        help="Launch mmdc once per diagram instead of using the batch worker.",
+    )
+    parser.add_argument(
+        "--manifest",
+        type=Path,
+        help="Record successful renders in this Mermaid render cache manifest.",
+    )
+    parser.add_argument(
+        "--cli-version",
+        default="unknown",
+        help="Mermaid CLI version recorded alongside cache manifest entries.",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = _parse_arguments(argv)
+    sources = [source for source in args.sources if source.is_file()]
+    if not sources:
+        return 0
+
+    jobs = [
+        RenderJob(
+            source=source,
+            target=source.with_suffix(".png"),
+            theme=args.theme,
+            background=args.background,
+            width=args.width,
+            height=args.height,
+            config_file=args.config_file,
+        )
+        for source in sources
+    ]
+
+    try:
+        renderer = create_renderer(batch=not args.no_batch, pages=args.pages)
+    except RendererUnavailable as exc:
+        print(f"⚠️  Warning: {exc}")
+        return 1
+
+    rendered: list[Path] = []
+    try:
+        for result in renderer.render(jobs):
+            source = result.job.source
+            if result.success:
+                print(f"✅ Converted {source} to {result.job.target} with enhanced styling")
+                rendered.append(source)
+            else:
+                print(
+                    f"⚠️  Warning: Failed to convert {source}, skipping "
+                    f"(PDF generation will continue): {result.detail}"
+                )
+    finally:
+        renderer.close()
+
+    if args.manifest and rendered:
+        cache = RenderCache(
+            RenderManifest.load(args.manifest),
+            config_file=args.config_file,
+            options=build_render_options(
+                theme=args.theme,
+                background=args.background,
+                width=args.width,
+                height=args.height,
+            ),
+            cli_version=args.cli_version,
+        )
+        for source in rendered:
+            cache.record(source)
+        cache.manifest.save()
+
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover - exercised via CLI
+    raise SystemExit(main())
@@ -0,0 +1,188 @@
+#!/usr/bin/env node
+// Persistent Mermaid renderer used by scripts/mermaid_batch_render.py.
+//
+// A single headless browser is launched for the lifetime of the process and
+// jobs are rendered across a fixed number of concurrent pages. Jobs arrive on
+// stdin as JSON lines:
+//
+//   {"id": "0", "source": "/abs/diagram.mmd", "target": "/abs/diagram.png",
+//    "theme": "default", "background": "transparent", "width": 1400,
+//    "height": 900, "configFile": "/abs/mermaid-kvadrat-theme.json"}
+//
+// and one JSON line per job is written to stdout as soon as it finishes:
+//
+//   {"id": "0", "ok": true}
+//   {"id": "1", "ok": false, "error": "Parse error on line 3 ..."}
+//
+// The process exits once stdin is closed and every queued job has completed.
+
+import fs from "node:fs/promises";
+import { createRequire } from "node:module";
+import path from "node:path";
+import readline from "node:readline";
+import { pathToFileURL } from "node:url";
+
+function parseArguments(argv) {
+  const options = { pages: 4, moduleRoot: null, puppeteerConfig: null };
+  for (let index = 0; index < argv.length; index += 1) {
+    const flag = argv[index];
+    const value = argv[index + 1];
+    if (flag === "--pages") {
+      options.pages = Math.max(1, Number.parseInt(value, 10) || 1);
+      index += 1;
+    } else if (flag === "--module-root") {
+      options.moduleRoot = value;
+      index += 1;
+    } else if (flag === "--puppeteer-config") {
+      options.puppeteerConfig = value;
+      index += 1;
+    }
+  }
+  return options;
+}
+
+async function importMermaidCli(moduleRoot) {
+  if (!moduleRoot) {
+    return import("@mermaid-js/mermaid-cli");
+  }
+  const packageDir = path.join(moduleRoot, "@mermaid-js", "mermaid-cli");
+  const manifest = JSON.parse(
+    await fs.readFile(path.join(packageDir, "package.json"), "utf-8"),
+  );
+  const exported = manifest.exports;
+  const entry =
+    (typeof exported === "string" && exported) ||
+    (exported && exported["."] && (exported["."].import || exported["."].default || exported["."])) ||
+    manifest.module ||
+    manifest.main ||
+    "src/index.js";
+  return import(pathToFileURL(path.join(packageDir, entry)).href);
+}
+
+async function importPuppeteer(moduleRoot) {
+  const anchor = moduleRoot
+    ? path.join(moduleRoot, "@mermaid-js", "mermaid-cli", "package.json")
+    : import.meta.url;
+  const require = createRequire(anchor);
+  const module = await import(pathToFileURL(require.resolve("puppeteer")).href);
+  return module.default ?? module;
+}
+
+async function loadJson(filePath) {
+  if (!filePath) {
+    return {};
+  }
+  return JSON.parse(await fs.readFile(filePath, "utf-8"));
+}
+
+function emit(payload) {
+  process.stdout.write(`${JSON.stringify(payload)}\n`);
+}
+
+function createJobQueue(input) {
+  const pending = [];
+  const waiters = [];
+  let closed = false;
+
+  const lines = readline.createInterface({ input, crlfDelay: Infinity });
+  lines.on("line", (line) => {
+    if (!line.trim()) {
+      return;
+    }
+    let job;
+    try {
+      job = JSON.parse(line);
+    } catch (error) {
+      emit({ id: null, ok: false, error: `Invalid job: ${error.message}` });
+      return;
+    }
+    const waiter = waiters.shift();
+    if (waiter) {
+      waiter(job);
+    } else {
+      pending.push(job);
+    }
+  });
+  lines.on("close", () => {
+    closed = true;
+    for (const waiter of waiters.splice(0)) {
+      waiter(null);
+    }
+  });
+
+  return function nextJob() {
+    if (pending.length > 0) {
+      return Promise.resolve(pending.shift());
+    }
+    if (closed) {
+      return Promise.resolve(null);
+    }
+    return new Promise((resolve) => waiters.push(resolve));
+  };
+}
+
+async function main() {
+  const options = parseArguments(process.argv.slice(2));
+  const nextJob = createJobQueue(process.stdin);
+  const configCache = new Map();
+
+  let browser = null;
+  let renderMermaid = null;
+  let startupError = null;
+
+  try {
+    ({ renderMermaid } = await importMermaidCli(options.moduleRoot));
+    const puppeteer = await importPuppeteer(options.moduleRoot);
+    const launchOptions = await loadJson(options.puppeteerConfig);
+    browser = await puppeteer.launch({ headless: "new", ...launchOptions });
+  } catch (error) {
+    startupError = error;
+  }
+
+  async function mermaidConfigFor(job) {
+    const key = `${job.theme}\u0000${job.configFile || ""}`;
+    if (!configCache.has(key)) {
+      const fileConfig = await loadJson(job.configFile);
+      configCache.set(key, { theme: job.theme || "default", ...fileConfig });
+    }
+    return configCache.get(key);
+  }
+
+  async function render(job) {
+    if (startupError) {
+      throw startupError;
+    }
+    const definition = await fs.readFile(job.source, "utf-8");
+    const { data } = await renderMermaid(browser, definition, "png", {
+      viewport: { width: job.width, height: job.height, deviceScaleFactor: 1 },
+      backgroundColor: job.background || "white",
+      mermaidConfig: await mermaidConfigFor(job),
+    });
+    await fs.mkdir(path.dirname(job.target), { recursive: true });
+    await fs.writeFile(job.target, data);
+  }
+
+  async function runner() {
+    for (let job = await nextJob(); job !== null; job = await nextJob()) {
+      try {
+        await render(job);
+        emit({ id: job.id, ok: true });
+      } catch (error) {
+        emit({ id: job.id, ok: false, error: String(error?.message ?? error) });
+      }
+    }
+  }
+
+  try {
+    await Promise.all(Array.from({ length: options.pages }, runner));
+  } finally {
+    if (browser) {
+      await browser.close();
+    }
+  }
+}
+
+main().catch((error) => {
+  process.stderr.write(`${error?.stack ?? error}\n`);
+  process.exit(1);
+});
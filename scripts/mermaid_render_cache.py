@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+"""Content-addressed render cache for Mermaid diagrams.
+
+Each rendered PNG is recorded in a manifest stored next to the diagrams
+(``docs/images/mermaid-render-manifest.json``). An entry is keyed by a digest
+of the Mermaid source, the theme configuration file, the render flags and the
+Mermaid CLI version, so a diagram only needs to be re-rendered when one of
+those inputs changes or when the PNG on disk no longer matches the recorded
+output.
+
+The module is used directly by the Python tooling and through its command
+line by ``docs/build_book.sh``::
+
+    python3 scripts/mermaid_render_cache.py stale --cli-version 10.7.0 images/*.mmd
+    python3 scripts/mermaid_render_cache.py record --cli-version 10.7.0 images/a.mmd
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import sys
+from pathlib import Path
+from typing import Iterable, Sequence
+
+MANIFEST_FILENAME = "mermaid-render-manifest.json"
+MANIFEST_VERSION = 1
+
+DEFAULT_RENDER_OPTIONS: dict[str, object] = {
+    "theme": "default",
+    "background": "transparent",
+    "width": 1400,
+    "height": 900,
+}
+
+_CHUNK_SIZE = 1024 * 1024
+
+
+def file_sha256(path: Path) -> str:
+    """Return the hexadecimal SHA-256 digest of ``path``."""
+
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def build_render_options(
+    *,
+    theme: str = "default",
+    background: str = "transparent",
+    width: int = 1400,
+    height: int = 900,
+) -> dict[str, object]:
+    """Return the render flags that influence the PNG produced by ``mmdc``."""
+
+    return {
+        "theme": theme,
+        "background": background,
+        "width": int(width),
+        "height": int(height),
+    }
+
+
+def render_cache_key(
+    source_sha256: str,
+    config_sha256: str | None,
+    options: dict[str, object],
+    cli_version: str,
+) -> str:
+    """Combine every render input into a single content address."""
+
+    payload = json.dumps(
+        {
+            "source": source_sha256,
+            "config": config_sha256,
+            "options": options,
+            "cli_version": cli_version.strip(),
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def png_target(source: Path) -> Path:
+    """Return the PNG path rendered for a Mermaid source file."""
+
+    return source.with_suffix(".png")
+
+
+class RenderManifest:
+    """Mapping of Mermaid sources to the cache key and PNG digest they produced."""
+
+    def __init__(self, path: Path, entries: dict[str, dict] | None = None) -> None:
+        self.path = path
+        self.entries: dict[str, dict] = dict(entries or {})
+        self._dirty = False
+
+    @classmethod
+    def load(cls, path: Path) -> "RenderManifest":
+        """Load the manifest at ``path``; missing or corrupt files start empty."""
+
+        if not path.is_file():
+            return cls(path)
+
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return cls(path)
+
+        if not isinstance(data, dict) or data.get("version") != MANIFEST_VERSION:
+            return cls(path)
+
+        entries = data.get("diagrams")
+        if not isinstance(entries, dict):
+            return cls(path)
+
+        return cls(path, entries)
+
+    def _entry_name(self, source: Path) -> str:
+        try:
+            return source.resolve().relative_to(self.path.parent.resolve()).as_posix()
+        except ValueError:
+            return source.name
+
+    def entry_for(self, source: Path) -> dict | None:
+        """Return the recorded entry for ``source`` if one exists."""
+
+        return self.entries.get(self._entry_name(source))
+
+    def is_fresh(self, source: Path, cache_key: str) -> bool:
+        """Return True when the PNG for ``source`` matches the recorded render."""
+
+        entry = self.entry_for(source)
+        if not entry or entry.get("cache_key") != cache_key:
+            return False
+
+        target = png_target(source)
+        if not target.is_file() or target.stat().st_size == 0:
+            return False
+
+        return entry.get("png_sha256") == file_sha256(target)
+
+    def record(
+        self,
+        source: Path,
+        *,
+        cache_key: str,
+        source_sha256: str,
+        config_sha256: str | None,
+        options: dict[str, object],
+        cli_version: str,
+    ) -> None:
+        """Store the render inputs and PNG digest for ``source``."""
+
+        target = png_target(source)
+        entry = {
+            "cache_key": cache_key,
+            "source_sha256": source_sha256,
+            "config_sha256": config_sha256,
+            "options": options,
+            "cli_version": cli_version.strip(),
+            "png": target.name,
+            "png_sha256": file_sha256(target),
+        }
+
+        name = self._entry_name(source)
+        if self.entries.get(name) != entry:
+            self.entries[name] = entry
+            self._dirty = True
+
+    def prune(self, sources: Iterable[Path]) -> None:
+        """Drop entries for Mermaid sources that no longer exist."""
+
+        keep = {self._entry_name(source) for source in sources}
+        for name in list(self.entries):
+            if name not in keep:
+                del self.entries[name]
+                self._dirty = True
+
+    def save(self) -> bool:
+        """Write the manifest when it changed; return True if a write happened."""
+
+        if not self._dirty and self.path.is_file():
+            return False
+
+        payload = {
+            "version": MANIFEST_VERSION,
+            "diagrams": {name: self.entries[name] for name in sorted(self.entries)},
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(
+            json.dumps(payload, indent=2, sort_keys=True) + "\n", encoding="utf-8"
+        )
+        self._dirty = False
+        return True
+
+
+class RenderCache:
+    """Resolve cache keys for Mermaid sources and track them in a manifest."""
+
+    def __init__(
+        self,
+        manifest: RenderManifest,
+        *,
+        config_file: Path | None,
+        options: dict[str, object],
+        cli_version: str,
+    ) -> None:
+        self.manifest = manifest
+        self.config_file = config_file
+        self.options = options
+        self.cli_version = cli_version
+        self.config_sha256 = (
+            file_sha256(config_file) if config_file and config_file.is_file() else None
+        )
+
+    def key_for(self, source: Path) -> tuple[str, str]:
+        """Return ``(cache_key, source_sha256)`` for ``source``."""
+
+        source_sha256 = file_sha256(source)
+        key = render_cache_key(
+            source_sha256, self.config_sha256, self.options, self.cli_version
+        )
+        return key, source_sha256
+
+    def is_fresh(self, source: Path) -> bool:
+        """Return True when ``source`` does not need to be rendered again."""
+
+        key, _ = self.key_for(source)
+        return self.manifest.is_fresh(source, key)
+
+    def stale_sources(self, sources: Sequence[Path]) -> list[Path]:
+        """Return the subset of ``sources`` that must be rendered."""
+
+        return [source for source in sources if not self.is_fresh(source)]
+
+    def record(self, source: Path) -> None:
+        """Record a freshly rendered PNG for ``source``."""
+
+        key, source_sha256 = self.key_for(source)
+        self.manifest.record(
+            source,
+            cache_key=key,
+            source_sha256=source_sha256,
+            config_sha256=self.config_sha256,
+            options=self.options,
+            cli_version=self.cli_version,
+        )
+
+
+def _parse_arguments(argv: Sequence[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Query and update the Mermaid render cache manifest."
+    )
+    parser.add_argument(
+        "command",
+        choices=("stale", "record"),
+        help=(
+            "'stale' prints the sources that must be rendered; 'record' stores "
+            "freshly rendered PNGs in the manifest."
+        ),
+    )
+    parser.add_argument("sources", nargs="*", type=Path, help="Mermaid source files.")
+    parser.add_argument(
+        "--manifest",
+        type=Path,
+        help=f"Manifest path (default: {MANIFEST_FILENAME} next to the sources).",
+    )
+    parser.add_argument(
+        "--config-file",
+        type=Path,
+        help="Mermaid theme configuration passed to mmdc via -c.",
+    )
+    parser.add_argument(
+        "--cli-version",
+        default="unknown",
+        help="Mermaid CLI version reported by 'mmdc -V'.",
+    )
+    parser.add_argument("--theme", default=DEFAULT_RENDER_OPTIONS["theme"])
+    parser.add_argument("--background", default=DEFAULT_RENDER_OPTIONS["background"])
+    parser.add_argument("--width", type=int, default=DEFAULT_RENDER_OPTIONS["width"])
+    parser.add_argument("--height", type=int, default=DEFAULT_RENDER_OPTIONS["height"])
+    return parser.parse_intermixed_args(argv)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = _parse_arguments(argv)
+    sources = [source for source in args.sources if source.is_file()]
+
+    manifest_path = args.manifest
+    if manifest_path is None:
+        base = sources[0].parent if sources else Path(".")
+        manifest_path = base / MANIFEST_FILENAME
+
+    cache = RenderCache(
+        RenderManifest.load(manifest_path),
+        config_file=args.config_file,
+        options=build_render_options(
+            theme=args.theme,
+            background=args.background,
+            width=args.width,
+            height=args.height,
+        ),
+        cli_version=args.cli_version,
+    )
+
+    if args.command == "stale":
+        for source in cache.stale_sources(sources):
+            print(source)
+        return 0
+
+    for source in sources:
+        if not png_target(source).is_file():
+            print(f"Skipping {source}: no rendered PNG to record", file=sys.stderr)
+            continue
+        cache.record(source)
+    cache.manifest.save()
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover - exercised via CLI
+    raise SystemExit(main())
@@ -1,15 +1,28 @@
-"""Canonical navigation utilities shared across the publishing toolchain."""
+"""Canonical navigation utilities shared across the publishing toolchain.
+
+Navigation is resolved through a :class:`NavigationIndex` that is built once
+per process and revalidated against the modification time and size of
+``mkdocs.yml``. The index is also written to ``.cache/navigation.json`` so
+later processes, including the ``--book-build`` invocation in
+``docs/build_book.sh``, can reuse it without importing PyYAML.
+"""
 
 from __future__ import annotations
 
 import argparse
+import copy
+import json
+import os
+import tempfile
+import threading
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Iterator, Sequence
 
-import yaml
-
 REPO_ROOT = Path(__file__).resolve().parents[1]
 MKDOCS_CONFIG_PATH = REPO_ROOT / "mkdocs.yml"
+NAVIGATION_SIDECAR_PATH = REPO_ROOT / ".cache" / "navigation.json"
+_SIDECAR_VERSION = 1
 
 
 class NavigationError(RuntimeError):
@@ -19,6 +32,8 @@ class NavigationError(RuntimeError):
 def load_mkdocs_configuration(path: Path = MKDOCS_CONFIG_PATH) -> dict:
     """Load the MkDocs configuration file."""
 
+    import yaml
+
     if not path.exists():
         raise NavigationError(f"MkDocs configuration not found at {path}.")
 
@@ -34,9 +49,7 @@ def load_mkdocs_configuration(path: Path = MKDOCS_CONFIG_PATH) -> dict:
     return data
 
 
-def load_navigation(path: Path = MKDOCS_CONFIG_PATH) -> list:
-    """Return the raw navigation structure from mkdocs.yml."""
-
+def _parse_navigation(path: Path) -> list:
     config = load_mkdocs_configuration(path)
     nav = config.get("nav")
     if not isinstance(nav, list):
@@ -45,6 +58,12 @@ def load_navigation(path: Path = MKDOCS_CONFIG_PATH) -> list:
     return nav
 
 
+def load_navigation(path: Path = MKDOCS_CONFIG_PATH) -> list:
+    """Return the raw navigation structure from mkdocs.yml."""
+
+    return copy.deepcopy(list(load_navigation_index(path).nav))
+
+
 def _iter_targets(node: object) -> Iterator[str]:
     """Yield every file target referenced within a navigation subtree."""
 
@@ -79,12 +98,48 @@ def _collect_section_markdown(section: Sequence[object]) -> list[str]:
     return markdown_files
 
 
-def get_book_build_files(nav: Sequence[object] | None = None) -> list[str]:
-    """Return the ordered markdown files that form the full book build."""
+def _is_book_section(title: str) -> bool:
+    return title.startswith("Part ") or title == "Appendices"
+
+
+@dataclass(frozen=True)
+class NavigationIndex:
+    """Precomputed views of the navigation with constant-time lookups."""
+
+    nav: tuple
+    book_files: tuple[str, ...]
+    chapter_files: tuple[str, ...]
+    all_targets: tuple[str, ...]
+    _positions: dict[str, int] = field(repr=False, compare=False)
+    _sections: dict[str, str] = field(repr=False, compare=False)
+
+    def position(self, target: str) -> int | None:
+        """Return the zero-based position of ``target`` in the book build."""
+
+        return self._positions.get(target)
+
+    def part_of(self, target: str) -> str | None:
+        """Return the title of the top-level section that contains ``target``."""
+
+        return self._sections.get(target)
+
+    def neighbours(self, target: str) -> tuple[str | None, str | None]:
+        """Return the previous and next files around ``target`` in the book build."""
 
-    nav = list(nav) if nav is not None else load_navigation()
+        position = self._positions.get(target)
+        if position is None:
+            return None, None
+        previous = self.book_files[position - 1] if position > 0 else None
+        following = self.book_files[position + 1] if position + 1 < len(self.book_files) else None
+        return previous, following
 
-    ordered_files: list[str] = []
+
+def build_navigation_index(nav: Sequence[object]) -> NavigationIndex:
+    """Resolve ``nav`` into a :class:`NavigationIndex`."""
+
+    nav = list(nav)
+    book_files: list[str] = []
+    sections: dict[str, str] = {}
     for entry in nav:
         if not isinstance(entry, dict) or len(entry) != 1:
             continue
@@ -93,9 +148,102 @@ def get_book_build_files(nav: Sequence[object] | None = None) -> list[str]:
         if not isinstance(children, (list, tuple)):
             continue
 
-        if title.startswith("Part ") or title == "Appendices":
-            ordered_files.extend(_collect_section_markdown(children))
+        for target in _iter_targets(list(children)):
+            sections.setdefault(target, title)
+        if _is_book_section(title):
+            book_files.extend(_collect_section_markdown(children))
+
+    return NavigationIndex(
+        nav=tuple(nav),
+        book_files=tuple(book_files),
+        chapter_files=tuple(name for name in book_files if not Path(name).stem.startswith("part_")),
+        all_targets=tuple(_iter_targets(nav)),
+        _positions={name: position for position, name in enumerate(book_files)},
+        _sections=sections,
+    )
+
+
+_index_lock = threading.Lock()
+_index_cache: dict[Path, tuple[tuple[int, int], NavigationIndex]] = {}
+
 
+def _source_signature(path: Path) -> tuple[int, int]:
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        raise NavigationError(f"MkDocs configuration not found at {path}.") from None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _read_sidecar(sidecar: Path, source: Path, signature: tuple[int, int]) -> list | None:
+    try:
+        payload = json.loads(sidecar.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if (
+        not isinstance(payload, dict)
+        or payload.get("version") != _SIDECAR_VERSION
+        or payload.get("source") != str(source)
+        or payload.get("signature") != list(signature)
+        or not isinstance(payload.get("nav"), list)
+    ):
+        return None
+    return payload["nav"]
+
+
+def _write_sidecar(sidecar: Path, source: Path, signature: tuple[int, int], index: NavigationIndex) -> None:
+    payload = {
+        "version": _SIDECAR_VERSION,
+        "source": str(source),
+        "signature": list(signature),
+        "book_files": list(index.book_files),
+        "chapter_files": list(index.chapter_files),
+        "nav": list(index.nav),
+    }
+    try:
+        sidecar.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile("w", dir=sidecar.parent, delete=False, encoding="utf-8") as handle:
+            json.dump(payload, handle, indent=2)
+            temporary = Path(handle.name)
+        os.replace(temporary, sidecar)
+    except OSError:
+        # The sidecar is only an accelerator; read-only checkouts still work.
+        pass
+
+
+def load_navigation_index(
+    path: Path = MKDOCS_CONFIG_PATH,
+    sidecar: Path | None = NAVIGATION_SIDECAR_PATH,
+) -> NavigationIndex:
+    """Return the navigation index, re-reading mkdocs.yml only when it changed."""
+
+    source = Path(path).resolve()
+    signature = _source_signature(source)
+    with _index_lock:
+        cached = _index_cache.get(source)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        nav = _read_sidecar(sidecar, source, signature) if sidecar is not None else None
+        if nav is None:
+            index = build_navigation_index(_parse_navigation(source))
+            if sidecar is not None:
+                _write_sidecar(sidecar, source, signature, index)
+        else:
+            index = build_navigation_index(nav)
+
+        _index_cache[source] = (signature, index)
+        return index
+
+
+def _resolve_index(nav: Sequence[object] | None) -> NavigationIndex:
+    return load_navigation_index() if nav is None else build_navigation_index(nav)
+
+
+def get_book_build_files(nav: Sequence[object] | None = None) -> list[str]:
+    """Return the ordered markdown files that form the full book build."""
+
+    ordered_files = list(_resolve_index(nav).book_files)
     if not ordered_files:
         raise NavigationError("No book chapters resolved from navigation.")
 
@@ -105,15 +253,16 @@ def get_book_build_files(nav: Sequence[object] | None = None) -> list[str]:
 def get_whitepaper_chapter_files(nav: Sequence[object] | None = None) -> list[str]:
     """Return ordered chapter files suitable for whitepaper exports."""
 
-    book_files = get_book_build_files(nav)
-    return [name for name in book_files if not Path(name).stem.startswith("part_")]
+    index = _resolve_index(nav)
+    if not index.book_files:
+        raise NavigationError("No book chapters resolved from navigation.")
+    return list(index.chapter_files)
 
 
 def get_all_navigation_targets(nav: Sequence[object] | None = None) -> list[str]:
     """Return every file target referenced anywhere in the navigation."""
 
-    nav = list(nav) if nav is not None else load_navigation()
-    return list(_iter_targets(nav))
+    return list(_resolve_index(nav).all_targets)
 
 
 def _parse_arguments(argv: Sequence[str] | None = None) -> argparse.Namespace:
@@ -0,0 +1,453 @@
+#!/usr/bin/env python3
+"""Parse the manuscript once into pandoc's JSON AST and fan it out to writers.
+
+``docs/build_book.sh`` used to run pandoc three times over the same chapters
+(PDF, EPUB and DOCX), reading and parsing every markdown file each time.
+:func:`parse_sources` instead reads each chapter into pandoc's JSON AST once
+and stores it under ``.cache/pandoc-ast/<sha256>.json``. The key covers the
+chapter text, the reader options and the pandoc version, so an unchanged
+chapter is never parsed again. :func:`fan_out` joins the chapter ASTs into
+one document per output family and runs the writers concurrently:
+
+* PDF reads the book as written, LaTeX part commands included, and always
+  runs through the pandoc CLI because the PDF engine needs it. With
+  ``--pdf-build-dir`` it is instead compiled from per-chapter LaTeX fragments
+  in a reused directory by :mod:`latex_build`;
+* EPUB and DOCX get the cover page, and part introductions stripped of their
+  LaTeX-only commands by :func:`sanitise_part_markdown` before parsing; they
+  run on pandoc-server workers when available.
+
+Command line usage (as invoked by ``docs/build_book.sh``)::
+
+    python3 ../scripts/pandoc_ast.py --pdf-defaults pandoc.yaml --defaults pandoc-nonlatex.yaml \\
+        --cover-page 00_front_cover.md --output pdf=book.pdf --output epub=book.epub 01_introduction.md
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import tempfile
+from collections.abc import Mapping, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:  # pragma: no cover - defensive guard for CLI execution
+    sys.path.insert(0, str(REPO_ROOT))
+
+from scripts.latex_build import LatexError, build_pdf  # noqa: E402
+from scripts.pandoc_server import (  # noqa: E402
+    DEFAULT_WORKERS,
+    ConversionRequest,
+    ConversionResult,
+    PandocCli,
+    PandocError,
+    PandocServerPool,
+    PandocUnavailable,
+    create_converter,
+    load_defaults,
+    pandoc_version,
+    parse_metadata_spec,
+    parse_output_spec,
+    with_metadata,
+)
+
+DEFAULT_CACHE_DIR = REPO_ROOT / ".cache" / "pandoc-ast"
+PART_FILE_PREFIX = "part_"
+PART_COMMAND_PREFIXES = ("\\cleardoublepage", "\\part{", "\\setbookpart")
+LATEX_FORMATS = frozenset({"pdf", "latex"})
+# Defaults-file keys that change how markdown is read; they belong to the
+# parse request and the cache key rather than to the writers.
+READER_KEYS = (
+    "from",
+    "reader",
+    "abbreviations",
+    "default-image-extension",
+    "indented-code-classes",
+    "shift-heading-level-by",
+    "strip-comments",
+    "tab-stop",
+)
+
+Converter = PandocServerPool | PandocCli
+
+
+class AstCache:
+    """Pandoc results on disk, keyed by source text, options and pandoc version.
+
+    Used for chapter ASTs here and for chapter XHTML by :mod:`epub_assembler`.
+    """
+
+    def __init__(self, cache_dir: Path | None = DEFAULT_CACHE_DIR, version: str | None = None) -> None:
+        self.cache_dir = cache_dir
+        self.version = version if version is not None else pandoc_version()
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, text: str, options: Mapping[str, object]) -> str:
+        digest = hashlib.sha256()
+        digest.update(json.dumps({"pandoc": self.version, "options": options}, sort_keys=True).encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(text.encode("utf-8"))
+        return digest.hexdigest()
+
+    def get(self, key: str) -> dict | None:
+        if self.cache_dir is None:
+            return None
+        try:
+            return json.loads((self.cache_dir / f"{key}.json").read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+    def put(self, key: str, ast: dict) -> None:
+        if self.cache_dir is None:
+            return
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile("w", dir=self.cache_dir, delete=False, encoding="utf-8") as handle:
+                json.dump(ast, handle)
+                temporary = Path(handle.name)
+            os.replace(temporary, self.cache_dir / f"{key}.json")
+        except OSError:
+            # The cache only saves work; a read-only checkout still parses.
+            pass
+
+
+def reader_options(options: Mapping[str, object]) -> dict[str, object]:
+    """Return the reader-related subset of defaults-file ``options``."""
+
+    return {key: options[key] for key in READER_KEYS if key in options}
+
+
+def sanitise_part_markdown(content: str) -> str:
+    """Remove LaTeX-only helpers from part introduction files."""
+
+    cleaned_lines = [line for line in content.splitlines() if not line.startswith(PART_COMMAND_PREFIXES)]
+
+    while cleaned_lines and not cleaned_lines[0].strip():
+        cleaned_lines.pop(0)
+
+    while cleaned_lines and not cleaned_lines[-1].strip():
+        cleaned_lines.pop()
+
+    return "\n".join(cleaned_lines)
+
+
+def non_latex_source(path: Path) -> str:
+    """Return the markdown of ``path`` as EPUB, DOCX and HTML read it.
+
+    Part introductions lose their LaTeX-only commands and come back empty
+    when nothing else remains.
+    """
+
+    content = Path(path).read_text(encoding="utf-8")
+    if not Path(path).name.startswith(PART_FILE_PREFIX):
+        return content
+    content = sanitise_part_markdown(content)
+    return content + "\n" if content.strip() else ""
+
+
+def parse_sources(
+    texts: Sequence[str],
+    converter: Converter,
+    *,
+    names: Sequence[str] | None = None,
+    reader: Mapping[str, object] | None = None,
+    readers: Sequence[Mapping[str, object]] | None = None,
+    cache: AstCache | None = None,
+) -> list[dict]:
+    """Return the JSON AST of every markdown text, parsing only cache misses.
+
+    ``readers`` gives each text its own reader options instead of the shared
+    ``reader``. Identical texts read with the same options are parsed once;
+    ``names`` label texts in error messages.
+    """
+
+    cache = cache or AstCache()
+    readers = [dict(options) for options in readers] if readers is not None else [dict(reader or {})] * len(texts)
+    names = list(names) if names is not None else [f"source {index + 1}" for index in range(len(texts))]
+    keys = [cache.key(text, options) for text, options in zip(texts, readers)]
+    parsed: dict[str, dict] = {}
+    missing: dict[str, int] = {}
+    for index, key in enumerate(keys):
+        if key in parsed or key in missing:
+            continue
+        ast = cache.get(key)
+        if ast is None:
+            missing[key] = index
+        else:
+            parsed[key] = ast
+
+    cache.hits += len(parsed)
+    cache.misses += len(missing)
+    requests = [ConversionRequest(texts[index], "json", readers[index]) for index in missing.values()]
+    for (key, index), result in zip(missing.items(), converter.convert_many(requests)):
+        if isinstance(result, PandocError):
+            raise PandocError(f"Could not parse {names[index]}: {result}")
+        ast = json.loads(result.output)
+        cache.put(key, ast)
+        parsed[key] = ast
+
+    return [parsed[key] for key in keys]
+
+
+def unique_identifiers(asts: Sequence[dict]) -> list[dict]:
+    """Return ``asts`` with pandoc's ``-1``, ``-2`` suffixes on repeated heading ids.
+
+    Identifiers are unique across all chapters, as when pandoc reads them as
+    one document.
+    """
+
+    seen: set[str] = set()
+    unique: list[dict] = []
+    for ast in asts:
+        blocks: list[dict] = []
+        for block in ast.get("blocks", []):
+            if block.get("t") == "Header" and block["c"][1][0]:
+                identifier = block["c"][1][0]
+                if identifier in seen:
+                    suffix = 1
+                    while f"{identifier}-{suffix}" in seen:
+                        suffix += 1
+                    identifier = f"{identifier}-{suffix}"
+                    level, attr, inlines = block["c"]
+                    block = {"t": "Header", "c": [level, [identifier, *attr[1:]], inlines]}
+                seen.add(identifier)
+            blocks.append(block)
+        unique.append({**ast, "blocks": blocks})
+    return unique
+
+
+def combine(asts: Sequence[dict]) -> dict:
+    """Join chapter ASTs into one document, as pandoc joins several inputs.
+
+    Later metadata wins, matching repeated YAML metadata blocks, and duplicate
+    heading identifiers get pandoc's ``-1``, ``-2`` suffixes.
+    """
+
+    if not asts:
+        raise PandocError("No chapters to combine.")
+
+    meta: dict = {}
+    blocks: list[dict] = []
+    for ast in unique_identifiers(asts):
+        meta.update(ast.get("meta", {}))
+        blocks.extend(ast["blocks"])
+
+    return {"pandoc-api-version": asts[0]["pandoc-api-version"], "meta": meta, "blocks": blocks}
+
+
+def _writer_options(options: Mapping[str, object]) -> dict[str, object]:
+    writer = {key: value for key, value in options.items() if key not in READER_KEYS}
+    writer["from"] = "json"
+    return writer
+
+
+def fan_out(
+    chapters: Sequence[Path],
+    outputs: Sequence[tuple[str, Path]],
+    converter: Converter,
+    *,
+    pdf_options: Mapping[str, object] | None = None,
+    options: Mapping[str, object] | None = None,
+    cover_page: Path | None = None,
+    resource_root: Path | None = None,
+    pdf_fallback_template: str | None = None,
+    pdf_build_dir: Path | None = None,
+    cache: AstCache | None = None,
+) -> dict[str, ConversionResult | PandocError]:
+    """Parse ``chapters`` once and write every requested output concurrently.
+
+    ``pdf_options`` configure LaTeX-based formats and ``options`` the others;
+    both use defaults-file keys. With ``pdf_build_dir`` the PDF is compiled
+    incrementally there by :func:`latex_build.build_pdf`. Returns the result
+    of each format.
+    """
+
+    pdf_options = dict(pdf_options or {})
+    options = dict(options or {})
+    formats = [fmt for fmt, _ in outputs]
+    needs_latex = any(fmt in LATEX_FORMATS for fmt in formats)
+    needs_other = any(fmt not in LATEX_FORMATS for fmt in formats)
+
+    latex_paths = list(chapters) if needs_latex else []
+    other_paths: list[Path] = []
+    if needs_other:
+        if cover_page and cover_page.is_file() and cover_page not in chapters:
+            other_paths.append(cover_page)
+        other_paths.extend(chapters)
+    latex_texts = [Path(path).read_text(encoding="utf-8") for path in latex_paths]
+    other_sources = [(path, non_latex_source(path)) for path in other_paths]
+    other_sources = [(path, text) for path, text in other_sources if text.strip()]
+
+    cache = cache or AstCache()
+    asts = parse_sources(
+        [*latex_texts, *(text for _, text in other_sources)],
+        converter,
+        names=[str(path) for path in [*latex_paths, *(path for path, _ in other_sources)]],
+        readers=[reader_options(pdf_options)] * len(latex_texts) + [reader_options(options)] * len(other_sources),
+        cache=cache,
+    )
+
+    latex_asts = unique_identifiers(asts[: len(latex_texts)])
+    documents: dict[bool, str] = {}
+    if "latex" in formats or ("pdf" in formats and pdf_build_dir is None):
+        documents[True] = json.dumps(combine(latex_asts))
+    if needs_other:
+        documents[False] = json.dumps(combine(asts[len(latex_texts):]))
+
+    cli = converter if isinstance(converter, PandocCli) else None
+
+    def write(fmt: str) -> ConversionResult | PandocError:
+        latex = fmt in LATEX_FORMATS
+        if fmt == "pdf" and pdf_build_dir is not None:
+            try:
+                pdf = build_pdf(
+                    [Path(path).stem for path in latex_paths],
+                    latex_asts,
+                    converter,
+                    options=_writer_options(pdf_options),
+                    build_dir=pdf_build_dir,
+                    cache=AstCache(pdf_build_dir / "cache", version=cache.version),
+                    cli=cli,
+                    resource_root=resource_root,
+                    fallback_template=pdf_fallback_template,
+                )
+            except (PandocError, LatexError, PandocUnavailable) as exc:
+                return PandocError(str(exc))
+            return ConversionResult(ConversionRequest("", fmt, pdf_options, resource_root), pdf)
+        request = ConversionRequest(
+            documents[latex],
+            fmt,
+            _writer_options(pdf_options if latex else options),
+            resource_root=resource_root,
+        )
+        try:
+            if fmt == "pdf":
+                return _convert_pdf(cli or PandocCli(workers=1), request, pdf_fallback_template)
+            return converter.convert(request)
+        except PandocError as exc:
+            return exc
+        except PandocUnavailable as exc:
+            return PandocError(str(exc))
+
+    with ThreadPoolExecutor(max_workers=max(1, len(formats))) as executor:
+        return dict(zip(formats, executor.map(write, formats)))
+
+
+def _convert_pdf(converter: PandocCli, request: ConversionRequest, fallback_template: str | None) -> ConversionResult:
+    try:
+        return converter.convert(request)
+    except PandocError:
+        if not fallback_template:
+            raise
+        template = request.options.get("template", "the configured template")
+        print(f"⚠️  PDF generation failed with {template}; retrying with the {fallback_template} template")
+        options = {**request.options, "template": fallback_template}
+        return converter.convert(ConversionRequest(request.text, request.to, options, request.resource_root))
+
+
+def _parse_arguments(argv: Sequence[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Parse chapters once into pandoc's AST and write several formats from it."
+    )
+    parser.add_argument("chapters", nargs="+", type=Path, help="Markdown chapters, in book order.")
+    parser.add_argument(
+        "--output",
+        action="append",
+        required=True,
+        type=parse_output_spec,
+        metavar="FORMAT=PATH",
+        help="Output format and destination; repeat for every format to build.",
+    )
+    parser.add_argument("--pdf-defaults", type=Path, help="Pandoc defaults file for PDF output.")
+    parser.add_argument("--css", action="append", default=[], help="Stylesheet passed to the PDF writer.")
+    parser.add_argument("--pdf-fallback-template", help="Template to retry with when the PDF build fails.")
+    parser.add_argument(
+        "--pdf-build-dir",
+        type=Path,
+        help="Reused directory for incremental PDF builds from per-chapter LaTeX fragments.",
+    )
+    parser.add_argument("--defaults", type=Path, help="Pandoc defaults file for EPUB, DOCX and other formats.")
+    parser.add_argument(
+        "--metadata",
+        action="append",
+        default=[],
+        type=parse_metadata_spec,
+        metavar="KEY=VALUE",
+        help="Metadata override for the non-PDF formats.",
+    )
+    parser.add_argument("--epub-cover-image", help="Cover image, relative to the resource root.")
+    parser.add_argument("--cover-page", type=Path, help="Markdown cover page prepended to non-PDF formats.")
+    parser.add_argument(
+        "--resource-root",
+        type=Path,
+        default=Path.cwd(),
+        help="Directory that image paths resolve against (default: current directory).",
+    )
+    parser.add_argument("--cache-dir", type=Path, default=DEFAULT_CACHE_DIR)
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    parser.add_argument("--no-server", action="store_true", help="Use the pandoc CLI only.")
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = _parse_arguments(argv)
+
+    pdf_options: dict[str, object] = load_defaults(args.pdf_defaults) if args.pdf_defaults else {}
+    if args.css:
+        pdf_options["css"] = args.css
+    options: dict[str, object] = load_defaults(args.defaults) if args.defaults else {}
+    if args.metadata:
+        options = with_metadata(options, dict(args.metadata))
+    if args.epub_cover_image:
+        options["epub-cover-image"] = args.epub_cover_image
+
+    try:
+        converter = create_converter(server=not args.no_server, workers=args.workers)
+    except PandocUnavailable as exc:
+        print(f"❌ {exc}")
+        return 1
+
+    cache = AstCache(args.cache_dir)
+    with converter:
+        try:
+            results = fan_out(
+                args.chapters,
+                args.output,
+                converter,
+                pdf_options=pdf_options,
+                options=options,
+                cover_page=args.cover_page,
+                resource_root=args.resource_root,
+                pdf_fallback_template=args.pdf_fallback_template,
+                pdf_build_dir=args.pdf_build_dir,
+                cache=cache,
+            )
+        except PandocError as exc:
+            print(f"❌ {exc}")
+            return 1
+
+    print(f"📄 Pandoc AST cache: {cache.hits} chapters reused, {cache.misses} parsed")
+    failures = 0
+    for fmt, destination in args.output:
+        result = results[fmt]
+        if isinstance(result, PandocError):
+            print(f"❌ {fmt.upper()} generation failed: {result}")
+            failures += 1
+            continue
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        destination.write_bytes(result.output)
+        for message in result.messages:
+            print(f"⚠️  {message}")
+        print(f"✅ {fmt.upper()} generated: {destination}")
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":  # pragma: no cover - exercised via CLI
+    raise SystemExit(main())
@@ -0,0 +1,503 @@
+#!/usr/bin/env python3
+"""Convert manuscript sources through a pool of local ``pandoc-server`` workers.
+
+Every ``pandoc`` invocation pays for process start-up and reader
+initialisation before it converts a single line. :class:`PandocServerPool`
+instead starts ``pandoc-server`` (pandoc's HTTP mode) a few times on local
+ports and submits conversions to idle workers as JSON requests over
+keep-alive connections. Chapter sources are sent from memory and the images
+they embed travel in the request's ``files`` map, because the server runs
+sandboxed and never reads the file system.
+
+When the server binary is unavailable :func:`create_converter` falls back to
+:class:`PandocCli`, which feeds the same request to a ``pandoc`` process on
+stdin. Both converters accept a defaults file (``docs/pandoc-nonlatex.yaml``)
+as options and convert several requests in parallel. The server cannot run
+filters or produce PDF, so PDF requests always go to :class:`PandocCli`.
+
+Command line usage (run from ``docs/``)::
+
+    python3 ../scripts/pandoc_server.py --defaults pandoc-nonlatex.yaml \\
+        --output epub=book.epub --output docx=book.docx 00_front_cover.md 01_introduction.md
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import http.client
+import json
+import os
+import queue
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Iterable, Mapping, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import yaml
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:  # pragma: no cover - defensive guard for CLI execution
+    sys.path.insert(0, str(REPO_ROOT))
+
+from scripts.manuscript import parse_document  # noqa: E402
+
+DEFAULT_WORKERS = min(4, os.cpu_count() or 1)
+# pandoc-server aborts conversions after two seconds by default; a whole book
+# takes longer than that.
+SERVER_TIMEOUT = 300
+STARTUP_TIMEOUT = 10.0
+# Keys that name files on disk, which requests supply themselves.
+_REQUEST_SCOPED_KEYS = ("input-files", "input-file", "output-file")
+# Defaults files accept aliases for some options; pandoc-server's JSON only
+# knows the option names themselves.
+_SERVER_OPTION_NAMES = {
+    "toc": "table-of-contents",
+    "reader": "from",
+    "writer": "to",
+    "metadata-file": "metadata-files",
+    "pdf-engine-opt": "pdf-engine-opts",
+}
+
+
+class PandocUnavailable(RuntimeError):
+    """Raised when neither pandoc-server nor pandoc can be started."""
+
+
+class PandocError(RuntimeError):
+    """Raised when pandoc rejects a conversion."""
+
+
+@dataclass(frozen=True)
+class ConversionRequest:
+    """Markdown ``text`` to convert into format ``to``.
+
+    ``options`` use the keys of a pandoc defaults file. Relative paths, such as
+    image targets and ``epub-cover-image``, resolve against ``resource_root``.
+    """
+
+    text: str
+    to: str
+    options: Mapping[str, object] = field(default_factory=dict)
+    resource_root: Path | None = None
+
+    @property
+    def from_format(self) -> str:
+        return str(self.options.get("from") or self.options.get("reader") or "markdown")
+
+    def resource_paths(self) -> list[str]:
+        """Relative paths of the local files the conversion reads."""
+
+        if self.from_format == "json":
+            paths = set(ast_image_targets(json.loads(self.text)))
+        else:
+            paths = {image.target for image in parse_document(self.text).images}
+        cover = self.options.get("epub-cover-image")
+        if cover:
+            paths.add(str(cover))
+        return sorted(path for path in paths if "://" not in path and not Path(path).is_absolute())
+
+    def to_payload(self) -> dict[str, object]:
+        """Return the JSON body ``pandoc-server`` expects."""
+
+        if self.options.get("filters"):
+            raise PandocError("pandoc-server cannot run filters; use the pandoc CLI instead.")
+        if self.to == "pdf":
+            raise PandocError("pandoc-server cannot produce PDF; use the pandoc CLI instead.")
+
+        files: dict[str, str] = {}
+        if self.resource_root is not None:
+            for rel_path in self.resource_paths():
+                resource = self.resource_root / rel_path
+                if resource.is_file():
+                    files[rel_path] = base64.b64encode(resource.read_bytes()).decode("ascii")
+
+        payload = {
+            _SERVER_OPTION_NAMES.get(key, key): value
+            for key, value in self.options.items()
+            if key not in _REQUEST_SCOPED_KEYS
+        }
+        payload.update({"text": self.text, "from": self.from_format, "to": self.to, "files": files})
+        return payload
+
+
+@dataclass(frozen=True)
+class ConversionResult:
+    """Converted ``output`` bytes and the warnings pandoc reported."""
+
+    request: ConversionRequest
+    output: bytes
+    messages: tuple[str, ...] = ()
+
+
+def ast_image_targets(node: object) -> Iterable[str]:
+    """Yield the target of every ``Image`` in a pandoc JSON AST."""
+
+    if isinstance(node, dict):
+        if node.get("t") == "Image":
+            yield node["c"][2][0]
+        for value in node.values():
+            yield from ast_image_targets(value)
+    elif isinstance(node, list):
+        for value in node:
+            yield from ast_image_targets(value)
+
+
+def pandoc_version(pandoc: str | None = None) -> str:
+    """Return the installed pandoc version, or ``"unknown"``."""
+
+    pandoc = pandoc or shutil.which("pandoc")
+    if not pandoc:
+        return "unknown"
+    try:
+        result = subprocess.run([pandoc, "--version"], capture_output=True, text=True, check=False)
+    except OSError:
+        return "unknown"
+    lines = result.stdout.strip().splitlines()
+    return lines[0] if result.returncode == 0 and lines else "unknown"
+
+
+def load_defaults(path: Path) -> dict[str, object]:
+    """Read a pandoc defaults file into request options."""
+
+    options = yaml.safe_load(path.read_text(encoding="utf-8")) or {}
+    if not isinstance(options, dict):
+        raise PandocError(f"{path} does not contain a pandoc defaults mapping.")
+    return options
+
+
+def with_metadata(options: Mapping[str, object], metadata: Mapping[str, object]) -> dict[str, object]:
+    """Return ``options`` with ``metadata`` overriding the defaults' metadata."""
+
+    merged = dict(options)
+    merged["metadata"] = {**dict(options.get("metadata") or {}), **metadata}
+    return merged
+
+
+def read_sources(paths: Iterable[Path]) -> str:
+    """Join chapter files the way pandoc joins several input files."""
+
+    return "\n\n".join(Path(path).read_text(encoding="utf-8") for path in paths)
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def resolve_server_command() -> list[str]:
+    """Return the command that starts pandoc in server mode."""
+
+    server = shutil.which("pandoc-server")
+    if server:
+        return [server]
+    pandoc = shutil.which("pandoc")
+    if pandoc:
+        # pandoc 3 also serves when called with the ``server`` subcommand.
+        return [pandoc, "server"]
+    raise PandocUnavailable("Neither pandoc-server nor pandoc is installed.")
+
+
+class _ServerWorker:
+    """One ``pandoc-server`` process and a keep-alive connection to it."""
+
+    def __init__(self, command: Sequence[str], timeout: float) -> None:
+        self.port = _free_port()
+        self.timeout = timeout
+        try:
+            self._process = subprocess.Popen(
+                [*command, "--port", str(self.port), "--timeout", str(SERVER_TIMEOUT)],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                text=True,
+            )
+        except OSError as exc:
+            raise PandocUnavailable(f"Could not start {command[0]}: {exc}") from exc
+        self._connection: http.client.HTTPConnection | None = None
+        self._wait_until_ready()
+
+    def _wait_until_ready(self) -> None:
+        deadline = time.monotonic() + STARTUP_TIMEOUT
+        while time.monotonic() < deadline:
+            if self._process.poll() is not None:
+                detail = (self._process.stderr.read() if self._process.stderr else "").strip()
+                raise PandocUnavailable(f"pandoc-server exited during start-up: {detail or self._process.returncode}")
+            try:
+                socket.create_connection(("127.0.0.1", self.port), timeout=0.2).close()
+                return
+            except OSError:
+                time.sleep(0.05)
+        self.close()
+        raise PandocUnavailable(f"pandoc-server did not listen on port {self.port} in time.")
+
+    def _post(self, body: bytes) -> tuple[int, bytes]:
+        if self._connection is None:
+            self._connection = http.client.HTTPConnection("127.0.0.1", self.port, timeout=self.timeout)
+        headers = {"Content-Type": "application/json", "Accept": "application/json"}
+        self._connection.request("POST", "/", body=body, headers=headers)
+        response = self._connection.getresponse()
+        return response.status, response.read()
+
+    def convert(self, request: ConversionRequest) -> ConversionResult:
+        body = json.dumps(request.to_payload()).encode("utf-8")
+        try:
+            try:
+                status, data = self._post(body)
+            except (http.client.HTTPException, ConnectionError):
+                # The server dropped the idle connection; retry once on a new one.
+                self._reset_connection()
+                status, data = self._post(body)
+        except (OSError, http.client.HTTPException) as exc:
+            # Covers timeouts and a failed retry; the request fails on its own
+            # instead of aborting the whole batch.
+            self._reset_connection()
+            raise PandocError(f"pandoc-server did not answer the {request.to} request: {exc}") from exc
+
+        text = data.decode("utf-8", errors="replace")
+        try:
+            reply = json.loads(text)
+        except json.JSONDecodeError:
+            reply = None
+        if status != 200 or not isinstance(reply, dict) or "output" not in reply:
+            detail = reply.get("error") if isinstance(reply, dict) else None
+            raise PandocError(f"pandoc-server failed to convert to {request.to}: {detail or text.strip()}")
+
+        output = reply["output"]
+        payload = base64.b64decode(output) if reply.get("base64") else str(output).encode("utf-8")
+        messages = tuple(
+            str(message.get("message") or json.dumps(message, sort_keys=True))
+            if isinstance(message, dict) else str(message)
+            for message in reply.get("messages") or ()
+        )
+        return ConversionResult(request, payload, messages)
+
+    def _reset_connection(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def close(self) -> None:
+        self._reset_connection()
+        if self._process.poll() is None:
+            self._process.terminate()
+            try:
+                self._process.wait(timeout=5)
+            except subprocess.TimeoutExpired:  # pragma: no cover - defensive cleanup
+                self._process.kill()
+                self._process.wait()
+        if self._process.stderr:
+            self._process.stderr.close()
+
+
+class PandocServerPool:
+    """Run conversions on a fixed pool of ``pandoc-server`` processes."""
+
+    def __init__(
+        self,
+        workers: int = DEFAULT_WORKERS,
+        *,
+        command: Sequence[str] | None = None,
+        timeout: float = SERVER_TIMEOUT,
+    ) -> None:
+        command = list(command or resolve_server_command())
+        self._workers: list[_ServerWorker] = []
+        self._idle: queue.Queue[_ServerWorker] = queue.Queue()
+        try:
+            for _ in range(max(1, workers)):
+                worker = _ServerWorker(command, timeout)
+                self._workers.append(worker)
+                self._idle.put(worker)
+        except PandocUnavailable:
+            self.close()
+            raise
+
+    @property
+    def size(self) -> int:
+        return len(self._workers)
+
+    def convert(self, request: ConversionRequest) -> ConversionResult:
+        worker = self._idle.get()
+        try:
+            return worker.convert(request)
+        finally:
+            self._idle.put(worker)
+
+    def convert_many(self, requests: Sequence[ConversionRequest]) -> list[ConversionResult | PandocError]:
+        """Convert ``requests`` in parallel, returning results in request order."""
+
+        return _convert_concurrently(self.convert, requests, self.size)
+
+    def close(self) -> None:
+        for worker in self._workers:
+            worker.close()
+        self._workers.clear()
+
+    def __enter__(self) -> "PandocServerPool":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+class PandocCli:
+    """Run each conversion in its own ``pandoc`` process, reading stdin."""
+
+    def __init__(self, pandoc: str | None = None, *, workers: int = DEFAULT_WORKERS) -> None:
+        pandoc = pandoc or shutil.which("pandoc")
+        if not pandoc:
+            raise PandocUnavailable("Pandoc is required but was not found in PATH.")
+        self.pandoc = pandoc
+        self.size = max(1, workers)
+
+    def convert(self, request: ConversionRequest) -> ConversionResult:
+        options = {key: value for key, value in request.options.items() if key not in _REQUEST_SCOPED_KEYS}
+        options["from"] = request.from_format
+        # pandoc picks the LaTeX writer and PDF engine from the output suffix.
+        if request.to != "pdf":
+            options["to"] = request.to
+        # The manuscript arrives on stdin, so there is no input file whose
+        # directory images could resolve against.
+        if request.resource_root is not None:
+            options.setdefault("resource-path", [str(request.resource_root)])
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            defaults = Path(temp_dir) / "defaults.yaml"
+            defaults.write_text(yaml.safe_dump(options, allow_unicode=True), encoding="utf-8")
+            output = Path(temp_dir) / f"output.{request.to}"
+            cwd = request.resource_root
+            result = subprocess.run(
+                [self.pandoc, "--defaults", str(defaults), "-o", str(output)],
+                input=request.text.encode("utf-8"),
+                cwd=str(cwd) if cwd is not None else None,
+                capture_output=True,
+                check=False,
+            )
+            stderr = result.stderr.decode("utf-8", errors="replace").strip()
+            if result.returncode != 0:
+                raise PandocError(f"pandoc failed to convert to {request.to}: {stderr}")
+            return ConversionResult(request, output.read_bytes(), tuple(stderr.splitlines()))
+
+    def convert_many(self, requests: Sequence[ConversionRequest]) -> list[ConversionResult | PandocError]:
+        """Convert ``requests`` in parallel, returning results in request order."""
+
+        return _convert_concurrently(self.convert, requests, self.size)
+
+    def close(self) -> None:
+        """Nothing to release; present for interface parity."""
+
+    def __enter__(self) -> "PandocCli":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+def _convert_concurrently(convert, requests: Sequence[ConversionRequest], workers: int):
+    def attempt(request: ConversionRequest) -> ConversionResult | PandocError:
+        try:
+            return convert(request)
+        except PandocError as exc:
+            return exc
+
+    if len(requests) <= 1 or workers <= 1:
+        return [attempt(request) for request in requests]
+    with ThreadPoolExecutor(max_workers=min(workers, len(requests))) as executor:
+        return list(executor.map(attempt, requests))
+
+
+def create_converter(*, server: bool = True, workers: int = DEFAULT_WORKERS) -> PandocServerPool | PandocCli:
+    """Return a server pool when possible, falling back to the pandoc CLI."""
+
+    if server:
+        try:
+            return PandocServerPool(workers)
+        except PandocUnavailable as exc:
+            print(f"⚠️  pandoc-server unavailable ({exc}); using the pandoc CLI.")
+    return PandocCli(workers=workers)
+
+
+def parse_output_spec(value: str) -> tuple[str, Path]:
+    fmt, separator, path = value.partition("=")
+    if not separator or not fmt or not path:
+        raise argparse.ArgumentTypeError(f"expected FORMAT=PATH, got '{value}'")
+    return fmt, Path(path)
+
+
+def parse_metadata_spec(value: str) -> tuple[str, str]:
+    key, _, setting = value.partition("=")
+    return key, setting
+
+
+def _parse_arguments(argv: Sequence[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Convert markdown sources with pooled pandoc-server workers."
+    )
+    parser.add_argument("sources", nargs="+", type=Path, help="Markdown inputs, in book order.")
+    parser.add_argument(
+        "--output",
+        action="append",
+        required=True,
+        type=parse_output_spec,
+        metavar="FORMAT=PATH",
+        help="Output format and destination; repeat to build several formats concurrently.",
+    )
+    parser.add_argument("--defaults", type=Path, help="Pandoc defaults file supplying the options.")
+    parser.add_argument("--metadata", action="append", default=[], type=parse_metadata_spec, metavar="KEY=VALUE")
+    parser.add_argument("--epub-cover-image", help="Cover image, relative to the resource root.")
+    parser.add_argument(
+        "--resource-root",
+        type=Path,
+        default=Path.cwd(),
+        help="Directory that image paths resolve against (default: current directory).",
+    )
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    parser.add_argument("--no-server", action="store_true", help="Use the pandoc CLI only.")
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = _parse_arguments(argv)
+
+    options: dict[str, object] = load_defaults(args.defaults) if args.defaults else {}
+    if args.metadata:
+        options = with_metadata(options, dict(args.metadata))
+    if args.epub_cover_image:
+        options["epub-cover-image"] = args.epub_cover_image
+
+    text = read_sources(args.sources)
+    requests = [
+        ConversionRequest(text, fmt, options, resource_root=args.resource_root)
+        for fmt, _ in args.output
+    ]
+
+    try:
+        converter = create_converter(server=not args.no_server, workers=min(args.workers, len(requests)))
+    except PandocUnavailable as exc:
+        print(f"❌ {exc}")
+        return 1
+
+    failures = 0
+    with converter:
+        for (fmt, destination), result in zip(args.output, converter.convert_many(requests)):
+            if isinstance(result, PandocError):
+                print(f"❌ {fmt.upper()} generation failed: {result}")
+                failures += 1
+                continue
+            destination.parent.mkdir(parents=True, exist_ok=True)
+            destination.write_bytes(result.output)
+            for message in result.messages:
+                print(f"⚠️  {message}")
+            print(f"✅ {fmt.upper()} generated: {destination}")
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":  # pragma: no cover - exercised via CLI
+    raise SystemExit(main())
@@ -0,0 +1,137 @@
+"""Persistent, TTL-based cache of URL verification results.
+
+Results are stored in a small SQLite database so that consecutive runs of
+``scripts/verify_sources.py`` only probe URLs whose previous result has
+expired. Success, failure and rate-limited (HTTP 429) results each have their
+own time-to-live; ``max_age`` caps every TTL and ``refresh_failed`` forces all
+non-successful results to be checked again.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_CACHE_DIR = REPO_ROOT / ".cache" / "source-verification"
+CACHE_FILENAME = "url-cache.sqlite3"
+
+HOUR = 3600.0
+DEFAULT_SUCCESS_TTL = 7 * 24 * HOUR
+DEFAULT_FAILURE_TTL = 6 * HOUR
+DEFAULT_RATE_LIMIT_TTL = 1 * HOUR
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS url_results (
+    url TEXT PRIMARY KEY,
+    valid INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    http_code INTEGER,
+    final_url TEXT,
+    checked_at REAL NOT NULL
+)
+"""
+
+
+@dataclass(frozen=True)
+class UrlCheck:
+    """Outcome of probing a single URL."""
+
+    valid: bool
+    status: str
+    http_code: int | None = None
+    final_url: str | None = None
+    checked_at: float = 0.0
+
+    @property
+    def rate_limited(self) -> bool:
+        return self.http_code == 429
+
+    def as_result(self) -> tuple[bool, str]:
+        """Return the ``(valid, status)`` pair used by ``SourceVerifier``."""
+
+        return self.valid, self.status
+
+
+class UrlVerificationCache:
+    """SQLite-backed store of :class:`UrlCheck` results keyed by URL."""
+
+    def __init__(
+        self,
+        cache_dir: Path = DEFAULT_CACHE_DIR,
+        *,
+        success_ttl: float = DEFAULT_SUCCESS_TTL,
+        failure_ttl: float = DEFAULT_FAILURE_TTL,
+        rate_limit_ttl: float = DEFAULT_RATE_LIMIT_TTL,
+        max_age: float | None = None,
+        refresh_failed: bool = False,
+    ) -> None:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        self.path = cache_dir / CACHE_FILENAME
+        self.success_ttl = success_ttl
+        self.failure_ttl = failure_ttl
+        self.rate_limit_ttl = rate_limit_ttl
+        self.max_age = max_age
+        self.refresh_failed = refresh_failed
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(str(self.path), check_same_thread=False)
+        with self._connection:
+            self._connection.execute(_SCHEMA)
+
+    def ttl_for(self, check: UrlCheck) -> float:
+        """Return how long ``check`` stays fresh."""
+
+        if check.rate_limited:
+            ttl = 0.0 if self.refresh_failed else self.rate_limit_ttl
+        elif check.valid:
+            ttl = self.success_ttl
+        else:
+            ttl = 0.0 if self.refresh_failed else self.failure_ttl
+
+        if self.max_age is not None:
+            ttl = min(ttl, self.max_age)
+        return ttl
+
+    def get(self, url: str, *, now: float | None = None) -> UrlCheck | None:
+        """Return the cached result for ``url`` while it is still fresh."""
+
+        now = time.time() if now is None else now
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT valid, status, http_code, final_url, checked_at "
+                "FROM url_results WHERE url = ?",
+                (url,),
+            ).fetchone()
+
+            check = None
+            if row is not None:
+                candidate = UrlCheck(bool(row[0]), row[1], row[2], row[3], row[4])
+                if now - candidate.checked_at < self.ttl_for(candidate):
+                    check = candidate
+
+            if check is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return check
+
+    def put(self, url: str, check: UrlCheck) -> None:
+        """Store ``check`` as the latest result for ``url``."""
+
+        checked_at = check.checked_at or time.time()
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO url_results "
+                "(url, valid, status, http_code, final_url, checked_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (url, int(check.valid), check.status, check.http_code, check.final_url, checked_at),
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
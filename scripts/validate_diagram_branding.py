@@ -18,141 +18,58 @@ Usage:
 """
 
 import sys
-import re
 from pathlib import Path
-from typing import List, Dict, Tuple
+from typing import List, Dict
 import argparse
 
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from manuscript_lint import READ_ERROR, DiagramBrandingRule, SourceFile, run_rules  # noqa: E402
+
 
 class BrandComplianceValidator:
-    """Validates diagram files against brand compliance rules."""
-    
-    # American to British spelling mappings
-    AMERICAN_SPELLINGS = {
-        'organization': 'organisation',
-        'organizations': 'organisations',
-        'organizational': 'organisational',
-        'optimize': 'optimise',
-        'optimized': 'optimised',
-        'optimizing': 'optimising',
-        'optimization': 'optimisation',
-        'optimizations': 'optimisations',
-        'optimizer': 'optimiser',
-        'color': 'colour',
-        'colors': 'colours',
-        'colored': 'coloured',
-        'colorize': 'colourise',
-        'center': 'centre',
-        'centered': 'centred',
-        'centers': 'centres',
-        'behavior': 'behaviour',
-        'behavioral': 'behavioural',
-        'behaviors': 'behaviours',
-        'digitization': 'digitisation',
-        'digitalization': 'digitalisation',
-        'containerization': 'containerisation',
-        'modernization': 'modernisation',
-        'standardization': 'standardisation',
-    }
+    """Validates diagram files against brand compliance rules.
+
+    The checks live in the ``diagram-branding`` rule of
+    ``scripts/manuscript_lint.py``; this class keeps the original interface.
+    """
     
-    # Emoji Unicode ranges to detect
-    EMOJI_PATTERN = re.compile(
-        r'[\U0001F300-\U0001F9FF]|'  # Misc Symbols and Pictographs
-        r'[\U0001F600-\U0001F64F]|'  # Emoticons
-        r'[\U0001F680-\U0001F6FF]|'  # Transport and Map
-        r'[\U00002600-\U000027BF]|'  # Misc symbols
-        r'[\U0001F1E0-\U0001F1FF]|'  # Flags
-        r'[\U00002700-\U000027BF]|'  # Dingbats
-        r'[\U0001F900-\U0001F9FF]|'  # Supplemental Symbols and Pictographs
-        r'[\U00002B50]|'             # Star
-        r'[\U00002764]|'             # Heart
-        r'[\U0001F3FB-\U0001F3FF]'   # Skin tones
-    )
+    AMERICAN_SPELLINGS = DiagramBrandingRule.AMERICAN_SPELLINGS
+    EMOJI_PATTERN = DiagramBrandingRule.EMOJI_PATTERN
     
     def __init__(self):
         self.issues: Dict[str, List[str]] = {}
+        self.unreadable: List[str] = []
+        self.rule = DiagramBrandingRule()
+    
+    @staticmethod
+    def _format(issues) -> List[str]:
+        return [f"Line {line}: {message}" for line, message in issues]
     
     def check_inline_theme(self, content: str, filepath: str) -> List[str]:
         """Detect inline theme configuration blocks."""
-        issues = []
-        for i, line in enumerate(content.split('\n'), 1):
-            if '%%{init:' in line:
-                issues.append(
-                    f"Line {i}: Inline theme configuration detected. "
-                    f"Use central theme file (docs/mermaid-kvadrat-theme.json) instead."
-                )
-        return issues
+        return self._format(self.rule.inline_theme(content))
     
     def check_american_spelling(self, content: str, filepath: str) -> List[str]:
         """Detect American English spellings."""
-        issues = []
-        content_lower = content.lower()
-        
-        for american, british in self.AMERICAN_SPELLINGS.items():
-            # Use word boundaries to avoid false positives
-            pattern = re.compile(r'\b' + re.escape(american) + r'\b', re.IGNORECASE)
-            matches = pattern.finditer(content)
-            
-            for match in matches:
-                # Find line number
-                line_num = content[:match.start()].count('\n') + 1
-                issues.append(
-                    f"Line {line_num}: American spelling '{match.group()}' detected. "
-                    f"Use British spelling '{british}' instead."
-                )
-        
-        return issues
+        return self._format(self.rule.american_spelling(content))
     
     def check_emojis(self, content: str, filepath: str) -> List[str]:
         """Detect emojis in content."""
-        issues = []
-        
-        for i, line in enumerate(content.split('\n'), 1):
-            if self.EMOJI_PATTERN.search(line):
-                # Extract the emoji for display
-                emojis_found = self.EMOJI_PATTERN.findall(line)
-                issues.append(
-                    f"Line {i}: Emoji detected: {' '.join(emojis_found)}. "
-                    f"Remove emojis for professional brand compliance."
-                )
-        
-        return issues
+        return self._format(self.rule.emojis(content))
     
     def check_css_classes(self, content: str, filepath: str) -> List[str]:
         """Verify proper CSS class usage."""
-        issues = []
-        valid_classes = ['kv-primary', 'kv-accent', 'kv-highlight', 'kv-muted', 'kv-pattern', 'kv-outline']
-        
-        # Find all CSS class definitions
-        class_pattern = re.compile(r':::([a-zA-Z0-9_-]+)')
-        matches = class_pattern.finditer(content)
-        
-        for match in matches:
-            class_name = match.group(1)
-            if class_name.startswith('kv-') and class_name not in valid_classes:
-                line_num = content[:match.start()].count('\n') + 1
-                issues.append(
-                    f"Line {line_num}: Invalid CSS class ':::{class_name}'. "
-                    f"Valid classes: {', '.join(valid_classes)}"
-                )
-        
-        return issues
+        return self._format(self.rule.css_classes(content))
     
     def validate_file(self, filepath: Path) -> bool:
         """Validate a single diagram file."""
         try:
-            content = filepath.read_text(encoding='utf-8')
+            source = SourceFile(Path(filepath))
         except Exception as e:
             print(f"Error reading {filepath}: {e}", file=sys.stderr)
             return False
         
-        file_issues = []
-        
-        # Run all validation checks
-        file_issues.extend(self.check_inline_theme(content, str(filepath)))
-        file_issues.extend(self.check_american_spelling(content, str(filepath)))
-        file_issues.extend(self.check_emojis(content, str(filepath)))
-        file_issues.extend(self.check_css_classes(content, str(filepath)))
+        file_issues = self._format((finding.line, finding.message) for finding in self.rule.check(source))
         
         if file_issues:
             self.issues[str(filepath)] = file_issues
@@ -160,6 +77,15 @@ class BrandComplianceValidator:
         
         return True
     
+    def record(self, findings) -> None:
+        """Collect engine findings, as produced by ``run_rules``, per file."""
+        for finding in findings:
+            if finding.rule == READ_ERROR:
+                print(finding.message, file=sys.stderr)
+                self.unreadable.append(finding.path)
+                continue
+            self.issues.setdefault(finding.path, []).append(f"Line {finding.line}: {finding.message}")
+    
     def print_report(self) -> int:
         """Print validation report and return exit code."""
         if not self.issues:
@@ -261,15 +187,10 @@ For more information, see docs/DIAGRAM_STYLE_GUIDE.md
     
     # Run validation
     validator = BrandComplianceValidator()
+    validator.record(run_rules([DiagramBrandingRule.name], diagram_files))
     
-    passed = 0
-    failed = 0
-    
-    for filepath in diagram_files:
-        if validator.validate_file(filepath):
-            passed += 1
-        else:
-            failed += 1
+    failed = len(validator.issues) + len(validator.unreadable)
+    passed = len(diagram_files) - failed
     
     # Print summary
     print(f"Validated: {len(diagram_files)} files")
@@ -6,37 +6,28 @@ This script scans all markdown files in the docs/ directory and checks that
 each figure caption (italic text after image references) begins with an uppercase
 "Figure" followed by a number.
 
+The check itself is the ``figure-caption`` rule of
+``scripts/manuscript_lint.py``; this script keeps the original report format.
+
 Exit codes:
   0 - All figure captions are properly capitalized
   1 - One or more figure captions start with lowercase letters
 """
 
-import re
 import sys
+from collections import defaultdict
 from pathlib import Path
 from typing import List, Tuple
 
-
-def is_figure_caption_properly_capitalized(line: str) -> bool:
-    """
-    Check if a figure caption starts with uppercase "Figure".
-    
-    Args:
-        line: A line from a markdown file (should be italic text)
-        
-    Returns:
-        True if the caption is properly capitalized, False otherwise
-    """
-    # Match italic figure captions: *Figure X.Y ...* or *figure X.Y ...*
-    match = re.match(r'^\*([Ff]igure)\s+\d+\.\d+', line)
-    
-    if not match:
-        return True  # Not a figure caption
-    
-    figure_word = match.group(1)
-    
-    # Check if "Figure" starts with uppercase F
-    return figure_word[0].isupper()
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from manuscript_lint import (  # noqa: E402
+    READ_ERROR,
+    FigureCaptionRule,
+    SourceFile,
+    is_figure_caption_properly_capitalized,  # noqa: F401 - re-exported for existing callers
+    run_rules,
+    select_files,
+)
 
 
 def check_file(file_path: Path) -> List[Tuple[int, str]]:
@@ -49,31 +40,13 @@ def check_file(file_path: Path) -> List[Tuple[int, str]]:
     Returns:
         List of tuples (line_number, line_content) for lines with issues
     """
-    issues = []
-    in_code_block = False
-    
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            for line_num, line in enumerate(f, start=1):
-                line_stripped = line.rstrip()
-                
-                # Track code blocks (``` or ~~~)
-                if line_stripped.startswith('```') or line_stripped.startswith('~~~'):
-                    in_code_block = not in_code_block
-                    continue
-                
-                # Skip lines inside code blocks
-                if in_code_block:
-                    continue
-                
-                # Check if it's a figure caption and validate capitalization
-                if line_stripped.startswith('*') and 'igure' in line_stripped:
-                    if not is_figure_caption_properly_capitalized(line_stripped):
-                        issues.append((line_num, line_stripped))
+        source = SourceFile(Path(file_path))
     except Exception as e:
         print(f"Error reading {file_path}: {e}", file=sys.stderr)
-    
-    return issues
+        return []
+
+    return [(finding.line, finding.message) for finding in FigureCaptionRule().check(source)]
 
 
 def main() -> int:
@@ -92,8 +65,8 @@ def main() -> int:
         print(f"Error: docs directory not found at {docs_dir}", file=sys.stderr)
         return 1
     
-    # Find all markdown files (excluding archive directory)
-    md_files = sorted([f for f in docs_dir.rglob('*.md') if 'archive' not in str(f)])
+    # Markdown files outside the archive directory
+    md_files = select_files(FigureCaptionRule.name)
     
     if not md_files:
         print(f"Warning: No markdown files found in {docs_dir}", file=sys.stderr)
@@ -101,19 +74,17 @@ def main() -> int:
     
     print(f"Checking {len(md_files)} markdown files for figure caption capitalization...")
     
-    total_issues = 0
-    files_with_issues = []
-    
-    for md_file in md_files:
-        issues = check_file(md_file)
-        if issues:
-            total_issues += len(issues)
-            files_with_issues.append((md_file, issues))
+    files_with_issues = defaultdict(list)
+    for finding in run_rules([FigureCaptionRule.name], md_files):
+        if finding.rule == READ_ERROR:
+            print(finding.message, file=sys.stderr)
+            continue
+        files_with_issues[finding.path].append((finding.line, finding.message))
+    total_issues = sum(len(issues) for issues in files_with_issues.values())
     
     if files_with_issues:
         print("\n❌ Found figure captions starting with lowercase 'figure':\n")
-        for file_path, issues in files_with_issues:
-            rel_path = file_path.relative_to(repo_root)
+        for rel_path, issues in files_with_issues.items():
             print(f"📄 {rel_path}")
             for line_num, line in issues:
                 print(f"  Line {line_num}: {line}")
@@ -11,7 +11,7 @@ from pathlib import Path
 from typing import Dict, Iterable, Tuple
 
 try:
-    import yaml
+    import yaml  # noqa: F401 - required by book_requirements
 except ImportError as exc:  # pragma: no cover - guidance for missing dependency
     message = (
         "PyYAML is required to parse BOOK_REQUIREMENTS.md. "
@@ -22,6 +22,9 @@ except ImportError as exc:  # pragma: no cover - guidance for missing dependency
 
 from packaging.version import InvalidVersion, Version
 
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from book_requirements import BookRequirementsError, load_book_requirements  # noqa: E402
+
 REPO_ROOT = Path(__file__).resolve().parents[1]
 BOOK_REQUIREMENTS = REPO_ROOT / "BOOK_REQUIREMENTS.md"
 REQUIREMENTS_TXT = REPO_ROOT / "requirements.txt"
@@ -34,23 +37,10 @@ class VerificationError(Exception):
 
 
 def _load_front_matter() -> dict:
-    if not BOOK_REQUIREMENTS.exists():
-        raise VerificationError("BOOK_REQUIREMENTS.md is missing.")
-
-    lines = BOOK_REQUIREMENTS.read_text(encoding="utf-8").splitlines()
-    if not lines or lines[0].strip() != "---":
-        raise VerificationError("BOOK_REQUIREMENTS.md does not contain YAML front matter.")
-
-    front_matter_lines = []
-    for line in lines[1:]:
-        if line.strip() == "---":
-            break
-        front_matter_lines.append(line)
-
-    if not front_matter_lines:
-        raise VerificationError("BOOK_REQUIREMENTS.md front matter is empty.")
-
-    return yaml.safe_load("\n".join(front_matter_lines)) or {}
+    try:
+        return load_book_requirements(BOOK_REQUIREMENTS).data
+    except BookRequirementsError as exc:
+        raise VerificationError(str(exc)) from exc
 
 
 def _parse_version(raw: str) -> Version:
@@ -8,8 +8,20 @@ This script verifies all cited sources throughout the manuscript:
 - Identifies archive entries and other references
 - Generates comprehensive reports
 
+URLs are checked concurrently by a bounded worker pool. Each host gets its
+own concurrency cap and minimum spacing between requests, so a slow host only
+delays its own URLs while reports keep the manuscript order. Requests go
+through a pooled keep-alive client, so URLs on the same host share one
+connection (and one TLS handshake) and each host name is resolved once.
+
+Results are kept in a persistent SQLite cache (.cache/source-verification/)
+so repeated runs only probe URLs whose previous result has expired. Successes,
+failures and rate-limited responses each have their own time-to-live.
+
 Usage:
     python3 scripts/verify_sources.py [--timeout 10] [--output reports/sources]
+    python3 scripts/verify_sources.py --workers 16 --per-host 2 --host-delay 0.2
+    python3 scripts/verify_sources.py --refresh-failed [--max-age 24] [--no-cache]
 """
 
 import os
@@ -18,29 +30,86 @@ import sys
 import json
 import time
 import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Tuple, Set
+from typing import Dict, Iterator, List, Optional, Tuple, Set
 from urllib.parse import urlparse
-import urllib.request
-from urllib.error import URLError, HTTPError
+import http.client
 import socket
 
 # Allow importing navigation from the same scripts/ directory.
 sys.path.insert(0, str(Path(__file__).resolve().parent))
+from http_pool import PooledHttpClient  # noqa: E402
+from manuscript import load_document  # noqa: E402
 from navigation import REPO_ROOT, get_book_build_files  # noqa: E402
+from source_verification_cache import (  # noqa: E402
+    DEFAULT_CACHE_DIR,
+    DEFAULT_FAILURE_TTL,
+    DEFAULT_RATE_LIMIT_TTL,
+    DEFAULT_SUCCESS_TTL,
+    HOUR,
+    UrlCheck,
+    UrlVerificationCache,
+)
 
 # Configuration
 DEFAULT_TIMEOUT = 10
 DEFAULT_OUTPUT = "source-verification-report"
+DEFAULT_WORKERS = 8
+DEFAULT_PER_HOST = 2
+DEFAULT_HOST_DELAY = 0.1
 USER_AGENT = "Architecture-as-Code-Book-Source-Verifier/1.0"
 
 
+class HostThrottle:
+    """Limit concurrent requests and request spacing for each host."""
+
+    def __init__(self, max_concurrent: int = DEFAULT_PER_HOST, min_interval: float = DEFAULT_HOST_DELAY):
+        self.max_concurrent = max(1, max_concurrent)
+        self.min_interval = max(0.0, min_interval)
+        self._lock = threading.Lock()
+        self._semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        self._next_start: Dict[str, float] = {}
+
+    @contextmanager
+    def slot(self, host: str) -> Iterator[None]:
+        """Hold one of the host's request slots, waiting for its rate limit."""
+        with self._lock:
+            semaphore = self._semaphores.setdefault(
+                host, threading.BoundedSemaphore(self.max_concurrent)
+            )
+
+        with semaphore:
+            with self._lock:
+                now = time.monotonic()
+                start = max(now, self._next_start.get(host, now))
+                self._next_start[host] = start + self.min_interval
+            if start > now:
+                time.sleep(start - now)
+            yield
+
+
 class SourceVerifier:
     """Verify sources cited in book chapters."""
     
-    def __init__(self, timeout: int = DEFAULT_TIMEOUT):
+    def __init__(
+        self,
+        timeout: int = DEFAULT_TIMEOUT,
+        workers: int = DEFAULT_WORKERS,
+        per_host: int = DEFAULT_PER_HOST,
+        host_delay: float = DEFAULT_HOST_DELAY,
+        skip_localhost: bool = True,
+        cache: Optional[UrlVerificationCache] = None,
+    ):
         self.timeout = timeout
+        self.cache = cache
+        self.workers = max(1, workers)
+        self.skip_localhost = skip_localhost
+        self.throttle = HostThrottle(per_host, host_delay)
+        self.http = PooledHttpClient(timeout=timeout, user_agent=USER_AGENT, max_idle_per_host=per_host)
         self.verified_urls = {}  # Cache for URL verification results
         self.all_sources = []
         self.broken_sources = []
@@ -52,51 +121,23 @@ class SourceVerifier:
         sources = []
         
         try:
-            content = file_path.read_text(encoding='utf-8')
-            lines = content.split('\n')
-            
-            in_sources_section = False
-            source_section_indent = 0
-            
-            for line_num, line in enumerate(lines, 1):
-                # Detect sources section
-                if re.match(r'^(##\s+)?Sources?(\s+and\s+[Rr]eferences)?:?\s*$', line, re.IGNORECASE):
-                    in_sources_section = True
-                    source_section_indent = 0
-                    continue
-                    
-                # Check for subsection headers within sources (like "### Academic sources")
-                if in_sources_section and re.match(r'^###\s+', line):
-                    continue
+            for entry in load_document(file_path).sources:
+                source_text = entry.text
                 
-                # Exit sources section if we hit another main section
-                if in_sources_section and re.match(r'^##\s+(?!.*[Ss]ources)', line):
-                    in_sources_section = False
-                    continue
+                # Extract URLs from the source text
+                urls = self._extract_urls(source_text)
                 
-                # Extract source entries
-                if in_sources_section:
-                    # Match list items (- or * prefix)
-                    match = re.match(r'^[-*]\s+(.+)$', line)
-                    if match:
-                        source_text = match.group(1).strip()
-                        
-                        # Extract URLs from the source text
-                        urls = self._extract_urls(source_text)
-                        
-                        # Extract ISBN if present
-                        isbn = self._extract_isbn(source_text)
-                        
-                        source_entry = {
-                            'file': file_path.name,
-                            'line': line_num,
-                            'text': source_text,
-                            'urls': urls,
-                            'isbn': isbn,
-                            'type': self._classify_source(source_text, urls, isbn)
-                        }
-                        
-                        sources.append(source_entry)
+                # Extract ISBN if present
+                isbn = self._extract_isbn(source_text)
+                
+                sources.append({
+                    'file': file_path.name,
+                    'line': entry.line,
+                    'text': source_text,
+                    'urls': urls,
+                    'isbn': isbn,
+                    'type': self._classify_source(source_text, urls, isbn)
+                })
         
         except Exception as e:
             print(f"Error reading {file_path}: {e}")
@@ -117,7 +158,7 @@ class SourceVerifier:
         plain_urls = re.findall(r'https?://[^\s\)\]]+', text)
         urls.extend(plain_urls)
         
-        return list(set(urls))  # Remove duplicates
+        return list(dict.fromkeys(urls))  # Remove duplicates, keep citation order
     
     def _extract_isbn(self, text: str) -> str:
         """Extract ISBN from text if present."""
@@ -142,12 +183,12 @@ class SourceVerifier:
     
     def verify_url(self, url: str) -> Tuple[bool, str]:
         """Verify if a URL is accessible."""
-        # Check cache first
+        # Check results from this run first
         if url in self.verified_urls:
             return self.verified_urls[url]
         
         # Skip localhost and template variables
-        if 'localhost' in url or '127.0.0.1' in url:
+        if self.skip_localhost and ('localhost' in url or '127.0.0.1' in url):
             result = (True, 'Skipped (localhost)')
             self.verified_urls[url] = result
             return result
@@ -157,68 +198,76 @@ class SourceVerifier:
             self.verified_urls[url] = result
             return result
         
+        if self.cache is not None:
+            cached = self.cache.get(url)
+            if cached is not None:
+                result = cached.as_result()
+                self.verified_urls[url] = result
+                return result
+
+        with self.throttle.slot(urlparse(url).netloc.lower()):
+            check = self._check_url(url)
+        if self.cache is not None:
+            self.cache.put(url, check)
+        result = check.as_result()
+        self.verified_urls[url] = result
+        return result
+
+    def _check_url(self, url: str) -> UrlCheck:
+        """Probe ``url`` over the network and describe its accessibility."""
         try:
-            # Create request with user agent
-            req = urllib.request.Request(url)
-            req.add_header('User-Agent', USER_AGENT)
-            
             # Try HEAD request first (faster)
-            req.get_method = lambda: 'HEAD'
-            
-            with urllib.request.urlopen(req, timeout=self.timeout) as response:
+            response = self.http.request('HEAD', url)
+            status = response.status
+            method_label = 'OK' if status == 200 else 'Accessible'
+
+            # Some servers don't support HEAD; ask for a single byte instead,
+            # reusing the same keep-alive connection.
+            if status in (405, 501):
+                response = self.http.request('GET', url, headers={'Range': 'bytes=0-0'})
                 status = response.status
-                if status == 200:
-                    result = (True, f'OK ({status})')
-                else:
-                    result = (True, f'Accessible ({status})')
-                self.verified_urls[url] = result
-                return result
-                
-        except HTTPError as e:
-            # Some servers don't support HEAD, try GET
-            if e.code == 405 or e.code == 501:
-                try:
-                    req = urllib.request.Request(url)
-                    req.add_header('User-Agent', USER_AGENT)
-                    
-                    with urllib.request.urlopen(req, timeout=self.timeout) as response:
-                        status = response.status
-                        result = (True, f'OK ({status})')
-                        self.verified_urls[url] = result
-                        return result
-                except Exception as e2:
-                    result = (False, f'Error: {str(e2)}')
-                    self.verified_urls[url] = result
-                    return result
-            
+                method_label = 'OK'
+
             # Treat 429 (rate limiting) as accessible but temporarily unavailable
-            if e.code == 429:
-                result = (True, f'Rate limited (429) - likely valid but temporarily unavailable')
-                self.verified_urls[url] = result
-                return result
-            
-            result = (False, f'HTTP {e.code}: {e.reason}')
-            self.verified_urls[url] = result
-            return result
-            
-        except URLError as e:
-            if isinstance(e.reason, socket.timeout):
-                result = (False, 'Timeout')
-            else:
-                result = (False, f'URL Error: {e.reason}')
-            self.verified_urls[url] = result
-            return result
-            
+            if status == 429:
+                return UrlCheck(
+                    True, 'Rate limited (429) - likely valid but temporarily unavailable', 429
+                )
+
+            if status >= 400:
+                return UrlCheck(False, f'HTTP {status}: {response.reason}', status, response.url)
+
+            return UrlCheck(True, f'{method_label} ({status})', status, response.url)
+
         except socket.timeout:
-            result = (False, 'Timeout')
-            self.verified_urls[url] = result
-            return result
-            
+            return UrlCheck(False, 'Timeout')
+
+        except (OSError, http.client.HTTPException) as e:
+            return UrlCheck(False, f'URL Error: {e}')
+
         except Exception as e:
-            result = (False, f'Error: {str(e)}')
-            self.verified_urls[url] = result
-            return result
+            return UrlCheck(False, f'Error: {str(e)}')
     
+    def verify_urls(self, urls: List[str]) -> Dict[str, Tuple[bool, str]]:
+        """Verify ``urls`` with the worker pool and return results in input order."""
+        unique_urls = list(dict.fromkeys(urls))
+        pending = [url for url in unique_urls if url not in self.verified_urls]
+
+        if pending:
+            if self.workers == 1:
+                for i, url in enumerate(pending, 1):
+                    self.verify_url(url)
+                    if i % 10 == 0:
+                        print(f"  Checked {i}/{len(pending)} URLs...")
+            else:
+                with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                    futures = [executor.submit(self.verify_url, url) for url in pending]
+                    for i, _ in enumerate(as_completed(futures), 1):
+                        if i % 10 == 0:
+                            print(f"  Checked {i}/{len(pending)} URLs...")
+
+        return {url: self.verified_urls[url] for url in unique_urls}
+
     def verify_isbn(self, isbn: str) -> Tuple[bool, str]:
         """Validate ISBN format."""
         # Remove hyphens and spaces
@@ -415,12 +464,12 @@ class SourceVerifier:
         
         print(f"Extracted {len(self.all_sources)} source citations\n")
         
-        # Verify each source
+        # Probe every distinct URL concurrently, then classify sources in
+        # manuscript order from the cached results.
         print("Verifying sources...")
-        for i, source in enumerate(self.all_sources, 1):
-            if i % 10 == 0:
-                print(f"  Processed {i}/{len(self.all_sources)} sources...")
-            
+        self.verify_urls([url for source in self.all_sources for url in source['urls']])
+
+        for source in self.all_sources:
             result = self.verify_source(source)
             
             if result['verified']:
@@ -430,9 +479,6 @@ class SourceVerifier:
                     self.skipped_sources.append(result)
                 else:
                     self.broken_sources.append(result)
-            
-            # Rate limiting
-            time.sleep(0.1)
         
         print(f"Verification complete! Processed {len(self.all_sources)} sources.\n")
     
@@ -648,6 +694,63 @@ def main():
         default=DEFAULT_OUTPUT,
         help=f'Output file prefix (default: {DEFAULT_OUTPUT})'
     )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f'Number of URLs checked concurrently (default: {DEFAULT_WORKERS}; 1 disables concurrency)'
+    )
+    parser.add_argument(
+        '--per-host',
+        type=int,
+        default=DEFAULT_PER_HOST,
+        help=f'Maximum concurrent requests to a single host (default: {DEFAULT_PER_HOST})'
+    )
+    parser.add_argument(
+        '--host-delay',
+        type=float,
+        default=DEFAULT_HOST_DELAY,
+        help=f'Minimum seconds between requests to the same host (default: {DEFAULT_HOST_DELAY})'
+    )
+    parser.add_argument(
+        '--cache-dir',
+        type=Path,
+        default=DEFAULT_CACHE_DIR,
+        help='Directory holding the persistent URL result cache'
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Probe every URL without reading or updating the persistent cache'
+    )
+    parser.add_argument(
+        '--success-ttl',
+        type=float,
+        default=DEFAULT_SUCCESS_TTL / HOUR,
+        help=f'Hours a successful result stays cached (default: {DEFAULT_SUCCESS_TTL / HOUR:g})'
+    )
+    parser.add_argument(
+        '--failure-ttl',
+        type=float,
+        default=DEFAULT_FAILURE_TTL / HOUR,
+        help=f'Hours a failed result stays cached (default: {DEFAULT_FAILURE_TTL / HOUR:g})'
+    )
+    parser.add_argument(
+        '--rate-limit-ttl',
+        type=float,
+        default=DEFAULT_RATE_LIMIT_TTL / HOUR,
+        help=f'Hours a rate-limited (429) result stays cached (default: {DEFAULT_RATE_LIMIT_TTL / HOUR:g})'
+    )
+    parser.add_argument(
+        '--max-age',
+        type=float,
+        help='Ignore cached results older than this many hours, whatever their TTL'
+    )
+    parser.add_argument(
+        '--refresh-failed',
+        action='store_true',
+        help='Re-check every cached failure and rate-limited URL'
+    )
     
     args = parser.parse_args()
     
@@ -665,9 +768,31 @@ def main():
         print(f"Error: docs directory not found at {docs_dir}")
         sys.exit(1)
     
+    cache = None
+    if not args.no_cache:
+        cache = UrlVerificationCache(
+            args.cache_dir,
+            success_ttl=args.success_ttl * HOUR,
+            failure_ttl=args.failure_ttl * HOUR,
+            rate_limit_ttl=args.rate_limit_ttl * HOUR,
+            max_age=None if args.max_age is None else args.max_age * HOUR,
+            refresh_failed=args.refresh_failed,
+        )
+
     # Create verifier and scan
-    verifier = SourceVerifier(timeout=args.timeout)
+    verifier = SourceVerifier(
+        timeout=args.timeout,
+        workers=args.workers,
+        per_host=args.per_host,
+        host_delay=args.host_delay,
+        cache=cache,
+    )
     verifier.scan_repository(docs_dir)
+    verifier.http.close()
+
+    if cache is not None:
+        print(f"URL cache: {cache.hits} reused, {cache.misses} checked ({cache.path})\n")
+        cache.close()
     
     # Print summary
     print(verifier.generate_summary())
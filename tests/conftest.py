@@ -5,7 +5,9 @@ import os
 from pathlib import Path
 
 import pytest
-import yaml
+
+from scripts.book_requirements import load_book_requirements
+from scripts.change_scope import ChangeScope, resolve_change_scope
 
 # Get project root directory
 PROJECT_ROOT = Path(__file__).parent.parent
@@ -30,42 +32,48 @@ def pytest_addoption(parser):
         default="english",
         help="Language to test (default: english)"
     )
+    parser.addoption(
+        "--changed-since",
+        action="store",
+        default=None,
+        metavar="REF",
+        help="Check only chapters changed since REF and their dependents (full run on main)"
+    )
+
+def pytest_report_header(config):
+    ref = config.getoption("--changed-since")
+    if ref:
+        scope = resolve_change_scope(ref, PROJECT_ROOT)
+        config.stash[_CHANGE_SCOPE_KEY] = scope
+        mode = "full run" if scope.full else "incremental run"
+        return f"changed since {ref}: {mode} ({scope.reason})"
+    return None
+
+_CHANGE_SCOPE_KEY = pytest.StashKey[ChangeScope]()
+
+@pytest.fixture(scope="session")
+def change_scope(request):
+    """Files selected by --changed-since; a full scope when the option is absent."""
+    config = request.config
+    if _CHANGE_SCOPE_KEY not in config.stash:
+        ref = config.getoption("--changed-since")
+        config.stash[_CHANGE_SCOPE_KEY] = (
+            resolve_change_scope(ref, PROJECT_ROOT) if ref else ChangeScope("", None)
+        )
+    return config.stash[_CHANGE_SCOPE_KEY]
 
 @pytest.fixture(scope="session")
 def language(request):
     """Get the language from command line option."""
     return request.config.getoption("--language")
 
-def _load_markdown_front_matter(path: Path) -> dict:
-    """Extract YAML front matter from a markdown file."""
-    with open(path, "r", encoding="utf-8") as file:
-        lines = file.readlines()
-
-    if not lines or lines[0].strip() != "---":
-        raise ValueError(f"File {path} does not start with YAML front matter")
-
-    front_matter_lines = []
-    for line in lines[1:]:
-        if line.strip() == "---":
-            break
-        front_matter_lines.append(line)
-    else:
-        raise ValueError(f"File {path} is missing closing YAML front matter delimiter")
-
-    data = yaml.safe_load("".join(front_matter_lines))
-    if not isinstance(data, dict):
-        raise ValueError(f"Front matter in {path} did not produce a dictionary")
-    return data
-
-
 @pytest.fixture(scope="session")
 def requirements_config(language):
     """Load book requirements configuration from the markdown requirements file."""
-    requirements_file = PROJECT_ROOT / "BOOK_REQUIREMENTS.md"
-    return _load_markdown_front_matter(requirements_file)
+    return load_book_requirements(PROJECT_ROOT / "BOOK_REQUIREMENTS.md").data
 
 @pytest.fixture(scope="session")
-def chapter_files(docs_directory, requirements_config):
+def all_chapter_files(docs_directory, requirements_config):
     """List canonical chapter files defined in the requirements specification."""
     book_config = requirements_config.get("book", {})
 
@@ -86,6 +94,11 @@ def chapter_files(docs_directory, requirements_config):
     # Sort for deterministic ordering across tests
     return sorted(chapter_paths, key=lambda path: path.name)
 
+@pytest.fixture(scope="session")
+def chapter_files(all_chapter_files, change_scope):
+    """Canonical chapter files to check, narrowed by --changed-since."""
+    return change_scope.filter(all_chapter_files, PROJECT_ROOT)
+
 @pytest.fixture(scope="session")
 def mermaid_files(docs_directory):
     """List all mermaid diagram files."""
@@ -11,29 +11,22 @@ import re
 from pathlib import Path
 import sys
 
-import yaml
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from scripts.book_requirements import BookRequirementsError, load_book_requirements  # noqa: E402
 
 
 def _load_canonical_chapter_paths(docs_dir: Path) -> list[Path]:
     """Load the canonical chapter paths from the requirements specification."""
     requirements_path = docs_dir.parent / "BOOK_REQUIREMENTS.md"
 
-    if not requirements_path.exists():
-        return sorted([path for path in docs_dir.glob('[0-9]*.md') if path.is_file()])
-
-    lines = requirements_path.read_text(encoding="utf-8").splitlines()
-    if not lines or lines[0].strip() != "---":
+    try:
+        chapters = load_book_requirements(requirements_path).chapters
+    except BookRequirementsError:
         return sorted([path for path in docs_dir.glob('[0-9]*.md') if path.is_file()])
 
-    front_matter = []
-    for line in lines[1:]:
-        if line.strip() == "---":
-            break
-        front_matter.append(line)
-
-    data = yaml.safe_load("\n".join(front_matter)) or {}
-    chapters = data.get("book", {}).get("chapters", [])
-
     canonical_names = [chapter.get("filename") for chapter in chapters if chapter.get("filename")]
     if not canonical_names:
         return sorted([path for path in docs_dir.glob('[0-9]*.md') if path.is_file()])
@@ -0,0 +1,124 @@
+"""Tests for the content-addressed build artifact cache."""
+from __future__ import annotations
+
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from scripts.artifact_cache import ORPHAN_GRACE_SECONDS, ArtifactCache
+
+
+@pytest.fixture
+def workspace(tmp_path: Path) -> Path:
+    book = tmp_path / "repo" / "releases" / "book"
+    book.mkdir(parents=True)
+    (book / "architecture_as_code.pdf").write_bytes(b"%PDF-1.7 book")
+    (book / "architecture_as_code.epub").write_bytes(b"PK epub")
+    return tmp_path / "repo"
+
+
+def _book(root: Path) -> tuple[Path, ...]:
+    return (root / "releases" / "book",)
+
+
+def test_round_trip_mirrors_artifact_directories(workspace: Path, tmp_path: Path) -> None:
+    cache = ArtifactCache(tmp_path / "cache")
+    assert cache.store("book", "f1", workspace, _book(workspace)) == 2
+
+    book = workspace / "releases" / "book"
+    (book / "architecture_as_code.pdf").write_bytes(b"changed")
+    (book / "stale.log").write_text("left over", encoding="utf-8")
+
+    assert cache.restore("book", "f1", workspace, _book(workspace))
+    assert (book / "architecture_as_code.pdf").read_bytes() == b"%PDF-1.7 book"
+    assert not (book / "stale.log").exists()
+    assert not cache.restore("book", "other-fingerprint", workspace, _book(workspace))
+
+
+def test_identical_files_are_stored_once(workspace: Path, tmp_path: Path) -> None:
+    cache = ArtifactCache(tmp_path / "cache")
+    cache.store("book", "f1", workspace, _book(workspace))
+    cache.store("book", "f2", workspace, _book(workspace))
+
+    assert len(list((tmp_path / "cache" / "objects").glob("*/*"))) == 2
+
+
+def test_corrupt_objects_are_detected_and_discarded(workspace: Path, tmp_path: Path) -> None:
+    cache = ArtifactCache(tmp_path / "cache")
+    cache.store("book", "f1", workspace, _book(workspace))
+    for path in (tmp_path / "cache" / "objects").glob("*/*"):
+        path.write_bytes(b"bit rot")
+    pdf = workspace / "releases" / "book" / "architecture_as_code.pdf"
+    pdf.write_bytes(b"local build")
+
+    assert not cache.restore("book", "f1", workspace, _book(workspace))
+    assert pdf.read_bytes() == b"local build", "A failed restore must not touch the workspace"
+    assert not list((tmp_path / "cache" / "entries").glob("*.json"))
+
+
+def test_least_recently_used_entries_are_evicted(workspace: Path, tmp_path: Path) -> None:
+    book = workspace / "releases" / "book"
+    pdf = book / "architecture_as_code.pdf"
+    # Three 13-byte PDFs plus a shared 7-byte EPUB: any two entries fit, three do not.
+    cache = ArtifactCache(tmp_path / "cache", max_bytes=40)
+
+    cache.store("book", "old", workspace, _book(workspace))
+    pdf.write_bytes(b"%PDF-1.7 used")
+    cache.store("book", "used", workspace, _book(workspace))
+    entries = tmp_path / "cache" / "entries"
+    os.utime(entries / "book-old.json", (1, 1))
+    os.utime(entries / "book-used.json", (2, 2))
+    assert cache.restore("book", "used", workspace, _book(workspace))  # refreshes "used"
+
+    pdf.write_bytes(b"%PDF-1.7 new!")
+    cache.store("book", "new", workspace, _book(workspace))
+
+    assert sorted(path.name for path in entries.glob("*.json")) == ["book-new.json", "book-used.json"]
+    # The evicted entry's PDF is swept once it is past the grace period.
+    assert len(list((tmp_path / "cache" / "objects").glob("*/*"))) == 4
+    cache.evict(now=time.time() + ORPHAN_GRACE_SECONDS + 1)
+    assert len(list((tmp_path / "cache" / "objects").glob("*/*"))) == 3
+    assert cache.restore("book", "used", workspace, _book(workspace))
+    assert pdf.read_bytes() == b"%PDF-1.7 used"
+
+
+def test_evict_during_a_concurrent_store_keeps_its_objects(workspace: Path, tmp_path: Path, monkeypatch) -> None:
+    storing = ArtifactCache(tmp_path / "cache")
+    other = ArtifactCache(tmp_path / "cache")
+    other.store("book", "earlier", workspace, _book(workspace))
+    (workspace / "releases" / "book" / "architecture_as_code.pdf").write_bytes(b"%PDF-1.7 next")
+    entry_path = storing._entry_path
+
+    def evict_then_locate(stage: str, fingerprint: str) -> Path:
+        # Another process evicts after the objects are published but before
+        # the entry that references them is written.
+        other.evict()
+        return entry_path(stage, fingerprint)
+
+    monkeypatch.setattr(storing, "_entry_path", evict_then_locate)
+    storing.store("book", "next", workspace, _book(workspace))
+    monkeypatch.undo()
+
+    (workspace / "releases" / "book" / "architecture_as_code.pdf").write_bytes(b"local")
+    assert storing.restore("book", "next", workspace, _book(workspace))
+    assert (workspace / "releases" / "book" / "architecture_as_code.pdf").read_bytes() == b"%PDF-1.7 next"
+
+
+def test_evict_skips_entries_removed_by_another_process(workspace: Path, tmp_path: Path, monkeypatch) -> None:
+    cache = ArtifactCache(tmp_path / "cache", max_bytes=1)
+    cache.store("book", "f1", workspace, _book(workspace))
+    vanished = tmp_path / "cache" / "entries" / "book-gone.json"
+    glob = Path.glob
+
+    def glob_then_lose_one(self: Path, pattern: str):
+        found = list(glob(self, pattern))
+        # Another process deletes an entry between the listing and the stat.
+        return [*found, vanished] if self == cache.entries else found
+
+    monkeypatch.setattr(Path, "glob", glob_then_lose_one)
+    cache.evict()
+    monkeypatch.undo()
+
+    assert not list((tmp_path / "cache" / "entries").glob("*.json"))
@@ -0,0 +1,75 @@
+"""Tests for the shared BOOK_REQUIREMENTS.md metadata service."""
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+
+from scripts.book_requirements import (
+    BOOK_REQUIREMENTS_PATH,
+    BookRequirementsError,
+    load_book_requirements,
+    load_book_requirements_or_empty,
+)
+
+FRONT_MATTER = """---
+release:
+  version: "{version}"
+book:
+  chapters:
+    - filename: "01_intro.md"
+      title: "Intro"
+    - filename: "02_next.md"
+      title: "Next"
+  part_introductions:
+    - title: "Part A"
+quality:
+  clarity:
+    min_paragraphs: 3
+---
+
+# Requirements
+"""
+
+
+def _write(path: Path, version: str, mtime_ns: int) -> None:
+    path.write_text(FRONT_MATTER.format(version=version), encoding="utf-8")
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_parses_once_and_reloads_when_the_file_changes(tmp_path: Path) -> None:
+    path = tmp_path / "BOOK_REQUIREMENTS.md"
+    _write(path, "1.0", 1_000_000_000_000_000_000)
+
+    first = load_book_requirements(path)
+    assert load_book_requirements(path) is first
+    assert first.release["version"] == "1.0"
+    assert first.chapter_filenames == ["01_intro.md", "02_next.md"]
+    assert first.chapter("02_next.md")["title"] == "Next"
+    assert first.chapter("99_missing.md") is None
+    assert first.parts[0]["title"] == "Part A"
+    assert first.quality["clarity"]["min_paragraphs"] == 3
+
+    _write(path, "2.0", 1_000_000_001_000_000_000)
+    second = load_book_requirements(path)
+    assert second is not first
+    assert second.release["version"] == "2.0"
+
+
+def test_missing_or_malformed_files_are_reported(tmp_path: Path) -> None:
+    with pytest.raises(BookRequirementsError, match="missing"):
+        load_book_requirements(tmp_path / "absent.md")
+
+    no_front_matter = tmp_path / "plain.md"
+    no_front_matter.write_text("# Requirements\n", encoding="utf-8")
+    with pytest.raises(BookRequirementsError, match="does not contain YAML front matter"):
+        load_book_requirements(no_front_matter)
+    assert load_book_requirements_or_empty(no_front_matter) == {}
+
+
+def test_repository_requirements_are_loaded() -> None:
+    requirements = load_book_requirements(BOOK_REQUIREMENTS_PATH)
+
+    assert requirements.book["title"] == "Architecture as Code"
+    assert len(requirements.chapter_filenames) == requirements.book["total_chapters"]
@@ -0,0 +1,375 @@
+"""Tests for the stage scheduler in build_all_orchestrator.py."""
+from __future__ import annotations
+
+import hashlib
+import shutil
+import struct
+import subprocess
+import sys
+import threading
+import time
+import zipfile
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+import build_all_orchestrator as orchestrator  # noqa: E402
+from build_all_orchestrator import Stage, StageScheduler, run_command  # noqa: E402
+from scripts.artifact_cache import ArtifactCache  # noqa: E402
+
+
+def _python(code: str) -> list[str]:
+    return [sys.executable, "-c", code]
+
+
+def _sleeper(seconds: float, events: list, name: str):
+    def _run() -> None:
+        events.append(("start", name, time.monotonic()))
+        run_command(_python(f"import time; print('{name} working'); time.sleep({seconds})"))
+        events.append(("end", name, time.monotonic()))
+
+    return _run
+
+
+def test_independent_stages_run_concurrently(tmp_path: Path) -> None:
+    events: list = []
+    stages = [Stage(name, _sleeper(0.5, events, name)) for name in ("book", "whitepapers", "presentations")]
+
+    started = time.monotonic()
+    StageScheduler(stages, jobs=3, log_dir=tmp_path).run()
+    elapsed = time.monotonic() - started
+
+    assert elapsed < 1.2, f"Stages ran sequentially ({elapsed:.2f}s)"
+    assert "whitepapers working" in (tmp_path / "whitepapers.log").read_text(encoding="utf-8")
+
+
+def test_dependencies_and_job_limit_are_respected(tmp_path: Path) -> None:
+    events: list = []
+    in_flight = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def _tracked(name: str):
+        inner = _sleeper(0.2, events, name)
+
+        def _run() -> None:
+            nonlocal in_flight, peak
+            with lock:
+                in_flight += 1
+                peak = max(peak, in_flight)
+            try:
+                inner()
+            finally:
+                with lock:
+                    in_flight -= 1
+
+        return _run
+
+    stages = [
+        Stage("book", _tracked("book")),
+        Stage("whitepapers", _tracked("whitepapers")),
+        Stage("presentations", _tracked("presentations")),
+        Stage("archive", _tracked("archive"), depends_on=("book", "whitepapers", "presentations")),
+    ]
+    scheduler = StageScheduler(stages, jobs=2, log_dir=tmp_path)
+    scheduler.run()
+
+    assert peak == 2
+    archive_start = next(t for kind, name, t in events if kind == "start" and name == "archive")
+    assert all(t <= archive_start for kind, name, t in events if kind == "end" and name != "archive")
+    assert set(scheduler.statuses.values()) == {"succeeded"}
+
+
+def test_first_failure_cancels_running_siblings(tmp_path: Path) -> None:
+    stages = [
+        Stage("book", lambda: run_command(_python("import time; time.sleep(30)"))),
+        Stage("whitepapers", lambda: run_command(_python("import sys, time; time.sleep(0.2); sys.exit(3)"))),
+        Stage("archive", lambda: None, depends_on=("book", "whitepapers")),
+    ]
+    scheduler = StageScheduler(stages, jobs=2, log_dir=tmp_path)
+
+    started = time.monotonic()
+    with pytest.raises(subprocess.CalledProcessError) as excinfo:
+        scheduler.run()
+
+    assert excinfo.value.returncode == 3
+    assert time.monotonic() - started < 10
+    assert scheduler.statuses == {"book": "cancelled", "whitepapers": "failed", "archive": "skipped"}
+
+
+def test_invalid_graphs_are_rejected(tmp_path: Path) -> None:
+    with pytest.raises(ValueError, match="unknown"):
+        StageScheduler([Stage("archive", lambda: None, depends_on=("book",))], log_dir=tmp_path)
+
+    with pytest.raises(ValueError, match="cycle"):
+        StageScheduler(
+            [Stage("a", lambda: None, depends_on=("b",)), Stage("b", lambda: None, depends_on=("a",))],
+            log_dir=tmp_path,
+        )
+
+
+def test_archive_waits_for_every_selected_stage() -> None:
+    args = orchestrator.argparse.Namespace(
+        skip_book=False,
+        skip_whitepapers=True,
+        skip_presentations=False,
+        include_site=False,
+        create_zip=True,
+        archive_name="release.zip",
+    )
+
+    stages = {stage.name: stage for stage in orchestrator.build_stages(args)}
+
+    assert list(stages) == ["book", "presentations", "archive"]
+    assert stages["book"].depends_on == ()
+    assert stages["presentations"].depends_on == ("book",)
+    assert stages["archive"].depends_on == ("book", "presentations")
+
+
+def test_stages_reading_rendered_diagrams_wait_for_the_book() -> None:
+    args = orchestrator.argparse.Namespace(
+        skip_book=False,
+        skip_whitepapers=False,
+        skip_presentations=False,
+        include_site=True,
+        create_zip=False,
+    )
+
+    stages = {stage.name: stage for stage in orchestrator.build_stages(args)}
+
+    assert stages["whitepapers"].depends_on == ()
+    assert stages["presentations"].depends_on == ("book",)
+    assert stages["site"].depends_on == ("book",)
+
+
+def test_generator_helpers_are_part_of_every_stage_fingerprint(tmp_path: Path) -> None:
+    args = orchestrator.argparse.Namespace(
+        skip_book=False,
+        skip_whitepapers=False,
+        skip_presentations=False,
+        include_site=False,
+        create_zip=False,
+    )
+    (tmp_path / "docs").mkdir()
+    (tmp_path / "docs" / "01_intro.md").write_text("# Intro\n", encoding="utf-8")
+    (tmp_path / "scripts").mkdir()
+    helper = tmp_path / "scripts" / "manuscript.py"
+    helper.write_text("VERSION = 1\n", encoding="utf-8")
+    store = orchestrator.FingerprintStore(tmp_path / "fingerprints", root=tmp_path)
+
+    stages = orchestrator.build_stages(args)
+    before = {stage.name: store.digest(stage, store.collect(stage)) for stage in stages}
+    helper.write_text("VERSION = 2\n", encoding="utf-8")
+    after = {stage.name: store.digest(stage, store.collect(stage)) for stage in stages}
+
+    assert list(before) == ["book", "whitepapers", "presentations"]
+    assert all(before[name] != after[name] for name in before)
+    for stage in stages:
+        collected = orchestrator.FingerprintStore(root=orchestrator.ROOT).collect(stage)
+        assert {"scripts/book_requirements.py", "scripts/html_template.py", "scripts/pandoc_ast.py"} <= set(collected)
+
+
+def test_stages_run_one_at_a_time_by_default(monkeypatch) -> None:
+    monkeypatch.setattr(orchestrator.sys, "argv", ["build_all_orchestrator.py"])
+
+    assert orchestrator.parse_args().jobs == 1
+
+
+def test_archive_compression_does_not_inherit_the_stage_jobs(monkeypatch) -> None:
+    monkeypatch.setattr(
+        orchestrator.sys, "argv", ["build_all_orchestrator.py", "--skip-book", "--skip-whitepapers",
+                                   "--skip-presentations", "--zip"],
+    )
+    calls: list[dict] = []
+    monkeypatch.setattr(orchestrator, "create_archive", lambda path, **kwargs: calls.append(kwargs))
+
+    (archive,) = orchestrator.build_stages(orchestrator.parse_args())
+    archive.run()
+
+    # None lets create_archive use every CPU while stages still run one at a time.
+    assert calls == [{"workers": None, "manifest": False}]
+
+
+@pytest.fixture
+def workspace(tmp_path: Path):
+    root = tmp_path / "repo"
+    (root / "docs").mkdir(parents=True)
+    (root / "docs" / "01_intro.md").write_text("# Intro\n", encoding="utf-8")
+    (root / "docs" / "02_next.md").write_text("# Next\n", encoding="utf-8")
+    output = root / "releases" / "whitepapers"
+    runs: list[str] = []
+
+    def _build() -> None:
+        runs.append("whitepapers")
+        output.mkdir(parents=True, exist_ok=True)
+        (output / "01_intro.html").write_text("<html></html>", encoding="utf-8")
+
+    stage = Stage("whitepapers", _build, inputs=("docs/*.md",), outputs=(output,))
+    store = orchestrator.FingerprintStore(root / "releases" / ".fingerprints", root=root)
+    return root, stage, store, runs
+
+
+def _schedule(workspace, tmp_path: Path, **kwargs) -> StageScheduler:
+    _, stage, store, _ = workspace
+    scheduler = StageScheduler([stage], log_dir=tmp_path / "logs", fingerprints=store, **kwargs)
+    scheduler.run()
+    return scheduler
+
+
+def test_unchanged_inputs_skip_the_stage(workspace, tmp_path: Path) -> None:
+    root, _, _, runs = workspace
+
+    _schedule(workspace, tmp_path)
+    second = _schedule(workspace, tmp_path)
+
+    assert runs == ["whitepapers"]
+    assert second.statuses == {"whitepapers": "up to date"}
+
+    (root / "docs" / "02_next.md").write_text("# Next, revised\n", encoding="utf-8")
+    _schedule(workspace, tmp_path)
+    assert runs == ["whitepapers", "whitepapers"]
+
+
+def test_explain_reports_changed_inputs_and_missing_outputs(workspace, tmp_path: Path) -> None:
+    root, stage, store, _ = workspace
+    _schedule(workspace, tmp_path)
+
+    (root / "docs" / "01_intro.md").write_text("# Intro, revised\n", encoding="utf-8")
+    (root / "docs" / "03_new.md").write_text("# New\n", encoding="utf-8")
+    reason = store.stale_reason(stage, store.collect(stage))
+    assert reason == "inputs changed: docs/01_intro.md; added: docs/03_new.md"
+
+    _schedule(workspace, tmp_path, explain=True)
+    assert "🔎 Out of date: inputs changed" in (tmp_path / "logs" / "whitepapers.log").read_text(encoding="utf-8")
+
+    (root / "releases" / "whitepapers" / "01_intro.html").unlink()
+    assert store.stale_reason(stage, store.collect(stage)) == "outputs missing: releases/whitepapers"
+
+
+def test_force_rebuilds_fresh_stages(workspace, tmp_path: Path) -> None:
+    _, _, _, runs = workspace
+
+    _schedule(workspace, tmp_path)
+    _schedule(workspace, tmp_path, force=True)
+
+    assert runs == ["whitepapers", "whitepapers"]
+
+
+def test_failed_stage_forgets_its_fingerprint(workspace, tmp_path: Path) -> None:
+    root, stage, store, _ = workspace
+    _schedule(workspace, tmp_path)
+    (root / "docs" / "01_intro.md").write_text("# Broken\n", encoding="utf-8")
+
+    def _fail() -> None:
+        raise FileNotFoundError("whitepapers not generated")
+
+    failing = Stage(stage.name, _fail, inputs=stage.inputs, outputs=stage.outputs)
+    with pytest.raises(FileNotFoundError):
+        StageScheduler([failing], log_dir=tmp_path / "logs", fingerprints=store).run()
+
+    assert store.load("whitepapers") is None
+
+
+def test_artifact_cache_restores_outputs_in_a_fresh_workspace(workspace, tmp_path: Path) -> None:
+    root, stage, store, runs = workspace
+    cache = ArtifactCache(tmp_path / "artifact-cache")
+    StageScheduler([stage], log_dir=tmp_path / "logs", fingerprints=store, artifact_cache=cache).run()
+
+    # Simulate a fresh checkout: no outputs, no local fingerprints.
+    shutil.rmtree(root / "releases")
+    scheduler = StageScheduler([stage], log_dir=tmp_path / "logs", fingerprints=store, artifact_cache=cache)
+    scheduler.run()
+
+    assert runs == ["whitepapers"]
+    assert scheduler.statuses == {"whitepapers": "restored"}
+    assert (root / "releases" / "whitepapers" / "01_intro.html").read_text(encoding="utf-8") == "<html></html>"
+    assert store.stale_reason(stage, store.collect(stage)) is None
+
+
+@pytest.fixture
+def release_tree(tmp_path: Path, monkeypatch) -> Path:
+    releases = tmp_path / "releases"
+    monkeypatch.setattr(orchestrator, "RELEASE_ROOT", releases)
+    monkeypatch.setattr(orchestrator, "LOG_ROOT", releases / "logs")
+    monkeypatch.setattr(orchestrator, "FINGERPRINT_ROOT", releases / ".fingerprints")
+    monkeypatch.setattr(orchestrator, "_ARCHIVE_CHUNK_SIZE", 1024)
+
+    (releases / "book").mkdir(parents=True)
+    (releases / "book" / "architecture_as_code.pdf").write_bytes(bytes(range(256)) * 40)
+    (releases / "whitepapers").mkdir()
+    for index in range(12):
+        (releases / "whitepapers" / f"chapter_{index:02d}.html").write_text(
+            f"<html>{'chapter text ' * 500}{index}</html>", encoding="utf-8"
+        )
+    (releases / "logs").mkdir()
+    (releases / "logs" / "book.log").write_text("log", encoding="utf-8")
+    return releases
+
+
+def test_archive_stores_compressed_formats_and_deflates_the_rest(release_tree: Path) -> None:
+    archive_path = release_tree / "release.zip"
+    orchestrator.create_archive(archive_path, workers=4, manifest=True)
+
+    with zipfile.ZipFile(archive_path) as archive:
+        assert archive.testzip() is None
+        infos = {info.filename: info for info in archive.infolist()}
+        assert "logs/book.log" not in infos
+        assert infos["book/architecture_as_code.pdf"].compress_type == zipfile.ZIP_STORED
+        html = infos["whitepapers/chapter_07.html"]
+        assert html.compress_type == zipfile.ZIP_DEFLATED
+        assert html.compress_size < html.file_size
+        assert archive.read(html).decode("utf-8").endswith("7</html>")
+        assert list(infos) == sorted(infos)
+
+    manifest = (release_tree / "release.zip.sha256").read_text(encoding="utf-8").splitlines()
+    assert len(manifest) == 13
+    digest, name = manifest[0].split("  ")
+    assert name == "book/architecture_as_code.pdf"
+    assert digest == hashlib.sha256((release_tree / name).read_bytes()).hexdigest()
+
+    # Rebuilding must not pick up the previous archive or its manifest.
+    orchestrator.create_archive(archive_path, workers=1)
+    with zipfile.ZipFile(archive_path) as archive:
+        assert len(archive.namelist()) == 13
+    assert not (release_tree / "release.zip.sha256").exists()
+
+
+def test_archive_writes_zip64_records_past_the_limit(release_tree: Path, monkeypatch) -> None:
+    archive_path = release_tree / "release.zip"
+    with monkeypatch.context() as patch:
+        patch.setattr(zipfile, "ZIP64_LIMIT", 1000)
+        orchestrator.create_archive(archive_path, workers=2)
+
+    with zipfile.ZipFile(archive_path) as archive:
+        assert archive.testzip() is None
+        pdf = archive.getinfo("book/architecture_as_code.pdf")
+        assert pdf.file_size == 10240
+        assert archive.read(pdf) == (release_tree / "book" / "architecture_as_code.pdf").read_bytes()
+
+
+def test_zip64_fields_are_marked_in_both_headers(release_tree: Path, monkeypatch) -> None:
+    # With the limit lowered, sizes and offsets above it but below 2**32 stand
+    # in for values between 2**31 and 2**32 in a real release.
+    archive_path = release_tree / "release.zip"
+    with monkeypatch.context() as patch:
+        patch.setattr(zipfile, "ZIP64_LIMIT", 1000)
+        orchestrator.create_archive(archive_path, workers=2)
+    data = archive_path.read_bytes()
+
+    end = data.rindex(b"PK\x05\x06")
+    assert struct.unpack_from("<HHII", data, end + 8) == (0xFFFF, 0xFFFF, 0xFFFFFFFF, 0xFFFFFFFF)
+    (zip64_offset,) = struct.unpack_from("<Q", data, end - 20 + 8)
+    (offset,) = struct.unpack_from("<Q", data, zip64_offset + 48)
+    with zipfile.ZipFile(archive_path) as archive:
+        infos = archive.infolist()
+    for info in infos:
+        fields = struct.unpack_from("<IHHHHHHIIIHHHHHII", data, offset)
+        compress_size, file_size, name_length, extra_length, comment_length = fields[8:13]
+        assert fields[16] == (0xFFFFFFFF if info.header_offset > 1000 else info.header_offset)
+        assert (compress_size, file_size) == struct.unpack_from("<II", data, info.header_offset + 18)
+        assert (compress_size == 0xFFFFFFFF) == (max(info.file_size, info.compress_size) > 1000)
+        offset += 46 + name_length + extra_length + comment_length
@@ -0,0 +1,97 @@
+"""Tests for git-diff scoped validation in scripts/change_scope.py."""
+from __future__ import annotations
+
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from scripts.change_scope import resolve_change_scope
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git is not installed")
+
+REFERENCES = """# References
+
+- [**Source [1]:**]{#source-1} First source.
+- [**Source [2]:**]{#source-2} Second source.
+"""
+
+
+def _git(root: Path, *args: str) -> None:
+    subprocess.run(
+        ["git", "-c", "user.name=Test", "-c", "user.email=test@example.com", *args],
+        cwd=root,
+        check=True,
+        capture_output=True,
+    )
+
+
+@pytest.fixture
+def repo(tmp_path: Path) -> Path:
+    docs = tmp_path / "docs"
+    (docs / "images").mkdir(parents=True)
+    (docs / "01_intro.md").write_text(
+        "# Intro\n\n![Overview](images/diagram_01_overview.png)\n\n"
+        "Text [Source [1]](33_references.md#source-1).\n",
+        encoding="utf-8",
+    )
+    (docs / "02_principles.md").write_text(
+        "# Principles\n\nText [Source [2]](33_references.md#source-2).\n", encoding="utf-8"
+    )
+    (docs / "03_practice.md").write_text("# Practice\n\nNo citations.\n", encoding="utf-8")
+    (docs / "33_references.md").write_text(REFERENCES, encoding="utf-8")
+    (docs / "images" / "diagram_01_overview.mmd").write_text("flowchart TD\n  A --> B\n", encoding="utf-8")
+    _git(tmp_path, "init", "-q", "-b", "main")
+    _git(tmp_path, "add", ".")
+    _git(tmp_path, "commit", "-q", "-m", "Initial manuscript")
+    _git(tmp_path, "checkout", "-q", "-b", "feature")
+    return tmp_path
+
+
+def test_diagram_and_reference_changes_pull_in_dependent_chapters(repo: Path) -> None:
+    (repo / "docs" / "images" / "diagram_01_overview.mmd").write_text("flowchart TD\n  A --> C\n", encoding="utf-8")
+    (repo / "docs" / "33_references.md").write_text(
+        REFERENCES.replace("Second source.", "Second source, revised."), encoding="utf-8"
+    )
+
+    scope = resolve_change_scope("main", repo, branch="feature")
+
+    assert scope.files == {
+        "docs/images/diagram_01_overview.mmd",
+        "docs/33_references.md",
+        "docs/01_intro.md",
+        "docs/02_principles.md",
+    }
+
+
+def test_citation_change_pulls_in_references(repo: Path) -> None:
+    chapter = repo / "docs" / "03_practice.md"
+    chapter.write_text("# Practice\n\nNow cited [Source [1]](33_references.md#source-1).\n", encoding="utf-8")
+    _git(repo, "commit", "-q", "-am", "Cite a source")
+
+    scope = resolve_change_scope("main", repo, branch="feature")
+
+    assert scope.files == {"docs/03_practice.md", "docs/33_references.md"}
+    assert scope.filter(sorted((repo / "docs").glob("*.md")), repo) == [chapter, repo / "docs" / "33_references.md"]
+
+
+def test_main_branch_and_unknown_refs_fall_back_to_a_full_run(repo: Path) -> None:
+    assert resolve_change_scope("main", repo, branch="main").full
+    assert resolve_change_scope("no-such-ref", repo, branch="feature").full
+
+    (repo / "mkdocs.yml").write_text("nav: []\n", encoding="utf-8")
+    assert resolve_change_scope("main", repo, branch="feature").full
+
+
+@pytest.mark.parametrize("rel_path", ["tests/test_clarity.py", "scripts/validate_figure_captions.py"])
+def test_test_and_validator_changes_check_the_whole_corpus(repo: Path, rel_path: str) -> None:
+    (repo / rel_path).parent.mkdir(exist_ok=True)
+    (repo / rel_path).write_text("# changed\n", encoding="utf-8")
+    _git(repo, "add", ".")
+    _git(repo, "commit", "-q", "-m", "Change a check")
+
+    scope = resolve_change_scope("main", repo, branch="feature")
+
+    assert scope.full
+    assert scope.reason == f"{rel_path} changed"
@@ -0,0 +1,125 @@
+"""Tests for the manifest-backed fast path in check_mermaid_diagrams."""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+import scripts.check_mermaid_diagrams as check
+from scripts.mermaid_batch_render import RenderResult
+from scripts.mermaid_render_cache import MANIFEST_FILENAME, RenderCache, RenderManifest, build_render_options
+
+CLI_VERSION = "10.7.0"
+
+
+class _CopyRenderer:
+    """Renderer double that 'renders' a PNG by copying the Mermaid source bytes."""
+
+    def __init__(self) -> None:
+        self.rendered: list[Path] = []
+
+    def render(self, jobs):
+        for job in jobs:
+            self.rendered.append(job.source)
+            job.target.write_bytes(job.source.read_bytes())
+            yield RenderResult(job, True)
+
+    def close(self) -> None:
+        pass
+
+
+@pytest.fixture
+def repo(tmp_path: Path, monkeypatch) -> Path:
+    images = tmp_path / "docs" / "images"
+    images.mkdir(parents=True)
+    (tmp_path / "docs" / "mermaid-kvadrat-theme.json").write_text("{}", encoding="utf-8")
+    for name in ("diagram_01", "diagram_02"):
+        source = images / f"{name}.mmd"
+        source.write_text(f"graph LR\n  {name} --> B\n", encoding="utf-8")
+        source.with_suffix(".png").write_bytes(source.read_bytes())
+    monkeypatch.setattr(check, "mermaid_cli_version", lambda root: CLI_VERSION)
+    return tmp_path
+
+
+def _record_all(repo: Path) -> None:
+    images = repo / "docs" / "images"
+    cache = RenderCache(
+        RenderManifest.load(images / MANIFEST_FILENAME),
+        config_file=repo / "docs" / "mermaid-kvadrat-theme.json",
+        options=build_render_options(),
+        cli_version=CLI_VERSION,
+    )
+    for source in images.glob("*.mmd"):
+        cache.record(source)
+    cache.manifest.save()
+
+
+def _use_renderer(monkeypatch, renderer) -> None:
+    monkeypatch.setattr(check, "create_renderer", lambda **kwargs: renderer)
+
+
+def test_manifest_hits_skip_rendering(repo: Path, monkeypatch) -> None:
+    _record_all(repo)
+
+    def _unexpected(**kwargs):
+        raise AssertionError("Unchanged diagrams must not be rendered")
+
+    monkeypatch.setattr(check, "create_renderer", _unexpected)
+    assert check.main([], repo_root=repo) == 0
+
+
+def test_only_changed_diagrams_are_rendered(repo: Path, monkeypatch) -> None:
+    _record_all(repo)
+    changed = repo / "docs" / "images" / "diagram_02.mmd"
+    changed.write_text("graph LR\n  changed --> B\n", encoding="utf-8")
+
+    renderer = _CopyRenderer()
+    _use_renderer(monkeypatch, renderer)
+
+    assert check.main([], repo_root=repo) == 1, "Stale PNG must fail the check"
+    assert renderer.rendered == [changed]
+
+
+def test_full_mode_renders_everything(repo: Path, monkeypatch) -> None:
+    _record_all(repo)
+    renderer = _CopyRenderer()
+    _use_renderer(monkeypatch, renderer)
+
+    assert check.main(["--full"], repo_root=repo) == 0
+    assert len(renderer.rendered) == 2
+
+
+def test_missing_png_is_rendered_once_and_recorded(repo: Path, monkeypatch) -> None:
+    images = repo / "docs" / "images"
+    (images / "diagram_01.png").unlink()
+    renderer = _CopyRenderer()
+    _use_renderer(monkeypatch, renderer)
+
+    assert check.main(["--write-missing"], repo_root=repo) == 0
+    assert renderer.rendered.count(images / "diagram_01.mmd") == 1
+    assert (images / "diagram_01.png").is_file()
+
+    monkeypatch.setattr(check, "create_renderer", lambda **kwargs: pytest.fail("cache miss"))
+    assert check.main([], repo_root=repo) == 0
+
+
+def test_missing_png_fails_without_write_mode(repo: Path, monkeypatch) -> None:
+    _record_all(repo)
+    (repo / "docs" / "images" / "diagram_01.png").unlink()
+    _use_renderer(monkeypatch, _CopyRenderer())
+
+    assert check.main([], repo_root=repo) == 1
+
+
+def test_committed_render_manifest_matches_the_pinned_cli() -> None:
+    repo_root = Path(__file__).resolve().parents[1]
+    manifest_path = repo_root / "docs" / "images" / MANIFEST_FILENAME
+    if not manifest_path.is_file():
+        pytest.skip("The render manifest is seeded by the Verify Mermaid diagrams workflow")
+    lock = json.loads((repo_root / "package-lock.json").read_text(encoding="utf-8"))
+    pinned = lock["packages"]["node_modules/@mermaid-js/mermaid-cli"]["version"]
+
+    manifest = RenderManifest.load(manifest_path)
+
+    assert {entry["cli_version"] for entry in manifest.entries.values()} <= {pinned}
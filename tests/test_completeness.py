@@ -31,10 +31,10 @@ class TestCompleteness:
             f"Found: {existing_files}"
         )
     
-    def test_total_chapter_count(self, chapter_files, requirements_config):
+    def test_total_chapter_count(self, all_chapter_files, requirements_config):
         """Test that the total number of chapters matches expected count."""
         expected_count = requirements_config["book"]["total_chapters"]
-        actual_count = len(chapter_files)
+        actual_count = len(all_chapter_files)
         
         assert actual_count == expected_count, (
             f"Expected {expected_count} chapters, found {actual_count}"
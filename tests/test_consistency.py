@@ -7,6 +7,8 @@ import pytest
 import re
 from collections import Counter
 
+from scripts.manuscript import load_document
+
 
 class TestConsistency:
     """Test consistency in formatting, style, and structure."""
@@ -247,14 +249,12 @@ class TestConsistency:
         
         short_chapters = []
         for chapter_file in chapter_files:
-            content = chapter_file.read_text(encoding='utf-8')
-            
             # Skip special chapters that don't need to meet word count requirements
             if chapter_file.name in special_filenames:
                 continue
             
-            # Extract text content and count words
-            word_count = self._count_content_words(content)
+            # Count prose words, excluding markdown formatting and code blocks
+            word_count = load_document(chapter_file).content_word_count
             
             if word_count < minimum_words:
                 short_chapters.append({
@@ -275,7 +275,7 @@ class TestConsistency:
                     UserWarning
                 )
     
-    def test_chapter_length_variance(self, chapter_files, requirements_config):
+    def test_chapter_length_variance(self, all_chapter_files, requirements_config):
         """Test that no chapter exceeds 100% variance (2x) of the average chapter length."""
         fail_on_consistency = requirements_config.get("testing", {}).get("fail_on_consistency_issues", True)
         
@@ -290,13 +290,12 @@ class TestConsistency:
         chapter_stats = []
         total_words = 0
         
-        for chapter_file in chapter_files:
+        for chapter_file in all_chapter_files:
             # Skip special chapters
             if chapter_file.name in special_filenames:
                 continue
             
-            content = chapter_file.read_text(encoding='utf-8')
-            word_count = self._count_content_words(content)
+            word_count = load_document(chapter_file).content_word_count
             
             chapter_stats.append({
                 "file": chapter_file.name,
@@ -353,28 +352,3 @@ class TestConsistency:
                     f"Chapter length variance detected: {len(excessive_chapters)} chapter(s) exceed 2x mean length. {error_msg}",
                     UserWarning
                 )
-    
-    def _count_content_words(self, content):
-        """Count actual content words, excluding markdown formatting and code blocks."""
-        # Remove code blocks (both fenced and indented)
-        content_no_code = re.sub(r'```.*?```', '', content, flags=re.DOTALL)
-        content_no_code = re.sub(r'^ {4,}.*$', '', content_no_code, flags=re.MULTILINE)
-        
-        # Remove inline code
-        content_no_code = re.sub(r'`[^`]*`', '', content_no_code)
-        
-        # Remove headers (they are structural, not content)
-        content_no_code = re.sub(r'^#{1,6}\s+.*$', '', content_no_code, flags=re.MULTILINE)
-        
-        # Remove image references
-        content_no_code = re.sub(r'!\[.*?\]\([^)]*\)', '', content_no_code)
-        
-        # Remove links but keep link text
-        content_no_code = re.sub(r'\[([^\]]*)\]\([^)]*\)', r'\1', content_no_code)
-        
-        # Remove markdown formatting characters
-        content_no_code = re.sub(r'[*_~`#\[\]()!-]', ' ', content_no_code)
-        
-        # Split into words and count non-empty words
-        words = content_no_code.split()
-        return len([word for word in words if word.strip()])
\ No newline at end of file
@@ -0,0 +1,127 @@
+"""Tests for the per-chapter cached EPUB assembly in scripts/epub_assembler.py."""
+from __future__ import annotations
+
+import json
+import zipfile
+from pathlib import Path
+from xml.etree import ElementTree
+
+import pytest
+
+from scripts.epub_assembler import assemble_epub
+from scripts.pandoc_ast import AstCache
+from scripts.pandoc_server import ConversionResult
+
+OPTIONS = {
+    "number-sections": True,
+    "toc-depth": 2,
+    "metadata": {"title": "Architecture as Code", "author": "Author", "date": "2026-01-01", "lang": "en-GB"},
+}
+
+
+class FragmentConverter:
+    """Reads '#'/'##' headings and raw HTML lines; writes numbered HTML fragments."""
+
+    def __init__(self) -> None:
+        self.requests: list[str] = []
+
+    def convert_many(self, requests):
+        return [self.convert(request) for request in requests]
+
+    def convert(self, request):
+        self.requests.append(request.to)
+        if request.to == "json":
+            blocks = []
+            for line in request.text.splitlines():
+                if line.startswith("#"):
+                    level = len(line) - len(line.lstrip("#"))
+                    title = line.lstrip("# ")
+                    blocks.append({"t": "Header", "c": [level, [title.lower(), [], []], [{"t": "Str", "c": title}]]})
+                elif line.startswith("\\"):
+                    blocks.append({"t": "RawBlock", "c": ["tex", line]})
+                elif line:
+                    blocks.append({"t": "RawBlock", "c": ["html", line]})
+            ast = {"pandoc-api-version": [1, 23, 1], "meta": {}, "blocks": blocks}
+            return ConversionResult(request, json.dumps(ast).encode())
+
+        number = request.options["number-offset"][0]
+        parts = []
+        for block in json.loads(request.text)["blocks"]:
+            if block["t"] == "Header":
+                level, (identifier, _, _), inlines = block["c"]
+                label = inlines[0]["c"]
+                if level == 1:
+                    number += 1
+                    label = f'<span class="header-section-number">{number}</span> {label}'
+                parts.append(f'<h{level} id="{identifier}">{label}</h{level}>')
+            elif block["t"] == "RawBlock" and block["c"][0] == "html":
+                parts.append(block["c"][1])
+        return ConversionResult(request, "\n".join(parts).encode())
+
+
+@pytest.fixture
+def book(tmp_path: Path) -> Path:
+    docs = tmp_path / "docs"
+    (docs / "images").mkdir(parents=True)
+    (docs / "images" / "diagram.png").write_bytes(b"\x89PNG")
+    (docs / "images" / "cover.png").write_bytes(b"\x89PNG cover")
+    (docs / "part_a.md").write_text("\\part{Foundations}\n\\setbookpart{Foundations}\n", encoding="utf-8")
+    (docs / "01_intro.md").write_text(
+        "# Intro\n## Scope\n<p><a href=\"02_next.md#next\">Next</a> <a href=\"#details\">Details</a></p>\n",
+        encoding="utf-8",
+    )
+    (docs / "02_next.md").write_text(
+        "# Next\n## Details\n<p><img src=\"images/diagram.png\" alt=\"Diagram\" /></p>\n", encoding="utf-8"
+    )
+    return docs
+
+
+def _build(book: Path, converter: FragmentConverter, output: Path) -> None:
+    assemble_epub(
+        [book / "part_a.md", book / "01_intro.md", book / "02_next.md"],
+        output,
+        converter,
+        options=OPTIONS,
+        resource_root=book,
+        cover_image=book / "images" / "cover.png",
+        ast_cache=AstCache(book.parent / "cache" / "ast", version="pandoc 3.1"),
+        cache=AstCache(book.parent / "cache" / "xhtml", version="pandoc 3.1"),
+    )
+
+
+def test_epub_package_is_assembled_from_chapter_fragments(book: Path, tmp_path: Path) -> None:
+    output = tmp_path / "book.epub"
+    _build(book, FragmentConverter(), output)
+
+    with zipfile.ZipFile(output) as archive:
+        first = archive.infolist()[0]
+        assert (first.filename, first.compress_type) == ("mimetype", zipfile.ZIP_STORED)
+        names = set(archive.namelist())
+        assert {"EPUB/text/01_intro.xhtml", "EPUB/text/02_next.xhtml", "EPUB/images/diagram.png"} <= names
+        assert "EPUB/text/part_a.xhtml" not in names
+        documents = {name: archive.read(name).decode() for name in names if name.endswith((".xhtml", ".opf"))}
+
+    for text in documents.values():
+        ElementTree.fromstring(text.encode())
+    opf = documents["EPUB/content.opf"]
+    assert "<dc:language>en-GB</dc:language>" in opf and "<dc:date>2026-01-01</dc:date>" in opf
+    assert 'properties="cover-image"' in opf
+    intro = documents["EPUB/text/01_intro.xhtml"]
+    assert 'href="02_next.xhtml#next"' in intro and 'href="02_next.xhtml#details"' in intro
+    assert 'src="../images/diagram.png"' in documents["EPUB/text/02_next.xhtml"]
+    assert '<span class="header-section-number">2</span> Next' in documents["EPUB/text/02_next.xhtml"]
+
+    nav = ElementTree.fromstring(documents["EPUB/nav.xhtml"].encode())
+    links = [link.get("href") for link in nav.iter("{http://www.w3.org/1999/xhtml}a")]
+    assert links == ["text/01_intro.xhtml#intro", "text/01_intro.xhtml#scope", "text/02_next.xhtml#next", "text/02_next.xhtml#details"]
+
+
+def test_single_chapter_edit_converts_only_that_chapter(book: Path, tmp_path: Path) -> None:
+    output = tmp_path / "book.epub"
+    _build(book, FragmentConverter(), output)
+
+    (book / "02_next.md").write_text("# Next\n## Details revised\n", encoding="utf-8")
+    converter = FragmentConverter()
+    _build(book, converter, output)
+
+    assert converter.requests == ["json", "html5"]
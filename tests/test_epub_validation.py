@@ -205,10 +205,10 @@ class TestBuildPipelineConfiguration:
 
     def test_build_script_invokes_pandoc(self, build_script):
         """Verify that the build script renders PDF and DOCX files with Pandoc."""
-        assert 'pandoc --defaults=pandoc.yaml "${CHAPTER_FILES[@]}" -o "$OUTPUT_PDF" 2>&1' in build_script
-        assert 'pandoc --defaults=pandoc.yaml "${NON_LATEX_CHAPTER_FILES[@]}"' in build_script
-        assert '-t docx \\' in build_script
-        assert '-o "$OUTPUT_DOCX"' in build_script
+        assert 'python3 ../scripts/pandoc_ast.py "${CHAPTER_FILES[@]}"' in build_script
+        assert '--pdf-defaults=pandoc.yaml' in build_script
+        assert '--output "pdf=$OUTPUT_PDF"' in build_script
+        assert '--output "docx=$OUTPUT_DOCX"' in build_script
 
     def test_build_script_runs_epubcheck(self, build_script):
         """Ensure the build script validates EPUB output using epubcheck."""
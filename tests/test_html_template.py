@@ -0,0 +1,63 @@
+"""Tests for the compiled placeholder templates in scripts/html_template.py."""
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from scripts.html_template import TemplateError, compile_template  # noqa: E402
+
+SOURCE = (
+    "<title>[[TITLE]]</title>\n"
+    "<h1>[[TITLE]]</h1>\n"
+    "    <!-- Static comment -->\n"
+    "        <!-- CONTENT -->\n"
+    "</body>\n"
+)
+
+
+def test_render_fills_every_occurrence_and_swallows_marker_indentation() -> None:
+    template = compile_template(SOURCE, frozenset({"TITLE", "CONTENT"}))
+
+    html = template.render({"TITLE": "A &amp; B", "CONTENT": "  <p>Body</p>"})
+
+    assert html == (
+        "<title>A &amp; B</title>\n"
+        "<h1>A &amp; B</h1>\n"
+        "    <!-- Static comment -->\n"
+        "  <p>Body</p>\n"
+        "</body>\n"
+    )
+    assert template.slot_names == ("TITLE", "TITLE", "CONTENT")
+
+
+def test_compile_rejects_missing_and_unknown_slots() -> None:
+    with pytest.raises(TemplateError, match="missing slots: AUTHOR; unknown slots: CONTENT"):
+        compile_template(SOURCE, frozenset({"TITLE", "AUTHOR"}))
+
+
+def test_render_rejects_values_that_do_not_match_the_slots() -> None:
+    template = compile_template(SOURCE)
+
+    with pytest.raises(TemplateError, match="missing slots: CONTENT"):
+        template.render({"TITLE": "Title"})
+    with pytest.raises(TemplateError, match="unknown slots: EXTRA"):
+        template.render({"TITLE": "Title", "CONTENT": "", "EXTRA": ""})
+
+
+def test_compiled_templates_are_cached() -> None:
+    assert compile_template(SOURCE) is compile_template(SOURCE)
+
+
+def test_whitepaper_template_provides_every_slot() -> None:
+    from generate_whitepapers import WHITEPAPER_SLOTS, load_whitepaper_template
+
+    template = compile_template(load_whitepaper_template(), WHITEPAPER_SLOTS)
+
+    assert template.slots == WHITEPAPER_SLOTS
+    assert "[[" not in "".join(template.literals)
@@ -0,0 +1,120 @@
+"""Tests for the incremental PDF build in scripts/latex_build.py."""
+from __future__ import annotations
+
+import json
+import stat
+import sys
+from pathlib import Path
+
+import pytest
+
+from scripts.latex_build import build_pdf, master_document
+from scripts.pandoc_ast import AstCache
+from scripts.pandoc_server import ConversionResult, PandocError
+
+FAKE_ENGINE = """#!{python}
+import pathlib, re, sys
+cwd = pathlib.Path.cwd()
+with open(cwd.parent / "runs.log", "a") as log:
+    log.write("run\\n")
+inputs = re.findall(r"\\\\input\\{{([^}}]+)\\}}", (cwd / "book.tex").read_text())
+body = "".join((cwd / name).read_text() for name in inputs)
+aux = cwd / "book.aux"
+listed = "".join(f"INPUT ./{{name}}\\n" for name in ["book.tex", *inputs])
+(cwd / "book.fls").write_text(f"PWD {{cwd}}\\n{{listed}}INPUT ./book.aux\\nOUTPUT book.aux\\nOUTPUT book.pdf\\n")
+aux.write_text("".join(f"\\\\@input{{{{{{name}}}}}}\\n" for name in inputs))
+(cwd / "book.pdf").write_text("%PDF " + body)
+"""
+
+
+def _chapter(title: str) -> dict:
+    header = {"t": "Header", "c": [1, [title.lower(), [], []], [{"t": "Str", "c": title}]]}
+    code = {"t": "CodeBlock", "c": [["", ["python"], []], "print('secret')"]}
+    return {"pandoc-api-version": [1, 23, 1], "meta": {}, "blocks": [header, code]}
+
+
+class LatexConverter:
+    """Writes a chapter's first heading as LaTeX; fails for templates in ``broken``."""
+
+    def __init__(self, broken: tuple[str, ...] = ()) -> None:
+        self.broken = broken
+        self.requests: list[str] = []
+
+    def convert_many(self, requests):
+        return [self.convert(request) for request in requests]
+
+    def convert(self, request):
+        ast = json.loads(request.text)
+        if request.options.get("standalone"):
+            template = request.options.get("template", "default")
+            self.requests.append(f"master:{template}")
+            if template in self.broken:
+                raise PandocError(f"Could not find template {template}")
+            body = "\n".join(block["c"][1] for block in ast["blocks"] if block["t"] == "RawBlock")
+            return ConversionResult(request, f"% {template}\n{body}\n".encode())
+        title = ast["blocks"][0]["c"][2][0]["c"]
+        self.requests.append(f"fragment:{title}")
+        return ConversionResult(request, f"\\chapter{{{title}}}\n".encode())
+
+
+@pytest.fixture
+def engine(tmp_path: Path) -> Path:
+    path = tmp_path / "bin" / "xelatex"
+    path.parent.mkdir()
+    path.write_text(FAKE_ENGINE.format(python=sys.executable), encoding="utf-8")
+    path.chmod(path.stat().st_mode | stat.S_IXUSR)
+    return path
+
+
+def _build(tmp_path: Path, engine: Path, converter: LatexConverter, titles: list[str], **kwargs) -> bytes:
+    return build_pdf(
+        [f"{index:02d}_chapter" for index in range(len(titles))],
+        [_chapter(title) for title in titles],
+        converter,
+        options={"pdf-engine": str(engine), "template": "eisvogel.latex", "top-level-division": "chapter"},
+        build_dir=tmp_path / "build",
+        cache=AstCache(tmp_path / "build" / "cache", version="pandoc 3.1"),
+        cli=converter,
+        **kwargs,
+    )
+
+
+def _runs(tmp_path: Path) -> int:
+    log = tmp_path / "runs.log"
+    return len(log.read_text().splitlines()) if log.exists() else 0
+
+
+def test_unchanged_book_skips_the_engine(tmp_path: Path, engine: Path, capsys) -> None:
+    pdf = _build(tmp_path, engine, LatexConverter(), ["Intro", "Next"])
+
+    assert pdf == b"%PDF \\chapter{Intro}\n\\chapter{Next}\n"
+    assert _runs(tmp_path) == 2
+    assert "Pass 1 changed book.aux" in capsys.readouterr().out
+    master = (tmp_path / "build" / "book.tex").read_text()
+    assert master.index("\\iffalse") < master.index("\\fi") < master.index("\\input{chapters/00_chapter.tex}")
+    sample = [block for block in master_document(["00_chapter"], [_chapter("Intro")])["blocks"] if block["t"] == "CodeBlock"]
+    assert sample == [{"t": "CodeBlock", "c": [["", ["python"], []], "x"]}]
+
+    converter = LatexConverter()
+    assert _build(tmp_path, engine, converter, ["Intro", "Next"]) == pdf
+    assert converter.requests == []
+    assert _runs(tmp_path) == 2
+
+    converter = LatexConverter()
+    assert _build(tmp_path, engine, converter, ["Intro", "Later"]) == b"%PDF \\chapter{Intro}\n\\chapter{Later}\n"
+    assert converter.requests == ["fragment:Later"]
+    assert _runs(tmp_path) == 3
+
+
+def test_failed_template_is_remembered(tmp_path: Path, engine: Path) -> None:
+    converter = LatexConverter(broken=("eisvogel.latex",))
+    _build(tmp_path, engine, converter, ["Intro"], fallback_template="default")
+
+    assert converter.requests == ["fragment:Intro", "master:eisvogel.latex", "master:default"]
+    assert (tmp_path / "build" / "book.tex").read_text().startswith("% default")
+
+    converter = LatexConverter(broken=("eisvogel.latex",))
+    _build(tmp_path, engine, converter, ["Intro"], fallback_template="default")
+
+    assert converter.requests == []
+    assert _runs(tmp_path) == 2
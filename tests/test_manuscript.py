@@ -0,0 +1,98 @@
+"""Tests for the parsed manuscript model in scripts/manuscript.py."""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from scripts import manuscript
+from scripts.manuscript import load_document, parse_document
+
+CHAPTER = """# Governance as Code
+
+Governance policies are expressed as code and
+reviewed like any other change [Source [4]](33_references.md#source-4).
+
+![Governance flow](images/diagram_11_governance.png)
+
+## Policy pipeline
+
+```python
+# Not a heading
+print("![not an image](images/x.png)")
+```
+
+- Bullet points are not paragraphs
+| Tables | are not either |
+
+Mismatched [Source [2]](33_references.md#source-3) and broken [Source [5]](refs.md).
+
+## Sources
+
+- Example Author. "Policy as Code." https://example.com/policy
+### Academic sources
+- Second Author. Book title. ISBN 978-0-00-000000-0
+## Next steps
+
+- Not a source
+"""
+
+
+def test_parse_document_extracts_structure() -> None:
+    document = parse_document(CHAPTER)
+
+    assert document.title == "Governance as Code"
+    assert document.section_headings() == ["Policy pipeline", "Sources", "Next steps"]
+    assert document.has_sources_section
+    assert [paragraph.text for paragraph in document.paragraphs] == [
+        "Governance policies are expressed as code and reviewed like any other change "
+        "[Source [4]](33_references.md#source-4).",
+        "Mismatched [Source [2]](33_references.md#source-3) and broken [Source [5]](refs.md).",
+    ]
+    assert document.paragraphs[0].line == 3
+
+    [code] = document.code_blocks
+    assert code.language == "python"
+    assert code.content.startswith("# Not a heading")
+
+    [image] = document.images
+    assert (image.target, image.line, image.standalone) == ("images/diagram_11_governance.png", 6, True)
+
+    assert [(c.line, c.number, c.anchor, c.well_formed) for c in document.citations] == [
+        (4, 4, 4, True),
+        (18, 2, 3, False),
+        (18, None, None, False),
+    ]
+    assert [(entry.line, entry.text[:14]) for entry in document.sources] == [
+        (22, "Example Author"),
+        (24, "Second Author."),
+    ]
+
+
+def test_load_document_reuses_the_persistent_cache(tmp_path: Path, monkeypatch) -> None:
+    chapter = tmp_path / "11_governance.md"
+    chapter.write_text(CHAPTER, encoding="utf-8")
+    cache_dir = tmp_path / "cache"
+
+    parsed = load_document(chapter, cache_dir)
+    [entry] = cache_dir.glob("*.json")
+    assert entry.stem == parsed.sha256
+    assert json.loads(entry.read_text(encoding="utf-8"))["title"] == "Governance as Code"
+
+    def _fail(*args, **kwargs):
+        raise AssertionError("cached chapter was parsed again")
+
+    monkeypatch.setattr(manuscript, "parse_document", _fail)
+    manuscript._memo.clear()
+    cached = load_document(chapter, cache_dir)
+
+    assert cached == parsed
+    assert cached.text == CHAPTER
+
+
+def test_edited_chapters_are_parsed_again(tmp_path: Path) -> None:
+    chapter = tmp_path / "01_intro.md"
+    chapter.write_text("# First title\n", encoding="utf-8")
+    assert load_document(chapter, cache_dir=None).title == "First title"
+
+    chapter.write_text("# Second, longer title\n", encoding="utf-8")
+    assert load_document(chapter, cache_dir=None).title == "Second, longer title"
@@ -0,0 +1,85 @@
+"""Tests for the single-pass lint engine in scripts/manuscript_lint.py."""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from scripts.manuscript_lint import (
+    Finding,
+    ReferenceAuditRule,
+    SourceFile,
+    format_sarif,
+    run_rules,
+)
+
+
+@pytest.fixture
+def corpus(tmp_path: Path) -> Path:
+    docs = tmp_path / "docs"
+    (docs / "images").mkdir(parents=True)
+    (docs / "01_intro.md").write_text(
+        "# Introduction\n\n## lowercase heading\n\n```bash\n# not a heading\n```\n\n*figure 1.1 caption*\n",
+        encoding="utf-8",
+    )
+    (docs / "03_gap.md").write_text("# Gap\n", encoding="utf-8")
+    (docs / "images" / "diagram.mmd").write_text(
+        "flowchart TD\n  A[Colour] --> B[color]\n  B:::kv-unknown\n", encoding="utf-8"
+    )
+    return tmp_path
+
+
+def test_rules_share_one_pass_over_the_corpus(corpus: Path) -> None:
+    rules = ["heading-capitalization", "figure-caption", "diagram-branding", "doc-numbering"]
+    findings = run_rules(rules, root=corpus, jobs=1)
+
+    assert {(finding.rule, finding.path, finding.line) for finding in findings} == {
+        ("heading-capitalization", "docs/01_intro.md", 3),
+        ("figure-caption", "docs/01_intro.md", 9),
+        ("diagram-branding", "docs/images/diagram.mmd", 2),
+        ("diagram-branding", "docs/images/diagram.mmd", 3),
+        ("doc-numbering", "docs", None),
+    }
+    assert run_rules(rules, root=corpus, jobs=2) == findings
+
+
+def test_selected_paths_still_feed_cross_file_checks(corpus: Path) -> None:
+    findings = run_rules(
+        ["heading-capitalization", "doc-numbering"],
+        [corpus / "docs" / "03_gap.md"],
+        root=corpus,
+        jobs=1,
+    )
+
+    assert [finding.message for finding in findings] == [
+        "Gap detected between numbered chapters: 01 is followed by 03."
+    ]
+
+
+def test_reference_audit_reports_malformed_citations(tmp_path: Path) -> None:
+    chapter = tmp_path / "chapter.md"
+    chapter.write_text(
+        "# Chapter\n\nSee [Source [2]](33_references.md#source-3).\n\n## References\n",
+        encoding="utf-8",
+    )
+
+    findings = list(ReferenceAuditRule().check(SourceFile(chapter, tmp_path)))
+
+    assert [(finding.line, finding.severity) for finding in findings] == [
+        (None, "warning"),
+        (5, "warning"),
+        (3, "warning"),
+    ]
+
+
+def test_sarif_report_lists_rules_and_locations() -> None:
+    findings = [Finding("heading-capitalization", "docs/01_intro.md", 3, "## lowercase heading")]
+
+    sarif = json.loads(format_sarif(findings, ["heading-capitalization"]))
+
+    run = sarif["runs"][0]
+    assert sarif["version"] == "2.1.0"
+    assert run["tool"]["driver"]["rules"][0]["id"] == "heading-capitalization"
+    location = run["results"][0]["locations"][0]["physicalLocation"]
+    assert location == {"artifactLocation": {"uri": "docs/01_intro.md"}, "region": {"startLine": 3}}
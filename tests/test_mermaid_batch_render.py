@@ -0,0 +1,144 @@
+"""Tests for the single-browser Mermaid batch renderer."""
+from __future__ import annotations
+
+import json
+import sys
+import textwrap
+from pathlib import Path
+
+import pytest
+
+from scripts.mermaid_batch_render import (
+    BatchRenderer,
+    MmdcRenderer,
+    RenderJob,
+    RendererUnavailable,
+    main,
+)
+from scripts.mermaid_render_cache import MANIFEST_FILENAME
+
+# Stand-in for ``node mermaid_batch_worker.mjs``: speaks the same JSON-lines
+# protocol, "renders" by copying the source bytes, fails on sources that
+# contain the word "broken" and never answers for sources containing "hang".
+# It also writes more stderr than a pipe buffer holds.
+FAKE_WORKER = textwrap.dedent(
+    """\
+    #!{python}
+    import json
+    import sys
+    from pathlib import Path
+
+    for line in sys.stdin:
+        job = json.loads(line)
+        source = Path(job["source"]).read_text(encoding="utf-8")
+        sys.stderr.write("Chromium warning\\n" * 5000)
+        if "hang" in source:
+            sys.stdin.read()
+        if "broken" in source:
+            print(json.dumps({{"id": job["id"], "ok": False, "error": "Parse error"}}), flush=True)
+            continue
+        Path(job["target"]).write_text(source + job["background"], encoding="utf-8")
+        print(json.dumps({{"id": job["id"], "ok": True}}), flush=True)
+    """
+)
+
+
+@pytest.fixture
+def fake_root(tmp_path: Path) -> Path:
+    package_dir = tmp_path / "node_modules" / "@mermaid-js" / "mermaid-cli"
+    package_dir.mkdir(parents=True)
+    (package_dir / "package.json").write_text(json.dumps({"name": "mermaid-cli"}))
+    return tmp_path
+
+
+@pytest.fixture
+def fake_node(tmp_path: Path) -> str:
+    worker = tmp_path / "fake-node"
+    worker.write_text(FAKE_WORKER.format(python=sys.executable), encoding="utf-8")
+    worker.chmod(0o755)
+    return str(worker)
+
+
+def _source(directory: Path, name: str, body: str) -> Path:
+    path = directory / f"{name}.mmd"
+    path.write_text(body, encoding="utf-8")
+    return path
+
+
+def test_batch_renderer_streams_results_for_every_job(
+    tmp_path: Path, fake_root: Path, fake_node: str
+) -> None:
+    good = _source(tmp_path, "good", "graph LR\n  A --> B\n")
+    bad = _source(tmp_path, "bad", "graph LR\n  broken\n")
+    jobs = [
+        RenderJob(good, good.with_suffix(".png")),
+        RenderJob(bad, bad.with_suffix(".png")),
+    ]
+
+    with BatchRenderer(root=fake_root, node=fake_node, pages=2) as renderer:
+        results = {result.job.source: result for result in renderer.render(jobs)}
+        # The worker stays alive between batches.
+        second = list(renderer.render([RenderJob(good, tmp_path / "again.png")]))
+
+    assert results[good].success
+    assert good.with_suffix(".png").read_text(encoding="utf-8").endswith("transparent")
+    assert not results[bad].success
+    assert results[bad].detail == "Parse error"
+    assert [result.success for result in second] == [True]
+
+
+def test_hung_worker_falls_back_to_mmdc(tmp_path: Path, fake_root: Path, fake_node: str) -> None:
+    mmdc = fake_root / "node_modules" / ".bin" / "mmdc"
+    mmdc.parent.mkdir()
+    mmdc.write_text(
+        f"#!{sys.executable}\nimport shutil, sys\n"
+        "args = sys.argv[1:]\nshutil.copy(args[args.index('-i') + 1], args[args.index('-o') + 1])\n",
+        encoding="utf-8",
+    )
+    mmdc.chmod(0o755)
+    hung = _source(tmp_path, "hung", "graph LR\n  hang\n")
+
+    with BatchRenderer(root=fake_root, node=fake_node, job_timeout=1) as renderer:
+        results = list(renderer.render([RenderJob(hung, hung.with_suffix(".png"))]))
+
+    assert [result.success for result in results] == [True]
+    assert hung.with_suffix(".png").read_text(encoding="utf-8") == "graph LR\n  hang\n"
+
+
+def test_batch_renderer_requires_mermaid_cli_package(tmp_path: Path, fake_node: str, monkeypatch) -> None:
+    monkeypatch.setattr("shutil.which", lambda name: None)
+    with pytest.raises(RendererUnavailable):
+        BatchRenderer(root=tmp_path, node=fake_node)
+
+
+def test_mmdc_command_matches_book_build_flags(tmp_path: Path) -> None:
+    theme = tmp_path / "theme.json"
+    theme.write_text("{}", encoding="utf-8")
+    job = RenderJob(tmp_path / "a.mmd", tmp_path / "a.png", config_file=theme)
+
+    command = MmdcRenderer(Path("mmdc")).build_command(job)
+
+    assert command[:5] == ["mmdc", "-i", str(job.source), "-o", str(job.target)]
+    for flag, value in (("-t", "default"), ("-b", "transparent"), ("--width", "1400"),
+                        ("--height", "900"), ("-c", str(theme))):
+        assert command[command.index(flag) + 1] == value
+
+
+def test_cli_records_successful_renders_in_manifest(
+    tmp_path: Path, fake_root: Path, fake_node: str, monkeypatch
+) -> None:
+    good = _source(tmp_path, "good", "graph LR\n  A --> B\n")
+    bad = _source(tmp_path, "bad", "graph LR\n  broken\n")
+
+    original_init = BatchRenderer.__init__
+
+    def _init(self, **kwargs):
+        original_init(self, **{**kwargs, "root": fake_root, "node": fake_node})
+
+    monkeypatch.setattr(BatchRenderer, "__init__", _init)
+
+    assert main(["--cli-version", "10.7.0", "--manifest", str(tmp_path / MANIFEST_FILENAME),
+                 str(good), str(bad)]) == 0
+
+    manifest = json.loads((tmp_path / MANIFEST_FILENAME).read_text(encoding="utf-8"))
+    assert list(manifest["diagrams"]) == ["good.mmd"]
@@ -0,0 +1,100 @@
+"""Tests for the content-addressed Mermaid render cache."""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from scripts.mermaid_render_cache import (
+    MANIFEST_FILENAME,
+    RenderCache,
+    RenderManifest,
+    build_render_options,
+    main,
+)
+
+
+def _make_diagram(images_dir: Path, name: str, source: str, png: bytes = b"png") -> Path:
+    images_dir.mkdir(parents=True, exist_ok=True)
+    mmd = images_dir / f"{name}.mmd"
+    mmd.write_text(source, encoding="utf-8")
+    (images_dir / f"{name}.png").write_bytes(png)
+    return mmd
+
+
+def _cache(images_dir: Path, theme: Path | None = None, version: str = "10.7.0") -> RenderCache:
+    return RenderCache(
+        RenderManifest.load(images_dir / MANIFEST_FILENAME),
+        config_file=theme,
+        options=build_render_options(),
+        cli_version=version,
+    )
+
+
+def test_unrecorded_diagrams_are_stale(tmp_path: Path) -> None:
+    source = _make_diagram(tmp_path, "diagram_01", "graph LR\n  A --> B\n")
+    assert _cache(tmp_path).stale_sources([source]) == [source]
+
+
+def test_recorded_diagram_is_a_cache_hit(tmp_path: Path) -> None:
+    source = _make_diagram(tmp_path, "diagram_01", "graph LR\n  A --> B\n")
+    cache = _cache(tmp_path)
+    cache.record(source)
+    assert cache.manifest.save()
+
+    reloaded = _cache(tmp_path)
+    assert reloaded.stale_sources([source]) == []
+    assert not reloaded.manifest.save(), "Unchanged manifests must not be rewritten"
+
+
+def test_cache_key_covers_every_render_input(tmp_path: Path) -> None:
+    theme = tmp_path / "theme.json"
+    theme.write_text('{"theme": "base"}', encoding="utf-8")
+    source = _make_diagram(tmp_path / "images", "diagram_01", "graph LR\n  A --> B\n")
+    images_dir = source.parent
+
+    cache = _cache(images_dir, theme)
+    cache.record(source)
+    cache.manifest.save()
+
+    assert _cache(images_dir, theme, version="11.0.0").stale_sources([source]) == [source]
+
+    wider = RenderCache(
+        RenderManifest.load(images_dir / MANIFEST_FILENAME),
+        config_file=theme,
+        options=build_render_options(width=1600),
+        cli_version="10.7.0",
+    )
+    assert wider.stale_sources([source]) == [source]
+
+    theme.write_text('{"theme": "dark"}', encoding="utf-8")
+    assert _cache(images_dir, theme).stale_sources([source]) == [source]
+
+    theme.write_text('{"theme": "base"}', encoding="utf-8")
+    source.write_text("graph LR\n  A --> C\n", encoding="utf-8")
+    assert _cache(images_dir, theme).stale_sources([source]) == [source]
+
+
+def test_modified_png_invalidates_entry(tmp_path: Path) -> None:
+    source = _make_diagram(tmp_path, "diagram_01", "graph TD\n  A --> B\n")
+    cache = _cache(tmp_path)
+    cache.record(source)
+    cache.manifest.save()
+
+    source.with_suffix(".png").write_bytes(b"edited by hand")
+    assert _cache(tmp_path).stale_sources([source]) == [source]
+
+
+def test_cli_stale_and_record_round_trip(tmp_path: Path, capsys) -> None:
+    first = _make_diagram(tmp_path, "diagram_01", "graph LR\n  A --> B\n")
+    second = _make_diagram(tmp_path, "diagram_02", "graph LR\n  C --> D\n")
+    args = ["--cli-version", "10.7.0", str(first), str(second)]
+
+    assert main(["stale", *args]) == 0
+    assert capsys.readouterr().out.split() == [str(first), str(second)]
+
+    assert main(["record", *args]) == 0
+    manifest = json.loads((tmp_path / MANIFEST_FILENAME).read_text(encoding="utf-8"))
+    assert sorted(manifest["diagrams"]) == ["diagram_01.mmd", "diagram_02.mmd"]
+
+    assert main(["stale", *args]) == 0
+    assert capsys.readouterr().out == ""
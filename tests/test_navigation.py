@@ -0,0 +1,71 @@
+"""Tests for the cached navigation index in scripts/navigation.py."""
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from scripts import navigation
+from scripts.navigation import NavigationError, load_navigation_index
+
+MKDOCS = """site_name: Test
+nav:
+  - Overview:
+      - Welcome: index.md
+  - Part A – Foundations:
+      - index: part_a.md
+      - Introduction: 01_intro.md
+      - Principles: 02_principles.md
+  - Appendices:
+      - Glossary: 30_glossary.md
+"""
+
+
+@pytest.fixture
+def mkdocs(tmp_path: Path) -> Path:
+    path = tmp_path / "mkdocs.yml"
+    path.write_text(MKDOCS, encoding="utf-8")
+    return path
+
+
+def test_index_exposes_positions_parts_and_neighbours(mkdocs: Path, tmp_path: Path) -> None:
+    index = load_navigation_index(mkdocs, sidecar=tmp_path / "navigation.json")
+
+    assert index.book_files == ("part_a.md", "01_intro.md", "02_principles.md", "30_glossary.md")
+    assert index.chapter_files == ("01_intro.md", "02_principles.md", "30_glossary.md")
+    assert index.position("02_principles.md") == 2
+    assert index.position("index.md") is None
+    assert index.part_of("01_intro.md") == "Part A – Foundations"
+    assert index.part_of("30_glossary.md") == "Appendices"
+    assert index.neighbours("02_principles.md") == ("01_intro.md", "30_glossary.md")
+    assert index.neighbours("part_a.md") == (None, "01_intro.md")
+
+
+def test_index_is_cached_until_mkdocs_changes(mkdocs: Path, tmp_path: Path) -> None:
+    sidecar = tmp_path / "navigation.json"
+    first = load_navigation_index(mkdocs, sidecar=sidecar)
+    assert load_navigation_index(mkdocs, sidecar=sidecar) is first
+
+    mkdocs.write_text(MKDOCS.replace("      - Glossary: 30_glossary.md\n", ""), encoding="utf-8")
+    os.utime(mkdocs, ns=(1, 1))
+    assert load_navigation_index(mkdocs, sidecar=sidecar).book_files[-1] == "02_principles.md"
+
+
+def test_sidecar_is_reused_without_parsing_yaml(mkdocs: Path, tmp_path: Path, monkeypatch) -> None:
+    sidecar = tmp_path / "navigation.json"
+    expected = load_navigation_index(mkdocs, sidecar=sidecar)
+    assert json.loads(sidecar.read_text(encoding="utf-8"))["book_files"] == list(expected.book_files)
+
+    def _fail(path: Path) -> list:
+        raise AssertionError("mkdocs.yml should not be parsed")
+
+    monkeypatch.setattr(navigation, "_parse_navigation", _fail)
+    navigation._index_cache.clear()
+    assert load_navigation_index(mkdocs, sidecar=sidecar).book_files == expected.book_files
+
+
+def test_missing_configuration_is_reported(tmp_path: Path) -> None:
+    with pytest.raises(NavigationError, match="not found"):
+        load_navigation_index(tmp_path / "mkdocs.yml", sidecar=None)
@@ -0,0 +1,140 @@
+"""Tests for the parse-once pandoc AST fan-out in scripts/pandoc_ast.py."""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from scripts.pandoc_ast import AstCache, combine, fan_out, non_latex_source
+from scripts.pandoc_server import ConversionResult, PandocError
+
+API_VERSION = [1, 23, 1]
+
+
+def _header(identifier: str, text: str) -> dict:
+    return {"t": "Header", "c": [1, [identifier, [], []], [{"t": "Str", "c": text}]]}
+
+
+class RecordingConverter:
+    """Parses '# Title' lines into headers and records writer requests."""
+
+    def __init__(self) -> None:
+        self.parsed: list[str] = []
+        self.readers: dict[str, list[dict]] = {}
+        self.written: dict[str, dict] = {}
+
+    def convert_many(self, requests):
+        return [self.convert(request) for request in requests]
+
+    def convert(self, request):
+        if request.to == "json":
+            self.parsed.append(request.text)
+            self.readers.setdefault(request.text, []).append(dict(request.options))
+            blocks = []
+            for line in request.text.splitlines():
+                if line.startswith("# "):
+                    blocks.append(_header(line[2:].lower(), line[2:]))
+                elif line.startswith("\\"):
+                    blocks.append({"t": "RawBlock", "c": ["tex", line]})
+            ast = {"pandoc-api-version": API_VERSION, "meta": {}, "blocks": blocks}
+            return ConversionResult(request, json.dumps(ast).encode())
+        self.written[request.to] = json.loads(request.text)
+        return ConversionResult(request, request.to.encode())
+
+
+def test_part_introductions_lose_latex_commands(tmp_path: Path) -> None:
+    part = tmp_path / "part_a_foundations.md"
+    part.write_text(
+        "\\cleardoublepage\n\\part{Foundations}\n\\setbookpart{Foundations}\n\n# Part A\n\nIntro \\part{kept}\n",
+        encoding="utf-8",
+    )
+    empty_part = tmp_path / "part_b_platform.md"
+    empty_part.write_text("\\cleardoublepage\n\\part{Platform}\n", encoding="utf-8")
+    chapter = tmp_path / "01_intro.md"
+    chapter.write_text("\\newpage\n# Intro\n", encoding="utf-8")
+
+    assert non_latex_source(part) == "# Part A\n\nIntro \\part{kept}\n"
+    assert non_latex_source(empty_part) == ""
+    assert non_latex_source(chapter) == "\\newpage\n# Intro\n"
+
+
+def test_combine_deduplicates_heading_identifiers() -> None:
+    chapter = {"pandoc-api-version": API_VERSION, "meta": {}, "blocks": [_header("summary", "Summary")]}
+
+    combined = combine([chapter, chapter, chapter])
+
+    assert [block["c"][1][0] for block in combined["blocks"]] == ["summary", "summary-1", "summary-2"]
+
+
+def test_fan_out_parses_each_chapter_once_per_content(tmp_path: Path) -> None:
+    (tmp_path / "00_front_cover.md").write_text("# Cover\n", encoding="utf-8")
+    (tmp_path / "part_a.md").write_text("\\part{Foundations}\n", encoding="utf-8")
+    (tmp_path / "01_intro.md").write_text("# Intro\n", encoding="utf-8")
+    chapters = [tmp_path / "part_a.md", tmp_path / "01_intro.md"]
+    cache = AstCache(tmp_path / "cache", version="pandoc 3.1")
+    converter = RecordingConverter()
+
+    results = fan_out(
+        chapters,
+        [("epub", tmp_path / "book.epub"), ("latex", tmp_path / "book.tex")],
+        converter,
+        cover_page=tmp_path / "00_front_cover.md",
+        cache=cache,
+    )
+
+    assert {fmt: result.output for fmt, result in results.items()} == {"epub": b"epub", "latex": b"latex"}
+    assert len(converter.parsed) == 3
+    assert converter.written["latex"]["blocks"] == [
+        {"t": "RawBlock", "c": ["tex", "\\part{Foundations}"]},
+        _header("intro", "Intro"),
+    ]
+    assert converter.written["epub"]["blocks"] == [_header("cover", "Cover"), _header("intro", "Intro")]
+
+    (tmp_path / "01_intro.md").write_text("# Introduction\n", encoding="utf-8")
+    fan_out(chapters, [("epub", tmp_path / "book.epub")], converter, cover_page=tmp_path / "00_front_cover.md", cache=cache)
+
+    assert converter.parsed[3:] == ["# Introduction\n"]
+
+
+def test_fan_out_reads_each_format_group_with_its_own_reader_options(tmp_path: Path) -> None:
+    (tmp_path / "01_intro.md").write_text("# Intro\n", encoding="utf-8")
+    converter = RecordingConverter()
+
+    fan_out(
+        [tmp_path / "01_intro.md"],
+        [("latex", tmp_path / "book.tex"), ("epub", tmp_path / "book.epub")],
+        converter,
+        pdf_options={"shift-heading-level-by": -1, "template": "eisvogel.latex"},
+        options={"strip-comments": True},
+        cache=AstCache(None, version="pandoc 3.1"),
+    )
+
+    assert sorted(converter.readers["# Intro\n"], key=sorted) == [
+        {"shift-heading-level-by": -1},
+        {"strip-comments": True},
+    ]
+
+
+def test_fan_out_reports_pandoc_errors_and_raises_anything_else(tmp_path: Path) -> None:
+    (tmp_path / "01_intro.md").write_text("# Intro\n", encoding="utf-8")
+
+    class FailingConverter(RecordingConverter):
+        def __init__(self, error: Exception) -> None:
+            super().__init__()
+            self.error = error
+
+        def convert(self, request):
+            if request.to != "json":
+                raise self.error
+            return super().convert(request)
+
+    chapters = [tmp_path / "01_intro.md"]
+    outputs = [("epub", tmp_path / "book.epub")]
+    cache = AstCache(None, version="pandoc 3.1")
+
+    results = fan_out(chapters, outputs, FailingConverter(PandocError("bad option")), cache=cache)
+    assert isinstance(results["epub"], PandocError)
+
+    with pytest.raises(RuntimeError, match="writer bug"):
+        fan_out(chapters, outputs, FailingConverter(RuntimeError("writer bug")), cache=cache)
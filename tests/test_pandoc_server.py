@@ -0,0 +1,129 @@
+"""Tests for the pooled pandoc-server client in scripts/pandoc_server.py."""
+from __future__ import annotations
+
+import base64
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+from scripts.pandoc_server import (
+    ConversionRequest,
+    PandocCli,
+    PandocError,
+    PandocServerPool,
+    load_defaults,
+    with_metadata,
+)
+
+# Speaks enough of the pandoc-server protocol to exercise the pool: it echoes
+# the request text, base64-encoding binary formats as pandoc-server does.
+FAKE_SERVER = '''
+import base64, json, sys, time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        if request["to"] == "drop":
+            self.close_connection = True
+            return
+        if request["to"] == "slow":
+            time.sleep(2)
+        if request["to"] == "broken":
+            status, reply = 500, {"error": "Unknown output format broken"}
+        else:
+            output = f"{request['to']}:{request['text']}:{','.join(sorted(request['files']))}"
+            binary = request["to"] in ("epub", "docx")
+            if binary:
+                output = base64.b64encode(output.encode()).decode()
+            status, reply = 200, {"output": output, "base64": binary, "messages": []}
+        body = json.dumps(reply).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+ThreadingHTTPServer(("127.0.0.1", int(sys.argv[sys.argv.index("--port") + 1])), Handler).serve_forever()
+'''
+
+
+@pytest.fixture
+def resources(tmp_path: Path) -> Path:
+    (tmp_path / "images").mkdir()
+    (tmp_path / "images" / "diagram_01.png").write_bytes(b"\x89PNG")
+    (tmp_path / "images" / "cover.png").write_bytes(b"cover")
+    return tmp_path
+
+
+def test_payload_carries_options_and_embedded_images(resources: Path) -> None:
+    defaults = resources / "defaults.yaml"
+    defaults.write_text("toc: true\nmetadata:\n  title: Book\n  date: '2025'\n", encoding="utf-8")
+    options = with_metadata(load_defaults(defaults), {"date": "2026-01-01"})
+    options["epub-cover-image"] = "images/cover.png"
+
+    request = ConversionRequest(
+        "# Intro\n\n![Diagram](images/diagram_01.png)\n\n![Remote](https://example.com/a.png)\n",
+        "epub",
+        options,
+        resource_root=resources,
+    )
+    payload = request.to_payload()
+
+    assert payload["from"] == "markdown" and payload["to"] == "epub"
+    assert payload["table-of-contents"] is True and "toc" not in payload
+    assert payload["metadata"] == {"title": "Book", "date": "2026-01-01"}
+    assert payload["files"] == {
+        "images/cover.png": base64.b64encode(b"cover").decode(),
+        "images/diagram_01.png": base64.b64encode(b"\x89PNG").decode(),
+    }
+    with pytest.raises(PandocError):
+        ConversionRequest("text", "epub", {"filters": ["fix.lua"]}).to_payload()
+
+
+def test_pool_converts_requests_in_parallel_and_in_order(resources: Path, tmp_path: Path) -> None:
+    server = tmp_path / "fake_pandoc_server.py"
+    server.write_text(FAKE_SERVER, encoding="utf-8")
+    text = "![Diagram](images/diagram_01.png)"
+    requests = [
+        ConversionRequest(text, fmt, resource_root=resources) for fmt in ("epub", "html", "broken", "docx")
+    ]
+
+    with PandocServerPool(2, command=[sys.executable, str(server)]) as pool:
+        results = pool.convert_many(requests)
+        again = pool.convert(requests[1])
+
+    outputs = [result if isinstance(result, PandocError) else result.output for result in results]
+    assert outputs[0] == f"epub:{text}:images/diagram_01.png".encode()
+    assert outputs[1] == again.output == f"html:{text}:images/diagram_01.png".encode()
+    assert isinstance(outputs[2], PandocError) and "Unknown output format" in str(outputs[2])
+    assert outputs[3].startswith(b"docx:")
+
+
+def test_dropped_and_timed_out_requests_fail_on_their_own(resources: Path, tmp_path: Path) -> None:
+    server = tmp_path / "fake_pandoc_server.py"
+    server.write_text(FAKE_SERVER, encoding="utf-8")
+    requests = [ConversionRequest("text", fmt, resource_root=resources) for fmt in ("drop", "slow", "html")]
+
+    with PandocServerPool(1, command=[sys.executable, str(server)], timeout=0.5) as pool:
+        results = pool.convert_many(requests)
+
+    assert all(isinstance(result, PandocError) for result in results[:2])
+    assert "did not answer the drop request" in str(results[0])
+    assert results[2].output == b"html:text:"
+
+
+@pytest.mark.skipif(shutil.which("pandoc") is None, reason="pandoc is not installed")
+def test_cli_fallback_reads_the_request_from_stdin(resources: Path) -> None:
+    request = ConversionRequest("# Intro\n\nHello *world*.\n", "html", {"metadata": {"title": "Book"}})
+
+    result = PandocCli(workers=1).convert(request)
+
+    assert b"<em>world</em>" in result.output
@@ -14,12 +14,17 @@ import json
 from pathlib import Path
 import sys
 import subprocess
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 
 # Add project root to path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root / "scripts"))
 
-from verify_sources import SourceVerifier
+from http_pool import PooledHttpClient
+from source_verification_cache import UrlCheck, UrlVerificationCache
+from verify_sources import HostThrottle, SourceVerifier
 
 
 class TestSourceVerification:
@@ -293,3 +298,283 @@ class TestSourceVerification:
         print(f"  Verified: {len(verifier.valid_sources)}")
         print(f"  Broken: {len(verifier.broken_sources)}")
         print(f"  Manual check needed: {len(verifier.skipped_sources)}")
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    """Slow local HTTP server that records request concurrency."""
+
+    def do_HEAD(self):
+        server = self.server
+        with server.lock:
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+        try:
+            time.sleep(server.delay)
+            status = 404 if self.path.startswith("/missing") else 200
+            self.send_response(status)
+            self.end_headers()
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+    def log_message(self, format, *args):  # noqa: A002 - signature fixed by base class
+        pass
+
+
+@pytest.fixture
+def stand_in_server():
+    """Serve HEAD requests from 127.0.0.1 with a fixed per-request delay."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StandInHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.in_flight = 0
+    server.max_in_flight = 0
+    server.delay = 0.3
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _base_url(server):
+    return f"http://127.0.0.1:{server.server_address[1]}"
+
+
+class TestConcurrentVerification:
+    """Concurrent URL verification against a local stand-in server."""
+
+    def test_urls_are_checked_concurrently(self, stand_in_server):
+        base = _base_url(stand_in_server)
+        urls = [f"{base}/page-{i}" for i in range(6)]
+        verifier = SourceVerifier(
+            timeout=5, workers=6, per_host=6, host_delay=0, skip_localhost=False
+        )
+
+        started = time.monotonic()
+        results = verifier.verify_urls(urls)
+        elapsed = time.monotonic() - started
+
+        assert list(results) == urls
+        assert all(valid for valid, _ in results.values())
+        assert elapsed < 6 * stand_in_server.delay * 0.6, (
+            f"Concurrent verification took {elapsed:.2f}s"
+        )
+
+    def test_per_host_limit_is_respected(self, stand_in_server):
+        base = _base_url(stand_in_server)
+        verifier = SourceVerifier(
+            timeout=5, workers=8, per_host=2, host_delay=0, skip_localhost=False
+        )
+
+        verifier.verify_urls([f"{base}/page-{i}" for i in range(6)])
+
+        assert stand_in_server.max_in_flight <= 2
+
+    def test_report_order_follows_manuscript_order(self, stand_in_server, tmp_path):
+        base = _base_url(stand_in_server)
+        chapter = tmp_path / "01_chapter.md"
+        chapter.write_text(
+            "# Chapter\n\n## Sources\n\n"
+            + "".join(
+                f"- Source {i}. [{name}]({base}/{name})\n"
+                for i, name in enumerate(["a", "missing-b", "c", "missing-d", "e"])
+            ),
+            encoding="utf-8",
+        )
+        verifier = SourceVerifier(
+            timeout=5, workers=4, per_host=4, host_delay=0, skip_localhost=False
+        )
+        verifier.all_sources = verifier.extract_sources_from_file(chapter)
+
+        verifier.verify_urls([url for s in verifier.all_sources for url in s["urls"]])
+        for source in verifier.all_sources:
+            result = verifier.verify_source(source)
+            (verifier.valid_sources if result["verified"] else verifier.broken_sources).append(result)
+
+        assert [r["source"]["line"] for r in verifier.valid_sources] == [5, 7, 9]
+        assert [r["source"]["line"] for r in verifier.broken_sources] == [6, 8]
+
+    def test_host_throttle_spaces_requests(self):
+        throttle = HostThrottle(max_concurrent=4, min_interval=0.05)
+        starts = []
+
+        def _request():
+            with throttle.slot("example.org"):
+                starts.append(time.monotonic())
+
+        threads = [threading.Thread(target=_request) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        starts.sort()
+        gaps = [later - earlier for earlier, later in zip(starts, starts[1:])]
+        assert all(gap >= 0.04 for gap in gaps), gaps
+
+
+class TestPersistentUrlCache:
+    """Persistent URL result cache shared across verifier runs."""
+
+    def _verifier(self, cache):
+        return SourceVerifier(
+            timeout=5, workers=4, per_host=4, host_delay=0, skip_localhost=False, cache=cache
+        )
+
+    def test_fresh_results_skip_the_network(self, stand_in_server, tmp_path):
+        stand_in_server.delay = 0
+        base = _base_url(stand_in_server)
+        urls = [f"{base}/page", f"{base}/missing"]
+
+        first = self._verifier(UrlVerificationCache(tmp_path))
+        first.verify_urls(urls)
+        stand_in_server.shutdown()
+
+        # A new run (fresh verifier, reopened database) answers from disk.
+        cache = UrlVerificationCache(tmp_path)
+        results = self._verifier(cache).verify_urls(urls)
+
+        assert results[f"{base}/page"] == (True, "OK (200)")
+        assert results[f"{base}/missing"][0] is False
+        assert cache.hits == 2
+
+    def test_each_outcome_has_its_own_ttl(self, tmp_path):
+        cache = UrlVerificationCache(
+            tmp_path, success_ttl=100, failure_ttl=10, rate_limit_ttl=1
+        )
+        cache.put("https://ok.example", UrlCheck(True, "OK (200)", 200, checked_at=1000))
+        cache.put("https://gone.example", UrlCheck(False, "HTTP 404", 404, checked_at=1000))
+        cache.put("https://busy.example", UrlCheck(True, "Rate limited (429)", 429, checked_at=1000))
+
+        fresh = {url for url in ("https://ok.example", "https://gone.example", "https://busy.example")
+                 if cache.get(url, now=1005) is not None}
+
+        assert fresh == {"https://ok.example", "https://gone.example"}
+        stored = cache.get("https://gone.example", now=1005)
+        assert (stored.http_code, stored.status) == (404, "HTTP 404")
+
+    def test_max_age_and_refresh_failed_force_rechecks(self, tmp_path):
+        UrlVerificationCache(tmp_path).put(
+            "https://ok.example", UrlCheck(True, "OK (200)", 200, checked_at=1000)
+        )
+        UrlVerificationCache(tmp_path).put(
+            "https://gone.example", UrlCheck(False, "HTTP 404", 404, checked_at=1000)
+        )
+
+        capped = UrlVerificationCache(tmp_path, max_age=30)
+        assert capped.get("https://ok.example", now=1060) is None
+
+        refreshing = UrlVerificationCache(tmp_path, refresh_failed=True)
+        assert refreshing.get("https://ok.example", now=1060) is not None
+        assert refreshing.get("https://gone.example", now=1001) is None
+
+
+class _KeepAliveHandler(BaseHTTPRequestHandler):
+    """HTTP/1.1 server that counts TCP connections and rejects HEAD on /no-head."""
+
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def _reply(self, status, body=b"", headers=()):
+        self.send_response(status)
+        for name, value in headers:
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def do_HEAD(self):
+        self.server.requests.append(("HEAD", self.path, None))
+        if self.path.startswith("/no-head"):
+            self._reply(405)
+        elif self.path == "/moved":
+            self._reply(301, headers=[("Location", "/page-moved")])
+        else:
+            self._reply(404 if self.path.startswith("/missing") else 200)
+
+    def do_GET(self):
+        self.server.requests.append(("GET", self.path, self.headers.get("Range")))
+        self._reply(206, b"x")
+
+    def log_message(self, format, *args):  # noqa: A002 - signature fixed by base class
+        pass
+
+
+@pytest.fixture
+def keep_alive_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _KeepAliveHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.connections = 0
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+class TestPooledHttpClient:
+    """Keep-alive connection reuse in the verifier's HTTP layer."""
+
+    def test_same_host_urls_share_one_connection(self, keep_alive_server):
+        base = _base_url(keep_alive_server)
+        verifier = SourceVerifier(timeout=5, workers=1, host_delay=0, skip_localhost=False)
+
+        results = verifier.verify_urls([f"{base}/page-{i}" for i in range(5)] + [f"{base}/missing"])
+
+        assert [valid for valid, _ in results.values()] == [True] * 5 + [False]
+        assert keep_alive_server.connections == 1
+        assert verifier.http.connections_opened == 1
+        assert verifier.http.dns.lookups == 1
+
+    def test_head_fallback_uses_ranged_get_on_same_connection(self, keep_alive_server):
+        base = _base_url(keep_alive_server)
+        verifier = SourceVerifier(timeout=5, workers=1, host_delay=0, skip_localhost=False)
+
+        assert verifier.verify_url(f"{base}/no-head") == (True, "OK (206)")
+        assert keep_alive_server.requests == [
+            ("HEAD", "/no-head", None),
+            ("GET", "/no-head", "bytes=0-0"),
+        ]
+        assert keep_alive_server.connections == 1
+
+    def test_redirects_are_followed_and_recorded(self, keep_alive_server):
+        base = _base_url(keep_alive_server)
+        with PooledHttpClient(timeout=5) as client:
+            response = client.request("HEAD", f"{base}/moved")
+
+        assert (response.status, response.url) == (200, f"{base}/page-moved")
+        assert keep_alive_server.connections == 1
+
+    def test_connections_closed_by_the_server_are_not_reused(self, stand_in_server):
+        stand_in_server.delay = 0
+        base = _base_url(stand_in_server)
+        with PooledHttpClient(timeout=5) as client:
+            statuses = [client.request("HEAD", f"{base}/page-{i}").status for i in range(3)]
+
+        # The stand-in speaks HTTP/1.0 and closes after every response.
+        assert statuses == [200, 200, 200]
+        assert client.connections_opened == 3
+
+    def test_plain_http_goes_through_the_configured_proxy(self, keep_alive_server):
+        proxy = _base_url(keep_alive_server)
+        with PooledHttpClient(timeout=5, proxies={"http": proxy}) as client:
+            response = client.request("HEAD", "http://books.example/page")
+
+        assert response.status == 200
+        assert keep_alive_server.requests == [("HEAD", "http://books.example/page", None)]
+
+    def test_no_proxy_hosts_are_contacted_directly(self, keep_alive_server):
+        base = _base_url(keep_alive_server)
+        proxies = {"http": "http://127.0.0.1:9", "no": "127.0.0.1"}
+        with PooledHttpClient(timeout=5, proxies=proxies) as client:
+            assert client.request("HEAD", f"{base}/page").status == 200
+
+        assert keep_alive_server.requests == [("HEAD", "/page", None)]
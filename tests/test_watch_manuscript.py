@@ -0,0 +1,83 @@
+"""Tests for the manuscript watch daemon in watch_manuscript.py."""
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+import generate_whitepapers
+from watch_manuscript import ChangeSet, InotifyWatcher, PollingWatcher, WatchSession, wait_for_changes
+
+
+@pytest.fixture
+def tree(tmp_path: Path) -> Path:
+    (tmp_path / "docs" / "images").mkdir(parents=True)
+    (tmp_path / "templates").mkdir()
+    (tmp_path / "docs" / "01_intro.md").write_text("# Intro\n", encoding="utf-8")
+    return tmp_path
+
+
+def test_changes_are_routed_to_the_outputs_they_affect() -> None:
+    changes = ChangeSet.classify({
+        "docs/01_intro.md",
+        "docs/images/diagram_01.mmd",
+        "templates/whitepaper-template.html",
+    })
+
+    assert changes.lint == {"docs/01_intro.md", "docs/images/diagram_01.mmd"}
+    assert changes.chapters == {"01_intro.md"}
+    assert changes.diagrams == {"docs/images/diagram_01.mmd"}
+    assert changes.affects_whitepapers
+    assert not ChangeSet.classify({"docs/images/diagram_01.png"}).actionable
+
+
+def test_polling_watcher_reports_watched_files_only(tree: Path) -> None:
+    watcher = PollingWatcher(tree)
+    (tree / "docs" / "01_intro.md").write_text("# Introduction\n", encoding="utf-8")
+    (tree / "docs" / "images" / "diagram_01.png").write_bytes(b"png")
+    (tree / "BOOK_REQUIREMENTS.md").write_text("---\n", encoding="utf-8")
+
+    assert watcher.read(0) == {"docs/01_intro.md", "BOOK_REQUIREMENTS.md"}
+    assert watcher.read(0) == set()
+
+
+def test_inotify_watcher_debounces_a_burst_of_saves(tree: Path) -> None:
+    try:
+        watcher = InotifyWatcher(tree)
+    except OSError as exc:
+        pytest.skip(f"inotify unavailable: {exc}")
+
+    try:
+        chapter = tree / "docs" / "01_intro.md"
+        for revision in range(3):
+            chapter.write_text(f"# Intro {revision}\n", encoding="utf-8")
+        # Editors often save by writing a temporary file and renaming it.
+        temporary = tree / "docs" / ".02_next.md.tmp"
+        temporary.write_text("# Next\n", encoding="utf-8")
+        temporary.rename(tree / "docs" / "02_next.md")
+
+        assert wait_for_changes(watcher, debounce=0.05) == {"docs/01_intro.md", "docs/02_next.md"}
+        assert watcher.read(0.05) == set()
+    finally:
+        watcher.close()
+
+
+def test_template_edit_reaches_the_next_whitepaper_build(tree: Path, monkeypatch) -> None:
+    template = tree / "templates" / "whitepaper-template.html"
+    template.write_text("<p>first</p>", encoding="utf-8")
+    monkeypatch.setattr(generate_whitepapers, "WHITEPAPER_TEMPLATE_PATH", template)
+    seen: list[str | None] = []
+
+    def fake_generate() -> bool:
+        seen.append(generate_whitepapers.load_whitepaper_template())
+        return True
+
+    monkeypatch.setattr(generate_whitepapers, "generate_whitepapers", fake_generate)
+    session = WatchSession(tree, presentation=False, diagrams=False)
+    changes = ChangeSet.classify({"templates/whitepaper-template.html"})
+
+    session.build(changes)
+    template.write_text("<p>second edit</p>", encoding="utf-8")
+    session.build(changes)
+
+    assert seen == ["<p>first</p>", "<p>second edit</p>"]
@@ -7,18 +7,21 @@ reflects the current Architecture as Code manuscript and generates the expected
 whitepaper outputs for every numbered chapter in ``docs/``.
 """
 
+import contextlib
+import io
+import json
 import unittest
 import os
 import sys
 import tempfile
 import shutil
 from pathlib import Path
-
-import yaml
+from unittest import mock
 
 # Add parent directory to path to import the script
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from scripts.book_requirements import load_book_requirements_or_empty
 from generate_whitepapers import (
     get_chapter_mapping, 
     get_book_overview, 
@@ -26,6 +29,11 @@ from generate_whitepapers import (
     generate_whitepapers,
     resolve_diagram_src,
     create_whitepaper_html,
+    load_whitepaper_template,
+    render_whitepaper,
+    write_if_changed,
+    load_whitepaper_state,
+    WHITEPAPER_STATE_FILENAME,
 )
 
 class TestWhitepaperGeneration(unittest.TestCase):
@@ -44,22 +52,7 @@ class TestWhitepaperGeneration(unittest.TestCase):
     
     def _load_requirements_config(self):
         """Load requirements front matter as a dictionary."""
-        requirements_path = Path("BOOK_REQUIREMENTS.md")
-
-        if not requirements_path.exists():
-            return {}
-
-        lines = requirements_path.read_text(encoding="utf-8").splitlines()
-        if not lines or lines[0].strip() != "---":
-            return {}
-
-        front_matter = []
-        for line in lines[1:]:
-            if line.strip() == "---":
-                break
-            front_matter.append(line)
-
-        return yaml.safe_load("\n".join(front_matter)) or {}
+        return load_book_requirements_or_empty(Path("BOOK_REQUIREMENTS.md"))
 
     def _canonical_chapters(self):
         """Return the canonical chapter filenames defined in requirements."""
@@ -208,6 +201,122 @@ class TestWhitepaperGeneration(unittest.TestCase):
         self.assertIn('diagram refresh', html)
         self.assertIn('governance automation', html)
     
+    def test_render_once_differs_only_in_diagram_path(self):
+        """A single render should serve every output directory."""
+        chapter_data = {
+            'title': 'Diagram Chapter',
+            'diagram_path': 'images/diagram_01_introduction.png',
+            'condensed_content': ['Paragraph.'],
+            'section_headers': ['Section'],
+        }
+        book_overview = {
+            'title': 'Architecture as Code',
+            'description': 'Test description.',
+            'target_audience': 'Test audience',
+            'chapters_count': 34,
+        }
+        rendered = render_whitepaper(chapter_data, {'label': 'Chapter 1'}, book_overview, {'version': '1.0'})
+        with mock.patch.object(Path, "read_text", autospec=True, side_effect=Path.read_text) as read_text:
+            render_whitepaper(chapter_data, {'label': 'Chapter 2'}, book_overview, {'version': '1.0'})
+        template_reads = [call for call in read_text.call_args_list if call.args[0].name == "whitepaper-template.html"]
+
+        release_html = rendered.for_directory(Path("releases/whitepapers"))
+        standard_html = rendered.for_directory(Path("whitepapers"))
+
+        self.assertIn('src="../../docs/images/diagram_01_introduction.png"', release_html)
+        self.assertIn('src="../docs/images/diagram_01_introduction.png"', standard_html)
+        self.assertEqual(
+            release_html.replace("../../docs/", "../docs/"),
+            standard_html,
+        )
+        self.assertEqual(template_reads, [], "An unchanged template should not be re-read from disk")
+
+    def test_write_if_changed_skips_identical_bytes(self):
+        """Unchanged whitepapers should not be rewritten."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            target = Path(temp_dir) / "01_introduction_whitepaper.html"
+            self.assertTrue(write_if_changed(target, "<html>one</html>"))
+            os.utime(target, (1, 1))
+
+            self.assertFalse(write_if_changed(target, "<html>one</html>"))
+            self.assertEqual(target.stat().st_mtime, 1)
+
+            self.assertTrue(write_if_changed(target, "<html>two</html>"))
+            self.assertEqual(target.read_text(encoding="utf-8"), "<html>two</html>")
+
+    def test_parallel_generation_matches_sequential_output(self):
+        """--jobs should change neither the generated files nor the log order."""
+        whitepapers_dir = Path("whitepapers")
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            backup_dir = None
+            if whitepapers_dir.exists():
+                backup_dir = Path(temp_dir) / "backup_whitepapers"
+                shutil.move(str(whitepapers_dir), backup_dir)
+
+            try:
+                runs = []
+                for jobs in (1, 2):
+                    if whitepapers_dir.exists():
+                        shutil.rmtree(whitepapers_dir)
+                    log = io.StringIO()
+                    with contextlib.redirect_stdout(log):
+                        self.assertTrue(generate_whitepapers(release_mode=False, jobs=jobs))
+                    files = {
+                        path.name: path.read_bytes()
+                        for path in sorted(whitepapers_dir.glob("*.html"))
+                    }
+                    lines = [
+                        line for line in log.getvalue().splitlines()
+                        if not line.startswith("Rendering ")
+                    ]
+                    runs.append((files, lines))
+
+                self.assertEqual(runs[0][0], runs[1][0])
+                self.assertEqual(runs[0][1], runs[1][1])
+            finally:
+                if whitepapers_dir.exists():
+                    shutil.rmtree(whitepapers_dir)
+                if backup_dir and backup_dir.exists():
+                    shutil.move(str(backup_dir), whitepapers_dir)
+
+    def test_incremental_generation_renders_only_changed_chapters(self):
+        """Unchanged chapters are skipped, orphans removed and --full rebuilds everything."""
+        whitepapers_dir = Path("whitepapers")
+
+        def run(**kwargs):
+            log = io.StringIO()
+            with contextlib.redirect_stdout(log):
+                self.assertTrue(generate_whitepapers(release_mode=False, **kwargs))
+            return [line for line in log.getvalue().splitlines() if line.startswith("Processing ")]
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            backup_dir = None
+            if whitepapers_dir.exists():
+                backup_dir = Path(temp_dir) / "backup_whitepapers"
+                shutil.move(str(whitepapers_dir), backup_dir)
+
+            try:
+                chapter_count = len(run())
+                self.assertEqual(len(run()), 0)
+
+                state_path = whitepapers_dir / WHITEPAPER_STATE_FILENAME
+                state = load_whitepaper_state(whitepapers_dir)
+                tampered = sorted(state)[0]
+                state[tampered] = "stale"
+                state_path.write_text(json.dumps({"version": 1, "chapters": state}), encoding="utf-8")
+                orphan = whitepapers_dir / "99_removed_chapter_whitepaper.html"
+                orphan.write_text("<html></html>", encoding="utf-8")
+
+                self.assertEqual(run(), [f"Processing {tampered}..."])
+                self.assertFalse(orphan.exists())
+                self.assertEqual(len(run(full=True)), chapter_count)
+            finally:
+                if whitepapers_dir.exists():
+                    shutil.rmtree(whitepapers_dir)
+                if backup_dir and backup_dir.exists():
+                    shutil.move(str(backup_dir), whitepapers_dir)
+
     def test_whitepaper_generation_creates_all_files(self):
         """Test that whitepaper generation creates files for all mapped chapters."""
         # Use a temporary directory for output
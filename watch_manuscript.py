@@ -0,0 +1,436 @@
+#!/usr/bin/env python3
+"""
+Watch the manuscript and rebuild only what a save affects.
+
+Running the generators and validators by hand pays interpreter start-up, the
+PyYAML import and a full corpus parse on every invocation. This long-running
+command keeps all of that warm instead: the parsed chapters, the navigation
+index and the BOOK_REQUIREMENTS.md metadata stay memoized in-process, the
+Mermaid batch renderer keeps its browser open, and each change only triggers
+the work it affects:
+
+    - lint results for the changed files (scripts/manuscript_lint.py)
+    - whitepapers, which skip chapters whose digest did not change
+    - presentation outline entries of the changed chapters
+    - PNG renders of the changed Mermaid diagrams
+
+docs/, docs/images/, templates/ and the repository root (for
+BOOK_REQUIREMENTS.md and mkdocs.yml) are watched with inotify on Linux and by
+polling file modification times elsewhere. Bursts of events, such as an
+editor's write-and-rename save, are debounced into a single rebuild.
+
+Usage:
+    python3 watch_manuscript.py
+    python3 watch_manuscript.py --no-diagrams --no-whitepapers
+    python3 watch_manuscript.py --poll --debounce 0.3
+    python3 watch_manuscript.py --once      # Warm up, build once and exit
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import ctypes
+import ctypes.util
+import io
+import os
+import select
+import struct
+import sys
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from scripts.book_requirements import load_book_requirements  # noqa: E402
+from scripts.manuscript import load_documents  # noqa: E402
+from scripts.manuscript_lint import READ_ERROR, corpus_files, format_text, run_rules  # noqa: E402
+from scripts.navigation import load_navigation_index  # noqa: E402
+
+WATCHED_DIRECTORIES = ("docs", "docs/images", "templates", ".")
+ROOT_INPUTS = frozenset({"BOOK_REQUIREMENTS.md", "mkdocs.yml"})
+WATCHED_SUFFIXES = (".md", ".mmd", ".html", ".css", ".json")
+MERMAID_CONFIG = Path("docs/mermaid-kvadrat-theme.json")
+RENDER_MANIFEST = Path("docs/images/mermaid-render-manifest.json")
+DEFAULT_DEBOUNCE = 0.15
+POLL_INTERVAL = 0.25
+
+
+def is_watched(rel_path: str) -> bool:
+    """Return True for files whose changes can affect an output."""
+    if rel_path in ROOT_INPUTS:
+        return True
+    if "/" not in rel_path or "archive" in rel_path or rel_path == RENDER_MANIFEST.as_posix():
+        return False
+    return rel_path.startswith(("docs/", "templates/")) and rel_path.endswith(WATCHED_SUFFIXES)
+
+
+# ---------------------------------------------------------------------------
+# File watchers
+# ---------------------------------------------------------------------------
+
+
+class PollingWatcher:
+    """Detect changes by comparing modification times and sizes."""
+
+    def __init__(self, root: Path, directories: Iterable[str] = WATCHED_DIRECTORIES) -> None:
+        self.root = root
+        self.directories = [root / directory for directory in directories]
+        self._snapshot = self._scan()
+
+    def _scan(self) -> dict[str, tuple[int, int]]:
+        snapshot = {}
+        for directory in self.directories:
+            try:
+                entries = list(os.scandir(directory))
+            except OSError:
+                continue
+            for entry in entries:
+                rel_path = Path(entry.path).relative_to(self.root).as_posix()
+                if not is_watched(rel_path):
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                snapshot[rel_path] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def read(self, timeout: float | None) -> set[str]:
+        """Return changed paths, waiting up to ``timeout`` seconds (None: until one changes)."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            current = self._scan()
+            changed = {
+                path for path in current.keys() | self._snapshot.keys()
+                if current.get(path) != self._snapshot.get(path)
+            }
+            self._snapshot = current
+            if changed:
+                return changed
+            if deadline is not None and time.monotonic() >= deadline:
+                return set()
+            time.sleep(POLL_INTERVAL if deadline is None else min(POLL_INTERVAL, max(0.0, deadline - time.monotonic())))
+
+    def close(self) -> None:
+        """Nothing to release; present for interface parity."""
+
+
+class InotifyWatcher:
+    """Linux inotify watcher driven through libc, without third-party packages."""
+
+    IN_MODIFY = 0x00000002
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_MODIFY
+    _EVENT = struct.Struct("iIII")
+
+    def __init__(self, root: Path, directories: Iterable[str] = WATCHED_DIRECTORIES) -> None:
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify is only available on Linux")
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+        if not hasattr(libc, "inotify_init1"):
+            raise OSError("libc does not provide inotify")
+
+        self.root = root
+        self._fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._directories: dict[int, Path] = {}
+        for directory in directories:
+            path = root / directory
+            if not path.is_dir():
+                continue
+            descriptor = libc.inotify_add_watch(self._fd, os.fsencode(path), self.MASK)
+            if descriptor < 0:
+                self.close()
+                raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {path}")
+            self._directories[descriptor] = path
+
+    def read(self, timeout: float | None) -> set[str]:
+        """Return changed paths, waiting up to ``timeout`` seconds (None: until one changes)."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            ready, _, _ = select.select([self._fd], [], [], remaining)
+            if not ready:
+                return set()
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                continue
+            changed = set(self._parse(data))
+            if changed or (deadline is not None and time.monotonic() >= deadline):
+                return changed
+
+    def _parse(self, data: bytes) -> Iterable[str]:
+        offset = 0
+        while offset + self._EVENT.size <= len(data):
+            descriptor, _mask, _cookie, length = self._EVENT.unpack_from(data, offset)
+            offset += self._EVENT.size
+            name = data[offset:offset + length].rstrip(b"\0")
+            offset += length
+            directory = self._directories.get(descriptor)
+            if directory is None or not name:
+                continue
+            rel_path = (directory / os.fsdecode(name)).relative_to(self.root).as_posix()
+            if is_watched(rel_path):
+                yield rel_path
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+def create_watcher(root: Path, *, poll: bool = False) -> InotifyWatcher | PollingWatcher:
+    """Return an inotify watcher where available, otherwise a polling one."""
+    if not poll:
+        try:
+            return InotifyWatcher(root)
+        except OSError as exc:
+            print(f"⚠️  inotify unavailable ({exc}); polling for changes.")
+    return PollingWatcher(root)
+
+
+def wait_for_changes(watcher, debounce: float = DEFAULT_DEBOUNCE) -> set[str]:
+    """Block until something changes, then collect events until ``debounce`` seconds pass quietly."""
+    changed = watcher.read(None)
+    while True:
+        more = watcher.read(debounce)
+        if not more:
+            return changed
+        changed |= more
+
+
+# ---------------------------------------------------------------------------
+# Rebuild stages
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class ChangeSet:
+    """Changed repository-relative paths, grouped by the outputs they affect."""
+
+    paths: set[str]
+    lint: set[str] = field(default_factory=set)
+    chapters: set[str] = field(default_factory=set)
+    diagrams: set[str] = field(default_factory=set)
+    templates: set[str] = field(default_factory=set)
+    global_inputs: set[str] = field(default_factory=set)
+
+    @classmethod
+    def classify(cls, paths: Iterable[str]) -> "ChangeSet":
+        changes = cls(set(paths))
+        for path in changes.paths:
+            if path in ROOT_INPUTS:
+                changes.global_inputs.add(path)
+            elif path.startswith("templates/"):
+                changes.templates.add(path)
+            elif path.startswith("docs/"):
+                if path.endswith((".md", ".mmd")):
+                    changes.lint.add(path)
+                if path.endswith(".md") and path.count("/") == 1:
+                    changes.chapters.add(Path(path).name)
+                if path.startswith("docs/images/") and path.endswith(".mmd"):
+                    changes.diagrams.add(path)
+                if path == MERMAID_CONFIG.as_posix():
+                    changes.diagrams.update(
+                        source.as_posix() for source in Path("docs/images").glob("*.mmd")
+                    )
+        return changes
+
+    @property
+    def actionable(self) -> bool:
+        return bool(self.lint or self.chapters or self.diagrams or self.templates or self.global_inputs)
+
+    @property
+    def affects_whitepapers(self) -> bool:
+        return bool(self.chapters or self.global_inputs or "templates/whitepaper-template.html" in self.templates)
+
+
+class WatchSession:
+    """In-memory state shared by every rebuild of a watch run."""
+
+    def __init__(
+        self,
+        root: Path = REPO_ROOT,
+        *,
+        whitepapers: bool = True,
+        presentation: bool = True,
+        diagrams: bool = True,
+    ) -> None:
+        self.root = root
+        self.whitepapers = whitepapers
+        self.presentation = presentation
+        self.diagrams = diagrams
+        self._presentation_data: list[dict] | None = None
+        self._renderer = None
+        self._render_cache = None
+
+    def warm_up(self) -> None:
+        """Load the corpus, navigation and requirements into the in-process memos."""
+        started = time.monotonic()
+        load_book_requirements(self.root / "BOOK_REQUIREMENTS.md")
+        load_navigation_index()
+        documents = load_documents(path for path in corpus_files(self.root) if path.suffix == ".md")
+        print(f"🔥 Loaded {len(documents)} documents in {time.monotonic() - started:.2f}s")
+
+    def build(self, changes: ChangeSet | None = None) -> None:
+        """Rebuild what ``changes`` affects; ``None`` rebuilds everything."""
+        started = time.monotonic()
+        full = changes is None or bool(changes.global_inputs)
+        if changes is not None:
+            print(f"\n🔄 {', '.join(sorted(changes.paths))}")
+
+        if full or changes.lint:
+            self._lint(None if full else changes.lint)
+        if self.whitepapers and (full or changes.affects_whitepapers):
+            self._build_whitepapers()
+        if self.presentation and (full or changes.chapters):
+            self._build_presentation_outline(None if full else changes.chapters)
+        if self.diagrams and changes is not None and changes.diagrams:
+            self._render_diagrams(changes.diagrams)
+
+        print(f"⏱️  Done in {time.monotonic() - started:.2f}s")
+
+    def _lint(self, paths: set[str] | None) -> None:
+        if paths is not None:
+            paths = [self.root / path for path in sorted(paths) if (self.root / path).exists()]
+        findings = run_rules(paths=paths, root=self.root, jobs=1)
+        if paths is not None:
+            linted = {path.relative_to(self.root).as_posix() for path in paths}
+            # Corpus-wide findings are only worth repeating on a full run.
+            findings = [finding for finding in findings if finding.path in linted or finding.rule == READ_ERROR]
+        print(format_text(findings), end="")
+
+    def _build_whitepapers(self) -> None:
+        import generate_whitepapers
+
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            success = generate_whitepapers.generate_whitepapers()
+        for line in output.getvalue().splitlines():
+            if line.startswith(("Generated:", "Removed", "Error")):
+                print(f"📄 {line}")
+        if not success:
+            print("❌ Whitepaper generation failed")
+
+    def _build_presentation_outline(self, chapters: set[str] | None) -> None:
+        import generate_presentation
+
+        known = {item.get("file") for item in self._presentation_data or []}
+        with contextlib.redirect_stdout(io.StringIO()):
+            if self._presentation_data is None or chapters is None or not chapters <= known:
+                self._presentation_data = generate_presentation.generate_presentation_outline()
+            else:
+                self._presentation_data = generate_presentation.refresh_presentation_outline(
+                    self._presentation_data, chapters
+                )
+            generate_presentation.write_presentation_outline(self._presentation_data, Path("presentations"))
+        print(f"🎞️  Presentation outline: {len(self._presentation_data)} entries")
+
+    def _render_diagrams(self, sources: set[str]) -> None:
+        from scripts.mermaid_batch_render import (
+            RendererUnavailable,
+            RenderJob,
+            create_renderer,
+            mermaid_cli_version,
+        )
+        from scripts.mermaid_render_cache import DEFAULT_RENDER_OPTIONS, RenderCache, RenderManifest
+
+        if self._render_cache is None:
+            self._render_cache = RenderCache(
+                RenderManifest.load(RENDER_MANIFEST),
+                config_file=MERMAID_CONFIG,
+                options=dict(DEFAULT_RENDER_OPTIONS),
+                cli_version=mermaid_cli_version(self.root),
+            )
+        existing = [path for path in (Path(source) for source in sorted(sources)) if path.is_file()]
+        jobs = [
+            RenderJob(source=path, target=path.with_suffix(".png"), config_file=MERMAID_CONFIG)
+            for path in self._render_cache.stale_sources(existing)
+        ]
+        if not jobs:
+            return
+        if self._renderer is None:
+            try:
+                self._renderer = create_renderer()
+            except RendererUnavailable as exc:
+                print(f"⚠️  Diagram rendering disabled: {exc}")
+                self.diagrams = False
+                return
+        for result in self._renderer.render(jobs):
+            if result.success:
+                self._render_cache.record(result.job.source)
+                print(f"🖼️  Rendered {result.job.target}")
+            else:
+                print(f"❌ Failed to render {result.job.source}: {result.detail}")
+        self._render_cache.manifest.save()
+
+    def close(self) -> None:
+        if self._renderer is not None:
+            self._renderer.close()
+            self._renderer = None
+
+
+def _parse_arguments(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Watch the manuscript and rebuild affected outputs.")
+    parser.add_argument("--poll", action="store_true", help="Poll modification times instead of using inotify.")
+    parser.add_argument(
+        "--debounce",
+        type=float,
+        default=DEFAULT_DEBOUNCE,
+        help=f"Seconds without events before rebuilding (default: {DEFAULT_DEBOUNCE}).",
+    )
+    parser.add_argument("--no-whitepapers", action="store_true", help="Do not regenerate whitepapers.")
+    parser.add_argument("--no-presentation", action="store_true", help="Do not refresh the presentation outline.")
+    parser.add_argument("--no-diagrams", action="store_true", help="Do not re-render changed Mermaid diagrams.")
+    parser.add_argument("--once", action="store_true", help="Warm up, run one full build and exit.")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = _parse_arguments(argv)
+    # The generators resolve docs/, templates/ and their outputs from the repository root.
+    os.chdir(REPO_ROOT)
+
+    session = WatchSession(
+        REPO_ROOT,
+        whitepapers=not args.no_whitepapers,
+        presentation=not args.no_presentation,
+        diagrams=not args.no_diagrams,
+    )
+    session.warm_up()
+    session.build()
+    if args.once:
+        session.close()
+        return 0
+
+    watcher = create_watcher(REPO_ROOT, poll=args.poll)
+    print(f"👀 Watching {', '.join(d for d in WATCHED_DIRECTORIES if d != '.')} and {', '.join(sorted(ROOT_INPUTS))} (Ctrl+C to stop)")
+    try:
+        while True:
+            changes = ChangeSet.classify(wait_for_changes(watcher, args.debounce))
+            if not changes.actionable:
+                continue
+            try:
+                session.build(changes)
+            except Exception as exc:  # keep watching after a failed rebuild
+                print(f"❌ Rebuild failed: {exc}")
+    except KeyboardInterrupt:
+        print("\nStopped watching.")
+    finally:
+        watcher.close()
+        session.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())